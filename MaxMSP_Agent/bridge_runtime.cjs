@@ -1,3 +1,4 @@
+const zlib = require("zlib");
 const protocol = require("./protocol.generated.cjs");
 
 function envFlag(rawValue, defaultValue = false) {
@@ -63,13 +64,101 @@ function buildBridgeConfig(env = process.env) {
     ),
     transportRequestRetryDelayMs: envInt(env.MAXMCP_TRANSPORT_REQUEST_RETRY_DELAY_MS, 120, 0),
     transportDictPrefix: envString(env.MAXMCP_TRANSPORT_DICT_PREFIX, "__maxmcp_transport"),
+    framing: envString(env.MAXMCP_BRIDGE_FRAMING, "auto").toLowerCase(),
+    // Clients opt in by offering codecs; this only limits what the bridge accepts.
+    compression: envString(env.MAXMCP_BRIDGE_COMPRESSION, "auto").toLowerCase(),
     projectRootDir: envString(env.MAXMCP_PROJECT_ROOT_DIR, process.cwd()),
     protocol,
   };
 }
 
+function loadFrameCodecs(preference = "auto", requireFn = require) {
+  // JSON needs no codec: socket.io serializes plain objects itself.
+  const codecs = new Map();
+  if (preference === "auto" || preference === protocol.framing_msgpack) {
+    try {
+      const msgpack = requireFn("@msgpack/msgpack");
+      if (typeof msgpack.encode === "function" && typeof msgpack.decode === "function") {
+        codecs.set(protocol.framing_msgpack, {
+          encode: (value) => Buffer.from(msgpack.encode(value)),
+          decode: (frame) => msgpack.decode(frame),
+        });
+      }
+    } catch (_require_error) {
+      // Optional dependency; fall back to JSON framing.
+    }
+  }
+  codecs.set(protocol.framing_json, null);
+  return codecs;
+}
+
+function negotiateFraming(offered, codecs) {
+  if (Array.isArray(offered)) {
+    for (const item of offered) {
+      const name = String(item || "").trim().toLowerCase();
+      if (codecs.has(name)) {
+        return name;
+      }
+    }
+  }
+  return protocol.framing_json;
+}
+
+function loadCompressionCodecs(preference = "auto", zlibModule = zlib) {
+  const codecs = new Map();
+  const wants = (name) => preference === "auto" || preference === name;
+  if (
+    wants(protocol.compression_zstd)
+    && typeof zlibModule.zstdCompressSync === "function"
+    && typeof zlibModule.zstdDecompressSync === "function"
+  ) {
+    codecs.set(protocol.compression_zstd, {
+      compress: (body) => zlibModule.zstdCompressSync(body),
+      decompress: (data) => zlibModule.zstdDecompressSync(data),
+    });
+  }
+  if (wants(protocol.compression_zlib)) {
+    codecs.set(protocol.compression_zlib, {
+      compress: (body) => zlibModule.deflateSync(body),
+      decompress: (data) => zlibModule.inflateSync(data),
+    });
+  }
+  return codecs;
+}
+
+function negotiateCompression(offered, codecs) {
+  if (Array.isArray(offered)) {
+    for (const item of offered) {
+      const name = String(item || "").trim().toLowerCase();
+      if (codecs.has(name)) {
+        return name;
+      }
+    }
+  }
+  return "";
+}
+
+function isBinaryFrame(data) {
+  return Buffer.isBuffer(data) || data instanceof ArrayBuffer || ArrayBuffer.isView(data);
+}
+
+// Milliseconds left before an envelope's absolute deadline_ms, or null when it carries none.
+function deadlineRemainingMs(envelope, nowMs = Date.now()) {
+  const deadline = Number(envelope && envelope.deadline_ms);
+  if (!Number.isFinite(deadline) || deadline <= 0) {
+    return null;
+  }
+  return deadline - nowMs;
+}
+
 module.exports = {
   buildBridgeConfig,
+  deadlineRemainingMs,
+  isBinaryFrame,
+  loadCompressionCodecs,
+  loadFrameCodecs,
+  negotiateCompression,
+  negotiateFraming,
   envFlag,
   envInt,
   envString,
@@ -10,6 +10,9 @@ var patcher_stack = [];  // Stack of {patcher, name} for navigation history
 var base_context_depth = 0; // hidden baseline depth when a managed workspace is active
 var active_workspace_target = "host";
 var active_workspace_varname = "";
+// Navigation state of workspaces that are not currently active, keyed by target id.
+// Requests carrying an envelope workspace_target switch to their workspace on arrival.
+var workspace_states = {};
 
 // Legacy alias - some functions still use 'p'
 var p = this.patcher;
@@ -65,11 +68,17 @@ var ACTION_TRANSPORT_END = "_maxmcp_transport_end"; // explicit legacy rejection
 var ACTION_TRANSPORT_DICT_REQUEST = "_maxmcp_transport_dict_request";
 var ACTION_TRANSPORT_DICT_RESPONSE = "_maxmcp_transport_dict_response";
 var ACTION_TRANSPORT_FILE_REQUEST = "_maxmcp_transport_file_request";
+var ACTION_TRANSPORT_CANCEL = "_maxmcp_transport_cancel";
+var CANCELLED_REQUEST_TTL_MS = 60000;
+// request_id -> expiry ms for requests the caller abandoned before Max reached them.
+var cancelled_requests = {};
+// request_id -> Date.now() when its handler started; echoed as meta.max_execute_ms.
+var request_started_ms = {};
 var TRANSPORT_DICT_TTL_MS = 45000;
 var TRANSPORT_DICT_PREFIX = "__maxmcp_transport";
 var CAPABILITY_ACTIONS = [
-    "get_objects_in_patch", "get_objects_in_selected", "get_object_attributes",
-    "get_avoid_rect_position", "add_object", "add_object_with_preflight", "remove_object",
+    "get_objects_in_patch", "get_objects_in_patch_page", "get_objects_in_selected",
+    "get_object_attributes", "get_avoid_rect_position", "add_object", "add_object_with_preflight", "remove_object",
     "connect_objects", "disconnect_objects", "set_object_attribute",
     "set_message_text", "send_message_to_object", "send_bang_to_object",
     "set_number", "create_subpatcher", "enter_subpatcher", "exit_subpatcher",
@@ -77,8 +86,14 @@ var CAPABILITY_ACTIONS = [
     "recreate_with_args", "move_object", "autofit_existing", "encapsulate",
     "check_signal_safety", "bridge_ping", "health_ping", "capabilities",
     "set_workspace_target", "workspace_status", "apply_topology_snapshot",
-    "apply_topology_snapshot_progressive"
+    "apply_topology_snapshot_progressive", "stage_topology_snapshot", "apply_topology_delta", "batch"
 ];
+var BATCH_ACTION = "batch";
+var CAPTURE_PAGE_DEFAULT_SIZE = 200;
+var CAPTURE_PAGE_MAX_SIZE = 1000;
+var BATCH_MAX_ITEMS = 256;
+// Maps in-progress batch item request ids to their captured response.
+var _batch_capture = null;
 
 function _capability_flags(actions) {
     var flags = {};
@@ -249,6 +264,9 @@ function _handle_transport_action(data) {
                 data.bridge_proto || ""
             );
             return true;
+        case ACTION_TRANSPORT_CANCEL:
+            _remember_cancelled_request(data.request_id || "");
+            return true;
         case ACTION_TRANSPORT_FILE_REQUEST:
             _transport_respond_error(
                 _transport_request_id(data),
@@ -404,6 +422,35 @@ function _maxmcp_transport_dict_request(dict_name, request_id, transport_id, tot
     );
 }
 
+function _remember_cancelled_request(request_id) {
+    var requestId = request_id ? String(request_id) : "";
+    if (!requestId) {
+        return;
+    }
+    var now = Date.now();
+    for (var key in cancelled_requests) {
+        if (cancelled_requests[key] <= now) {
+            delete cancelled_requests[key];
+        }
+    }
+    cancelled_requests[requestId] = now + CANCELLED_REQUEST_TTL_MS;
+}
+
+function _mark_request_started(request_id) {
+    var now = Date.now();
+    // Handlers that never respond must not pin their entries.
+    for (var key in request_started_ms) {
+        if (now - request_started_ms[key] > CANCELLED_REQUEST_TTL_MS) {
+            delete request_started_ms[key];
+        }
+    }
+    request_started_ms[request_id] = now;
+}
+
+function _maxmcp_transport_cancel(request_id, reason) {
+    _remember_cancelled_request(request_id);
+}
+
 function _maxmcp_transport_file_request(
     file_path,
     request_id,
@@ -562,6 +609,21 @@ function _emit_response_payload(envelope) {
 }
 
 function emit_response_envelope(request_id, state, results, error, meta) {
+    meta = _attach_twin_delta(request_id, state, meta);
+    if (request_id && request_started_ms.hasOwnProperty(request_id)) {
+        meta = meta || {};
+        meta.max_execute_ms = Date.now() - request_started_ms[request_id];
+        delete request_started_ms[request_id];
+    }
+    if (_batch_capture && request_id && _batch_capture.hasOwnProperty(request_id)) {
+        _batch_capture[request_id] = {
+            state: state,
+            results: results,
+            error: error,
+            meta: meta
+        };
+        return;
+    }
     var envelope = {
         protocol_version: "2.0",
         bridge_proto: BRIDGE_PROTO,
@@ -622,6 +684,13 @@ var ACTION_HANDLERS = {
             respond_error(data.request_id, "VALIDATION_ERROR", "Missing request_id for get_objects_in_patch");
         }
     },
+    get_objects_in_patch_page: function(data) {
+        if (data.request_id) {
+            get_objects_in_patch_page(data.request_id, data.cursor, data.page_size);
+        } else {
+            respond_error(data.request_id, "VALIDATION_ERROR", "Missing request_id for get_objects_in_patch_page");
+        }
+    },
     get_objects_in_selected: function(data) {
         if (data.request_id) {
             get_objects_in_selected(data.request_id);
@@ -926,8 +995,78 @@ var ACTION_HANDLERS = {
             respond_error(data.request_id, "VALIDATION_ERROR", "Missing request_id or snapshot for apply_topology_snapshot");
         }
     },
+    apply_topology_delta: function(data) {
+        if (data.request_id && data.delta) {
+            var delta_applied = apply_topology_delta(data.delta);
+            if (delta_applied.success) {
+                respond_success(data.request_id, delta_applied);
+            } else {
+                respond_error(
+                    data.request_id,
+                    delta_applied.error.code,
+                    delta_applied.error.message,
+                    delta_applied.error.hint,
+                    delta_applied.error.recoverable,
+                    delta_applied.error.details
+                );
+            }
+        } else {
+            respond_error(data.request_id, "VALIDATION_ERROR", "Missing request_id or delta for apply_topology_delta");
+        }
+    },
+    batch: function(data) {
+        if (data.request_id && data.items && data.items.length) {
+            run_batch(data.request_id, data.items, !!data.stop_on_error, data.deadline_ms);
+        } else {
+            respond_error(data.request_id, "VALIDATION_ERROR", "Missing request_id or items for batch");
+        }
+    },
+    stage_topology_snapshot: function(data) {
+        if (data.request_id && data.snapshot_hash) {
+            var staged = stage_topology_snapshot(
+                String(data.snapshot_hash),
+                data.piece_index,
+                data.piece_count,
+                data.boxes,
+                data.lines
+            );
+            if (staged.success) {
+                respond_success(data.request_id, staged);
+            } else {
+                respond_error(
+                    data.request_id,
+                    staged.error.code,
+                    staged.error.message,
+                    staged.error.hint,
+                    staged.error.recoverable,
+                    staged.error.details
+                );
+            }
+        } else {
+            respond_error(data.request_id, "VALIDATION_ERROR", "Missing request_id or snapshot_hash for stage_topology_snapshot");
+        }
+    },
     apply_topology_snapshot_progressive: function(data) {
-        if (data.request_id && data.snapshot) {
+        if (data.request_id && !data.snapshot && data.snapshot_hash) {
+            var applied_staged = apply_staged_topology_snapshot_progressive(
+                String(data.snapshot_hash),
+                (data.progress_state && typeof data.progress_state === "object") ? data.progress_state : null,
+                data.chunk_size,
+                !!data.debug_timing
+            );
+            if (applied_staged.success) {
+                respond_success(data.request_id, applied_staged);
+            } else {
+                respond_error(
+                    data.request_id,
+                    applied_staged.error.code,
+                    applied_staged.error.message,
+                    applied_staged.error.hint,
+                    applied_staged.error.recoverable,
+                    applied_staged.error.details
+                );
+            }
+        } else if (data.request_id && data.snapshot) {
             var continuation_state = null;
             if (data.progress_state && typeof data.progress_state === "object") {
                 continuation_state = data.progress_state;
@@ -964,7 +1103,7 @@ var ACTION_HANDLERS = {
             respond_error(
                 data.request_id,
                 "VALIDATION_ERROR",
-                "Missing request_id or snapshot for apply_topology_snapshot_progressive"
+                "Missing request_id, snapshot, or snapshot_hash for apply_topology_snapshot_progressive"
             );
         }
     }
@@ -993,14 +1132,321 @@ function _dispatch_action(data) {
             }
         }
     }
+    if (data.request_id && cancelled_requests[data.request_id]) {
+        // Nobody is waiting for this response any more; skip the work entirely.
+        delete cancelled_requests[data.request_id];
+        post("[maxmcp] skipped cancelled request " + data.request_id + "\n");
+        return;
+    }
+    if (data.deadline_ms && Date.now() > data.deadline_ms) {
+        respond_error(
+            data.request_id,
+            "DEADLINE_EXCEEDED",
+            "Request deadline passed before Max started it.",
+            null,
+            true,
+            { deadline_ms: data.deadline_ms, overdue_ms: Date.now() - data.deadline_ms }
+        );
+        return;
+    }
     var handler = ACTION_HANDLERS[data.action];
     if (typeof handler === "function") {
-        handler(data);
+        var target_error = _enter_request_workspace(data.workspace_target);
+        if (target_error) {
+            respond_error(
+                data.request_id,
+                target_error.code,
+                target_error.message,
+                target_error.hint,
+                target_error.recoverable,
+                target_error.details
+            );
+            return;
+        }
+        var previous_hook = _twin_delta_hook;
+        _twin_delta_hook = _prepare_twin_delta_hook(data);
+        if (data.request_id) {
+            _mark_request_started(data.request_id);
+        }
+        try {
+            handler(data);
+        } finally {
+            _twin_delta_hook = previous_hook;
+        }
         return;
     }
     respond_error(data.request_id, "UNKNOWN_ACTION", "Unknown action: " + data.action);
 }
 
+function _batch_item_failure(index, action, code, message) {
+    return {
+        index: index,
+        action: action,
+        state: "failed",
+        error: {
+            code: code,
+            message: message,
+            recoverable: true,
+            details: {}
+        }
+    };
+}
+
+function _run_batch_item(request_id, index, item) {
+    var action = item && item.action ? String(item.action) : "";
+    if (!action || action === BATCH_ACTION) {
+        return _batch_item_failure(index, action, "VALIDATION_ERROR", "Batch item has a missing or nested action.");
+    }
+    if (typeof ACTION_HANDLERS[action] !== "function") {
+        return _batch_item_failure(index, action, "UNKNOWN_ACTION", "Unknown action: " + action);
+    }
+    var item_request_id = request_id + ":" + index;
+    var data = {
+        bridge_proto: BRIDGE_PROTO,
+        request_id: item_request_id,
+        action: action,
+        payload: (item.payload && typeof item.payload === "object") ? item.payload : {}
+    };
+    var capture = {};
+    capture[item_request_id] = null;
+    _batch_capture = capture;
+    try {
+        _dispatch_action(data);
+    } catch (e) {
+        return _batch_item_failure(index, action, "INTERNAL_ERROR", "Batch item raised: " + e.message);
+    } finally {
+        _batch_capture = null;
+    }
+    var response = capture[item_request_id];
+    if (!response) {
+        return _batch_item_failure(index, action, "INTERNAL_ERROR", "Batch item completed without a response.");
+    }
+    var entry = { index: index, action: action, state: response.state };
+    if (response.state === "failed") {
+        entry.error = response.error;
+    } else {
+        entry.results = response.results;
+    }
+    if (response.meta) {
+        entry.meta = response.meta;
+    }
+    return entry;
+}
+
+// Runs each item through the regular action handlers and replies once with per-item results.
+// Items left when deadline_ms passes are skipped rather than run for a caller that gave up.
+function run_batch(request_id, items, stop_on_error, deadline_ms) {
+    if (items.length > BATCH_MAX_ITEMS) {
+        respond_error(
+            request_id,
+            "VALIDATION_ERROR",
+            "Batch exceeds the maximum of " + BATCH_MAX_ITEMS + " items.",
+            null,
+            false,
+            { item_count: items.length, max_items: BATCH_MAX_ITEMS }
+        );
+        return;
+    }
+    var results = [];
+    var failed = 0;
+    var halted = false;
+    var deadline_exceeded = false;
+    for (var i = 0; i < items.length; i++) {
+        var action = items[i] && items[i].action ? String(items[i].action) : "";
+        if (!halted && deadline_ms && Date.now() > deadline_ms) {
+            halted = true;
+            deadline_exceeded = true;
+        }
+        if (halted) {
+            results.push({ index: i, action: action, state: "skipped" });
+            continue;
+        }
+        var entry = _run_batch_item(request_id, i, items[i]);
+        if (entry.state === "failed") {
+            failed++;
+            halted = stop_on_error;
+        }
+        results.push(entry);
+    }
+    respond_success(request_id, {
+        items: results,
+        item_count: items.length,
+        failed: failed,
+        stopped_early: halted,
+        deadline_exceeded: deadline_exceeded
+    });
+}
+
+// Twin deltas: successful topology mutations echo the rows they touched so the
+// Python twin can update its local model without recapturing the whole patch.
+var TWIN_DELTA_ACTIONS = {
+    add_object: true,
+    add_object_with_preflight: true,
+    remove_object: true,
+    connect_objects: true,
+    disconnect_objects: true,
+    move_object: true,
+    apply_topology_delta: true
+};
+var _twin_delta_hook = null;
+
+function _twin_peer_varnames(obj, into) {
+    var complete = true;
+    var cords = obj && obj.patchcords ? obj.patchcords : null;
+    if (!cords) {
+        return complete;
+    }
+    var i;
+    for (i = 0; cords.inputs && i < cords.inputs.length; i++) {
+        if (cords.inputs[i].srcobject && cords.inputs[i].srcobject.varname) {
+            into.push(cords.inputs[i].srcobject.varname);
+        } else {
+            complete = false;
+        }
+    }
+    for (i = 0; cords.outputs && i < cords.outputs.length; i++) {
+        if (cords.outputs[i].dstobject && cords.outputs[i].dstobject.varname) {
+            into.push(cords.outputs[i].dstobject.varname);
+        } else {
+            complete = false;
+        }
+    }
+    return complete;
+}
+
+function _twin_lines_for(obj) {
+    var rows = [];
+    var cords = obj.patchcords;
+    var i;
+    for (i = 0; cords && cords.outputs && i < cords.outputs.length; i++) {
+        rows.push({patchline: {
+            source: [obj.varname, cords.outputs[i].srcoutlet],
+            destination: [cords.outputs[i].dstobject.varname, cords.outputs[i].dstinlet]
+        }});
+    }
+    for (i = 0; cords && cords.inputs && i < cords.inputs.length; i++) {
+        rows.push({patchline: {
+            source: [cords.inputs[i].srcobject.varname, cords.inputs[i].srcoutlet],
+            destination: [obj.varname, cords.inputs[i].dstinlet]
+        }});
+    }
+    return rows;
+}
+
+function _prepare_twin_delta_hook(data) {
+    if (!data || !TWIN_DELTA_ACTIONS[data.action] || !data.request_id) {
+        return null;
+    }
+    var hook = {
+        request_id: data.request_id,
+        touched: [],
+        removed: [],
+        complete: true
+    };
+    if (data.action === "connect_objects" || data.action === "disconnect_objects") {
+        hook.touched.push(data.src_varname, data.dst_varname);
+    } else if (data.action === "remove_object") {
+        hook.removed.push(data.varname);
+        // Peers lose inlet/outlet cords, so capture them before the object disappears.
+        hook.complete = _twin_peer_varnames(current_patcher.getnamed(data.varname), hook.touched);
+    } else if (data.action === "apply_topology_delta") {
+        _prepare_topology_delta_hook(data.delta, hook);
+    } else {
+        hook.touched.push(data.varname);
+    }
+    return hook;
+}
+
+function _line_endpoint_varnames(row, into) {
+    var line = row && row.patchline ? row.patchline : row;
+    if (!line || !line.source || !line.destination) {
+        return false;
+    }
+    into.push(line.source[0], line.destination[0]);
+    return true;
+}
+
+function _prepare_topology_delta_hook(delta, hook) {
+    if (!delta || !Array.isArray(delta.remove) || !Array.isArray(delta.boxes)
+        || !Array.isArray(delta.disconnect) || !Array.isArray(delta.connect)) {
+        hook.complete = false;
+        return;
+    }
+    var created = {};
+    var touched = [];
+    var i;
+    for (i = 0; i < delta.boxes.length; i++) {
+        var box = delta.boxes[i] && delta.boxes[i].box ? delta.boxes[i].box : delta.boxes[i];
+        if (!box || typeof box.varname !== "string" || !box.varname) {
+            hook.complete = false;
+            return;
+        }
+        created[box.varname] = true;
+        touched.push(box.varname);
+    }
+    var gone = {};
+    for (i = 0; i < delta.remove.length; i++) {
+        var varname = delta.remove[i];
+        if (!created[varname]) {
+            gone[varname] = true;
+            hook.removed.push(varname);
+        }
+        // Peers lose cords to removed boxes, so capture them before the removal.
+        var obj = current_patcher.getnamed(varname);
+        if (obj && !_twin_peer_varnames(obj, touched)) {
+            hook.complete = false;
+        }
+    }
+    var lines = delta.disconnect.concat(delta.connect);
+    for (i = 0; i < lines.length; i++) {
+        if (!_line_endpoint_varnames(lines[i], touched)) {
+            hook.complete = false;
+        }
+    }
+    for (i = 0; i < touched.length; i++) {
+        if (touched[i] && !gone[touched[i]]) {
+            hook.touched.push(touched[i]);
+        }
+    }
+}
+
+function _build_twin_delta(hook) {
+    var delta = { complete: hook.complete, removed: hook.removed, boxes: {}, lines_for: {} };
+    for (var i = 0; i < hook.touched.length && delta.complete; i++) {
+        var varname = hook.touched[i];
+        var obj = varname ? current_patcher.getnamed(varname) : null;
+        if (!obj) {
+            delta.complete = false;
+            break;
+        }
+        var peers = [];
+        if (!_twin_peer_varnames(obj, peers)) {
+            delta.complete = false;
+            break;
+        }
+        delta.boxes[varname] = _serialize_box(obj);
+        delta.lines_for[varname] = _twin_lines_for(obj);
+    }
+    for (var r = 0; r < hook.removed.length; r++) {
+        delta.lines_for[hook.removed[r]] = [];
+    }
+    return delta;
+}
+
+function _attach_twin_delta(request_id, state, meta) {
+    var hook = _twin_delta_hook;
+    if (!hook || state !== "succeeded" || hook.request_id !== request_id) {
+        return meta;
+    }
+    var merged = meta || {};
+    try {
+        merged.twin_delta = _build_twin_delta(hook);
+    } catch (e) {
+        merged.twin_delta = { complete: false };
+    }
+    return merged;
+}
+
 // Called when a message arrives at inlet 0 (from [udpreceive] or similar)
 function anything() {
     var msg = arrayfromargs(messagename, arguments).join(" ");
@@ -1127,7 +1573,53 @@ function _ensure_workspace_patcher(workspace_varname, workspace_name) {
     return { success: true, patcher: created.subpatcher, created: true };
 }
 
+function _capture_navigation_state() {
+    return {
+        current_patcher: current_patcher,
+        patcher_stack: patcher_stack.slice(0),
+        base_context_depth: base_context_depth,
+        workspace_varname: active_workspace_varname,
+        avoid_rect_called: avoid_rect_called
+    };
+}
+
+function _restore_navigation_state(target_id, state) {
+    current_patcher = state.current_patcher;
+    patcher_stack = state.patcher_stack.slice(0);
+    base_context_depth = state.base_context_depth;
+    active_workspace_target = target_id;
+    active_workspace_varname = state.workspace_varname;
+    avoid_rect_called = state.avoid_rect_called;
+}
+
+function _enter_request_workspace(spec) {
+    // Returns null when the request may proceed, or an error object.
+    if (!spec || typeof spec !== "object" || !spec.target_id) {
+        return null;
+    }
+    if (spec.target_id === active_workspace_target && !spec.reset_navigation) {
+        return null;
+    }
+    if (spec.target_id !== active_workspace_target) {
+        workspace_states[active_workspace_target] = _capture_navigation_state();
+    }
+    // The first request of a session starts at the workspace root, like an activation.
+    var saved = spec.reset_navigation ? null : workspace_states[spec.target_id];
+    if (saved && (spec.target_id === "host" || root_patcher.getnamed(saved.workspace_varname))) {
+        delete workspace_states[spec.target_id];
+        _restore_navigation_state(spec.target_id, saved);
+        return null;
+    }
+    var ws = set_workspace_target(
+        spec.target_id,
+        spec.workspace_varname || "",
+        spec.workspace_name || ""
+    );
+    return ws.success ? null : ws.error;
+}
+
 function set_workspace_target(target_id, workspace_varname, workspace_name) {
+    delete workspace_states[target_id];
     if (target_id === "host") {
         current_patcher = root_patcher;
         patcher_stack = [];
@@ -1741,6 +2233,208 @@ function apply_topology_snapshot_progressive(snapshot, state, chunk_size, debug_
     };
 }
 
+// Snapshots uploaded once via stage_topology_snapshot, keyed by content hash.
+var STAGED_SNAPSHOT_MAX = 4;
+var staged_snapshots = {};
+var staged_snapshot_order = [];
+
+function _staging_error(reason, message, details) {
+    var merged = details || {};
+    merged.reason = reason;
+    return {
+        success: false,
+        error: {
+            code: "PRECONDITION_FAILED",
+            message: message,
+            hint: "Stage the snapshot again with stage_topology_snapshot.",
+            recoverable: true,
+            details: merged
+        }
+    };
+}
+
+function _drop_staged_snapshot(snapshot_hash) {
+    delete staged_snapshots[snapshot_hash];
+    var idx = staged_snapshot_order.indexOf(snapshot_hash);
+    if (idx >= 0) {
+        staged_snapshot_order.splice(idx, 1);
+    }
+}
+
+function stage_topology_snapshot(snapshot_hash, piece_index, piece_count, boxes, lines) {
+    var index = parseInt(piece_index, 10);
+    var count = parseInt(piece_count, 10);
+    if (!isFinite(index) || index < 0 || !isFinite(count) || count < 1 || index >= count) {
+        return _snapshot_validation_error(
+            "Staging requires a valid piece_index and piece_count.",
+            { piece_index: piece_index, piece_count: piece_count }
+        );
+    }
+    if (index === 0) {
+        _drop_staged_snapshot(snapshot_hash);
+        while (staged_snapshot_order.length >= STAGED_SNAPSHOT_MAX) {
+            delete staged_snapshots[staged_snapshot_order.shift()];
+        }
+        staged_snapshots[snapshot_hash] = {
+            snapshot: { boxes: [], lines: [] },
+            next_piece: 0,
+            piece_count: count,
+            complete: false,
+            state: null
+        };
+        staged_snapshot_order.push(snapshot_hash);
+    }
+    var entry = staged_snapshots[snapshot_hash];
+    if (!entry) {
+        return _staging_error("staged_snapshot_missing", "No staged snapshot for this hash.", { snapshot_hash: snapshot_hash });
+    }
+    if (entry.next_piece !== index || entry.piece_count !== count) {
+        _drop_staged_snapshot(snapshot_hash);
+        return _staging_error(
+            "staged_piece_out_of_order",
+            "Staged snapshot piece arrived out of order.",
+            { snapshot_hash: snapshot_hash, expected_piece: entry.next_piece, piece_index: index }
+        );
+    }
+    var i;
+    if (Array.isArray(boxes)) {
+        for (i = 0; i < boxes.length; i++) {
+            entry.snapshot.boxes.push(boxes[i]);
+        }
+    }
+    if (Array.isArray(lines)) {
+        for (i = 0; i < lines.length; i++) {
+            entry.snapshot.lines.push(lines[i]);
+        }
+    }
+    entry.next_piece = index + 1;
+    entry.complete = entry.next_piece === entry.piece_count;
+    return {
+        success: true,
+        snapshot_hash: snapshot_hash,
+        complete: entry.complete,
+        staged_boxes: entry.snapshot.boxes.length,
+        staged_lines: entry.snapshot.lines.length
+    };
+}
+
+function _staged_cursor_matches(state, cursor) {
+    return !!state && !!cursor
+        && state.phase === cursor.phase
+        && state.box_index === cursor.box_index
+        && state.line_index === cursor.line_index;
+}
+
+// Progressive apply against a staged snapshot. The full continuation state (including
+// ref_map) stays in the bridge; callers only round-trip a small cursor.
+function apply_staged_topology_snapshot_progressive(snapshot_hash, cursor, chunk_size, debug_timing) {
+    var entry = staged_snapshots[snapshot_hash];
+    if (!entry || !entry.complete) {
+        return _staging_error("staged_snapshot_missing", "No complete staged snapshot for this hash.", { snapshot_hash: snapshot_hash });
+    }
+    var state = null;
+    if (cursor) {
+        if (!_staged_cursor_matches(entry.state, cursor)) {
+            return _staging_error(
+                "staged_cursor_mismatch",
+                "Progress cursor does not match the staged apply state.",
+                { snapshot_hash: snapshot_hash }
+            );
+        }
+        state = entry.state;
+    }
+    var step = apply_topology_snapshot_progressive(entry.snapshot, state, chunk_size, debug_timing);
+    if (!step || !step.success) {
+        entry.state = null;
+        return step;
+    }
+    if (step.done) {
+        _drop_staged_snapshot(snapshot_hash);
+        return step;
+    }
+    entry.state = step.state;
+    step.state = {
+        phase: step.state.phase,
+        box_index: step.state.box_index,
+        line_index: step.state.line_index,
+        reset_done: step.state.reset_done
+    };
+    return step;
+}
+
+// Applies a structural diff computed by the server without clearing the patcher:
+// removes boxes (their cords go with them), disconnects stale cords, then creates
+// boxes and connects cords the same way a snapshot apply does.
+function apply_topology_delta(delta) {
+    if (!delta || !Array.isArray(delta.remove) || !Array.isArray(delta.boxes)
+        || !Array.isArray(delta.disconnect) || !Array.isArray(delta.connect)) {
+        return _snapshot_validation_error(
+            "Topology delta must include remove, boxes, disconnect and connect arrays.",
+            {}
+        );
+    }
+    var removed_boxes = 0;
+    var missing_boxes = 0;
+    var disconnected_lines = 0;
+    var i;
+    for (i = 0; i < delta.remove.length; i++) {
+        var obj = current_patcher.getnamed(delta.remove[i]);
+        if (!obj) {
+            missing_boxes++;
+            continue;
+        }
+        try {
+            current_patcher.remove(obj);
+            removed_boxes++;
+        } catch (_remove_error) {
+            missing_boxes++;
+        }
+    }
+    for (i = 0; i < delta.disconnect.length; i++) {
+        var row = delta.disconnect[i];
+        var line = row && row.patchline ? row.patchline : row;
+        if (!line || !line.source || !line.destination) {
+            continue;
+        }
+        var src = current_patcher.getnamed(line.source[0]);
+        var dst = current_patcher.getnamed(line.destination[0]);
+        if (!src || !dst) {
+            continue;
+        }
+        try {
+            current_patcher.disconnect(src, line.source[1], dst, line.destination[1]);
+            disconnected_lines++;
+        } catch (_disconnect_error) {
+            // Cord already gone.
+        }
+    }
+
+    var snapshot = { boxes: delta.boxes, lines: delta.connect };
+    var state = _normalize_snapshot_state(null);
+    for (i = 0; i < snapshot.boxes.length; i++) {
+        var box_error = _apply_snapshot_box_at(snapshot, state, i);
+        if (box_error) {
+            return box_error;
+        }
+    }
+    for (i = 0; i < snapshot.lines.length; i++) {
+        _apply_snapshot_line_at(snapshot, state, i);
+    }
+    avoid_rect_called = false;
+    return {
+        success: true,
+        removed_boxes: removed_boxes,
+        missing_boxes: missing_boxes,
+        disconnected_lines: disconnected_lines,
+        restored_boxes: state.stats.restored_boxes,
+        restored_lines: state.stats.restored_lines,
+        skipped_boxes: state.stats.skipped_boxes,
+        skipped_lines: state.stats.skipped_lines,
+        attributes_applied: state.stats.attributes_applied,
+        attributes_skipped: state.stats.attributes_skipped
+    };
+}
+
 function apply_topology_snapshot(snapshot) {
     var state = null;
     var guard = 0;
@@ -1778,6 +2472,7 @@ function send_capabilities(request_id) {
         transport_health: _transport_health_payload(),
         supports_auth: true,
         supports_idempotency: true,
+        supports_workspace_target: true,
         notes: "Bridge transport protocol maxmcp-4 uses dict_ref request/response transport."
     };
     for (var key in capability_flags) {
@@ -2399,6 +3094,51 @@ function get_objects_in_patch(request_id) {
     respond_success(request_id, patcher_dict);
 }
 
+// Cursors are offsets into the patcher's object order; total_boxes lets the caller
+// detect a patch that changed between pages.
+function get_objects_in_patch_page(request_id, cursor, page_size) {
+    var size = parseInt(page_size, 10);
+    if (!isFinite(size) || size < 1) {
+        size = CAPTURE_PAGE_DEFAULT_SIZE;
+    }
+    size = Math.min(size, CAPTURE_PAGE_MAX_SIZE);
+    var offset = (cursor === undefined || cursor === null || cursor === "") ? 0 : parseInt(cursor, 10);
+    if (!isFinite(offset) || offset < 0) {
+        respond_error(
+            request_id,
+            "VALIDATION_ERROR",
+            "Invalid capture cursor: " + cursor,
+            null,
+            false,
+            { cursor: cursor }
+        );
+        return;
+    }
+
+    var objects = [];
+    current_patcher.apply(function (obj) {
+        if (obj.varname && obj.varname.substring(0, 8) == "maxmcpid") {
+            return;
+        }
+        objects.push(obj);
+    });
+    var end = Math.min(objects.length, offset + size);
+    obj_count = offset;
+    boxes = [];
+    lines = [];
+    for (var i = offset; i < end; i++) {
+        collect_objects(objects[i]);
+    }
+    respond_success(request_id, {
+        boxes: boxes,
+        lines: lines,
+        cursor: String(offset),
+        next_cursor: end < objects.length ? String(end) : null,
+        total_boxes: objects.length,
+        page_size: size
+    });
+}
+
 function get_objects_in_selected(request_id) {
     obj_count = 0;
     boxes = [];
@@ -2433,6 +3173,10 @@ function collect_objects(obj) {
             }})
         }
     }
+    boxes.push(_serialize_box(obj));
+}
+
+function _serialize_box(obj) {
     var attr = collect_serializable_attributes(obj);
     var boxtext = null;
     try {
@@ -2441,7 +3185,7 @@ function collect_objects(obj) {
         boxtext = null;
     }
 
-    boxes.push({box:{
+    return {box:{
         maxclass: obj.maxclass,
         varname: obj.varname,
         patching_rect: obj.rect,
@@ -2450,7 +3194,7 @@ function collect_objects(obj) {
         text: boxtext,
         boxtext: boxtext,
         attributes: attr,
-    }})
+    }};
 }
 
 function get_object_attributes(request_id, var_name) {
@@ -4,7 +4,15 @@ const Max = require("max-api");
 const { Server } = require("socket.io");
 const crypto = require("crypto");
 const fs = require("fs");
-const { buildBridgeConfig } = require("./bridge_runtime.cjs");
+const {
+  buildBridgeConfig,
+  isBinaryFrame,
+  loadCompressionCodecs,
+  loadFrameCodecs,
+  negotiateCompression,
+  negotiateFraming,
+  deadlineRemainingMs
+} = require("./bridge_runtime.cjs");
 
 const BRIDGE_RUNTIME = buildBridgeConfig(process.env);
 const PROTOCOL = BRIDGE_RUNTIME.protocol;
@@ -34,10 +42,16 @@ const TRANSPORT_FAILURE_THRESHOLD = BRIDGE_RUNTIME.transportFailureThreshold;
 const TRANSPORT_REQUEST_RETRY_ATTEMPTS = BRIDGE_RUNTIME.transportRequestRetryAttempts;
 const TRANSPORT_REQUEST_RETRY_DELAY_MS = BRIDGE_RUNTIME.transportRequestRetryDelayMs;
 const TRANSPORT_DICT_PREFIX = BRIDGE_RUNTIME.transportDictPrefix;
+const FRAMING_JSON = PROTOCOL.framing_json;
+const FRAME_CODECS = loadFrameCodecs(BRIDGE_RUNTIME.framing);
+const COMPRESSION_CODECS = loadCompressionCodecs(BRIDGE_RUNTIME.compression);
+const DEFAULT_COMPRESS_MIN_BYTES = 65536;
 
 const ACTION_TRANSPORT_DICT_REQUEST = PROTOCOL.action_transport_dict_request;
 const ACTION_TRANSPORT_DICT_RESPONSE = PROTOCOL.action_transport_dict_response;
+const ACTION_TRANSPORT_CANCEL = PROTOCOL.action_transport_cancel;
 const BRIDGE_NODE_HELLO_EVENT = PROTOCOL.bridge_node_hello_event;
+const REQUEST_CANCEL_EVENT = PROTOCOL.request_cancel_event;
 const ERROR_CODES = PROTOCOL.error_codes;
 
 const transportHealthState = {
@@ -53,10 +67,15 @@ const transportHealthState = {
     dict_attempts: 0,
     dict_successes: 0,
     dict_failures: 0,
+    expired_before_handoff: 0,
+    cancelled_before_handoff: 0,
+    cancels_received: 0,
     last_handoff_mode: ""
   }
 };
 const inflightRequests = new Map();
+// request_id -> { socket_id, expires_ms } for cancels that arrive before the handoff finishes.
+const cancelledRequests = new Map();
 
 function resolve_auth_token() {
   const fromEnv = String(process.env.MAXMCP_AUTH_TOKEN || "").trim();
@@ -213,6 +232,96 @@ function reject_if_unauthorized(socket, data) {
   return true;
 }
 
+function socket_framing(socket) {
+  return socket && socket.data && socket.data.framing ? socket.data.framing : FRAMING_JSON;
+}
+
+function encode_socket_frame(socket, payload, sizeHint = -1) {
+  const framing = socket_framing(socket);
+  const codec = FRAME_CODECS.get(framing);
+  const compressionName = socket && socket.data ? socket.data.compression : "";
+  const compressor = compressionName ? COMPRESSION_CODECS.get(compressionName) : null;
+  const minBytes = socket && socket.data && socket.data.compressMinBytes
+    ? socket.data.compressMinBytes
+    : DEFAULT_COMPRESS_MIN_BYTES;
+  try {
+    // JSON responses are only serialized here when their size is known to qualify.
+    if (compressor && (codec || sizeHint >= minBytes)) {
+      const body = codec
+        ? codec.encode(payload)
+        : Buffer.from(JSON.stringify(payload), "utf8");
+      if (body.length >= minBytes) {
+        return {
+          compression: compressionName,
+          framing: framing,
+          raw_bytes: body.length,
+          data: compressor.compress(body)
+        };
+      }
+      return codec ? body : payload;
+    }
+    return codec ? codec.encode(payload) : payload;
+  } catch (_encode_error) {
+    return payload;
+  }
+}
+
+function is_compressed_frame(data) {
+  return Boolean(
+    data
+      && typeof data === "object"
+      && !isBinaryFrame(data)
+      && typeof data.compression === "string"
+      && isBinaryFrame(data.data)
+  );
+}
+
+function decode_socket_frame(data) {
+  if (is_compressed_frame(data)) {
+    const compressor = COMPRESSION_CODECS.get(String(data.compression).toLowerCase());
+    if (!compressor) {
+      return {
+        ok: false,
+        reason: "Unsupported frame compression '" + String(data.compression) + "'.",
+        frame_bytes: data.data.byteLength
+      };
+    }
+    let body = null;
+    try {
+      body = compressor.decompress(data.data);
+    } catch (e) {
+      return { ok: false, reason: describe_error(e), frame_bytes: data.data.byteLength };
+    }
+    if (data.framing === FRAMING_JSON) {
+      try {
+        return { ok: true, data: JSON.parse(body.toString("utf8")), frame_bytes: body.length };
+      } catch (e) {
+        return { ok: false, reason: describe_error(e), frame_bytes: body.length };
+      }
+    }
+    return decode_socket_frame(body);
+  }
+  if (!isBinaryFrame(data)) {
+    return { ok: true, data: data, frame_bytes: -1 };
+  }
+  const frameBytes = data.byteLength;
+  for (const codec of FRAME_CODECS.values()) {
+    if (!codec) {
+      continue;
+    }
+    try {
+      return { ok: true, data: codec.decode(data), frame_bytes: frameBytes };
+    } catch (e) {
+      return { ok: false, reason: describe_error(e), frame_bytes: frameBytes };
+    }
+  }
+  return {
+    ok: false,
+    reason: "No binary frame codec is available in the Node bridge.",
+    frame_bytes: frameBytes
+  };
+}
+
 function normalize_outbound_request(data) {
   const normalized = (data && typeof data === "object") ? { ...data } : {};
   normalized.bridge_proto = BRIDGE_PROTO;
@@ -291,6 +400,8 @@ function transport_health_snapshot() {
     last_error: transportHealthState.last_error || "",
     last_probe_id: transportHealthState.last_probe_id || "",
     consecutive_failures: transportHealthState.consecutive_failures || 0,
+    inflight_requests: inflightRequests.size,
+    max_inflight_requests: TRANSPORT_MAX_INFLIGHT,
     circuit_open_until_ms: transportHealthState.circuit_open_until_ms || 0,
     probe_interval_ms: TRANSPORT_HEALTH_PROBE_INTERVAL_MS,
     cooldown_ms: TRANSPORT_FAILURE_COOLDOWN_MS,
@@ -305,6 +416,9 @@ function _handoff_stats_mutable() {
       dict_attempts: 0,
       dict_successes: 0,
       dict_failures: 0,
+      expired_before_handoff: 0,
+      cancelled_before_handoff: 0,
+      cancels_received: 0,
       last_handoff_mode: ""
     };
   }
@@ -319,6 +433,9 @@ function transport_handoff_snapshot() {
     dict_successes: dictSuccesses,
     dict_failures: Math.max(0, Number(stats.dict_failures || 0)),
     total_successes: dictSuccesses,
+    expired_before_handoff: Math.max(0, Number(stats.expired_before_handoff || 0)),
+    cancelled_before_handoff: Math.max(0, Number(stats.cancelled_before_handoff || 0)),
+    cancels_received: Math.max(0, Number(stats.cancels_received || 0)),
     last_handoff_mode: String(stats.last_handoff_mode || "")
   };
 }
@@ -342,6 +459,8 @@ function build_bridge_node_hello_payload(reason, socketId) {
     transport_mode: TRANSPORT_DICT_REF,
     stream_kind: STREAM_KIND_HELLO,
     dict_api_available: supports_dict_api(),
+    supported_framings: Array.from(FRAME_CODECS.keys()),
+    supported_compressions: Array.from(COMPRESSION_CODECS.keys()),
     reason: String(reason || "connect"),
     socket_id: String(socketId || ""),
     timestamp_ms: now_ms(),
@@ -355,7 +474,13 @@ function emit_bridge_node_hello(socket, reason) {
     socket && socket.id ? socket.id : ""
   );
   if (socket && typeof socket.emit === "function") {
-    socket.emit(BRIDGE_NODE_HELLO_EVENT, payload);
+    // Only the connecting socket learns its negotiated framing; the broadcast copy
+    // must not switch framing for other clients.
+    socket.emit(BRIDGE_NODE_HELLO_EVENT, {
+      ...payload,
+      framing: socket_framing(socket),
+      compression: socket.data && socket.data.compression ? socket.data.compression : ""
+    });
   }
   try {
     io.of(NAMESPACE).emit(BRIDGE_NODE_HELLO_EVENT, payload);
@@ -431,7 +556,7 @@ function cleanup_inflight_entry(entry) {
   }
 }
 
-function emit_payload_to_origin(requestId, payload) {
+function emit_payload_to_origin(requestId, payload, sizeHint = -1) {
   const normalizedRequestId = normalize_request_id(
     requestId || (payload && payload.request_id)
   );
@@ -448,7 +573,21 @@ function emit_payload_to_origin(requestId, payload) {
   if (!socket || socket.connected === false) {
     return false;
   }
-  socket.emit("response", payload);
+  if (payload && typeof payload === "object") {
+    // Lets Python's concurrency controller see bridge-side queueing, and its tracer
+    // place the handoff and Max stages.
+    const respondedAt = now_ms();
+    payload.meta = {
+      ...(payload.meta && typeof payload.meta === "object" ? payload.meta : {}),
+      bridge_inflight: inflightRequests.size,
+      bridge_max_inflight: TRANSPORT_MAX_INFLIGHT,
+      bridge_timings: {
+        handoff_ms: Math.max(0, tracked.requested_at_ms - tracked.received_at_ms),
+        max_ms: Math.max(0, respondedAt - tracked.requested_at_ms)
+      }
+    };
+  }
+  socket.emit("response", encode_socket_frame(socket, payload, sizeHint));
   return true;
 }
 
@@ -495,6 +634,7 @@ function register_inflight_request(socket, outbound, meta) {
     socket_id: socket && socket.id ? String(socket.id) : "",
     event_name: meta && meta.event_name ? String(meta.event_name) : "",
     requested_at_ms: now_ms(),
+    received_at_ms: meta && meta.received_at_ms ? Number(meta.received_at_ms) : now_ms(),
     dict_name: meta && meta.dict_name ? String(meta.dict_name) : "",
     transport_id: meta && meta.transport_id ? String(meta.transport_id) : "",
     request_chars: meta && meta.request_chars ? Number(meta.request_chars) : 0
@@ -516,8 +656,69 @@ function release_socket_inflight_requests(socketId) {
   }
 }
 
+function cancel_bridge_request(socket, requestId, reason) {
+  const socketId = socket && socket.id ? String(socket.id) : "";
+  const tracked = inflightRequests.get(requestId);
+  if (tracked && tracked.socket_id === socketId) {
+    // Already handed to Max: forget it here and let Max skip it if it has not started.
+    inflightRequests.delete(requestId);
+    cleanup_inflight_entry(tracked);
+    Max.outlet("command", ACTION_TRANSPORT_CANCEL, requestId, String(reason || ""));
+    return;
+  }
+  if (!tracked) {
+    cancelledRequests.set(requestId, {
+      socket_id: socketId,
+      expires_ms: now_ms() + TRANSPORT_INFLIGHT_TTL_MS
+    });
+  }
+}
+
+function take_cancelled_request(socket, requestId) {
+  const cancelled = cancelledRequests.get(requestId);
+  if (!cancelled) {
+    return false;
+  }
+  cancelledRequests.delete(requestId);
+  return cancelled.socket_id === (socket && socket.id ? String(socket.id) : "");
+}
+
+// True when the request must not be handed to Max; expired requests get a failure response.
+function request_abandoned(socket, eventName, outbound, requestId) {
+  if (take_cancelled_request(socket, requestId)) {
+    record_handoff_stat("cancelled_before_handoff");
+    return true;
+  }
+  const remainingMs = deadlineRemainingMs(outbound);
+  if (remainingMs === null || remainingMs > 0) {
+    return false;
+  }
+  record_handoff_stat("expired_before_handoff");
+  socket.emit(
+    "response",
+    build_failed_response(
+      outbound,
+      ERROR_CODES.deadline_exceeded,
+      "Request deadline passed before the Node bridge handed it to Max.",
+      true,
+      {
+        event: eventName,
+        request_id: requestId,
+        deadline_ms: Number(outbound.deadline_ms),
+        overdue_ms: -remainingMs
+      }
+    )
+  );
+  return true;
+}
+
 function sweep_stale_inflight_requests() {
   const now = now_ms();
+  for (const [requestId, cancelled] of cancelledRequests.entries()) {
+    if (now >= cancelled.expires_ms) {
+      cancelledRequests.delete(requestId);
+    }
+  }
   for (const [requestId, entry] of inflightRequests.entries()) {
     const requestedAt = entry && entry.requested_at_ms ? Number(entry.requested_at_ms) : 0;
     if (requestedAt <= 0 || now - requestedAt < TRANSPORT_INFLIGHT_TTL_MS) {
@@ -679,7 +880,13 @@ async function forward_dict_request(socket, eventName, outbound, rawLength) {
   };
 }
 
-async function forward_bridge_request(socket, eventName, data) {
+async function forward_bridge_request(
+  socket,
+  eventName,
+  data,
+  frameBytes = -1,
+  receivedAtMs = now_ms()
+) {
   const outbound = normalize_outbound_request(data);
   const requestId = normalize_request_id(outbound && outbound.request_id);
   if (!requestId) {
@@ -699,9 +906,13 @@ async function forward_bridge_request(socket, eventName, data) {
     );
     return;
   }
+  if (request_abandoned(socket, eventName, outbound, requestId)) {
+    return;
+  }
+  // Binary frames were measured on arrival; only JSON envelopes need a size pass.
   let raw = "";
   try {
-    raw = JSON.stringify(outbound);
+    raw = frameBytes >= 0 ? "" : JSON.stringify(outbound);
   } catch (e) {
     socket.emit(
       "response",
@@ -716,7 +927,9 @@ async function forward_bridge_request(socket, eventName, data) {
     return;
   }
 
-  const rawLength = raw.length;
+  const rawLength = frameBytes >= 0 ? frameBytes : raw.length;
+  // Frame bytes are not comparable with the JSON char count Max checks against.
+  const handoffChars = frameBytes >= 0 ? -1 : rawLength;
   if (rawLength > TRANSPORT_MAX_TOTAL_CHARS) {
     socket.emit(
       "response",
@@ -800,8 +1013,12 @@ async function forward_bridge_request(socket, eventName, data) {
   let sent = null;
   const retryAttempts = Math.max(1, TRANSPORT_REQUEST_RETRY_ATTEMPTS);
   for (let attempt = 1; attempt <= retryAttempts; attempt++) {
+    // Probes and retry delays may outlive the caller's budget.
+    if (request_abandoned(socket, eventName, outbound, requestId)) {
+      return;
+    }
     record_handoff_stat("dict_attempts");
-    sent = await forward_dict_request(socket, eventName, outbound, rawLength);
+    sent = await forward_dict_request(socket, eventName, outbound, handoffChars);
     if (sent && sent.ok) {
       record_handoff_stat("dict_successes");
       record_handoff_mode(TRANSPORT_DICT_REF);
@@ -847,7 +1064,8 @@ async function forward_bridge_request(socket, eventName, data) {
     event_name: eventName,
     dict_name: sent.dict_name || "",
     transport_id: sent.transport_id || "",
-    request_chars: rawLength
+    request_chars: rawLength,
+    received_at_ms: receivedAtMs
   });
   if (!registered.ok) {
     cleanup_inflight_entry(sent);
@@ -871,6 +1089,10 @@ async function forward_bridge_request(socket, eventName, data) {
     );
     return;
   }
+  if (take_cancelled_request(socket, requestId)) {
+    // The cancel raced the dict handoff.
+    cancel_bridge_request(socket, requestId, "cancelled");
+  }
 }
 
 // Create Socket.IO server
@@ -1101,7 +1323,8 @@ async function handle_dict_response_reference(
 
   const delivered = emit_payload_to_origin(
     normalize_request_id(payload.request_id || normalizedRequestId),
-    payload
+    payload,
+    isFinite(expectedChars) ? expectedChars : -1
   );
   if (!delivered) {
     io.of(NAMESPACE).emit("response", payload);
@@ -1163,7 +1386,8 @@ Max.addHandler("response", async (...msg) => {
     }
   const delivered = emit_payload_to_origin(
     normalize_request_id(data.request_id),
-    data
+    data,
+    str.length
   );
   if (!delivered) {
 	  await io.of(NAMESPACE).emit("response", data);
@@ -1202,6 +1426,13 @@ io.of(NAMESPACE).on("connection", (socket) => {
   const handshakeAuthorized = is_authorized_token(handshakeToken);
   socket.data = socket.data || {};
   socket.data.handshakeAuthorized = handshakeAuthorized;
+  const handshakeAuth = socket.handshake && socket.handshake.auth ? socket.handshake.auth : {};
+  socket.data.framing = negotiateFraming(handshakeAuth.framings, FRAME_CODECS);
+  socket.data.compression = negotiateCompression(handshakeAuth.compressions, COMPRESSION_CODECS);
+  socket.data.compressMinBytes = Math.max(
+    1024,
+    parseInt(handshakeAuth.compress_min_bytes, 10) || DEFAULT_COMPRESS_MIN_BYTES
+  );
   if (MAXMCP_AUTH_TOKEN && MAXMCP_REQUIRE_HANDSHAKE_AUTH && !handshakeAuthorized) {
     Max.post(`Rejected unauthenticated MCP client: ${socket.id}`);
     socket.emit(
@@ -1219,12 +1450,27 @@ io.of(NAMESPACE).on("connection", (socket) => {
   emit_bridge_node_hello(socket, "socket_connected");
   probe_dict_transport(true).catch(() => {});
 
-  socket.on("command", async (data) => {
+  socket.on("command", async (frame) => {
+    const decoded = decode_socket_frame(frame);
+    if (!decoded.ok) {
+      socket.emit(
+        "response",
+        build_failed_response(
+          {},
+          "TRANSPORT_CORRUPT_PAYLOAD",
+          "Unable to decode binary request frame.",
+          true,
+          { event: "command", frame_bytes: decoded.frame_bytes, reason: decoded.reason }
+        )
+      );
+      return;
+    }
+    const data = decoded.data;
     if (reject_if_unauthorized(socket, data)) {
       return;
     }
     try {
-      await forward_bridge_request(socket, "command", data);
+      await forward_bridge_request(socket, "command", data, decoded.frame_bytes);
     } catch (e) {
       socket.emit(
         "response",
@@ -1239,13 +1485,29 @@ io.of(NAMESPACE).on("connection", (socket) => {
     }
   });
 
-  socket.on("request", async (data) => {
+  socket.on("request", async (frame) => {
+    const receivedAtMs = now_ms();
+    const decoded = decode_socket_frame(frame);
+    if (!decoded.ok) {
+      socket.emit(
+        "response",
+        build_failed_response(
+          {},
+          "TRANSPORT_CORRUPT_PAYLOAD",
+          "Unable to decode binary request frame.",
+          true,
+          { event: "request", frame_bytes: decoded.frame_bytes, reason: decoded.reason }
+        )
+      );
+      return;
+    }
+    const data = decoded.data;
     if (reject_if_unauthorized(socket, data)) {
       return;
     }
     // Route requests through same outlet as commands - js handles both.
     try {
-      await forward_bridge_request(socket, "request", data);
+      await forward_bridge_request(socket, "request", data, decoded.frame_bytes, receivedAtMs);
     } catch (e) {
       socket.emit(
         "response",
@@ -1260,6 +1522,18 @@ io.of(NAMESPACE).on("connection", (socket) => {
     }
   });
 
+  socket.on(REQUEST_CANCEL_EVENT, (data) => {
+    if (reject_if_unauthorized(socket, data)) {
+      return;
+    }
+    const requestId = normalize_request_id(data && data.request_id);
+    if (!requestId) {
+      return;
+    }
+    record_handoff_stat("cancels_received");
+    cancel_bridge_request(socket, requestId, data && data.reason);
+  });
+
   socket.on("port", async (data) => {
     Max.post(`msg ${data}`);
     if (data > 0 && data < 65536) {
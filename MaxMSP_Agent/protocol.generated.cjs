@@ -1,16 +1,25 @@
 // This file is generated by scripts/generate_protocol_artifacts.py.
 module.exports = Object.freeze({
+  "action_transport_cancel": "_maxmcp_transport_cancel",
   "action_transport_dict_request": "_maxmcp_transport_dict_request",
   "action_transport_dict_response": "_maxmcp_transport_dict_response",
   "actions": {
+    "transport_cancel": "_maxmcp_transport_cancel",
     "transport_dict_request": "_maxmcp_transport_dict_request",
     "transport_dict_response": "_maxmcp_transport_dict_response"
   },
   "bridge_node_hello_event": "bridge_node_hello",
   "bridge_proto": "maxmcp-4",
+  "compression_zlib": "zlib",
+  "compression_zstd": "zstd",
+  "compressions": {
+    "zlib": "zlib",
+    "zstd": "zstd"
+  },
   "error_codes": {
     "bridge_timeout": "BRIDGE_TIMEOUT",
     "bridge_unavailable": "BRIDGE_UNAVAILABLE",
+    "deadline_exceeded": "DEADLINE_EXCEEDED",
     "internal": "INTERNAL_ERROR",
     "object_not_found": "OBJECT_NOT_FOUND",
     "overloaded": "OVERLOADED",
@@ -19,6 +28,7 @@ module.exports = Object.freeze({
     "proto_v3_invalid_type": "PROTO_V3_INVALID_TYPE",
     "proto_v3_missing_field": "PROTO_V3_MISSING_FIELD",
     "proto_v3_unsupported_version": "PROTO_V3_UNSUPPORTED_VERSION",
+    "request_cancelled": "REQUEST_CANCELLED",
     "unauthorized": "UNAUTHORIZED",
     "unknown_action": "UNKNOWN_ACTION",
     "validation": "VALIDATION_ERROR"
@@ -26,6 +36,7 @@ module.exports = Object.freeze({
   "errors": {
     "bridge_timeout": "BRIDGE_TIMEOUT",
     "bridge_unavailable": "BRIDGE_UNAVAILABLE",
+    "deadline_exceeded": "DEADLINE_EXCEEDED",
     "internal": "INTERNAL_ERROR",
     "object_not_found": "OBJECT_NOT_FOUND",
     "overloaded": "OVERLOADED",
@@ -34,14 +45,23 @@ module.exports = Object.freeze({
     "proto_v3_invalid_type": "PROTO_V3_INVALID_TYPE",
     "proto_v3_missing_field": "PROTO_V3_MISSING_FIELD",
     "proto_v3_unsupported_version": "PROTO_V3_UNSUPPORTED_VERSION",
+    "request_cancelled": "REQUEST_CANCELLED",
     "unauthorized": "UNAUTHORIZED",
     "unknown_action": "UNKNOWN_ACTION",
     "validation": "VALIDATION_ERROR"
   },
   "events": {
-    "bridge_node_hello": "bridge_node_hello"
+    "bridge_node_hello": "bridge_node_hello",
+    "request_cancel": "cancel"
+  },
+  "framing_json": "json",
+  "framing_msgpack": "msgpack",
+  "framings": {
+    "json": "json",
+    "msgpack": "msgpack"
   },
   "protocol_version": "2.0",
+  "request_cancel_event": "cancel",
   "stream_kind_hello": "hello",
   "stream_kind_request": "request",
   "stream_kind_response": "response",
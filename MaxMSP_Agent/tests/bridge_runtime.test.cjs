@@ -3,13 +3,27 @@ const assert = require("node:assert/strict");
 const fs = require("node:fs");
 const path = require("node:path");
 
-const { buildBridgeConfig, envFlag, envInt, envString, protocol } = require("../bridge_runtime.cjs");
+const {
+  buildBridgeConfig,
+  deadlineRemainingMs,
+  envFlag,
+  envInt,
+  envString,
+  isBinaryFrame,
+  loadCompressionCodecs,
+  loadFrameCodecs,
+  negotiateCompression,
+  negotiateFraming,
+  protocol,
+} = require("../bridge_runtime.cjs");
 const protocolSpec = require("../../maxmsp_mcp/protocol_spec.json");
 
 test("generated protocol stays in sync with protocol_spec.json", () => {
   assert.equal(protocol.protocol_version, protocolSpec.protocol_version);
   assert.equal(protocol.bridge_proto, protocolSpec.bridge_proto);
   assert.deepEqual(protocol.transports, protocolSpec.transports);
+  assert.deepEqual(protocol.framings, protocolSpec.framings);
+  assert.deepEqual(protocol.compressions, protocolSpec.compressions);
   assert.deepEqual(protocol.stream_kinds, protocolSpec.stream_kinds);
   assert.deepEqual(protocol.events, protocolSpec.events);
   for (const [key, value] of Object.entries(protocolSpec.actions)) {
@@ -64,6 +78,58 @@ test("bridge env helpers normalize booleans, integers, and strings", () => {
   assert.equal(envString("   ", "fallback"), "fallback");
 });
 
+test("frame codecs negotiate msgpack only when the codec loads", () => {
+  const fakeMsgpack = {
+    encode: (value) => new TextEncoder().encode(JSON.stringify(value)),
+    decode: (frame) => JSON.parse(Buffer.from(frame).toString("utf8")),
+  };
+  const codecs = loadFrameCodecs("auto", () => fakeMsgpack);
+  assert.deepEqual([...codecs.keys()], ["msgpack", "json"]);
+  assert.equal(negotiateFraming(["msgpack", "json"], codecs), "msgpack");
+  assert.equal(negotiateFraming(["json", "msgpack"], codecs), "json");
+  const frame = codecs.get("msgpack").encode({ request_id: "r1" });
+  assert.equal(isBinaryFrame(frame), true);
+  assert.deepEqual(codecs.get("msgpack").decode(frame), { request_id: "r1" });
+
+  const missing = loadFrameCodecs("auto", () => {
+    throw new Error("Cannot find module '@msgpack/msgpack'");
+  });
+  assert.deepEqual([...missing.keys()], ["json"]);
+  assert.equal(negotiateFraming(["msgpack"], missing), "json");
+  assert.equal(negotiateFraming(undefined, loadFrameCodecs("json", () => fakeMsgpack)), "json");
+  assert.equal(isBinaryFrame({ request_id: "r1" }), false);
+  assert.equal(buildBridgeConfig({ MAXMCP_BRIDGE_FRAMING: " JSON " }).framing, "json");
+});
+
+test("compression codecs round-trip and negotiate in client preference order", () => {
+  const codecs = loadCompressionCodecs("auto");
+  assert.equal(codecs.has("zlib"), true);
+  const body = Buffer.from(JSON.stringify({ boxes: Array(200).fill({ maxclass: "newobj" }) }));
+  const compressed = codecs.get("zlib").compress(body);
+  assert.ok(compressed.length < body.length);
+  assert.deepEqual(codecs.get("zlib").decompress(compressed), body);
+  assert.equal(negotiateCompression(["zstd", "zlib"], loadCompressionCodecs("zlib")), "zlib");
+  assert.equal(negotiateCompression([], codecs), "");
+  assert.equal(negotiateCompression(["zlib"], loadCompressionCodecs("off")), "");
+
+  const fakeZstd = {
+    zstdCompressSync: (b) => b,
+    zstdDecompressSync: (b) => b,
+    deflateSync: (b) => b,
+    inflateSync: (b) => b,
+  };
+  assert.deepEqual([...loadCompressionCodecs("auto", fakeZstd).keys()], ["zstd", "zlib"]);
+  assert.equal(buildBridgeConfig({}).compression, "auto");
+});
+
+test("deadlineRemainingMs reads absolute envelope deadlines", () => {
+  assert.equal(deadlineRemainingMs({ deadline_ms: 1500 }, 1000), 500);
+  assert.equal(deadlineRemainingMs({ deadline_ms: 900 }, 1000), -100);
+  assert.equal(deadlineRemainingMs({}, 1000), null);
+  assert.equal(deadlineRemainingMs({ deadline_ms: "soon" }, 1000), null);
+  assert.equal(deadlineRemainingMs(null, 1000), null);
+});
+
 test("node bridge source is dict-only on the request handoff path", () => {
   const source = fs.readFileSync(path.join(__dirname, "../max_mcp_node.js"), "utf8");
   assert.equal(source.includes("forward_file_request"), false);
@@ -0,0 +1,740 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from difflib import SequenceMatcher
+import hashlib
+import json
+import os
+from pathlib import Path
+import sys
+from typing import Any, Container, Iterable
+
+from .json_utils import canonical_json, compact_json
+from .topology import clone_json_value
+
+
+# Longest run of parent deltas before a checkpoint is stored as a full manifest again.
+DEFAULT_MAX_DELTA_CHAIN = 8
+# Compact-JSON bytes of recently used topologies a store keeps materialized.
+DEFAULT_HOT_TOPOLOGY_BYTES = 8 * 1024 * 1024
+# Format of the append-only index written by CheckpointJournal.
+CHECKPOINT_JOURNAL_FORMAT = "journal-v1"
+# Dead index events or record lines tolerated beyond the live count before compaction.
+CHECKPOINT_JOURNAL_SLACK = 64
+_SECTIONS = ("boxes", "lines")
+_SPLICE_KEYS = {"boxes": "box_splices", "lines": "line_splices"}
+
+
+def record_hash(row: Any) -> str:
+    """Content address of one box or line record.
+
+    Interned, so every manifest listing a record shares one string for its hash.
+    """
+    return sys.intern(hashlib.sha256(canonical_json(row).encode("utf-8")).hexdigest())
+
+
+def _diff_splices(parent: list[str], child: list[str]) -> list[list[Any]]:
+    """Edit script turning ``parent`` into ``child`` as ``[start, end, hashes]`` splices."""
+    if parent == child:
+        return []
+    matcher = SequenceMatcher(None, parent, child, autojunk=False)
+    return [
+        [i1, i2, child[j1:j2]]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _apply_splices(parent: list[str], splices: Iterable[Any]) -> list[str]:
+    result: list[str] = []
+    cursor = 0
+    for start, end, hashes in splices:
+        result.extend(parent[cursor:start])
+        result.extend(hashes)
+        cursor = end
+    result.extend(parent[cursor:])
+    return result
+
+
+def _interned_manifest(manifest: dict[str, Any]) -> dict[str, Any]:
+    """Copy of a persisted manifest whose hashes share the interned record-hash strings."""
+    interned = dict(manifest)
+    for section in _SECTIONS:
+        if section in manifest:
+            interned[section] = [sys.intern(digest) for digest in manifest[section]]
+        splice_key = _SPLICE_KEYS[section]
+        if splice_key in manifest:
+            interned[splice_key] = [
+                [start, end, [sys.intern(digest) for digest in hashes]]
+                for start, end, hashes in manifest[splice_key]
+            ]
+    return interned
+
+
+def _splice_size(splices: list[list[Any]]) -> int:
+    return sum(1 + len(hashes) for _start, _end, hashes in splices)
+
+
+class CheckpointStore:
+    """Checkpoint topologies as manifests over deduplicated box/line records.
+
+    Every distinct record is kept once, keyed by :func:`record_hash`, and reference
+    counted by the checkpoints that contain it. A manifest either lists a checkpoint's
+    record hashes in order or stores splices against its parent's lists, so a checkpoint
+    taken after a small edit only adds the changed records and a short delta.
+
+    Removing a checkpoint that delta children still replay from keeps it as a hidden
+    base until the last of them is gone, so eviction never rewrites a child's manifest.
+
+    With ``spill_saved``, a record body is dropped from ``records`` once it is marked
+    saved and read back from disk on demand, so only manifests stay resident. Recently
+    used topologies are kept as compact JSON in an LRU bounded by ``hot_bytes``.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_delta_chain: int = DEFAULT_MAX_DELTA_CHAIN,
+        hot_bytes: int = DEFAULT_HOT_TOPOLOGY_BYTES,
+        spill_saved: bool = False,
+    ) -> None:
+        self.max_delta_chain = max(0, int(max_delta_chain))
+        self.hot_bytes = max(0, int(hot_bytes))
+        self.spill_saved = bool(spill_saved)
+        self.records: dict[str, Any] = {}
+        self._refcounts: dict[str, int] = {}
+        self._manifests: dict[str, dict[str, Any]] = {}
+        # Removed checkpoints kept only as delta bases, in insertion order.
+        self._hidden: dict[str, None] = {}
+        # Records added since the last persisted write, in insertion order.
+        self._unsaved: dict[str, None] = {}
+        # checkpoint id -> compact JSON topology, least recently used first.
+        self._hot: OrderedDict[str, str] = OrderedDict()
+        self._hot_size = 0
+        self.hot_hits = 0
+        self.hot_misses = 0
+
+    def __contains__(self, checkpoint_id: object) -> bool:
+        return checkpoint_id in self._manifests and checkpoint_id not in self._hidden
+
+    def __len__(self) -> int:
+        return len(self._manifests) - len(self._hidden)
+
+    def clear(self) -> None:
+        self.records.clear()
+        self._refcounts.clear()
+        self._manifests.clear()
+        self._hidden.clear()
+        self._unsaved.clear()
+        self._hot.clear()
+        self._hot_size = 0
+
+    def _cache(self, checkpoint_id: str, text: str) -> None:
+        self._uncache(checkpoint_id)
+        if len(text) > self.hot_bytes:
+            return
+        self._hot[checkpoint_id] = text
+        self._hot_size += len(text)
+        while self._hot_size > self.hot_bytes:
+            _evicted, evicted_text = self._hot.popitem(last=False)
+            self._hot_size -= len(evicted_text)
+
+    def _uncache(self, checkpoint_id: str) -> None:
+        text = self._hot.pop(checkpoint_id, None)
+        if text is not None:
+            self._hot_size -= len(text)
+
+    def _spill(self, digests: Iterable[str]) -> None:
+        if not self.spill_saved:
+            return
+        for digest in digests:
+            if digest not in self._unsaved:
+                self.records.pop(digest, None)
+
+    def _resolve(self, checkpoint_id: str) -> dict[str, list[str]]:
+        chain: list[dict[str, Any]] = []
+        manifest = self._manifests[checkpoint_id]
+        while "parent" in manifest:
+            chain.append(manifest)
+            manifest = self._manifests[manifest["parent"]]
+        lists = {section: list(manifest[section]) for section in _SECTIONS}
+        for delta in reversed(chain):
+            for section in _SECTIONS:
+                lists[section] = _apply_splices(lists[section], delta[_SPLICE_KEYS[section]])
+        return lists
+
+    def _retain(self, hashes: Iterable[str]) -> None:
+        for digest in set(hashes):
+            self._refcounts[digest] = self._refcounts.get(digest, 0) + 1
+
+    def _release(self, hashes: Iterable[str]) -> None:
+        for digest in set(hashes):
+            remaining = self._refcounts.get(digest, 0) - 1
+            if remaining > 0:
+                self._refcounts[digest] = remaining
+                continue
+            self._refcounts.pop(digest, None)
+            self.records.pop(digest, None)
+            self._unsaved.pop(digest, None)
+
+    def _make_manifest(self, lists: dict[str, list[str]], parent_id: str | None) -> dict[str, Any]:
+        full = {section: lists[section] for section in _SECTIONS}
+        parent = self._manifests.get(parent_id) if parent_id else None
+        if parent is None or parent.get("depth", 0) >= self.max_delta_chain:
+            return full
+        parent_lists = self._resolve(parent_id)
+        splices = {
+            _SPLICE_KEYS[section]: _diff_splices(parent_lists[section], lists[section])
+            for section in _SECTIONS
+        }
+        # A delta that rewrites most of the patch costs more to replay than it saves.
+        delta_size = sum(_splice_size(value) for value in splices.values())
+        if delta_size * 2 > sum(map(len, full.values())):
+            return full
+        return {"parent": parent_id, "depth": parent.get("depth", 0) + 1, **splices}
+
+    def add(
+        self,
+        checkpoint_id: str,
+        topology: dict[str, Any],
+        *,
+        parent_id: str | None = None,
+    ) -> dict:
+        """Store ``topology`` under ``checkpoint_id``, as a delta from ``parent_id`` when cheap."""
+        if checkpoint_id in self._manifests:
+            # Children must not replay their splices against the replacement.
+            for child_id in self._children(checkpoint_id):
+                self._manifests[child_id] = self._resolve(child_id)
+                self._rebase_depths(child_id)
+            replaced_parent = self._manifests[checkpoint_id].get("parent")
+            self._hidden.pop(checkpoint_id, None)
+            self._delete(checkpoint_id)
+            if replaced_parent is not None:
+                self._free_unreferenced(replaced_parent)
+        lists: dict[str, list[str]] = {}
+        sections: dict[str, list[Any]] = {}
+        new_records = 0
+        for section in _SECTIONS:
+            rows = topology.get(section) if isinstance(topology, dict) else None
+            sections[section] = rows = rows if isinstance(rows, list) else []
+            hashes: list[str] = []
+            for row in rows:
+                digest = record_hash(row)
+                # Live records may be spilled to disk, so residency alone does not mean new.
+                if digest not in self.records and digest not in self._refcounts:
+                    self.records[digest] = clone_json_value(row)
+                    self._unsaved[digest] = None
+                    new_records += 1
+                hashes.append(digest)
+            lists[section] = hashes
+        manifest = self._make_manifest(lists, parent_id)
+        self._manifests[checkpoint_id] = manifest
+        self._retain(lists["boxes"] + lists["lines"])
+        # The newest checkpoint is the likeliest to be restored (transaction rollback).
+        self._cache(checkpoint_id, compact_json(sections))
+        return {
+            "new_records": new_records,
+            "delta": "parent" in manifest,
+            "depth": manifest.get("depth", 0),
+        }
+
+    def remove(self, checkpoint_id: str) -> None:
+        """Drop a checkpoint, keeping it as a hidden base while delta children need it.
+
+        Hidden bases with no children left are freed along with it, so no other
+        checkpoint's manifest ever changes.
+        """
+        if checkpoint_id not in self:
+            return
+        self._hidden[checkpoint_id] = None
+        self._uncache(checkpoint_id)
+        self._free_unreferenced(checkpoint_id)
+
+    def _free_unreferenced(self, checkpoint_id: str) -> None:
+        # Free a hidden base nobody replays from, then the hidden ancestors it leaves childless.
+        current = checkpoint_id
+        while current in self._hidden and not self._children(current):
+            parent_id = self._manifests[current].get("parent")
+            del self._hidden[current]
+            self._delete(current)
+            current = parent_id
+
+    def _children(self, checkpoint_id: str) -> list[str]:
+        return [
+            child_id
+            for child_id, manifest in self._manifests.items()
+            if manifest.get("parent") == checkpoint_id
+        ]
+
+    def _delete(self, checkpoint_id: str) -> None:
+        lists = self._resolve(checkpoint_id)
+        del self._manifests[checkpoint_id]
+        self._uncache(checkpoint_id)
+        self._release(lists["boxes"] + lists["lines"])
+
+    def hidden_bases(self) -> list[str]:
+        """Ids of removed checkpoints still kept as delta bases, oldest first."""
+        return list(self._hidden)
+
+    def _rebase_depths(self, root_id: str) -> None:
+        pending = [(root_id, 0)]
+        while pending:
+            parent_id, depth = pending.pop()
+            for child_id, manifest in self._manifests.items():
+                if manifest.get("parent") == parent_id:
+                    manifest["depth"] = depth + 1
+                    pending.append((child_id, depth + 1))
+
+    def topology(self, checkpoint_id: str) -> dict[str, list[Any]]:
+        """Materialize a checkpoint's topology as an independent copy.
+
+        Raises KeyError when a record body is neither hot nor resident; callers read
+        :meth:`missing_records` from disk and :meth:`adopt_records` them first.
+        """
+        text = self._hot.get(checkpoint_id)
+        if text is not None:
+            self._hot.move_to_end(checkpoint_id)
+            self.hot_hits += 1
+            return json.loads(text)
+        if checkpoint_id not in self:
+            raise KeyError(checkpoint_id)
+        self.hot_misses += 1
+        lists = self._resolve(checkpoint_id)
+        text = compact_json(
+            {section: [self.records[digest] for digest in lists[section]] for section in _SECTIONS}
+        )
+        self._cache(checkpoint_id, text)
+        self._spill(lists["boxes"] + lists["lines"])
+        return json.loads(text)
+
+    def manifest(self, checkpoint_id: str) -> dict[str, Any]:
+        return clone_json_value(self._manifests[checkpoint_id])
+
+    def load(
+        self,
+        checkpoint_id: str,
+        manifest: dict[str, Any],
+        available: Container[str],
+        *,
+        hidden: bool = False,
+    ) -> bool:
+        """Adopt a persisted manifest whose parent (if any) was loaded before it.
+
+        Record bodies are not read here: every hash only has to be resident or in
+        ``available`` (the records on disk). Returns False, leaving the store untouched,
+        when the parent or a record is missing. ``hidden`` loads a removed checkpoint
+        that only serves as a delta base.
+        """
+        if not isinstance(manifest, dict):
+            return False
+        parent_id = manifest.get("parent")
+        if parent_id is not None and parent_id not in self._manifests:
+            return False
+        if parent_id is None and not all(isinstance(manifest.get(s), list) for s in _SECTIONS):
+            return False
+        try:
+            self._manifests[checkpoint_id] = _interned_manifest(manifest)
+            lists = self._resolve(checkpoint_id)
+        except (KeyError, TypeError, ValueError):
+            self._manifests.pop(checkpoint_id, None)
+            return False
+        hashes = lists["boxes"] + lists["lines"]
+        if any(digest not in self.records and digest not in available for digest in hashes):
+            del self._manifests[checkpoint_id]
+            return False
+        self._retain(hashes)
+        if hidden:
+            self._hidden[checkpoint_id] = None
+        return True
+
+    def missing_records(self, checkpoint_id: str) -> list[str]:
+        """Hashes a checkpoint needs whose bodies are not resident."""
+        if checkpoint_id in self._hot:
+            return []
+        lists = self._resolve(checkpoint_id)
+        return [
+            digest
+            for digest in dict.fromkeys(lists["boxes"] + lists["lines"])
+            if digest not in self.records
+        ]
+
+    def adopt_records(self, rows: dict[str, Any]) -> None:
+        """Make record bodies read back from disk resident again."""
+        for digest, row in rows.items():
+            if digest in self._refcounts and digest not in self.records:
+                self.records[digest] = row
+
+    def live_hashes(self) -> list[str]:
+        return list(self._refcounts)
+
+    def unsaved_records(self) -> list[tuple[str, Any]]:
+        return [(digest, self.records[digest]) for digest in self._unsaved]
+
+    def mark_saved(self, digests: Iterable[str]) -> None:
+        digests = list(digests)
+        for digest in digests:
+            self._unsaved.pop(digest, None)
+        self._spill(digests)
+
+    def mark_unsaved(self, digests: Iterable[str]) -> None:
+        """Queue records again after a failed write."""
+        for digest in digests:
+            if digest in self.records:
+                self._unsaved[digest] = None
+
+    def stats(self) -> dict:
+        deltas = sum(1 for manifest in self._manifests.values() if "parent" in manifest)
+        return {
+            "checkpoints": len(self),
+            "hidden_bases": len(self._hidden),
+            "delta_manifests": deltas,
+            "full_manifests": len(self._manifests) - deltas,
+            "live_records": len(self._refcounts),
+            "resident_records": len(self.records),
+            "unsaved_records": len(self._unsaved),
+            "hot_topologies": len(self._hot),
+            "hot_bytes": self._hot_size,
+            "hot_budget_bytes": self.hot_bytes,
+            "hot_hits": self.hot_hits,
+            "hot_misses": self.hot_misses,
+        }
+
+
+def _record_line(digest: str, row: Any) -> bytes:
+    return (compact_json({"hash": digest, "row": row}) + "\n").encode("utf-8")
+
+
+def _fsync_append(path: Path, data: bytes) -> int:
+    """Append ``data`` durably; returns the offset it was written at."""
+    with path.open("ab") as handle:
+        offset = handle.seek(0, os.SEEK_END)
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    return offset
+
+
+def _fsync_write(path: Path, data: bytes) -> None:
+    with path.open("wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def _fsync_dir(path: Path) -> None:
+    """Make renames and new files in ``path`` durable; Windows cannot open directories."""
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class CheckpointJournal:
+    """Append-only persistence for a :class:`CheckpointStore` and its metadata.
+
+    The index (``index_path``) is a JSON-lines event log: a header naming the record
+    file, then ``checkpoint`` and ``drop`` events. A dropped checkpoint that later
+    rows still delta against is replayed as a ``dropped`` row (a hidden base). Records live in a separate JSON-lines
+    file and are located by byte offsets carried in the index, so startup replays the
+    index only and record bodies are read on demand. Records are fsynced before the
+    index line that references them, which makes a torn final index line the only
+    possible crash damage; :meth:`load` truncates it away.
+
+    Not thread-safe: callers serialize access (the runtime holds an asyncio lock around
+    each worker-thread call).
+    """
+
+    def __init__(self, index_path: Path) -> None:
+        self.index_path = Path(index_path)
+        self.records_path = self._records_path_for(1)
+        self.generation = 1
+        # record hash -> (offset, length) of its line in the record file
+        self.locations: dict[str, tuple[int, int]] = {}
+        self.index_events = 0
+        self.record_lines = 0
+        self._records_tail_checked = False
+
+    def _records_path_for(self, generation: int) -> Path:
+        return self.index_path.with_name(f"{self.index_path.stem}-records-{generation}.jsonl")
+
+    @property
+    def legacy_path(self) -> Path:
+        return self.index_path.with_suffix(".json")
+
+    def exists(self) -> bool:
+        return self.index_path.exists() or self.legacy_path.exists()
+
+    def _header(self) -> dict[str, Any]:
+        return {
+            "op": "header",
+            "format": CHECKPOINT_JOURNAL_FORMAT,
+            "records_file": self.records_path.name,
+            "generation": self.generation,
+        }
+
+    def load(self) -> dict[str, Any]:
+        """Replay the index into the live checkpoint rows, oldest first.
+
+        Returns ``{"checkpoints", "legacy", "corrupt_lines", "truncated_bytes"}``; ``legacy``
+        holds a whole-document journal written before the append-only format. Rows
+        marked ``dropped`` are hidden bases, listed before the rows built on them.
+        """
+        self.locations = {}
+        self.index_events = 0
+        self.record_lines = 0
+        self._records_tail_checked = False
+        result: dict[str, Any] = {
+            "checkpoints": OrderedDict(),
+            "legacy": None,
+            "corrupt_lines": 0,
+            "truncated_bytes": 0,
+        }
+        path = self.index_path if self.index_path.exists() else self.legacy_path
+        if not path.exists():
+            return result
+        data = path.read_bytes()
+        legacy = self._parse_legacy(data)
+        if legacy is not None:
+            result["legacy"] = legacy
+            return result
+
+        rows: OrderedDict[str, dict[str, Any]] = result["checkpoints"]
+        offset = 0
+        while offset < len(data):
+            newline = data.find(b"\n", offset)
+            end = len(data) if newline < 0 else newline + 1
+            try:
+                event = json.loads(data[offset:end])
+            except ValueError:
+                event = None
+            if not isinstance(event, dict):
+                if newline < 0:
+                    # Torn final append: cut it so the next event starts on a fresh line.
+                    with path.open("r+b") as handle:
+                        handle.truncate(offset)
+                    result["truncated_bytes"] = len(data) - offset
+                    break
+                if data[offset:end].strip():
+                    result["corrupt_lines"] += 1
+                offset = end
+                continue
+            if newline < 0:
+                _fsync_append(path, b"\n")
+            self.index_events += 1
+            self._replay(event, rows)
+            offset = end
+        self._prune_dropped(rows)
+        return result
+
+    @staticmethod
+    def _prune_dropped(rows: OrderedDict[str, dict[str, Any]]) -> None:
+        # Dropped rows only survive as the delta base of a later row.
+        needed: set[str] = set()
+        for checkpoint_id in reversed(list(rows)):
+            row = rows[checkpoint_id]
+            if row.get("dropped") and checkpoint_id not in needed:
+                del rows[checkpoint_id]
+                continue
+            manifest = row.get("manifest")
+            if isinstance(manifest, dict) and isinstance(manifest.get("parent"), str):
+                needed.add(manifest["parent"])
+
+    @staticmethod
+    def _parse_legacy(data: bytes) -> dict[str, Any] | None:
+        if not data.lstrip().startswith(b"{"):
+            return None
+        first_line = data.lstrip().split(b"\n", 1)[0]
+        try:
+            first = json.loads(first_line)
+        except ValueError:
+            first = None
+        if isinstance(first, dict) and "op" in first:
+            return None
+        try:
+            document = json.loads(data)
+        except ValueError:
+            return None
+        return document if isinstance(document, dict) else None
+
+    def _replay(self, event: dict[str, Any], rows: OrderedDict[str, dict[str, Any]]) -> None:
+        op = event.get("op")
+        if op == "header":
+            name = event.get("records_file")
+            if isinstance(name, str) and name:
+                self.records_path = self.index_path.with_name(Path(name).name)
+            self.generation = int(event.get("generation") or 1)
+        records = event.get("records")
+        if isinstance(records, dict):
+            for digest, location in records.items():
+                if isinstance(location, list) and len(location) == 2:
+                    self.locations[digest] = (int(location[0]), int(location[1]))
+                    self.record_lines += 1
+        checkpoint_id = event.get("checkpoint_id")
+        if not isinstance(checkpoint_id, str) or not checkpoint_id:
+            return
+        if op == "checkpoint":
+            row = {key: value for key, value in event.items() if key not in {"op", "records"}}
+            rows.pop(checkpoint_id, None)
+            rows[checkpoint_id] = row
+        elif op == "drop":
+            if checkpoint_id in rows:
+                rows[checkpoint_id]["dropped"] = True
+            # Journals written before hidden bases rebased children in the drop event.
+            rebased = event.get("rebased")
+            for child_id, manifest in (rebased or {}).items():
+                if child_id in rows:
+                    rows[child_id]["manifest"] = manifest
+
+    def _ensure_index(self) -> None:
+        if self.index_path.exists() and self.index_path.stat().st_size > 0:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        _fsync_write(self.index_path, (compact_json(self._header()) + "\n").encode("utf-8"))
+        self.index_events = 1
+
+    def _append_records(self, records: Iterable[tuple[str, Any]]) -> dict[str, list[int]]:
+        lines: list[tuple[str, bytes]] = []
+        for digest, row in records:
+            if digest not in self.locations:
+                lines.append((digest, _record_line(digest, row)))
+        if not lines:
+            return {}
+        prefix = b""
+        if not self._records_tail_checked:
+            # Records orphaned by a crash may end without a newline; start clean after them.
+            if self.records_path.exists() and self.records_path.stat().st_size > 0:
+                with self.records_path.open("rb") as handle:
+                    handle.seek(-1, os.SEEK_END)
+                    if handle.read(1) != b"\n":
+                        prefix = b"\n"
+            self._records_tail_checked = True
+        data = prefix + b"".join(line for _digest, line in lines)
+        offset = _fsync_append(self.records_path, data) + len(prefix)
+        written: dict[str, list[int]] = {}
+        for digest, line in lines:
+            self.locations[digest] = (offset, len(line))
+            written[digest] = [offset, len(line)]
+            offset += len(line)
+        self.record_lines += len(written)
+        return written
+
+    def append(self, events: list[dict[str, Any]], records: Iterable[tuple[str, Any]] = ()) -> dict:
+        """Durably append ``records`` not yet on disk, then ``events`` to the index.
+
+        The new record locations ride on the first event so the index alone can find them.
+        """
+        self._ensure_index()
+        written = self._append_records(records)
+        if not events and not written:
+            return {"events": 0, "records_written": 0, "bytes_written": 0}
+        events = [dict(event) for event in events] or [{"op": "records"}]
+        if written:
+            events[0]["records"] = written
+        data = "".join(compact_json(event) + "\n" for event in events).encode("utf-8")
+        _fsync_append(self.index_path, data)
+        self.index_events += len(events)
+        record_bytes = sum(length for _offset, length in written.values())
+        return {
+            "events": len(events),
+            "records_written": len(written),
+            "bytes_written": len(data) + record_bytes,
+        }
+
+    def read_records(self, digests: Iterable[str]) -> dict[str, Any]:
+        """Read record bodies by offset, checking each against its content address."""
+        wanted = sorted(
+            ((self.locations[digest], digest) for digest in digests if digest in self.locations),
+            key=lambda item: item[0][0],
+        )
+        rows: dict[str, Any] = {}
+        if not wanted:
+            return rows
+        with self.records_path.open("rb") as handle:
+            for (offset, length), digest in wanted:
+                handle.seek(offset)
+                payload = json.loads(handle.read(length))
+                row = payload.get("row") if isinstance(payload, dict) else None
+                if not isinstance(payload, dict) or payload.get("hash") != digest:
+                    raise ValueError(f"Checkpoint record {digest[:12]} is corrupt.")
+                if record_hash(row) != digest:
+                    raise ValueError(f"Checkpoint record {digest[:12]} failed verification.")
+                rows[digest] = row
+        return rows
+
+    def compaction_due(self, live_checkpoints: int, live_records: int) -> bool:
+        dead_events = self.index_events - live_checkpoints - 1
+        dead_records = self.record_lines - live_records
+        return (
+            dead_events > live_checkpoints + CHECKPOINT_JOURNAL_SLACK
+            or dead_records > live_records + CHECKPOINT_JOURNAL_SLACK
+        )
+
+    def compact(
+        self,
+        rows: list[dict[str, Any]],
+        live_hashes: Iterable[str],
+        resident: dict[str, Any],
+    ) -> dict:
+        """Rewrite the journal to hold only ``rows`` and the records they use.
+
+        Records go to a new generation file first; the index is then swapped in
+        atomically, so a crash at any point leaves a consistent pair on disk. A live
+        record that is neither resident nor readable aborts the compaction and keeps
+        the current generation.
+        """
+        old_records = self.records_path
+        old_locations = self.locations
+        generation = self.generation + 1
+        records_path = self._records_path_for(generation)
+        live = list(dict.fromkeys(live_hashes))
+        on_disk = self.read_records(digest for digest in live if digest not in resident)
+        missing = [digest for digest in live if digest not in resident and digest not in on_disk]
+        if missing:
+            raise ValueError(
+                f"Checkpoint record {missing[0][:12]} is missing; "
+                f"{len(missing)} live record(s) unavailable, compaction aborted."
+            )
+        locations: dict[str, tuple[int, int]] = {}
+        chunks: list[bytes] = []
+        offset = 0
+        for digest in live:
+            row = resident[digest] if digest in resident else on_disk[digest]
+            line = _record_line(digest, row)
+            locations[digest] = (offset, len(line))
+            chunks.append(line)
+            offset += len(line)
+        _fsync_write(records_path, b"".join(chunks))
+
+        self.records_path = records_path
+        self.generation = generation
+        events = [
+            {**self._header(), "records": {digest: list(loc) for digest, loc in locations.items()}},
+            *({"op": "checkpoint", **row} for row in rows),
+        ]
+        staging = self.index_path.with_name(f"{self.index_path.name}.compact")
+        data = "".join(compact_json(event) + "\n" for event in events).encode("utf-8")
+        try:
+            _fsync_write(staging, data)
+            os.replace(staging, self.index_path)
+        except Exception:
+            self.records_path, self.generation = old_records, generation - 1
+            self.locations = old_locations
+            records_path.unlink(missing_ok=True)
+            raise
+        _fsync_dir(self.index_path.parent)
+        self.locations = locations
+        self.index_events = len(events)
+        self.record_lines = len(locations)
+        self._records_tail_checked = True
+        if old_records != records_path:
+            old_records.unlink(missing_ok=True)
+        return {
+            "compacted": True,
+            "checkpoints": len(rows),
+            "records": len(locations),
+            "bytes": len(data) + offset,
+            "generation": generation,
+        }
@@ -90,9 +90,11 @@ class RuntimeSettings:
     stale_threshold_seconds: float
     idempotency_cache_size: int
     checkpoint_max: int
+    checkpoint_cache_bytes: int
     managed_mode: bool
     npm_auto_install: bool
     twin_auto_sync: bool
+    twin_reconcile_seconds: float
     strict_v3: bool
     strict_capability_gating: bool
     require_healthy_ready: bool
@@ -100,6 +102,17 @@ class RuntimeSettings:
     mutation_max_inflight: int
     mutation_max_queue: int
     mutation_queue_wait_timeout_seconds: float
+    mutation_aimd: bool
+    mutation_aimd_max_inflight: int
+    bridge_max_inflight: int
+    health_lane_max_inflight: int
+    read_lane_max_inflight: int
+    bulk_lane_max_inflight: int
+    lane_max_queue: int
+    batch_max_items: int
+    read_cache_ttl_seconds: float
+    topology_cache_seconds: float
+    restore_diff_max_ratio: float
     enforce_patch_roots: bool
     allowed_patch_roots_raw: str
     preflight_mode: str
@@ -107,9 +120,18 @@ class RuntimeSettings:
     workspace_capture_timeout_seconds: float
     workspace_capture_retries: int
     workspace_capture_backoff_seconds: float
+    workspace_capture_page_size: int
     health_check_cooldown_seconds: float
     failure_backoff_max_seconds: float
     transport_failure_clear_caps_threshold: int
+    bridge_framing: str
+    bridge_compression: str
+    bridge_compress_min_bytes: int
+    adaptive_timeouts: bool
+    adaptive_timeout_factor: float
+    adaptive_timeout_min_seconds: float
+    adaptive_timeout_max_seconds: float
+    adaptive_timeout_min_samples: int
     import_apply_timeout_seconds: float
     import_apply_retry_count: int
     import_apply_retry_backoff_seconds: float
@@ -126,13 +148,20 @@ class RuntimeSettings:
 
 @dataclass(frozen=True)
 class MetricsSettings:
-    sample_size: int
+    slice_seconds: float
+    retention_seconds: float
     event_log_size: int
     log_interval_seconds: float
     alert_failure_rate: float
     alert_p95_ms: float
     alert_queue_depth: float
     alert_window_seconds: float
+    alert_short_window_seconds: float
+    alert_burn_rate: float
+    http_host: str
+    http_port: int
+    tracing: bool
+    trace_buffer_size: int
 
 
 @dataclass(frozen=True)
@@ -161,8 +190,11 @@ class Settings:
         "current_dir": ("paths", "root_dir"),
         "maxpylang_root": ("paths", "maxpy_root"),
         "maxpylang_template_path": ("paths", "maxpy_template_path"),
-        "metrics_sample_size": ("metrics", "sample_size"),
+        "metrics_slice_seconds": ("metrics", "slice_seconds"),
+        "metrics_retention_seconds": ("metrics", "retention_seconds"),
         "metrics_log_interval_seconds": ("metrics", "log_interval_seconds"),
+        "metrics_http_host": ("metrics", "http_host"),
+        "metrics_http_port": ("metrics", "http_port"),
         "hygiene_auto_cleanup": ("hygiene", "auto_cleanup"),
         "hygiene_scope": ("hygiene", "scope"),
         "hygiene_mode": ("hygiene", "mode"),
@@ -316,9 +348,11 @@ def load_settings(root_dir: Path | None = None) -> Settings:
         stale_threshold_seconds=float(os.environ.get("MAXMCP_STALE_THRESHOLD_SECONDS", "30")),
         idempotency_cache_size=int(os.environ.get("MAXMCP_IDEMPOTENCY_CACHE_SIZE", "512")),
         checkpoint_max=int(os.environ.get("MAXMCP_CHECKPOINT_MAX", "20")),
+        checkpoint_cache_bytes=int(os.environ.get("MAXMCP_CHECKPOINT_CACHE_BYTES", "8388608")),
         managed_mode=env_bool("MAXMCP_MANAGED_MODE", True),
         npm_auto_install=env_bool("MAXMCP_NPM_AUTO_INSTALL", True),
         twin_auto_sync=env_bool("MAXMCP_TWIN_AUTO_SYNC", True),
+        twin_reconcile_seconds=float(os.environ.get("MAXMCP_TWIN_RECONCILE_SECONDS", "60")),
         strict_v3=strict_v3,
         strict_capability_gating=env_bool("MAXMCP_STRICT_CAPABILITY_GATING", True),
         require_healthy_ready=env_bool("MAXMCP_REQUIRE_HEALTHY_READY", True),
@@ -328,6 +362,17 @@ def load_settings(root_dir: Path | None = None) -> Settings:
         mutation_queue_wait_timeout_seconds=float(
             os.environ.get("MAXMCP_MUTATION_QUEUE_WAIT_TIMEOUT_SECONDS", "15")
         ),
+        mutation_aimd=env_bool("MAXMCP_MUTATION_AIMD", True),
+        mutation_aimd_max_inflight=int(os.environ.get("MAXMCP_MUTATION_AIMD_MAX_INFLIGHT", "8")),
+        bridge_max_inflight=int(os.environ.get("MAXMCP_BRIDGE_MAX_INFLIGHT", "8")),
+        health_lane_max_inflight=int(os.environ.get("MAXMCP_HEALTH_LANE_MAX_INFLIGHT", "2")),
+        read_lane_max_inflight=int(os.environ.get("MAXMCP_READ_LANE_MAX_INFLIGHT", "6")),
+        bulk_lane_max_inflight=int(os.environ.get("MAXMCP_BULK_LANE_MAX_INFLIGHT", "2")),
+        lane_max_queue=int(os.environ.get("MAXMCP_LANE_MAX_QUEUE", "64")),
+        batch_max_items=int(os.environ.get("MAXMCP_BATCH_MAX_ITEMS", "64")),
+        read_cache_ttl_seconds=float(os.environ.get("MAXMCP_READ_CACHE_TTL_SECONDS", "0.5")),
+        topology_cache_seconds=float(os.environ.get("MAXMCP_TOPOLOGY_CACHE_SECONDS", "5")),
+        restore_diff_max_ratio=float(os.environ.get("MAXMCP_RESTORE_DIFF_MAX_RATIO", "0.5")),
         enforce_patch_roots=env_bool("MAXMCP_ENFORCE_PATCH_ROOTS", False),
         allowed_patch_roots_raw=os.environ.get("MAXMCP_ALLOWED_PATCH_ROOTS", "").strip(),
         preflight_mode=preflight_mode,
@@ -339,6 +384,7 @@ def load_settings(root_dir: Path | None = None) -> Settings:
         workspace_capture_backoff_seconds=float(
             os.environ.get("MAXMCP_WORKSPACE_CAPTURE_BACKOFF_SECONDS", "0.5")
         ),
+        workspace_capture_page_size=int(os.environ.get("MAXMCP_WORKSPACE_CAPTURE_PAGE_SIZE", "200")),
         health_check_cooldown_seconds=float(
             os.environ.get("MAXMCP_HEALTH_CHECK_COOLDOWN_SECONDS", "2.0")
         ),
@@ -346,6 +392,20 @@ def load_settings(root_dir: Path | None = None) -> Settings:
         transport_failure_clear_caps_threshold=int(
             os.environ.get("MAXMCP_TRANSPORT_FAILURE_CLEAR_CAPS_THRESHOLD", "2")
         ),
+        bridge_framing=os.environ.get("MAXMCP_BRIDGE_FRAMING", "auto").strip().lower(),
+        bridge_compression=os.environ.get("MAXMCP_BRIDGE_COMPRESSION", "off").strip().lower(),
+        bridge_compress_min_bytes=int(os.environ.get("MAXMCP_BRIDGE_COMPRESS_MIN_BYTES", "65536")),
+        adaptive_timeouts=env_bool("MAXMCP_ADAPTIVE_TIMEOUTS", True),
+        adaptive_timeout_factor=float(os.environ.get("MAXMCP_ADAPTIVE_TIMEOUT_FACTOR", "3.0")),
+        adaptive_timeout_min_seconds=float(
+            os.environ.get("MAXMCP_ADAPTIVE_TIMEOUT_MIN_SECONDS", "1.0")
+        ),
+        adaptive_timeout_max_seconds=float(
+            os.environ.get("MAXMCP_ADAPTIVE_TIMEOUT_MAX_SECONDS", "60.0")
+        ),
+        adaptive_timeout_min_samples=int(
+            os.environ.get("MAXMCP_ADAPTIVE_TIMEOUT_MIN_SAMPLES", "20")
+        ),
         import_apply_timeout_seconds=float(os.environ.get("MAXMCP_IMPORT_APPLY_TIMEOUT_SECONDS", "25")),
         import_apply_retry_count=int(os.environ.get("MAXMCP_IMPORT_APPLY_RETRY_COUNT", "1")),
         import_apply_retry_backoff_seconds=float(
@@ -371,13 +431,22 @@ def load_settings(root_dir: Path | None = None) -> Settings:
     )
 
     metrics = MetricsSettings(
-        sample_size=int(os.environ.get("MAXMCP_METRICS_SAMPLE_SIZE", "512")),
+        slice_seconds=float(os.environ.get("MAXMCP_METRICS_SLICE_SECONDS", "10")),
+        retention_seconds=float(os.environ.get("MAXMCP_METRICS_RETENTION_SECONDS", "3600")),
         event_log_size=int(os.environ.get("MAXMCP_EVENT_LOG_SIZE", "256")),
         log_interval_seconds=float(os.environ.get("MAXMCP_METRICS_LOG_INTERVAL_SECONDS", "30")),
         alert_failure_rate=float(os.environ.get("MAXMCP_ALERT_FAILURE_RATE", "0.10")),
         alert_p95_ms=float(os.environ.get("MAXMCP_ALERT_P95_MS", "1500")),
         alert_queue_depth=float(os.environ.get("MAXMCP_ALERT_QUEUE_DEPTH", "0.80")),
         alert_window_seconds=float(os.environ.get("MAXMCP_ALERT_WINDOW_SECONDS", "300")),
+        alert_short_window_seconds=float(
+            os.environ.get("MAXMCP_ALERT_SHORT_WINDOW_SECONDS", "60")
+        ),
+        alert_burn_rate=float(os.environ.get("MAXMCP_ALERT_BURN_RATE", "2.0")),
+        http_host=os.environ.get("MAXMCP_METRICS_HTTP_HOST", "127.0.0.1").strip(),
+        http_port=int(os.environ.get("MAXMCP_METRICS_HTTP_PORT", "0")),
+        tracing=env_bool("MAXMCP_TRACING", True),
+        trace_buffer_size=int(os.environ.get("MAXMCP_TRACE_BUFFER_SIZE", "64")),
     )
 
     hygiene = HygieneSettings(
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any
+
+from maxmsp_mcp.json_utils import compact_json
+from maxmsp_mcp.protocol import (
+    COMPRESSION_ZLIB,
+    COMPRESSION_ZSTD,
+    FRAMING_JSON,
+    FRAMING_MSGPACK,
+)
+
+try:
+    import msgpack
+except ImportError:  # Optional: without it the bridge keeps JSON framing.
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: zlib is always available.
+    zstandard = None
+
+
+FRAMING_AUTO = "auto"
+COMPRESSION_OFF = "off"
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def available_framings(preference: str = FRAMING_AUTO) -> list[str]:
+    """Framings this process can encode, most preferred first; JSON is always last."""
+    normalized = str(preference or FRAMING_AUTO).strip().lower()
+    framings: list[str] = []
+    if normalized in {FRAMING_AUTO, FRAMING_MSGPACK} and msgpack is not None:
+        framings.append(FRAMING_MSGPACK)
+    framings.append(FRAMING_JSON)
+    return framings
+
+
+def available_compressions(preference: str = COMPRESSION_OFF) -> list[str]:
+    """Compression codecs to offer, most preferred first; empty when compression is off."""
+    normalized = str(preference or COMPRESSION_OFF).strip().lower()
+    codecs: list[str] = []
+    if normalized in {FRAMING_AUTO, COMPRESSION_ZSTD} and zstandard is not None:
+        codecs.append(COMPRESSION_ZSTD)
+    if normalized in {FRAMING_AUTO, COMPRESSION_ZLIB}:
+        codecs.append(COMPRESSION_ZLIB)
+    return codecs
+
+
+def is_binary_frame(data: Any) -> bool:
+    return isinstance(data, (bytes, bytearray, memoryview))
+
+
+def is_compressed_frame(data: Any) -> bool:
+    return (
+        isinstance(data, dict)
+        and isinstance(data.get("compression"), str)
+        and is_binary_frame(data.get("data"))
+    )
+
+
+def encode_frame(envelope: dict, framing: str) -> tuple[Any, int | None]:
+    """Return the value to emit and its encoded byte count.
+
+    JSON envelopes are handed to socket.io as dicts so they are serialized exactly
+    once, by the transport; their size is therefore unknown (``None``) here.
+    """
+    if framing == FRAMING_MSGPACK and msgpack is not None:
+        frame = msgpack.packb(envelope, use_bin_type=True)
+        return frame, len(frame)
+    return envelope, None
+
+
+def compress_body(body: bytes, compression: str) -> bytes:
+    if compression == COMPRESSION_ZSTD and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(body, ZLIB_LEVEL)
+    raise ValueError(f"Unsupported bridge compression '{compression}'.")
+
+
+def decompress_body(data: Any, compression: str) -> bytes:
+    if compression == COMPRESSION_ZSTD and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(bytes(data))
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(bytes(data))
+    raise ValueError(f"Unsupported bridge compression '{compression}'.")
+
+
+def compress_frame(envelope: dict, frame: Any, framing: str, compression: str) -> dict:
+    """Wrap an encoded envelope in a compressed frame.
+
+    Binary frames are compressed as-is; JSON envelopes are serialized here, once,
+    instead of by socket.io.
+    """
+    body = bytes(frame) if is_binary_frame(frame) else compact_json(envelope).encode("utf-8")
+    return {
+        "compression": compression,
+        "framing": framing if is_binary_frame(frame) else FRAMING_JSON,
+        "raw_bytes": len(body),
+        "data": compress_body(body, compression),
+    }
+
+
+def decode_frame(data: Any) -> Any:
+    if is_compressed_frame(data):
+        body = decompress_body(data["data"], data["compression"])
+        if data.get("framing") == FRAMING_MSGPACK:
+            return decode_frame(body)
+        return json.loads(body.decode("utf-8"))
+    if not is_binary_frame(data):
+        return data
+    if msgpack is None:
+        raise ValueError("Received a binary bridge frame but msgpack is not installed.")
+    return msgpack.unpackb(bytes(data), raw=False)
@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+from collections import deque
+import math
+import time
+from typing import Iterable
+
+
+# Values are recorded in milliseconds at 10 microsecond resolution. Below 2**SUB_BITS
+# units buckets are linear; above, each power of two is split into 2**(SUB_BITS - 1)
+# buckets, so any recorded value is within ~3% of its bucket's midpoint.
+UNITS_PER_MS = 100
+SUB_BITS = 5
+LINEAR_BUCKETS = 1 << SUB_BITS
+HALF_BUCKETS = LINEAR_BUCKETS >> 1
+MAX_UNITS = (1 << 40) - 1  # ~127 days; larger values land in the last bucket
+
+
+def _bucket_index(units: int) -> int:
+    if units < LINEAR_BUCKETS:
+        return units
+    shift = units.bit_length() - SUB_BITS
+    return LINEAR_BUCKETS + (shift - 1) * HALF_BUCKETS + ((units >> shift) - HALF_BUCKETS)
+
+
+def _bucket_bounds_ms(index: int) -> tuple[float, float]:
+    if index < LINEAR_BUCKETS:
+        return index / UNITS_PER_MS, index / UNITS_PER_MS
+    shift = (index - LINEAR_BUCKETS) // HALF_BUCKETS + 1
+    mantissa = (index - LINEAR_BUCKETS) % HALF_BUCKETS + HALF_BUCKETS
+    lower = mantissa << shift
+    return lower / UNITS_PER_MS, (lower + (1 << shift) - 1) / UNITS_PER_MS
+
+
+def _bucket_midpoint_ms(index: int) -> float:
+    lower, upper = _bucket_bounds_ms(index)
+    return (lower + upper) / 2.0
+
+
+class LogHistogram:
+    """Log-linear latency histogram with O(1) record and mergeable counts.
+
+    Buckets are stored sparsely, and the bucket space is bounded, so memory stays
+    fixed no matter how many values are recorded. Exact count, sum, min and max are
+    tracked alongside the buckets.
+    """
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def record(self, value_ms: float, count: int = 1) -> None:
+        value = max(0.0, float(value_ms))
+        index = _bucket_index(min(MAX_UNITS, int(value * UNITS_PER_MS)))
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "LogHistogram") -> None:
+        if not other.count:
+            return
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def subtract(self, other: "LogHistogram") -> None:
+        """Remove ``other``'s values, which must previously have been merged in.
+
+        Bucket counts stay exact; min/max can only be narrowed to the bounds of the
+        remaining extreme buckets.
+        """
+        if not other.count:
+            return
+        for index, count in other.buckets.items():
+            remaining = self.buckets.get(index, 0) - count
+            if remaining > 0:
+                self.buckets[index] = remaining
+            else:
+                self.buckets.pop(index, None)
+        self.count = max(0, self.count - other.count)
+        self.total = max(0.0, self.total - other.total)
+        if not self.count or not self.buckets:
+            self.buckets.clear()
+            self.count = 0
+            self.total = 0.0
+            self.min = self.max = None
+            return
+        low, _ = _bucket_bounds_ms(min(self.buckets))
+        _, high = _bucket_bounds_ms(max(self.buckets))
+        if self.min is None or self.min < low:
+            self.min = low
+        if self.max is None or self.max > high:
+            self.max = high
+
+    def percentile(self, fraction: float) -> float | None:
+        """Nearest-rank percentile, reported as the bucket midpoint clamped to min/max."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(float(fraction) * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                value = _bucket_midpoint_ms(index)
+                return round(min(self.max, max(self.min, value)), 3)
+        return self.max
+
+    def cumulative_counts(self, bounds_ms: Iterable[float]) -> list[int]:
+        """Count values at or below each ascending bound, placing buckets by midpoint."""
+        ordered = sorted(self.buckets.items())
+        counts: list[int] = []
+        seen = 0
+        position = 0
+        for bound in bounds_ms:
+            while position < len(ordered) and _bucket_midpoint_ms(ordered[position][0]) <= bound:
+                seen += ordered[position][1]
+                position += 1
+            counts.append(seen)
+        return counts
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class RequestSlice:
+    """Counts and latency histograms for the requests of one time bucket (or window)."""
+
+    __slots__ = ("requests", "successes", "failures", "timeouts", "durations", "queue_waits", "actions")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.durations = LogHistogram()
+        self.queue_waits = LogHistogram()
+        self.actions: dict[str, dict[str, int]] = {}
+
+    def record(self, *, duration_ms: float, queue_wait_ms: float, action: str, state: str) -> None:
+        row = self.actions.get(action)
+        if row is None:
+            row = {"requests": 0, "succeeded": 0, "failed": 0, "timeouts": 0}
+            self.actions[action] = row
+        self.requests += 1
+        row["requests"] += 1
+        if state == "succeeded":
+            self.successes += 1
+            row["succeeded"] += 1
+        elif state in {"failed", "timeout"}:
+            # Timeouts count as failures too, as the SLO reports always have.
+            self.failures += 1
+            row["failed"] += 1
+            if state == "timeout":
+                self.timeouts += 1
+                row["timeouts"] += 1
+        self.durations.record(duration_ms)
+        self.queue_waits.record(queue_wait_ms)
+
+    def merge(self, other: "RequestSlice") -> None:
+        self.requests += other.requests
+        self.successes += other.successes
+        self.failures += other.failures
+        self.timeouts += other.timeouts
+        self.durations.merge(other.durations)
+        self.queue_waits.merge(other.queue_waits)
+        for action, counts in other.actions.items():
+            row = self.actions.setdefault(
+                action, {"requests": 0, "succeeded": 0, "failed": 0, "timeouts": 0}
+            )
+            for key, value in counts.items():
+                row[key] += value
+
+    def subtract(self, other: "RequestSlice") -> None:
+        self.requests -= other.requests
+        self.successes -= other.successes
+        self.failures -= other.failures
+        self.timeouts -= other.timeouts
+        self.durations.subtract(other.durations)
+        self.queue_waits.subtract(other.queue_waits)
+        for action, counts in other.actions.items():
+            row = self.actions.get(action)
+            if row is None:
+                continue
+            for key, value in counts.items():
+                row[key] -= value
+            if row["requests"] <= 0:
+                del self.actions[action]
+
+
+class RollingWindow:
+    """Running aggregate over the most recent ``seconds`` of time slices.
+
+    Records are added to the aggregate as they arrive and whole slices are subtracted
+    as they age out, so reading the window costs the same at any request rate.
+    """
+
+    def __init__(self, seconds: float, slice_seconds: float) -> None:
+        self.seconds = float(seconds)
+        self.slice_seconds = slice_seconds
+        self.aggregate = RequestSlice()
+        self._members: deque[tuple[int, RequestSlice]] = deque()
+        self._first = 0
+
+    def first_index(self, now: float) -> int:
+        return int((now - self.seconds) // self.slice_seconds)
+
+    def advance(self, now: float) -> None:
+        first = self.first_index(now)
+        if first <= self._first:
+            return
+        self._first = first
+        members = self._members
+        while members and members[0][0] < first:
+            self.aggregate.subtract(members.popleft()[1])
+
+    def admit(self, index: int, slice_: RequestSlice) -> bool:
+        """Track a new slice; returns False when it is already older than the window."""
+        if index < self._first:
+            return False
+        members = self._members
+        if not members or members[-1][0] < index:
+            members.append((index, slice_))
+            return True
+        for position, (existing, _slice) in enumerate(members):
+            if existing > index:
+                members.insert(position, (index, slice_))
+                return True
+        members.append((index, slice_))
+        return True
+
+    def contains(self, index: int) -> bool:
+        return index >= self._first
+
+
+class LatencyRecorder:
+    """Request latency accounting by action, by lane and by fixed-width time slice.
+
+    All-time histograms answer whole-process percentiles; time slices are retained for
+    ``retention_seconds`` and merged on demand for arbitrary windows and series. Windows
+    named in ``rolling_seconds`` are kept as incrementally updated aggregates instead.
+    """
+
+    def __init__(
+        self,
+        *,
+        slice_seconds: float = 10.0,
+        retention_seconds: float = 3600.0,
+        rolling_seconds: Iterable[float] = (),
+    ) -> None:
+        self.slice_seconds = max(0.1, float(slice_seconds))
+        self.retention_seconds = max(self.slice_seconds, float(retention_seconds))
+        self._rolling_spans = sorted({float(seconds) for seconds in rolling_seconds if seconds > 0})
+        self.clear()
+
+    def clear(self) -> None:
+        self._rolling = {
+            seconds: RollingWindow(seconds, self.slice_seconds) for seconds in self._rolling_spans
+        }
+        self.count = 0
+        self.durations = LogHistogram()
+        self.queue_waits = LogHistogram()
+        self.by_action: dict[str, LogHistogram] = {}
+        self.by_lane: dict[str, LogHistogram] = {}
+        self._slices: deque[tuple[int, RequestSlice]] = deque()
+
+    def record(
+        self,
+        *,
+        duration_ms: float,
+        queue_wait_ms: float = 0.0,
+        action: str | None = None,
+        lane: str | None = None,
+        state: str = "succeeded",
+        timestamp: float | None = None,
+    ) -> None:
+        action_name = str(action or "unknown")
+        self.count += 1
+        self.durations.record(duration_ms)
+        self.queue_waits.record(queue_wait_ms)
+        histogram = self.by_action.get(action_name)
+        if histogram is None:
+            histogram = self.by_action[action_name] = LogHistogram()
+        histogram.record(duration_ms)
+        if lane:
+            histogram = self.by_lane.get(lane)
+            if histogram is None:
+                histogram = self.by_lane[lane] = LogHistogram()
+            histogram.record(duration_ms)
+        at = time.time() if timestamp is None else float(timestamp)
+        index, slice_ = self._slice_for(at)
+        slice_.record(
+            duration_ms=duration_ms,
+            queue_wait_ms=queue_wait_ms,
+            action=action_name,
+            state=state,
+        )
+        for window in self._rolling.values():
+            if window.contains(index):
+                window.aggregate.record(
+                    duration_ms=duration_ms,
+                    queue_wait_ms=queue_wait_ms,
+                    action=action_name,
+                    state=state,
+                )
+
+    def _slice_for(self, timestamp: float) -> tuple[int, RequestSlice]:
+        index = int(timestamp // self.slice_seconds)
+        slices = self._slices
+        if slices and slices[-1][0] == index:
+            return slices[-1]
+        created = (index, RequestSlice())
+        if not slices or slices[-1][0] < index:
+            slices.append(created)
+            horizon = index - int(self.retention_seconds // self.slice_seconds)
+            while slices and slices[0][0] < horizon:
+                slices.popleft()
+            for window in self._rolling.values():
+                window.advance(timestamp)
+        else:
+            # Back-dated sample: find or insert its slice (rare; keeps the deque ordered).
+            for position, existing in enumerate(slices):
+                if existing[0] == index:
+                    return existing
+                if existing[0] > index:
+                    slices.insert(position, created)
+                    break
+            else:
+                slices.append(created)
+        for window in self._rolling.values():
+            window.admit(*created)
+        return created
+
+    def rolling(self, seconds: float, now: float | None = None) -> RequestSlice | None:
+        """The incrementally maintained window of ``seconds``, if one was configured."""
+        window = self._rolling.get(float(seconds))
+        if window is None:
+            return None
+        window.advance(time.time() if now is None else now)
+        return window.aggregate
+
+    def _slices_since(self, start: float) -> Iterable[tuple[int, RequestSlice]]:
+        # A slice belongs to the window if any part of it falls after ``start``.
+        first = int(start // self.slice_seconds)
+        return ((index, slice_) for index, slice_ in self._slices if index >= first)
+
+    def window(self, start: float) -> RequestSlice:
+        merged = RequestSlice()
+        for _index, slice_ in self._slices_since(start):
+            merged.merge(slice_)
+        return merged
+
+    def series(self, start: float, width: float) -> dict[int, RequestSlice]:
+        """Merge slices since ``start`` into buckets ``width`` seconds wide."""
+        width = max(self.slice_seconds, float(width))
+        buckets: dict[int, RequestSlice] = {}
+        for index, slice_ in self._slices_since(start):
+            bucket = int(max(0.0, index * self.slice_seconds - start) // width)
+            merged = buckets.get(bucket)
+            if merged is None:
+                merged = buckets[bucket] = RequestSlice()
+            merged.merge(slice_)
+        return buckets
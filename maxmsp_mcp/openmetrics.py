@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from typing import Callable
+
+from maxmsp_mcp.histograms import LogHistogram
+
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+METRICS_PATH = "/metrics"
+# Upper bounds, in seconds, of the exported latency histogram buckets.
+LATENCY_BOUNDS_SECONDS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+REQUEST_READ_TIMEOUT_SECONDS = 5.0
+MAX_REQUEST_HEAD_BYTES = 8192
+
+
+def _escape_label(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float | int | bool | None) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(labels: dict[str, object] | None) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+    return "{" + body + "}"
+
+
+class MetricsWriter:
+    """Collects metric families and renders them as OpenMetrics text.
+
+    Samples may be added to a family in any order; each family is rendered once, with
+    its samples grouped under its TYPE/HELP metadata as the format requires.
+    """
+
+    def __init__(self, prefix: str = "maxmcp") -> None:
+        self.prefix = prefix
+        self._families: dict[str, tuple[str, str, list[str]]] = {}
+
+    def _family(self, name: str, kind: str, help_text: str) -> list[str]:
+        full = self._sample_name(name)
+        family = self._families.get(full)
+        if family is None:
+            family = self._families[full] = (kind, help_text, [])
+        elif family[0] != kind:
+            raise ValueError(f"Metric '{full}' already registered as {family[0]}.")
+        return family[2]
+
+    def _sample_name(self, name: str) -> str:
+        return f"{self.prefix}_{name}" if self.prefix else name
+
+    def counter(
+        self,
+        name: str,
+        value: float | int | None,
+        help_text: str,
+        labels: dict[str, object] | None = None,
+    ) -> None:
+        self._family(name, "counter", help_text).append(
+            f"{self._sample_name(name)}_total{_format_labels(labels)} {_format_value(value or 0)}"
+        )
+
+    def gauge(
+        self,
+        name: str,
+        value: float | int | bool | None,
+        help_text: str,
+        labels: dict[str, object] | None = None,
+    ) -> None:
+        self._family(name, "gauge", help_text).append(
+            f"{self._sample_name(name)}{_format_labels(labels)} {_format_value(value)}"
+        )
+
+    def latency_histogram(
+        self,
+        name: str,
+        histogram: LogHistogram,
+        help_text: str,
+        labels: dict[str, object] | None = None,
+    ) -> None:
+        """Export a millisecond :class:`LogHistogram` as a histogram in seconds."""
+        samples = self._family(name, "histogram", help_text)
+        sample_name = self._sample_name(name)
+        bounds_ms = [bound * 1000.0 for bound in LATENCY_BOUNDS_SECONDS]
+        for bound, count in zip(LATENCY_BOUNDS_SECONDS, histogram.cumulative_counts(bounds_ms)):
+            bucket_labels = {**(labels or {}), "le": _format_value(bound)}
+            samples.append(f"{sample_name}_bucket{_format_labels(bucket_labels)} {count}")
+        inf_labels = {**(labels or {}), "le": "+Inf"}
+        samples.append(f"{sample_name}_bucket{_format_labels(inf_labels)} {histogram.count}")
+        samples.append(f"{sample_name}_count{_format_labels(labels)} {histogram.count}")
+        samples.append(
+            f"{sample_name}_sum{_format_labels(labels)} {_format_value(histogram.total / 1000.0)}"
+        )
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for name, (kind, help_text, samples) in self._families.items():
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"# HELP {name} {_escape_label(help_text)}")
+            lines.extend(samples)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _http_response(status: str, body: bytes, content_type: str) -> bytes:
+    head = (
+        f"HTTP/1.1 {status}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    return head.encode("ascii") + body
+
+
+async def _read_request_line(reader: asyncio.StreamReader) -> str:
+    # The reader's limit rejects oversized heads with LimitOverrunError.
+    head = await asyncio.wait_for(
+        reader.readuntil(b"\r\n\r\n"), timeout=REQUEST_READ_TIMEOUT_SECONDS
+    )
+    return head.split(b"\r\n", 1)[0].decode("latin-1")
+
+
+async def serve_openmetrics(
+    host: str,
+    port: int,
+    render: Callable[[], str],
+) -> asyncio.AbstractServer:
+    """Serve ``render()`` at ``GET /metrics`` on a plain HTTP listener.
+
+    Rendering runs on the event loop, so ``render`` must only read in-process state.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request_line = await _read_request_line(reader)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                return
+            parts = request_line.split()
+            method = parts[0] if parts else ""
+            path = parts[1].split("?", 1)[0] if len(parts) > 1 else ""
+            if method not in {"GET", "HEAD"}:
+                response = _http_response("405 Method Not Allowed", b"", "text/plain")
+            elif path != METRICS_PATH:
+                response = _http_response("404 Not Found", b"", "text/plain")
+            else:
+                try:
+                    body = render().encode("utf-8")
+                    response = _http_response("200 OK", body, CONTENT_TYPE)
+                except Exception as exc:
+                    logging.warning("OpenMetrics render failed: %s", exc)
+                    response = _http_response("500 Internal Server Error", b"", "text/plain")
+                if method == "HEAD":
+                    response = response.split(b"\r\n\r\n", 1)[0] + b"\r\n\r\n"
+            writer.write(response)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host=host, port=int(port), limit=MAX_REQUEST_HEAD_BYTES)
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 # This file is generated by scripts/generate_protocol_artifacts.py.
 
-PROTOCOL_SPEC = {'actions': {'transport_dict_request': '_maxmcp_transport_dict_request',
+PROTOCOL_SPEC = {'actions': {'transport_cancel': '_maxmcp_transport_cancel',
+             'transport_dict_request': '_maxmcp_transport_dict_request',
              'transport_dict_response': '_maxmcp_transport_dict_response'},
  'bridge_proto': 'maxmcp-4',
+ 'compressions': {'zlib': 'zlib', 'zstd': 'zstd'},
  'error_codes': {'bridge_timeout': 'BRIDGE_TIMEOUT',
                  'bridge_unavailable': 'BRIDGE_UNAVAILABLE',
+                 'deadline_exceeded': 'DEADLINE_EXCEEDED',
                  'internal': 'INTERNAL_ERROR',
                  'object_not_found': 'OBJECT_NOT_FOUND',
                  'overloaded': 'OVERLOADED',
@@ -15,10 +18,13 @@ PROTOCOL_SPEC = {'actions': {'transport_dict_request': '_maxmcp_transport_dict_r
                  'proto_v3_invalid_type': 'PROTO_V3_INVALID_TYPE',
                  'proto_v3_missing_field': 'PROTO_V3_MISSING_FIELD',
                  'proto_v3_unsupported_version': 'PROTO_V3_UNSUPPORTED_VERSION',
+                 'request_cancelled': 'REQUEST_CANCELLED',
                  'unauthorized': 'UNAUTHORIZED',
                  'unknown_action': 'UNKNOWN_ACTION',
                  'validation': 'VALIDATION_ERROR'},
- 'events': {'bridge_node_hello': 'bridge_node_hello'},
+ 'events': {'bridge_node_hello': 'bridge_node_hello',
+            'request_cancel': 'cancel'},
+ 'framings': {'json': 'json', 'msgpack': 'msgpack'},
  'protocol_version': '2.0',
  'stream_kinds': {'hello': 'hello',
                   'request': 'request',
@@ -37,21 +43,33 @@ BRIDGE_PROTO_DEFAULT = DEFAULT_BRIDGE_PROTO
 TRANSPORTS = {'dict_ref': 'dict_ref'}
 TRANSPORT_DICT_REF = 'dict_ref'
 
+FRAMINGS = {'json': 'json', 'msgpack': 'msgpack'}
+FRAMING_JSON = 'json'
+FRAMING_MSGPACK = 'msgpack'
+
+COMPRESSIONS = {'zlib': 'zlib', 'zstd': 'zstd'}
+COMPRESSION_ZLIB = 'zlib'
+COMPRESSION_ZSTD = 'zstd'
+
 STREAM_KINDS = {'hello': 'hello', 'request': 'request', 'response': 'response'}
 STREAM_KIND_REQUEST = 'request'
 STREAM_KIND_RESPONSE = 'response'
 STREAM_KIND_HELLO = 'hello'
 
-EVENTS = {'bridge_node_hello': 'bridge_node_hello'}
+EVENTS = {'bridge_node_hello': 'bridge_node_hello', 'request_cancel': 'cancel'}
 BRIDGE_NODE_HELLO_EVENT = 'bridge_node_hello'
+REQUEST_CANCEL_EVENT = 'cancel'
 
-ACTIONS = {'transport_dict_request': '_maxmcp_transport_dict_request',
+ACTIONS = {'transport_cancel': '_maxmcp_transport_cancel',
+ 'transport_dict_request': '_maxmcp_transport_dict_request',
  'transport_dict_response': '_maxmcp_transport_dict_response'}
 ACTION_TRANSPORT_DICT_REQUEST = '_maxmcp_transport_dict_request'
 ACTION_TRANSPORT_DICT_RESPONSE = '_maxmcp_transport_dict_response'
+ACTION_TRANSPORT_CANCEL = '_maxmcp_transport_cancel'
 
 ERROR_CODES = {'bridge_timeout': 'BRIDGE_TIMEOUT',
  'bridge_unavailable': 'BRIDGE_UNAVAILABLE',
+ 'deadline_exceeded': 'DEADLINE_EXCEEDED',
  'internal': 'INTERNAL_ERROR',
  'object_not_found': 'OBJECT_NOT_FOUND',
  'overloaded': 'OVERLOADED',
@@ -60,6 +78,7 @@ ERROR_CODES = {'bridge_timeout': 'BRIDGE_TIMEOUT',
  'proto_v3_invalid_type': 'PROTO_V3_INVALID_TYPE',
  'proto_v3_missing_field': 'PROTO_V3_MISSING_FIELD',
  'proto_v3_unsupported_version': 'PROTO_V3_UNSUPPORTED_VERSION',
+ 'request_cancelled': 'REQUEST_CANCELLED',
  'unauthorized': 'UNAUTHORIZED',
  'unknown_action': 'UNKNOWN_ACTION',
  'validation': 'VALIDATION_ERROR'}
@@ -76,5 +95,7 @@ ERROR_UNAUTHORIZED = 'UNAUTHORIZED'
 ERROR_PROTO_V3_MISSING_FIELD = 'PROTO_V3_MISSING_FIELD'
 ERROR_PROTO_V3_INVALID_TYPE = 'PROTO_V3_INVALID_TYPE'
 ERROR_PROTO_V3_UNSUPPORTED_VERSION = 'PROTO_V3_UNSUPPORTED_VERSION'
+ERROR_DEADLINE_EXCEEDED = 'DEADLINE_EXCEEDED'
+ERROR_REQUEST_CANCELLED = 'REQUEST_CANCELLED'
 
 TRANSPORT_HANDOFF_FAILURE_MARKERS = ('failed to hand off request through dictionary transport', 'dictionary request transport is currently unhealthy', 'dictionary request transport is required but unavailable')
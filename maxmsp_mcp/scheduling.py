@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+import time
+from typing import Callable
+
+
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = 1
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a scheduler already holds ``max_queue`` waiters."""
+
+
+class QueueWaitTimeout(RuntimeError):
+    """Raised when a waiter is not granted a slot before its timeout."""
+
+
+class _Waiter:
+    __slots__ = ("future", "active")
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.active = True
+
+
+class SlotScheduler:
+    """Bounded slot admission that hands each freed slot directly to one waiter.
+
+    Waiters are grouped by priority (lower values run first) and, within a priority,
+    by key; keys take turns so a burst of one action cannot starve the others, while
+    waiters sharing a key stay FIFO. A release resolves at most one waiter's future, so
+    its cost does not grow with queue depth.
+    """
+
+    def __init__(self, *, max_inflight: int, max_queue: int) -> None:
+        self._max_inflight = max(1, int(max_inflight))
+        self.max_queue = max(1, int(max_queue))
+        self.inflight = 0
+        self.queued = 0
+        self._queues: dict[int, OrderedDict[str, deque[_Waiter]]] = {}
+
+    @property
+    def max_inflight(self) -> int:
+        return self._max_inflight
+
+    @max_inflight.setter
+    def max_inflight(self, value: int) -> None:
+        self._max_inflight = max(1, int(value))
+        self._grant_available()
+
+    def _enqueue(self, key: str, priority: int, waiter: _Waiter) -> None:
+        lanes = self._queues.setdefault(priority, OrderedDict())
+        lane = lanes.get(key)
+        if lane is None:
+            lane = deque()
+            lanes[key] = lane
+        lane.append(waiter)
+        self.queued += 1
+
+    def _pop_next(self) -> _Waiter | None:
+        for priority in sorted(self._queues):
+            lanes = self._queues[priority]
+            while lanes:
+                key, lane = next(iter(lanes.items()))
+                waiter = lane.popleft() if lane else None
+                if lane:
+                    lanes.move_to_end(key)
+                else:
+                    del lanes[key]
+                if waiter is not None and waiter.active:
+                    return waiter
+            del self._queues[priority]
+        return None
+
+    def _grant_available(self) -> None:
+        while self.inflight < self._max_inflight and self.queued > 0:
+            waiter = self._pop_next()
+            if waiter is None:
+                self.queued = 0
+                return
+            waiter.active = False
+            self.queued -= 1
+            self.inflight += 1
+            waiter.future.set_result(None)
+
+    async def acquire(self, key: str, *, priority: int = PRIORITY_NORMAL, timeout: float) -> float:
+        """Wait for a slot and return the seconds spent queued."""
+        if self.inflight < self._max_inflight and self.queued == 0:
+            self.inflight += 1
+            return 0.0
+        if self.queued >= self.max_queue:
+            raise QueueFullError(f"Queue already holds {self.queued} waiters.")
+
+        started = time.perf_counter()
+        waiter = _Waiter(asyncio.get_running_loop().create_future())
+        self._enqueue(key, priority, waiter)
+        self._grant_available()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=max(0.0, timeout))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.active:
+                waiter.active = False
+                self.queued -= 1
+            elif waiter.future.done():
+                # The slot was handed over as we gave up; pass it on.
+                self.release()
+            if isinstance(exc, asyncio.TimeoutError):
+                raise QueueWaitTimeout(f"No slot granted within {timeout} seconds.") from None
+            raise
+        return max(0.0, time.perf_counter() - started)
+
+    def release(self) -> None:
+        if self.inflight > 0:
+            self.inflight -= 1
+        self._grant_available()
+
+
+class AimdLimit:
+    """Additive-increase/multiplicative-decrease concurrency limit.
+
+    The limit grows by one after each full round of ``limit`` successes that finished
+    healthy and found every slot in use at least once, and is cut by ``decrease_factor`` on
+    congestion. Congestion reported within one round of a cut belongs to the same
+    burst and is ignored, so a wave of timeouts costs a single cut.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        decrease_factor: float = 0.5,
+        history_size: int = 32,
+    ) -> None:
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.decrease_factor = min(0.9, max(0.1, float(decrease_factor)))
+        self.limit = min(self.maximum, max(self.minimum, int(initial)))
+        self.increases = 0
+        self.decreases = 0
+        self.history: deque[dict] = deque(maxlen=max(1, int(history_size)))
+        self._round_successes = 0
+        self._round_saturated = False
+        self._since_decrease = self.limit
+
+    def reset(self, limit: int) -> None:
+        """Adopt an externally chosen limit as the new baseline."""
+        self.limit = min(self.maximum, max(self.minimum, int(limit)))
+        self._round_successes = 0
+        self._round_saturated = False
+        self._since_decrease = self.limit
+
+    def _change(self, limit: int, reason: str) -> int:
+        self.history.append(
+            {"at": time.time(), "from": self.limit, "to": limit, "reason": reason}
+        )
+        self.limit = limit
+        self._round_successes = 0
+        self._round_saturated = False
+        return limit
+
+    def on_success(self, *, healthy: Callable[[], bool], saturated: bool) -> int | None:
+        """Record a success; return the new limit when it grew.
+
+        ``healthy`` is only evaluated at the end of a round.
+        """
+        self._since_decrease += 1
+        self._round_successes += 1
+        self._round_saturated = self._round_saturated or saturated
+        if self._round_successes < self.limit:
+            return None
+        saturated_round = self._round_saturated
+        self._round_successes = 0
+        self._round_saturated = False
+        if not saturated_round or self.limit >= self.maximum or not healthy():
+            return None
+        self.increases += 1
+        return self._change(self.limit + 1, "healthy_round")
+
+    def on_congestion(self, reason: str) -> int | None:
+        """Record a timeout or backpressure signal; return the new limit when it shrank."""
+        self._since_decrease += 1
+        if self._since_decrease <= self.limit:
+            return None
+        self._since_decrease = 0
+        reduced = max(self.minimum, int(self.limit * self.decrease_factor))
+        if reduced >= self.limit:
+            return None
+        self.decreases += 1
+        return self._change(reduced, reason)
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "history": list(self.history),
+        }
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from collections import deque
+import math
+from typing import Any
+
+
+LATENCY_MODEL_VERSION = 1
+LATENCY_WINDOW = 128
+MAX_SIZE_BUCKET = 16
+
+
+def size_bucket(units: int) -> int:
+    """Bucket a payload size so each bucket spans a power of two (0, 1, 2-3, 4-7, ...)."""
+    return min(MAX_SIZE_BUCKET, max(0, int(units)).bit_length())
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+class _LatencyWindow:
+    __slots__ = ("samples", "observed", "_stats")
+
+    def __init__(self, samples: list[float] | None = None) -> None:
+        self.samples: deque[float] = deque(samples or (), maxlen=LATENCY_WINDOW)
+        self.observed = len(self.samples)
+        self._stats: tuple[float, float] | None = None
+
+    def add(self, duration_ms: float) -> None:
+        self.samples.append(duration_ms)
+        self.observed += 1
+        self._stats = None
+
+    def stats(self) -> tuple[float, float]:
+        """Return (p50_ms, p99_ms), sorting only after new samples arrived."""
+        if self._stats is None:
+            ordered = sorted(self.samples)
+            self._stats = (_percentile(ordered, 0.5), _percentile(ordered, 0.99))
+        return self._stats
+
+
+class LatencyModel:
+    """Per-action, per-size-bucket latency windows that derive request timeouts.
+
+    A key only drives timeouts once it holds ``min_samples`` observations; until then
+    the nearest warm bucket of equal or larger size is consulted, and callers fall
+    back to their static default when there is none. Smaller buckets are never
+    borrowed, since their latency understates what a bigger payload needs.
+    Timed-out requests are recorded at their timeout so a budget that proved too
+    short grows instead of repeating.
+    """
+
+    def __init__(
+        self,
+        *,
+        factor: float,
+        min_seconds: float,
+        max_seconds: float,
+        min_samples: int,
+    ) -> None:
+        self.factor = max(1.0, float(factor))
+        self.min_seconds = max(0.001, float(min_seconds))
+        self.max_seconds = max(self.min_seconds, float(max_seconds))
+        self.min_samples = max(1, int(min_samples))
+        self._windows: dict[tuple[str, int], _LatencyWindow] = {}
+        self.dirty = False
+
+    def observe(self, action: str, bucket: int, duration_ms: float) -> None:
+        window = self._windows.get((action, bucket))
+        if window is None:
+            window = _LatencyWindow()
+            self._windows[(action, bucket)] = window
+        window.add(float(duration_ms))
+        self.dirty = True
+
+    def _timeout_from(self, window: _LatencyWindow | None) -> float | None:
+        if window is None or len(window.samples) < self.min_samples:
+            return None
+        _p50, p99 = window.stats()
+        seconds = p99 * self.factor / 1000.0
+        return min(self.max_seconds, max(self.min_seconds, seconds))
+
+    def timeout_for(self, action: str, bucket: int) -> float | None:
+        for larger in range(max(0, bucket), MAX_SIZE_BUCKET + 1):
+            learned = self._timeout_from(self._windows.get((action, larger)))
+            if learned is not None:
+                return learned
+        return None
+
+    def snapshot(self) -> dict:
+        actions: dict[str, dict[str, Any]] = {}
+        for (action, bucket), window in self._windows.items():
+            p50, p99 = window.stats()
+            learned = self._timeout_from(window)
+            actions.setdefault(action, {})[str(bucket)] = {
+                "samples": len(window.samples),
+                "observed": window.observed,
+                "p50_ms": round(p50, 3),
+                "p99_ms": round(p99, 3),
+                "timeout_seconds": round(learned, 3) if learned is not None else None,
+            }
+        return {
+            "factor": self.factor,
+            "min_seconds": self.min_seconds,
+            "max_seconds": self.max_seconds,
+            "min_samples": self.min_samples,
+            "actions": actions,
+        }
+
+    def to_state(self) -> dict:
+        return {
+            "version": LATENCY_MODEL_VERSION,
+            "windows": [
+                {"action": action, "bucket": bucket, "samples": [round(v, 3) for v in window.samples]}
+                for (action, bucket), window in self._windows.items()
+            ],
+        }
+
+    def load_state(self, payload: Any) -> int:
+        """Restore windows persisted by :meth:`to_state`; returns how many were loaded."""
+        if not isinstance(payload, dict) or payload.get("version") != LATENCY_MODEL_VERSION:
+            return 0
+        loaded = 0
+        for row in payload.get("windows") or []:
+            if not isinstance(row, dict) or not isinstance(row.get("action"), str):
+                continue
+            bucket = row.get("bucket")
+            # Action-wide windows from older state files no longer drive timeouts.
+            if not isinstance(bucket, int):
+                continue
+            samples = [
+                float(v)
+                for v in row.get("samples") or []
+                if isinstance(v, (int, float)) and v >= 0
+            ]
+            if samples:
+                self._windows[(row["action"], bucket)] = _LatencyWindow(samples)
+                loaded += 1
+        return loaded
@@ -3,15 +3,18 @@ from __future__ import annotations
 from copy import deepcopy
 from dataclasses import dataclass
 import hashlib
+import json
 import math
 from pathlib import Path
 from typing import Any
+import zlib
 
 from .json_utils import canonical_json, read_json_file, write_json_file
 
 
 ERROR_VALIDATION = "VALIDATION_ERROR"
 ERROR_PRECONDITION = "PRECONDITION_FAILED"
+MERKLE_BUCKET_COUNT = 64
 
 
 class TopologyError(RuntimeError):
@@ -215,6 +218,363 @@ class TopologySnapshot:
         return set(self._varnames_cache)
 
 
+def _sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def box_leaf_hash(box: dict[str, Any]) -> str:
+    row = CanonicalBox(
+        varname=box.get("varname"),
+        maxclass=box.get("maxclass"),
+        patching_rect=box.get("patching_rect"),
+        numinlets=box.get("numinlets"),
+        numoutlets=box.get("numoutlets"),
+        boxtext=box.get("boxtext"),
+        attributes=box.get("attributes"),
+    )
+    return _sha256_text(canonical_json(_stable_value(row.to_dict())))
+
+
+def line_leaf_key(row: Any) -> str | None:
+    line = row.get("patchline") if isinstance(row, dict) else None
+    if not isinstance(line, dict):
+        return None
+    return canonical_json([line.get("source"), line.get("destination")])
+
+
+class TopologyMerkle:
+    """Bucketed Merkle digest over per-box and per-line leaf hashes.
+
+    Leaves are spread over a fixed number of buckets by key, so an edit only
+    rehashes the buckets it touched plus the root, and two digests can be
+    diffed bucket-by-bucket to find the boxes and lines that diverged.
+    """
+
+    _BOX_PREFIX = "b:"
+    _LINE_PREFIX = "l:"
+
+    def __init__(self, bucket_count: int = MERKLE_BUCKET_COUNT) -> None:
+        self.bucket_count = max(1, int(bucket_count))
+        self._buckets: list[dict[str, str]] = [{} for _ in range(self.bucket_count)]
+        self._bucket_digests: list[str | None] = [None] * self.bucket_count
+        self._root: str | None = None
+        self.box_count = 0
+        self.line_count = 0
+
+    @classmethod
+    def from_payload(cls, topology: Any, *, bucket_count: int = MERKLE_BUCKET_COUNT) -> "TopologyMerkle":
+        return MutableTopology.from_payload(topology, bucket_count=bucket_count).merkle
+
+    def _bucket_for(self, key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % self.bucket_count
+
+    def _adjust_count(self, key: str, delta: int) -> None:
+        if key.startswith(self._BOX_PREFIX):
+            self.box_count += delta
+        else:
+            self.line_count += delta
+
+    def _set_leaf(self, key: str, leaf: str) -> None:
+        index = self._bucket_for(key)
+        bucket = self._buckets[index]
+        previous = bucket.get(key)
+        if previous == leaf:
+            return
+        if previous is None:
+            self._adjust_count(key, 1)
+        bucket[key] = leaf
+        self._bucket_digests[index] = None
+        self._root = None
+
+    def _remove_leaf(self, key: str) -> None:
+        index = self._bucket_for(key)
+        if self._buckets[index].pop(key, None) is None:
+            return
+        self._adjust_count(key, -1)
+        self._bucket_digests[index] = None
+        self._root = None
+
+    def set_box(self, key: str, row: Any) -> None:
+        box = row.get("box") if isinstance(row, dict) else None
+        self._set_leaf(self._BOX_PREFIX + key, box_leaf_hash(box if isinstance(box, dict) else {}))
+
+    def remove_box(self, key: str) -> None:
+        self._remove_leaf(self._BOX_PREFIX + key)
+
+    def add_line(self, row: Any) -> None:
+        key = line_leaf_key(row)
+        if key is not None:
+            self._set_leaf(self._LINE_PREFIX + key, _sha256_text(key))
+
+    def remove_line(self, row: Any) -> None:
+        key = line_leaf_key(row)
+        if key is not None:
+            self._remove_leaf(self._LINE_PREFIX + key)
+
+    def _bucket_digest(self, index: int) -> str:
+        digest = self._bucket_digests[index]
+        if digest is None:
+            digest = _sha256_text(canonical_json(sorted(self._buckets[index].items())))
+            self._bucket_digests[index] = digest
+        return digest
+
+    def root(self) -> str:
+        if self._root is None:
+            self._root = _sha256_text(
+                "".join(self._bucket_digest(index) for index in range(self.bucket_count))
+            )
+        return self._root
+
+    def diff(self, other: "TopologyMerkle", *, limit: int = 50) -> dict[str, Any]:
+        """Report leaves that differ from ``other`` (treated as the newer side)."""
+        if other.bucket_count == self.bucket_count:
+            indexes = [
+                index
+                for index in range(self.bucket_count)
+                if self._bucket_digest(index) != other._bucket_digest(index)
+            ]
+            pairs = [(self._buckets[index], other._buckets[index]) for index in indexes]
+        else:
+            merged_self: dict[str, str] = {}
+            merged_other: dict[str, str] = {}
+            for bucket in self._buckets:
+                merged_self.update(bucket)
+            for bucket in other._buckets:
+                merged_other.update(bucket)
+            indexes = []
+            pairs = [(merged_self, merged_other)]
+
+        report: dict[str, Any] = {
+            "boxes": {"added": [], "removed": [], "changed": []},
+            "lines": {"added": [], "removed": []},
+            "bucket_mismatches": len(indexes),
+            "truncated": False,
+        }
+        bounded = max(1, int(limit))
+
+        def record(kind: str, change: str, key: str) -> None:
+            bucket = report[kind][change]
+            if len(bucket) >= bounded:
+                report["truncated"] = True
+                return
+            if kind == "boxes":
+                bucket.append(key[len(self._BOX_PREFIX):])
+            else:
+                source, destination = json.loads(key[len(self._LINE_PREFIX):])
+                bucket.append({"source": source, "destination": destination})
+
+        for mine, theirs in pairs:
+            for key in sorted(set(mine) | set(theirs)):
+                kind = "boxes" if key.startswith(self._BOX_PREFIX) else "lines"
+                if key not in mine:
+                    record(kind, "added", key)
+                elif key not in theirs:
+                    record(kind, "removed", key)
+                elif mine[key] != theirs[key]:
+                    record(kind, "changed", key)
+        return report
+
+
+def _line_endpoint_varnames(row: Any) -> tuple[Any, Any]:
+    line = row.get("patchline") if isinstance(row, dict) else None
+    if not isinstance(line, dict):
+        return None, None
+    source = line.get("source")
+    destination = line.get("destination")
+    source_var = source[0] if isinstance(source, list) and source else None
+    destination_var = destination[0] if isinstance(destination, list) and destination else None
+    return source_var, destination_var
+
+
+def _line_key(row: Any) -> tuple[Any, ...] | None:
+    line = row.get("patchline") if isinstance(row, dict) else None
+    if not isinstance(line, dict):
+        return None
+    return (_stable_value(line.get("source")), _stable_value(line.get("destination")))
+
+
+class MutableTopology:
+    """Local twin model that applies bridge-reported mutation deltas in place.
+
+    Boxes are keyed by varname and lines by their endpoints, so a delta only
+    touches the rows it names instead of rebuilding the whole topology.
+    """
+
+    def __init__(self, *, bucket_count: int = MERKLE_BUCKET_COUNT) -> None:
+        self.boxes: dict[str, dict[str, Any]] = {}
+        self.lines: dict[tuple[Any, ...], dict[str, Any]] = {}
+        self._lines_by_varname: dict[str, set[tuple[Any, ...]]] = {}
+        self.merkle = TopologyMerkle(bucket_count)
+
+    @classmethod
+    def from_payload(cls, topology: Any, *, bucket_count: int = MERKLE_BUCKET_COUNT) -> "MutableTopology":
+        model = cls(bucket_count=bucket_count)
+        snapshot = TopologySnapshot.from_payload(topology)
+        for index, row in enumerate(snapshot.boxes):
+            box = row.get("box") if isinstance(row, dict) else None
+            if not isinstance(box, dict):
+                continue
+            varname = box.get("varname")
+            key = str(varname) if varname else f"#unnamed-{index}"
+            if key in model.boxes:
+                key = f"{key}#dup-{index}"
+            model._set_box(key, row)
+        for row in snapshot.lines:
+            model._add_line(row)
+        return model
+
+    def to_payload(self) -> dict[str, list[dict[str, Any]]]:
+        return {
+            "boxes": clone_json_value(list(self.boxes.values())),
+            "lines": clone_json_value(list(self.lines.values())),
+        }
+
+    def counts(self) -> tuple[int, int]:
+        return len(self.boxes), len(self.lines)
+
+    def digest_counts(self) -> tuple[str, int, int]:
+        """Merkle root plus counts; only buckets touched since the last call are rehashed."""
+        object_count, connection_count = self.counts()
+        return self.merkle.root(), object_count, connection_count
+
+    def _set_box(self, key: str, row: dict[str, Any]) -> None:
+        self.boxes[key] = row
+        self.merkle.set_box(key, row)
+
+    def _add_line(self, row: Any) -> bool:
+        key = _line_key(row)
+        if key is None:
+            return False
+        self.lines[key] = row
+        self.merkle.add_line(row)
+        for varname in _line_endpoint_varnames(row):
+            if isinstance(varname, str):
+                self._lines_by_varname.setdefault(varname, set()).add(key)
+        return True
+
+    def _drop_lines_for(self, varname: str) -> None:
+        for key in self._lines_by_varname.pop(varname, set()):
+            row = self.lines.pop(key, None)
+            if row is not None:
+                self.merkle.remove_line(row)
+            for other in _line_endpoint_varnames(row):
+                if isinstance(other, str) and other != varname:
+                    self._lines_by_varname.get(other, set()).discard(key)
+
+    def apply_delta(self, delta: Any) -> bool:
+        """Apply a bridge twin delta; returns False when it does not fit this model.
+
+        A False result means the model may be partially updated and should be
+        replaced by a full recapture.
+        """
+        if not isinstance(delta, dict) or not delta.get("complete"):
+            return False
+        removed = delta.get("removed") or []
+        boxes = delta.get("boxes") or {}
+        lines_for = delta.get("lines_for") or {}
+        if not isinstance(removed, list) or not isinstance(boxes, dict) or not isinstance(lines_for, dict):
+            return False
+        for varname in removed:
+            if varname not in self.boxes:
+                return False
+            self.boxes.pop(varname)
+            self.merkle.remove_box(varname)
+            self._drop_lines_for(varname)
+        for varname, row in boxes.items():
+            box = row.get("box") if isinstance(row, dict) else None
+            if not isinstance(box, dict) or box.get("varname") != varname:
+                return False
+            self._set_box(varname, clone_json_value(row))
+        for varname, rows in lines_for.items():
+            if not isinstance(rows, list):
+                return False
+            self._drop_lines_for(varname)
+            for row in rows:
+                if not all(endpoint in self.boxes for endpoint in _line_endpoint_varnames(row)):
+                    return False
+                if not self._add_line(clone_json_value(row)):
+                    return False
+        return True
+
+
+def _boxes_by_varname(topology: Any) -> dict[str, dict[str, Any]] | None:
+    rows: dict[str, dict[str, Any]] = {}
+    for row in TopologySnapshot.from_payload(topology).boxes:
+        box = row.get("box") if isinstance(row, dict) else None
+        varname = box.get("varname") if isinstance(box, dict) else None
+        if not isinstance(varname, str) or not varname or varname in rows:
+            return None
+        rows[varname] = row
+    return rows
+
+
+def _lines_by_key(topology: Any) -> dict[tuple[Any, ...], dict[str, Any]]:
+    rows: dict[tuple[Any, ...], dict[str, Any]] = {}
+    for row in TopologySnapshot.from_payload(topology).lines:
+        key = _line_key(row)
+        if key is not None:
+            rows[key] = row
+    return rows
+
+
+# Live captures fill these from patchcord counts, so adding or removing a line changes
+# them on both endpoint boxes without the boxes themselves changing.
+_CONNECTION_DERIVED_BOX_FIELDS = frozenset({"numinlets", "numoutlets"})
+
+
+def _box_fingerprint(row: dict[str, Any]) -> str:
+    box = row.get("box")
+    if not isinstance(box, dict):
+        return canonical_json(row)
+    return canonical_json(
+        {key: value for key, value in box.items() if key not in _CONNECTION_DERIVED_BOX_FIELDS}
+    )
+
+
+def topology_delta(current: Any, target: Any) -> dict[str, list[Any]] | None:
+    """Structural diff that turns ``current`` into ``target``, with boxes keyed by varname.
+
+    Changed boxes are removed and recreated, so every target line touching a recreated
+    box is reconnected; inlet and outlet counts follow the cords and do not count as a
+    change. Returns None when either side has unnamed or duplicate varnames.
+    """
+    current_boxes = _boxes_by_varname(current)
+    target_boxes = _boxes_by_varname(target)
+    if current_boxes is None or target_boxes is None:
+        return None
+    replaced = {
+        varname
+        for varname, row in target_boxes.items()
+        if varname in current_boxes and _box_fingerprint(current_boxes[varname]) != _box_fingerprint(row)
+    }
+    remove = [
+        varname for varname in current_boxes if varname not in target_boxes or varname in replaced
+    ]
+    created = {varname for varname in target_boxes if varname not in current_boxes} | replaced
+    gone = set(remove)
+
+    current_lines = _lines_by_key(current)
+    target_lines = _lines_by_key(target)
+    disconnect = [
+        row
+        for key, row in current_lines.items()
+        if key not in target_lines
+        and not any(endpoint in gone for endpoint in _line_endpoint_varnames(row))
+    ]
+    connect = [
+        row
+        for key, row in target_lines.items()
+        if key not in current_lines
+        or any(endpoint in created for endpoint in _line_endpoint_varnames(row))
+    ]
+    return {
+        "remove": remove,
+        "boxes": [row for varname, row in target_boxes.items() if varname in created],
+        "disconnect": disconnect,
+        "connect": connect,
+    }
+
+
 def extract_topology_with_format(payload: Any) -> tuple[str, dict[str, list[dict[str, Any]]]] | None:
     if not isinstance(payload, dict):
         return None
@@ -459,6 +819,13 @@ def topology_hash(topology: dict[str, Any]) -> tuple[str, int, int]:
     return Topology.from_payload(topology).digest_counts()
 
 
+def topology_content_hash(topology: dict[str, Any]) -> str:
+    """Order-sensitive digest of the raw box/line rows, used to address staged uploads."""
+    boxes = topology.get("boxes", []) if isinstance(topology, dict) else []
+    lines = topology.get("lines", []) if isinstance(topology, dict) else []
+    return hashlib.sha256(canonical_json({"boxes": boxes, "lines": lines}).encode("utf-8")).hexdigest()
+
+
 def topology_varnames(topology: dict[str, Any]) -> set[str]:
     return Topology.from_payload(topology).varnames()
 
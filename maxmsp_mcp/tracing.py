@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+import itertools
+import os
+import time
+from typing import Any, Iterator
+
+
+# Process id reported in Chrome trace events; each trace gets its own thread row.
+TRACE_PID = os.getpid()
+
+
+class Trace:
+    """Spans recorded for one top-level operation, timed on the perf counter."""
+
+    __slots__ = ("trace_id", "name", "args", "wall_start", "perf_start", "perf_end", "spans")
+
+    def __init__(self, trace_id: int, name: str, args: dict[str, Any]) -> None:
+        self.trace_id = trace_id
+        self.name = name
+        self.args = args
+        self.wall_start = time.time()
+        self.perf_start = time.perf_counter()
+        self.perf_end: float | None = None
+        # (name, category, start, end, args) with perf-counter start/end.
+        self.spans: list[tuple[str, str, float, float, dict[str, Any]]] = []
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.perf_end if self.perf_end is not None else time.perf_counter()
+        return (end - self.perf_start) * 1000.0
+
+    def add(self, name: str, category: str, start: float, end: float, args: dict[str, Any]) -> None:
+        self.spans.append((name, category, start, max(start, end), args))
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "args": self.args,
+            "started_at": self.wall_start,
+            "duration_ms": round(self.duration_ms, 3),
+            "spans": [
+                {
+                    "name": name,
+                    "category": category,
+                    "offset_ms": round((start - self.perf_start) * 1000.0, 3),
+                    "duration_ms": round((end - start) * 1000.0, 3),
+                    "args": args,
+                }
+                for name, category, start, end, args in self.spans
+            ],
+        }
+
+    def chrome_events(self) -> list[dict]:
+        """Complete ("X") events; nesting is implied by time containment on one row."""
+        base_us = self.wall_start * 1_000_000.0
+        end = self.perf_end if self.perf_end is not None else time.perf_counter()
+        rows = [(self.name, "operation", self.perf_start, end, self.args), *self.spans]
+        return [
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": round(base_us + (start - self.perf_start) * 1_000_000.0, 3),
+                "dur": round((finish - start) * 1_000_000.0, 3),
+                "pid": TRACE_PID,
+                "tid": self.trace_id,
+                "args": args,
+            }
+            for name, category, start, finish, args in rows
+        ]
+
+
+_CURRENT_TRACE: ContextVar[Trace | None] = ContextVar("maxmcp_current_trace", default=None)
+
+
+def current_trace() -> Trace | None:
+    return _CURRENT_TRACE.get()
+
+
+@contextmanager
+def span(name: str, category: str = "stage", **args: Any) -> Iterator[dict[str, Any]]:
+    """Time a stage of the current trace; a no-op outside of one.
+
+    Yields the span's args so the caller can annotate it before it closes.
+    """
+    trace = _CURRENT_TRACE.get()
+    if trace is None:
+        yield args
+        return
+    start = time.perf_counter()
+    try:
+        yield args
+    finally:
+        trace.add(name, category, start, time.perf_counter(), args)
+
+
+def add_span(name: str, start: float, end: float, category: str = "stage", **args: Any) -> None:
+    """Record an externally timed stage (perf-counter bounds) on the current trace."""
+    trace = _CURRENT_TRACE.get()
+    if trace is not None:
+        trace.add(name, category, start, end, args)
+
+
+class Tracer:
+    """Starts traces for top-level operations and keeps the most recent ones."""
+
+    def __init__(self, *, enabled: bool = True, capacity: int = 64) -> None:
+        self.enabled = bool(enabled)
+        self._ids = itertools.count(1)
+        self._finished: deque[Trace] = deque(maxlen=max(1, int(capacity)))
+
+    @contextmanager
+    def trace(self, name: str, category: str = "operation", **args: Any) -> Iterator[dict[str, Any]]:
+        """Start a trace, or record a nested span when one is already active."""
+        if _CURRENT_TRACE.get() is not None or not self.enabled:
+            with span(name, category, **args) as span_args:
+                yield span_args
+            return
+        trace = Trace(next(self._ids), name, args)
+        token = _CURRENT_TRACE.set(trace)
+        try:
+            yield args
+        finally:
+            _CURRENT_TRACE.reset(token)
+            trace.perf_end = time.perf_counter()
+            self._finished.append(trace)
+
+    def recent(self, limit: int | None = None) -> list[Trace]:
+        traces = list(self._finished)
+        if limit is not None:
+            traces = traces[-max(1, int(limit)) :]
+        return traces
+
+    def clear(self) -> None:
+        self._finished.clear()
+
+    def chrome_trace(self, limit: int | None = None) -> dict:
+        """Trace-event JSON loadable in chrome://tracing or Perfetto."""
+        events: list[dict] = []
+        for trace in self.recent(limit):
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": TRACE_PID,
+                    "tid": trace.trace_id,
+                    "args": {"name": f"{trace.name} #{trace.trace_id}"},
+                }
+            )
+            events.extend(trace.chrome_events())
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
@@ -14,6 +14,8 @@ JS_PATH = REPO_ROOT / "MaxMSP_Agent" / "protocol.generated.cjs"
 
 def _build_payload(spec: dict) -> dict:
     transports = dict(spec.get("transports", {}))
+    framings = dict(spec.get("framings", {}))
+    compressions = dict(spec.get("compressions", {}))
     stream_kinds = dict(spec.get("stream_kinds", {}))
     events = dict(spec.get("events", {}))
     actions = dict(spec.get("actions", {}))
@@ -23,15 +25,23 @@ def _build_payload(spec: dict) -> dict:
         "bridge_proto": str(spec["bridge_proto"]),
         "transports": transports,
         "transport_dict_ref": str(transports.get("dict_ref", "")),
+        "framings": framings,
+        "framing_json": str(framings.get("json", "")),
+        "framing_msgpack": str(framings.get("msgpack", "")),
+        "compressions": compressions,
+        "compression_zlib": str(compressions.get("zlib", "")),
+        "compression_zstd": str(compressions.get("zstd", "")),
         "stream_kinds": stream_kinds,
         "stream_kind_request": str(stream_kinds.get("request", "")),
         "stream_kind_response": str(stream_kinds.get("response", "")),
         "stream_kind_hello": str(stream_kinds.get("hello", "")),
         "events": events,
         "bridge_node_hello_event": str(events.get("bridge_node_hello", "")),
+        "request_cancel_event": str(events.get("request_cancel", "")),
         "actions": actions,
         "action_transport_dict_request": str(actions.get("transport_dict_request", "")),
         "action_transport_dict_response": str(actions.get("transport_dict_response", "")),
+        "action_transport_cancel": str(actions.get("transport_cancel", "")),
         "error_codes": error_codes,
         "errors": error_codes,
         "transport_handoff_failure_markers": list(spec.get("transport_handoff_failure_markers", [])),
@@ -53,6 +63,14 @@ BRIDGE_PROTO_DEFAULT = DEFAULT_BRIDGE_PROTO
 TRANSPORTS = {transports}
 TRANSPORT_DICT_REF = {transport_dict_ref!r}
 
+FRAMINGS = {framings}
+FRAMING_JSON = {framing_json!r}
+FRAMING_MSGPACK = {framing_msgpack!r}
+
+COMPRESSIONS = {compressions}
+COMPRESSION_ZLIB = {compression_zlib!r}
+COMPRESSION_ZSTD = {compression_zstd!r}
+
 STREAM_KINDS = {stream_kinds}
 STREAM_KIND_REQUEST = {stream_kind_request!r}
 STREAM_KIND_RESPONSE = {stream_kind_response!r}
@@ -60,10 +78,12 @@ STREAM_KIND_HELLO = {stream_kind_hello!r}
 
 EVENTS = {events}
 BRIDGE_NODE_HELLO_EVENT = {bridge_node_hello_event!r}
+REQUEST_CANCEL_EVENT = {request_cancel_event!r}
 
 ACTIONS = {actions}
 ACTION_TRANSPORT_DICT_REQUEST = {action_transport_dict_request!r}
 ACTION_TRANSPORT_DICT_RESPONSE = {action_transport_dict_response!r}
+ACTION_TRANSPORT_CANCEL = {action_transport_cancel!r}
 
 ERROR_CODES = {error_codes}
 ERROR_BRIDGE_UNAVAILABLE = {bridge_unavailable!r}
@@ -79,6 +99,8 @@ ERROR_UNAUTHORIZED = {unauthorized!r}
 ERROR_PROTO_V3_MISSING_FIELD = {proto_missing_field!r}
 ERROR_PROTO_V3_INVALID_TYPE = {proto_invalid_type!r}
 ERROR_PROTO_V3_UNSUPPORTED_VERSION = {proto_unsupported_version!r}
+ERROR_DEADLINE_EXCEEDED = {deadline_exceeded!r}
+ERROR_REQUEST_CANCELLED = {request_cancelled!r}
 
 TRANSPORT_HANDOFF_FAILURE_MARKERS = {transport_handoff_failure_markers}
 """.format(
@@ -87,15 +109,23 @@ TRANSPORT_HANDOFF_FAILURE_MARKERS = {transport_handoff_failure_markers}
         bridge_proto=payload["bridge_proto"],
         transports=pformat(payload["transports"], sort_dicts=True),
         transport_dict_ref=payload["transport_dict_ref"],
+        framings=pformat(payload["framings"], sort_dicts=True),
+        framing_json=payload["framing_json"],
+        framing_msgpack=payload["framing_msgpack"],
+        compressions=pformat(payload["compressions"], sort_dicts=True),
+        compression_zlib=payload["compression_zlib"],
+        compression_zstd=payload["compression_zstd"],
         stream_kinds=pformat(payload["stream_kinds"], sort_dicts=True),
         stream_kind_request=payload["stream_kind_request"],
         stream_kind_response=payload["stream_kind_response"],
         stream_kind_hello=payload["stream_kind_hello"],
         events=pformat(payload["events"], sort_dicts=True),
         bridge_node_hello_event=payload["bridge_node_hello_event"],
+        request_cancel_event=payload["request_cancel_event"],
         actions=pformat(payload["actions"], sort_dicts=True),
         action_transport_dict_request=payload["action_transport_dict_request"],
         action_transport_dict_response=payload["action_transport_dict_response"],
+        action_transport_cancel=payload["action_transport_cancel"],
         error_codes=pformat(error_codes, sort_dicts=True),
         bridge_unavailable=error_codes["bridge_unavailable"],
         bridge_timeout=error_codes["bridge_timeout"],
@@ -110,6 +140,8 @@ TRANSPORT_HANDOFF_FAILURE_MARKERS = {transport_handoff_failure_markers}
         proto_missing_field=error_codes["proto_v3_missing_field"],
         proto_invalid_type=error_codes["proto_v3_invalid_type"],
         proto_unsupported_version=error_codes["proto_v3_unsupported_version"],
+        deadline_exceeded=error_codes["deadline_exceeded"],
+        request_cancelled=error_codes["request_cancelled"],
         transport_handoff_failure_markers=tuple(payload["transport_handoff_failure_markers"]),
     )
 
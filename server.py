@@ -1,10 +1,11 @@
 # server.py
 from mcp.server.fastmcp import FastMCP, Context
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from collections import OrderedDict, deque, defaultdict
 from pathlib import Path
 from difflib import get_close_matches, unified_diff
 import asyncio
+import contextvars
 import anyio
 import socketio
 import socket
@@ -28,13 +29,28 @@ import math
 from datetime import datetime, timezone
 
 from maxmsp_mcp.catalog import MaxPyCatalog, load_flattened_docs
+from maxmsp_mcp.checkpoints import (
+    CheckpointJournal,
+    CheckpointStore,
+)
 from maxmsp_mcp.config import (
     env_bool,
     load_settings,
     parse_path_roots,
     resolve_auth_token_from_sources,
 )
+from maxmsp_mcp.framing import (
+    available_compressions,
+    available_framings,
+    compress_frame,
+    decode_frame,
+    encode_frame,
+    is_binary_frame,
+    is_compressed_frame,
+)
+from maxmsp_mcp.histograms import LatencyRecorder, LogHistogram, RequestSlice
 from maxmsp_mcp.json_utils import (
+    canonical_json,
     compact_json_size,
     read_json_file,
     read_json_object_file,
@@ -46,13 +62,16 @@ from maxmsp_mcp.object_specs import (
     normalize_avoid_rect_payload as _normalize_avoid_rect_payload,
     validate_add_object_payload as _validate_add_max_object_payload,
 )
+from maxmsp_mcp.openmetrics import MetricsWriter, serve_openmetrics
 from maxmsp_mcp.platform import macos as macos_platform
 from maxmsp_mcp.process_utils import run_command
 from maxmsp_mcp.protocol import (
     BRIDGE_NODE_HELLO_EVENT,
+    REQUEST_CANCEL_EVENT,
     DEFAULT_BRIDGE_PROTO,
     ERROR_BRIDGE_TIMEOUT,
     ERROR_BRIDGE_UNAVAILABLE,
+    ERROR_DEADLINE_EXCEEDED,
     ERROR_INTERNAL,
     ERROR_OBJECT_NOT_FOUND,
     ERROR_OVERLOADED,
@@ -64,6 +83,7 @@ from maxmsp_mcp.protocol import (
     ERROR_UNAUTHORIZED,
     ERROR_UNKNOWN_ACTION,
     ERROR_VALIDATION,
+    FRAMING_JSON,
     PROTOCOL_VERSION,
     TRANSPORT_DICT_REF,
     TRANSPORT_HANDOFF_FAILURE_MARKERS,
@@ -81,6 +101,14 @@ from maxmsp_mcp.runtime_startup import (
     apply_startup_metadata,
     schedule_runtime_warmup,
 )
+from maxmsp_mcp.scheduling import (
+    AimdLimit,
+    PRIORITY_NORMAL,
+    PRIORITY_URGENT,
+    QueueFullError,
+    QueueWaitTimeout,
+    SlotScheduler,
+)
 from maxmsp_mcp.shared_daemon import (
     SERVER_ROLE_CLIENT,
     SERVER_ROLE_DAEMON,
@@ -95,7 +123,10 @@ from maxmsp_mcp.shared_daemon import (
     run_stdio_proxy_to_sse,
     wait_for_shared_daemon,
 )
+from maxmsp_mcp.timeouts import LatencyModel, size_bucket
+from maxmsp_mcp.tracing import Tracer, add_span, span
 from maxmsp_mcp.topology import (
+    MutableTopology,
     TopologySnapshot as Topology,
     TopologyError,
     clone_json_data as clone_json_value,
@@ -105,6 +136,8 @@ from maxmsp_mcp.topology import (
     merge_topologies,
     normalize_import_topology,
     patch_payload_from_template,
+    topology_content_hash,
+    topology_delta,
     topology_hash,
     topology_varnames,
 )
@@ -144,6 +177,7 @@ MAXMCP_SESSION_ID = SETTINGS.session_id
 MAXPYLANG_ROOT = SETTINGS.maxpylang_root
 MAXPYLANG_TEMPLATE_PATH = SETTINGS.maxpylang_template_path
 MAXMCP_CHECKPOINT_MAX = SETTINGS.checkpoint_max
+MAXMCP_CHECKPOINT_CACHE_BYTES = SETTINGS.checkpoint_cache_bytes
 MAXMCP_MAXDEVTOOLS_ROOT = SETTINGS.maxdevtools_root
 MAXMCP_QA_REPORTS_DIR = SETTINGS.qa_reports_dir
 MAXMCP_SERVER_LOCK_PATH = SETTINGS.server_lock_path
@@ -154,6 +188,7 @@ MAXMCP_SERVER_LOCK_TAKEOVER_GRACE_SECONDS = SETTINGS.server_lock_takeover_grace_
 MAXMCP_MANAGED_MODE = SETTINGS.managed_mode
 MAXMCP_NPM_AUTO_INSTALL = SETTINGS.npm_auto_install
 MAXMCP_TWIN_AUTO_SYNC = SETTINGS.twin_auto_sync
+MAXMCP_TWIN_RECONCILE_SECONDS = SETTINGS.twin_reconcile_seconds
 MAXMCP_STRICT_V3 = SETTINGS.strict_v3
 MAXMCP_STRICT_CAPABILITY_GATING = SETTINGS.strict_capability_gating
 MAXMCP_REQUIRE_HEALTHY_READY = SETTINGS.require_healthy_ready
@@ -161,14 +196,32 @@ MAXMCP_REQUIRE_HANDSHAKE_AUTH = SETTINGS.require_handshake_auth
 MAXMCP_AUTH_TOKEN_FILE = SETTINGS.auth_token_file
 MAXMCP_MUTATION_MAX_INFLIGHT = SETTINGS.mutation_max_inflight
 MAXMCP_MUTATION_MAX_QUEUE = SETTINGS.mutation_max_queue
+MAXMCP_BRIDGE_MAX_INFLIGHT = SETTINGS.bridge_max_inflight
+MAXMCP_HEALTH_LANE_MAX_INFLIGHT = SETTINGS.health_lane_max_inflight
+MAXMCP_READ_LANE_MAX_INFLIGHT = SETTINGS.read_lane_max_inflight
+MAXMCP_BULK_LANE_MAX_INFLIGHT = SETTINGS.bulk_lane_max_inflight
+MAXMCP_LANE_MAX_QUEUE = SETTINGS.lane_max_queue
 MAXMCP_MUTATION_QUEUE_WAIT_TIMEOUT_SECONDS = SETTINGS.mutation_queue_wait_timeout_seconds
-MAXMCP_METRICS_SAMPLE_SIZE = SETTINGS.metrics_sample_size
+MAXMCP_MUTATION_AIMD = SETTINGS.mutation_aimd
+MAXMCP_MUTATION_AIMD_MAX_INFLIGHT = SETTINGS.mutation_aimd_max_inflight
+MAXMCP_BATCH_MAX_ITEMS = SETTINGS.batch_max_items
+MAXMCP_READ_CACHE_TTL_SECONDS = SETTINGS.read_cache_ttl_seconds
+MAXMCP_TOPOLOGY_CACHE_SECONDS = SETTINGS.topology_cache_seconds
+MAXMCP_RESTORE_DIFF_MAX_RATIO = SETTINGS.restore_diff_max_ratio
+MAXMCP_METRICS_SLICE_SECONDS = SETTINGS.metrics_slice_seconds
+MAXMCP_METRICS_RETENTION_SECONDS = SETTINGS.metrics_retention_seconds
 MAXMCP_EVENT_LOG_SIZE = SETTINGS.event_log_size
 MAXMCP_METRICS_LOG_INTERVAL_SECONDS = SETTINGS.metrics_log_interval_seconds
+MAXMCP_METRICS_HTTP_HOST = SETTINGS.metrics_http_host
+MAXMCP_METRICS_HTTP_PORT = SETTINGS.metrics_http_port
+MAXMCP_TRACING = SETTINGS.tracing
+MAXMCP_TRACE_BUFFER_SIZE = SETTINGS.trace_buffer_size
 MAXMCP_ALERT_FAILURE_RATE = SETTINGS.alert_failure_rate
 MAXMCP_ALERT_P95_MS = SETTINGS.alert_p95_ms
 MAXMCP_ALERT_QUEUE_DEPTH = SETTINGS.alert_queue_depth
 MAXMCP_ALERT_WINDOW_SECONDS = SETTINGS.alert_window_seconds
+MAXMCP_ALERT_SHORT_WINDOW_SECONDS = SETTINGS.alert_short_window_seconds
+MAXMCP_ALERT_BURN_RATE = SETTINGS.alert_burn_rate
 MAXMCP_ENFORCE_PATCH_ROOTS = SETTINGS.enforce_patch_roots
 MAXMCP_ALLOWED_PATCH_ROOTS_RAW = SETTINGS.allowed_patch_roots_raw
 MAXMCP_ALLOWED_PATCH_ROOTS = SETTINGS.allowed_patch_roots
@@ -177,9 +230,18 @@ MAXMCP_PREFLIGHT_CACHE_SECONDS = SETTINGS.preflight_cache_seconds
 MAXMCP_WORKSPACE_CAPTURE_TIMEOUT_SECONDS = SETTINGS.workspace_capture_timeout_seconds
 MAXMCP_WORKSPACE_CAPTURE_RETRIES = SETTINGS.workspace_capture_retries
 MAXMCP_WORKSPACE_CAPTURE_BACKOFF_SECONDS = SETTINGS.workspace_capture_backoff_seconds
+MAXMCP_WORKSPACE_CAPTURE_PAGE_SIZE = SETTINGS.workspace_capture_page_size
 MAXMCP_HEALTH_CHECK_COOLDOWN_SECONDS = SETTINGS.health_check_cooldown_seconds
 MAXMCP_FAILURE_BACKOFF_MAX_SECONDS = SETTINGS.failure_backoff_max_seconds
 MAXMCP_TRANSPORT_FAILURE_CLEAR_CAPS_THRESHOLD = SETTINGS.transport_failure_clear_caps_threshold
+MAXMCP_BRIDGE_FRAMING = SETTINGS.bridge_framing
+MAXMCP_BRIDGE_COMPRESSION = SETTINGS.bridge_compression
+MAXMCP_BRIDGE_COMPRESS_MIN_BYTES = SETTINGS.bridge_compress_min_bytes
+MAXMCP_ADAPTIVE_TIMEOUTS = SETTINGS.adaptive_timeouts
+MAXMCP_ADAPTIVE_TIMEOUT_FACTOR = SETTINGS.adaptive_timeout_factor
+MAXMCP_ADAPTIVE_TIMEOUT_MIN_SECONDS = SETTINGS.adaptive_timeout_min_seconds
+MAXMCP_ADAPTIVE_TIMEOUT_MAX_SECONDS = SETTINGS.adaptive_timeout_max_seconds
+MAXMCP_ADAPTIVE_TIMEOUT_MIN_SAMPLES = SETTINGS.adaptive_timeout_min_samples
 MAXMCP_IMPORT_APPLY_TIMEOUT_SECONDS = SETTINGS.import_apply_timeout_seconds
 MAXMCP_IMPORT_APPLY_RETRY_COUNT = SETTINGS.import_apply_retry_count
 MAXMCP_IMPORT_APPLY_RETRY_BACKOFF_SECONDS = SETTINGS.import_apply_retry_backoff_seconds
@@ -638,13 +700,65 @@ MUTATING_BRIDGE_ACTIONS = {
     "set_workspace_target",
     "apply_topology_snapshot",
     "apply_topology_snapshot_progressive",
+    "apply_topology_delta",
 }
+PAGED_CAPTURE_ACTION = "get_objects_in_patch_page"
 BULK_BRIDGE_ACTIONS = {
     "get_objects_in_patch",
+    PAGED_CAPTURE_ACTION,
     "get_objects_in_selected",
+    "stage_topology_snapshot",
+    "apply_topology_snapshot",
+    "apply_topology_snapshot_progressive",
+    "apply_topology_delta",
+}
+# JSON requests are only serialized client-side for compression when they carry topology.
+COMPRESSIBLE_REQUEST_ACTIONS = {
+    "stage_topology_snapshot",
+    "apply_topology_snapshot",
+    "apply_topology_snapshot_progressive",
+    "apply_topology_delta",
+}
+PREFLIGHT_EPOCH_ACTIONS = {
+    "set_workspace_target",
+    "enter_subpatcher",
+    "exit_subpatcher",
     "apply_topology_snapshot",
     "apply_topology_snapshot_progressive",
+    "apply_topology_delta",
 }
+BATCH_BRIDGE_ACTION = "batch"
+TOPOLOGY_DELTA_ACTION = "apply_topology_delta"
+TRANSACTION_CHECKPOINT_MODES = {"twin_verified", "twin", "live"}
+COALESCED_READ_ACTIONS = {
+    "get_objects_in_patch",
+    PAGED_CAPTURE_ACTION,
+    "get_patcher_context",
+    "get_object_attributes",
+    "get_object_connections",
+    "check_signal_safety",
+    "workspace_status",
+}
+READ_CACHE_MAX_ENTRIES = 32
+LANE_HEALTH = "health"
+LANE_READ = "read"
+LANE_BULK = "bulk"
+LANE_MUTATION = "mutation"
+# Lower values are granted shared bridge slots first.
+LANE_PRIORITIES = {LANE_HEALTH: 0, LANE_READ: 1, LANE_MUTATION: 2, LANE_BULK: 3}
+# Mutations issued while restoring or rolling back run ahead of queued regular edits.
+_REQUEST_MUTATION_PRIORITY: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "maxmcp_request_mutation_priority",
+    default=PRIORITY_NORMAL,
+)
+# Workspace selected for bridge requests issued by the current task; bridges that advertise
+# supports_workspace_target resolve it per envelope instead of via set_workspace_target.
+_REQUEST_WORKSPACE_TARGET: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "maxmcp_request_workspace_target",
+    default=None,
+)
+TOPOLOGY_STAGE_PIECE_ROWS = 1024
+TWIN_DRIFT_REPORT_LIMIT = 50
 
 
 def _name_match_score(query_lc: str, candidate: str) -> int | None:
@@ -752,25 +866,90 @@ class MaxMSPConnection:
         self.alert_p95_ms = max(0.0, MAXMCP_ALERT_P95_MS)
         self.alert_queue_depth = min(1.0, max(0.0, MAXMCP_ALERT_QUEUE_DEPTH))
         self.alert_window_seconds = max(30.0, MAXMCP_ALERT_WINDOW_SECONDS)
+        self.alert_short_window_seconds = min(
+            self.alert_window_seconds,
+            max(MAXMCP_METRICS_SLICE_SECONDS, MAXMCP_ALERT_SHORT_WINDOW_SECONDS),
+        )
+        self.alert_burn_rate = max(1.0, MAXMCP_ALERT_BURN_RATE)
         self.last_metrics_log_emit_at: float | None = None
 
-        self.mutation_max_inflight = max(1, MAXMCP_MUTATION_MAX_INFLIGHT)
-        self.mutation_max_queue = max(1, MAXMCP_MUTATION_MAX_QUEUE)
+        self._mutation_scheduler = SlotScheduler(
+            max_inflight=MAXMCP_MUTATION_MAX_INFLIGHT,
+            max_queue=MAXMCP_MUTATION_MAX_QUEUE,
+        )
         self.mutation_queue_wait_timeout_seconds = max(
             0.1,
             MAXMCP_MUTATION_QUEUE_WAIT_TIMEOUT_SECONDS,
         )
-        self._mutation_condition = asyncio.Condition()
-        self._mutation_waiters: deque[str] = deque()
-        self._queued_mutation_requests = 0
-        self._inflight_mutation_requests = 0
+        self.mutation_aimd_enabled = bool(MAXMCP_MUTATION_AIMD)
+        # Growth stops one short of the shared bridge cap so mutations can never
+        # take every bridge slot away from health checks and reads.
+        self._mutation_concurrency = AimdLimit(
+            initial=MAXMCP_MUTATION_MAX_INFLIGHT,
+            minimum=1,
+            maximum=max(
+                MAXMCP_MUTATION_MAX_INFLIGHT,
+                min(MAXMCP_MUTATION_AIMD_MAX_INFLIGHT, MAXMCP_BRIDGE_MAX_INFLIGHT - 1),
+            ),
+        )
+        # Latest Node bridge in-flight depth, as echoed in response meta.
+        self.bridge_queue_depth: dict[str, int] | None = None
+        self._lane_schedulers = {
+            LANE_HEALTH: SlotScheduler(
+                max_inflight=MAXMCP_HEALTH_LANE_MAX_INFLIGHT,
+                max_queue=MAXMCP_LANE_MAX_QUEUE,
+            ),
+            LANE_READ: SlotScheduler(
+                max_inflight=MAXMCP_READ_LANE_MAX_INFLIGHT,
+                max_queue=MAXMCP_LANE_MAX_QUEUE,
+            ),
+            LANE_BULK: SlotScheduler(
+                max_inflight=MAXMCP_BULK_LANE_MAX_INFLIGHT,
+                max_queue=MAXMCP_LANE_MAX_QUEUE,
+            ),
+            LANE_MUTATION: self._mutation_scheduler,
+        }
+        # Every lane holder also needs one of these, so lane caps bound each class of
+        # traffic and lane priority decides who gets the next free bridge slot. Only
+        # lane slot holders wait here, so the queue bound is a backstop.
+        self._bridge_scheduler = SlotScheduler(
+            max_inflight=MAXMCP_BRIDGE_MAX_INFLIGHT,
+            max_queue=len(LANE_PRIORITIES)
+            * max(MAXMCP_LANE_MAX_QUEUE, MAXMCP_MUTATION_MAX_QUEUE),
+        )
+        self._lane_queue_waits = {lane: LogHistogram() for lane in LANE_PRIORITIES}
+        self.lane_rejections: dict[str, int] = defaultdict(int)
         self.max_queue_depth_seen = 0
         self.mutation_queue_rejections = 0
         self.mutation_queue_timeouts = 0
         self.total_mutation_queue_wait_seconds = 0.0
-
-        self._latency_samples = deque(maxlen=max(8, MAXMCP_METRICS_SAMPLE_SIZE))
+        self.batch_max_items = max(1, MAXMCP_BATCH_MAX_ITEMS)
+        self.batch_requests = 0
+        self.batch_items_total = 0
+        self.batch_item_failures = 0
+        self.batch_sequential_fallbacks = 0
+        self.read_cache_ttl_seconds = max(0.0, MAXMCP_READ_CACHE_TTL_SECONDS)
+        self._mutation_epoch = 0
+        # Mutation/navigation epochs per envelope target; ``None`` counts unscoped
+        # requests, which may land on whichever target the bridge has active.
+        self._target_epochs: dict[str | None, int] = defaultdict(int)
+        self._read_cache: dict[tuple, tuple[float, dict]] = {}
+        self._inflight_reads: dict[tuple, asyncio.Future] = {}
+        # Envelope targets whose bridge navigation has left the workspace root.
+        self._navigated_targets: set[str] = set()
+        self.read_bridge_requests = 0
+        self.read_coalesced_requests = 0
+        self.read_cache_hits = 0
+
+        self._latency = LatencyRecorder(
+            slice_seconds=MAXMCP_METRICS_SLICE_SECONDS,
+            retention_seconds=max(MAXMCP_METRICS_RETENTION_SECONDS, self.alert_window_seconds),
+            rolling_seconds=(self.alert_window_seconds, self.alert_short_window_seconds),
+        )
         self._event_log = deque(maxlen=max(8, MAXMCP_EVENT_LOG_SIZE))
+        self.tracer = Tracer(enabled=MAXMCP_TRACING, capacity=MAXMCP_TRACE_BUFFER_SIZE)
+        # Decode/normalize timings of responses, kept until their request picks them up.
+        self._response_timings: dict[str, tuple[float, float]] = {}
         self._preflight_last_at: float = 0.0
         self._preflight_epoch = 0
         self._preflight_epoch_at_last_run = -1
@@ -779,6 +958,8 @@ class MaxMSPConnection:
         self.preflight_invalid_rects = 0
         self.workspace_capture_timeouts = 0
         self.workspace_capture_retries = 0
+        self.workspace_capture_pages = 0
+        self.workspace_capture_restarts = 0
         self.transport_failure_streak = 0
         self.last_transport_failure_at: float | None = None
         self.last_transport_failure_message: str | None = None
@@ -789,14 +970,74 @@ class MaxMSPConnection:
         self.node_hello_seen = False
         self.node_hello_at: float | None = None
         self.node_hello_payload: dict[str, Any] = {}
+        self.offered_framings = available_framings(MAXMCP_BRIDGE_FRAMING)
+        # JSON until the Node bridge hello confirms a negotiated framing.
+        self.request_framing = FRAMING_JSON
+        self.frames_sent = 0
+        self.frame_bytes_sent = 0
+        self.frames_received = 0
+        self.frame_bytes_received = 0
+        self.frame_decode_failures = 0
+        self.adaptive_timeouts = bool(MAXMCP_ADAPTIVE_TIMEOUTS)
+        self.latency_model = LatencyModel(
+            factor=MAXMCP_ADAPTIVE_TIMEOUT_FACTOR,
+            min_seconds=MAXMCP_ADAPTIVE_TIMEOUT_MIN_SECONDS,
+            max_seconds=MAXMCP_ADAPTIVE_TIMEOUT_MAX_SECONDS,
+            min_samples=MAXMCP_ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+        )
+        self.latency_model_file: Path | None = None
+        self.adaptive_timeouts_applied = 0
+        self.cancels_sent = 0
+        self.cancel_failures = 0
+        self.late_responses = 0
+        self.bridge_deadline_rejections = 0
+        self._cancel_tasks: set[asyncio.Task] = set()
+        self.offered_compressions = available_compressions(MAXMCP_BRIDGE_COMPRESSION)
+        self.compress_min_bytes = max(1024, MAXMCP_BRIDGE_COMPRESS_MIN_BYTES)
+        self.request_compression: str | None = None
+        self.compression_stats = {
+            "sent": {"frames": 0, "raw_bytes": 0, "wire_bytes": 0, "seconds": 0.0},
+            "received": {"frames": 0, "raw_bytes": 0, "wire_bytes": 0, "seconds": 0.0},
+        }
 
         @self.sio.on("response", namespace=self.namespace)
         async def _on_response(data):
+            received_at = time.perf_counter()
+            if is_compressed_frame(data):
+                started = time.perf_counter()
+                wire_bytes = len(data["data"])
+                raw_bytes = data.get("raw_bytes")
+                try:
+                    data = decode_frame(data)
+                except Exception as e:
+                    self.frame_decode_failures += 1
+                    logging.warning(f"Failed to decompress bridge response frame: {e}")
+                    return
+                self._record_compression(
+                    "received",
+                    raw_bytes=raw_bytes if isinstance(raw_bytes, int) else 0,
+                    wire_bytes=wire_bytes,
+                    seconds=time.perf_counter() - started,
+                )
+            elif is_binary_frame(data):
+                self.frames_received += 1
+                self.frame_bytes_received += len(data)
+                try:
+                    data = decode_frame(data)
+                except Exception as e:
+                    self.frame_decode_failures += 1
+                    logging.warning(f"Failed to decode bridge response frame: {e}")
+                    return
             envelope = self._normalize_response(data)
             req_id = envelope.get("request_id")
             fut = self._pending.get(req_id)
             if fut and not fut.done():
+                if self.tracer.enabled:
+                    self._response_timings[req_id] = (received_at, time.perf_counter())
                 fut.set_result(envelope)
+            elif req_id:
+                # The caller already gave up (and sent a cancel); the bridge finished anyway.
+                self.late_responses += 1
 
         @self.sio.on(BRIDGE_NODE_HELLO_EVENT, namespace=self.namespace)
         async def _on_bridge_node_hello(data):
@@ -961,6 +1202,14 @@ class MaxMSPConnection:
         self.node_hello_at = time.time()
         build_id = str(normalized.get("node_bridge_build_id") or "").strip()
         self.node_bridge_build_id = build_id or None
+        if "framing" in normalized:
+            framing = str(normalized.get("framing") or "").strip().lower()
+            self.request_framing = framing if framing in self.offered_framings else FRAMING_JSON
+        if "compression" in normalized:
+            compression = str(normalized.get("compression") or "").strip().lower()
+            self.request_compression = (
+                compression if compression in self.offered_compressions else None
+            )
         if isinstance(normalized.get("transport_health"), dict):
             self.transport_health = dict(normalized.get("transport_health"))
 
@@ -1114,6 +1363,9 @@ class MaxMSPConnection:
             "dict_successes": dict_successes,
             "dict_failures": dict_failures,
             "total_successes": dict_successes,
+            "expired_before_handoff": _as_int(stats.get("expired_before_handoff")),
+            "cancelled_before_handoff": _as_int(stats.get("cancelled_before_handoff")),
+            "cancels_received": _as_int(stats.get("cancels_received")),
             "last_handoff_mode": str(stats.get("last_handoff_mode") or ""),
         }
 
@@ -1131,9 +1383,66 @@ class MaxMSPConnection:
     def _is_mutating_action(self, action: str | None) -> bool:
         return isinstance(action, str) and action in MUTATING_BRIDGE_ACTIONS
 
-    def _default_timeout_for_action(self, action: str | None) -> float:
+    def _is_mutating_request(self, payload: dict) -> bool:
+        action = payload.get("action")
+        if action != BATCH_BRIDGE_ACTION:
+            return self._is_mutating_action(action)
+        batch_payload = payload.get("payload")
+        if not isinstance(batch_payload, dict):
+            batch_payload = payload
+        items = batch_payload.get("items")
+        if not isinstance(items, list):
+            return False
+        return any(
+            isinstance(item, dict) and self._is_mutating_action(item.get("action"))
+            for item in items
+        )
+
+    def _request_lane(self, payload: dict) -> str:
+        if self._is_mutating_request(payload):
+            return LANE_MUTATION
+        action = payload.get("action")
+        if action == BATCH_BRIDGE_ACTION:
+            batch_payload = payload.get("payload")
+            if not isinstance(batch_payload, dict):
+                batch_payload = payload
+            items = batch_payload.get("items")
+            actions = {
+                item.get("action")
+                for item in (items if isinstance(items, list) else [])
+                if isinstance(item, dict)
+            }
+            return LANE_BULK if actions & BULK_BRIDGE_ACTIONS else LANE_READ
+        if action in UNGATED_ACTIONS:
+            return LANE_HEALTH
+        if action in BULK_BRIDGE_ACTIONS:
+            return LANE_BULK
+        return LANE_READ
+
+    @staticmethod
+    def _request_size_units(payload: dict | None) -> int:
+        """Cheap payload-size proxy: batch items or snapshot boxes, without serializing."""
+        if not isinstance(payload, dict):
+            return 0
+        items = payload.get("items")
+        if isinstance(items, list):
+            return len(items)
+        snapshot = payload.get("snapshot") or payload.get("delta")
+        if isinstance(snapshot, dict):
+            boxes = snapshot.get("boxes")
+            return len(boxes) if isinstance(boxes, list) else 0
+        return 0
+
+    def _default_timeout_for_action(self, action: str | None, payload: dict | None = None) -> float:
         if not isinstance(action, str):
             return 2.0
+        if self.adaptive_timeouts:
+            learned = self.latency_model.timeout_for(
+                action, size_bucket(self._request_size_units(payload))
+            )
+            if learned is not None:
+                self.adaptive_timeouts_applied += 1
+                return learned
         if action in BULK_BRIDGE_ACTIONS:
             return 8.0
         if action in MUTATING_BRIDGE_ACTIONS:
@@ -1182,21 +1491,6 @@ class MaxMSPConnection:
             return [MaxMSPConnection._redact_sensitive(item) for item in data]
         return data
 
-    @staticmethod
-    def _percentile(values: list[float], pct: float) -> float | None:
-        if not values:
-            return None
-        ordered = sorted(values)
-        if len(ordered) == 1:
-            return ordered[0]
-        idx = (len(ordered) - 1) * pct
-        lower = int(idx)
-        upper = min(lower + 1, len(ordered) - 1)
-        if lower == upper:
-            return ordered[lower]
-        frac = idx - lower
-        return ordered[lower] + (ordered[upper] - ordered[lower]) * frac
-
     def _enforce_capabilities(self, action: str | None) -> None:
         if not self.strict_capability_gating or not isinstance(action, str):
             return
@@ -1221,33 +1515,29 @@ class MaxMSPConnection:
                 details={"auth_token_configured": True},
             )
 
-    def _rolling_latency_samples(self) -> list[dict]:
-        now = time.time()
-        threshold = now - self.alert_window_seconds
-        return [
-            sample
-            for sample in self._latency_samples
-            if isinstance(sample, dict)
-            and float(sample.get("timestamp", 0.0)) >= threshold
-        ]
+    def _rolling_window(self, seconds: float, now: float) -> RequestSlice:
+        # Configured alert windows are maintained incrementally; other spans are merged
+        # from the retained slices.
+        window = self._latency.rolling(seconds, now)
+        if window is None:
+            window = self._latency.window(now - seconds)
+        return window
+
+    def _burn_rate(self, window: RequestSlice) -> float:
+        if not window.requests:
+            return 0.0
+        return (window.failures / window.requests) / max(0.000001, float(self.alert_failure_rate))
 
     def _compute_alerts(self) -> tuple[list[dict], dict]:
-        samples = self._rolling_latency_samples()
-        durations = [
-            float(sample.get("duration_ms", 0.0))
-            for sample in samples
-            if isinstance(sample, dict)
-        ]
-        failures = [
-            sample
-            for sample in samples
-            if isinstance(sample, dict)
-            and sample.get("state") in {"failed", "timeout"}
-        ]
-        request_count = len(samples)
-        failure_count = len(failures)
+        now = time.time()
+        window = self._rolling_window(self.alert_window_seconds, now)
+        short_window = self._rolling_window(self.alert_short_window_seconds, now)
+        burn_rate = self._burn_rate(window)
+        short_burn_rate = self._burn_rate(short_window)
+        request_count = window.requests
+        failure_count = window.failures
         failure_rate = (failure_count / request_count) if request_count else 0.0
-        p95_latency_ms = self._percentile(durations, 0.95)
+        p95_latency_ms = window.durations.percentile(0.95)
         queue_capacity = max(1, self.mutation_max_queue)
         queue_depth_ratio = self._queued_mutation_requests / queue_capacity
         handoff = self._extract_transport_handoff_metrics(self.transport_health)
@@ -1269,6 +1559,20 @@ class MaxMSPConnection:
                 }
             )
 
+        # Multi-window burn: the long window shows the budget is really going, the short
+        # one that it is still going now.
+        if burn_rate >= self.alert_burn_rate and short_burn_rate >= self.alert_burn_rate:
+            alerts.append(
+                {
+                    "code": "ALERT_ERROR_BUDGET_BURN",
+                    "severity": "error",
+                    "message": "Error budget is burning fast in both the long and short windows.",
+                    "current": round(min(burn_rate, short_burn_rate), 4),
+                    "threshold": self.alert_burn_rate,
+                    "guidance": "Inspect get_bridge_diagnostics() and recent bridge events.",
+                }
+            )
+
         if p95_latency_ms is not None and p95_latency_ms >= self.alert_p95_ms:
             alerts.append(
                 {
@@ -1302,6 +1606,10 @@ class MaxMSPConnection:
             "request_count": request_count,
             "failure_count": failure_count,
             "failure_rate": round(failure_rate, 4),
+            "burn_rate": round(burn_rate, 4),
+            "short_window_seconds": self.alert_short_window_seconds,
+            "short_request_count": short_window.requests,
+            "short_burn_rate": round(short_burn_rate, 4),
             "p95_latency_ms": p95_latency_ms,
             "queue_depth_ratio": round(queue_depth_ratio, 4),
             "transport_total_handoff_successes": handoff["total_successes"],
@@ -1341,133 +1649,303 @@ class MaxMSPConnection:
         self.last_metrics_log_emit_at = now
         return payload
 
-    async def _acquire_mutation_slot(self, action: str) -> float:
-        token = uuid.uuid4().hex
-        queued_before = 0
-        now = time.time()
-        async with self._mutation_condition:
-            queued_before = len(self._mutation_waiters)
-            if queued_before >= self.mutation_max_queue:
-                self.total_failures += 1
-                self.consecutive_failures += 1
-                self.last_failed_request_at = now
-                self.action_failure_counts[action] += 1
-                self.mutation_queue_rejections += 1
-                self._push_event(
-                    level="warn",
-                    code=ERROR_OVERLOADED,
-                    message="Mutation queue capacity exceeded.",
-                    action=action,
-                    details={
-                        "queued": queued_before,
-                        "inflight": self._inflight_mutation_requests,
-                        "max_queue": self.mutation_max_queue,
-                        "max_inflight": self.mutation_max_inflight,
-                    },
-                )
-                raise MaxMCPError(
-                    ERROR_OVERLOADED,
-                    "Mutation queue is full. Retry after in-flight patch operations complete.",
-                    hint="Reduce concurrent mutation requests or raise MAXMCP_MUTATION_MAX_QUEUE.",
-                    recoverable=True,
-                    details={
-                        "queued": queued_before,
-                        "inflight": self._inflight_mutation_requests,
-                    },
-                )
+    # The scheduler owns the mutation slot counters; these views keep the metric fields
+    # and tuning knobs addressable on the connection.
+    @property
+    def mutation_max_inflight(self) -> int:
+        return self._mutation_scheduler.max_inflight
+
+    @mutation_max_inflight.setter
+    def mutation_max_inflight(self, value: int) -> None:
+        self._mutation_scheduler.max_inflight = value
+        # A manual setting becomes the controller's new starting point.
+        controller = self._mutation_concurrency
+        controller.maximum = max(controller.maximum, self._mutation_scheduler.max_inflight)
+        controller.reset(self._mutation_scheduler.max_inflight)
+
+    @property
+    def mutation_max_queue(self) -> int:
+        return self._mutation_scheduler.max_queue
+
+    @mutation_max_queue.setter
+    def mutation_max_queue(self, value: int) -> None:
+        self._mutation_scheduler.max_queue = max(1, int(value))
+
+    @property
+    def _inflight_mutation_requests(self) -> int:
+        return self._mutation_scheduler.inflight
+
+    @_inflight_mutation_requests.setter
+    def _inflight_mutation_requests(self, value: int) -> None:
+        self._mutation_scheduler.inflight = max(0, int(value))
+
+    @property
+    def _queued_mutation_requests(self) -> int:
+        return self._mutation_scheduler.queued
+
+    @_queued_mutation_requests.setter
+    def _queued_mutation_requests(self, value: int) -> None:
+        self._mutation_scheduler.queued = max(0, int(value))
+
+    def _record_bridge_queue_depth(self, meta: Any) -> None:
+        if not isinstance(meta, dict) or "bridge_inflight" not in meta:
+            return
+        try:
+            self.bridge_queue_depth = {
+                "inflight": max(0, int(meta["bridge_inflight"])),
+                "max_inflight": max(1, int(meta.get("bridge_max_inflight") or 1)),
+            }
+        except (TypeError, ValueError):
+            return
 
-            self._mutation_waiters.append(token)
-            self._queued_mutation_requests = len(self._mutation_waiters)
-            self.max_queue_depth_seen = max(
-                self.max_queue_depth_seen,
-                self._queued_mutation_requests + self._inflight_mutation_requests,
-            )
+    def _bridge_queue_ratio(self) -> float | None:
+        depth = self.bridge_queue_depth
+        if depth is None:
+            health = self.transport_health
+            if "inflight_requests" not in health:
+                return None
+            try:
+                depth = {
+                    "inflight": int(health["inflight_requests"]),
+                    "max_inflight": max(1, int(health.get("max_inflight_requests") or 1)),
+                }
+            except (TypeError, ValueError):
+                return None
+        return depth["inflight"] / depth["max_inflight"]
 
-        queue_start = time.perf_counter()
-        deadline = time.monotonic() + self.mutation_queue_wait_timeout_seconds
-        while True:
-            async with self._mutation_condition:
-                remaining = deadline - time.monotonic()
-                is_head = bool(self._mutation_waiters) and self._mutation_waiters[0] == token
-                can_run = self._inflight_mutation_requests < self.mutation_max_inflight
-                if is_head and can_run:
-                    self._mutation_waiters.popleft()
-                    self._queued_mutation_requests = len(self._mutation_waiters)
-                    self._inflight_mutation_requests += 1
-                    self.max_queue_depth_seen = max(
-                        self.max_queue_depth_seen,
-                        self._queued_mutation_requests + self._inflight_mutation_requests,
-                    )
-                    wait_seconds = max(0.0, time.perf_counter() - queue_start)
-                    self.total_mutation_queue_wait_seconds += wait_seconds
-                    self._mutation_condition.notify_all()
-                    return wait_seconds
-
-                if remaining <= 0:
-                    if token in self._mutation_waiters:
-                        self._mutation_waiters.remove(token)
-                    self._queued_mutation_requests = len(self._mutation_waiters)
-                    self.total_failures += 1
-                    self.consecutive_failures += 1
-                    self.last_failed_request_at = time.time()
-                    self.action_failure_counts[action] += 1
-                    self.mutation_queue_timeouts += 1
-                    self.mutation_queue_rejections += 1
-                    self._push_event(
-                        level="warn",
-                        code=ERROR_OVERLOADED,
-                        message="Timed out waiting for mutation queue slot.",
-                        action=action,
-                        details={
-                            "queue_wait_timeout_seconds": self.mutation_queue_wait_timeout_seconds,
-                            "queued": self._queued_mutation_requests,
-                            "inflight": self._inflight_mutation_requests,
-                        },
-                    )
-                    self._mutation_condition.notify_all()
-                    raise MaxMCPError(
-                        ERROR_OVERLOADED,
-                        (
-                            "Timed out waiting for mutation queue slot "
-                            f"after {self.mutation_queue_wait_timeout_seconds} seconds."
-                        ),
-                        hint="Reduce concurrent mutations or raise MAXMCP_MUTATION_QUEUE_WAIT_TIMEOUT_SECONDS.",
-                        recoverable=True,
-                        details={
-                            "queued": self._queued_mutation_requests,
-                            "inflight": self._inflight_mutation_requests,
-                        },
-                    )
+    def _mutation_concurrency_healthy(self) -> bool:
+        _alerts, rolling = self._compute_alerts()
+        if rolling["request_count"] and rolling["failure_rate"] >= self.alert_failure_rate:
+            return False
+        p95 = rolling["p95_latency_ms"]
+        if p95 is not None and p95 >= self.alert_p95_ms:
+            return False
+        ratio = self._bridge_queue_ratio()
+        return ratio is None or ratio < self.alert_queue_depth
 
-                try:
-                    await asyncio.wait_for(
-                        self._mutation_condition.wait(),
-                        timeout=remaining,
-                    )
-                except asyncio.TimeoutError:
-                    # Loop will process timeout on next iteration.
-                    pass
+    def _tune_mutation_concurrency(self, congestion: str | None = None) -> None:
+        """Feed one mutation outcome to the AIMD controller and apply any new limit."""
+        if not self.mutation_aimd_enabled:
+            return
+        controller = self._mutation_concurrency
+        scheduler = self._mutation_scheduler
+        if congestion:
+            limit = controller.on_congestion(congestion)
+        else:
+            limit = controller.on_success(
+                healthy=self._mutation_concurrency_healthy,
+                saturated=scheduler.queued > 0 or scheduler.inflight >= scheduler.max_inflight,
+            )
+        if limit is None:
+            return
+        previous = scheduler.max_inflight
+        scheduler.max_inflight = limit
+        self._push_event(
+            level="warn" if congestion else "info",
+            code="MUTATION_CONCURRENCY_ADJUSTED",
+            message=f"Mutation concurrency {previous} -> {limit}.",
+            details={"from": previous, "to": limit, "reason": congestion or "healthy_round"},
+        )
+
+    async def _acquire_mutation_slot(self, action: str) -> float:
+        scheduler = self._mutation_scheduler
+        try:
+            wait_seconds = await scheduler.acquire(
+                action,
+                priority=_REQUEST_MUTATION_PRIORITY.get(),
+                timeout=self.mutation_queue_wait_timeout_seconds,
+            )
+        except QueueFullError:
+            queued_before = scheduler.queued
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            self.last_failed_request_at = time.time()
+            self.action_failure_counts[action] += 1
+            self.mutation_queue_rejections += 1
+            self._push_event(
+                level="warn",
+                code=ERROR_OVERLOADED,
+                message="Mutation queue capacity exceeded.",
+                action=action,
+                details={
+                    "queued": queued_before,
+                    "inflight": scheduler.inflight,
+                    "max_queue": scheduler.max_queue,
+                    "max_inflight": scheduler.max_inflight,
+                },
+            )
+            raise MaxMCPError(
+                ERROR_OVERLOADED,
+                "Mutation queue is full. Retry after in-flight patch operations complete.",
+                hint="Reduce concurrent mutation requests or raise MAXMCP_MUTATION_MAX_QUEUE.",
+                recoverable=True,
+                details={
+                    "queued": queued_before,
+                    "inflight": scheduler.inflight,
+                },
+            )
+        except QueueWaitTimeout:
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            self.last_failed_request_at = time.time()
+            self.action_failure_counts[action] += 1
+            self.mutation_queue_timeouts += 1
+            self.mutation_queue_rejections += 1
+            self._push_event(
+                level="warn",
+                code=ERROR_OVERLOADED,
+                message="Timed out waiting for mutation queue slot.",
+                action=action,
+                details={
+                    "queue_wait_timeout_seconds": self.mutation_queue_wait_timeout_seconds,
+                    "queued": scheduler.queued,
+                    "inflight": scheduler.inflight,
+                },
+            )
+            raise MaxMCPError(
+                ERROR_OVERLOADED,
+                (
+                    "Timed out waiting for mutation queue slot "
+                    f"after {self.mutation_queue_wait_timeout_seconds} seconds."
+                ),
+                hint="Reduce concurrent mutations or raise MAXMCP_MUTATION_QUEUE_WAIT_TIMEOUT_SECONDS.",
+                recoverable=True,
+                details={
+                    "queued": scheduler.queued,
+                    "inflight": scheduler.inflight,
+                    "queue_timeout": True,
+                },
+            )
+        self.max_queue_depth_seen = max(
+            self.max_queue_depth_seen,
+            scheduler.queued + scheduler.inflight,
+        )
+        self.total_mutation_queue_wait_seconds += wait_seconds
+        return wait_seconds
 
     async def _release_mutation_slot(self) -> None:
-        async with self._mutation_condition:
-            if self._inflight_mutation_requests > 0:
-                self._inflight_mutation_requests -= 1
-            self._queued_mutation_requests = len(self._mutation_waiters)
-            self._mutation_condition.notify_all()
+        self._mutation_scheduler.release()
 
-    def _build_request_envelope(
-        self, payload: dict, *, idempotency_key: str | None = None
-    ) -> dict:
-        request_id = str(uuid.uuid4())
-        action = payload.get("action")
-        requested_transport = self._normalize_transport_name(payload.get("transport"))
-        selected_transport = self.request_transport
-        if requested_transport == TRANSPORT_DICT_REF:
-            selected_transport = (
-                requested_transport
-                if requested_transport in self.supported_transports
-                else self.request_transport
+    async def _acquire_scheduler_slot(
+        self,
+        scheduler: SlotScheduler,
+        lane: str,
+        action: str,
+        *,
+        key: str,
+        timeout: float,
+    ) -> float:
+        try:
+            return await scheduler.acquire(
+                key,
+                priority=LANE_PRIORITIES[lane],
+                timeout=timeout,
+            )
+        except (QueueFullError, QueueWaitTimeout) as e:
+            queue_full = isinstance(e, QueueFullError)
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            self.last_failed_request_at = time.time()
+            self.action_failure_counts[action] += 1
+            self.lane_rejections[lane] += 1
+            details = {
+                "lane": lane,
+                "queued": scheduler.queued,
+                "inflight": scheduler.inflight,
+                "max_queue": scheduler.max_queue,
+                "max_inflight": scheduler.max_inflight,
+            }
+            if not queue_full:
+                details["queue_timeout"] = True
+            message = (
+                f"Bridge {lane} lane queue is full."
+                if queue_full
+                else f"Timed out waiting for a bridge {lane} lane slot."
+            )
+            self._push_event(
+                level="warn",
+                code=ERROR_OVERLOADED,
+                message=message,
+                action=action,
+                details=details,
+            )
+            raise MaxMCPError(
+                ERROR_OVERLOADED,
+                message,
+                hint=(
+                    "Reduce concurrent bridge requests or raise MAXMCP_LANE_MAX_QUEUE."
+                    if queue_full
+                    else "Retry with a higher timeout or raise MAXMCP_BRIDGE_MAX_INFLIGHT."
+                ),
+                recoverable=True,
+                details=details,
+            )
+
+    async def _acquire_lane_slots(self, lane: str, action: str, request_deadline: float) -> float:
+        """Take a lane slot and then a shared bridge slot; return seconds spent queued."""
+        if lane == LANE_MUTATION:
+            lane_wait_seconds = await self._acquire_mutation_slot(action)
+        else:
+            lane_wait_seconds = await self._acquire_scheduler_slot(
+                self._lane_schedulers[lane],
+                lane,
+                action,
+                key=action,
+                timeout=request_deadline - time.monotonic(),
+            )
+        try:
+            bridge_wait_seconds = await self._acquire_scheduler_slot(
+                self._bridge_scheduler,
+                lane,
+                action,
+                key=lane,
+                timeout=request_deadline - time.monotonic(),
             )
+        except BaseException:
+            await self._release_lane_slots(lane, bridge_slot=False)
+            raise
+        wait_seconds = lane_wait_seconds + bridge_wait_seconds
+        self._lane_queue_waits[lane].record(wait_seconds * 1000.0)
+        return wait_seconds
+
+    async def _release_lane_slots(self, lane: str, *, bridge_slot: bool = True) -> None:
+        if bridge_slot:
+            self._bridge_scheduler.release()
+        if lane == LANE_MUTATION:
+            await self._release_mutation_slot()
+        else:
+            self._lane_schedulers[lane].release()
+
+    def lane_snapshot(self) -> dict:
+        lanes = {}
+        for lane, priority in LANE_PRIORITIES.items():
+            scheduler = self._lane_schedulers[lane]
+            waits = self._lane_queue_waits[lane]
+            lanes[lane] = {
+                "priority": priority,
+                "inflight": scheduler.inflight,
+                "queued": scheduler.queued,
+                "max_inflight": scheduler.max_inflight,
+                "max_queue": scheduler.max_queue,
+                "rejections": self.lane_rejections.get(lane, 0),
+                "queue_wait_ms": {
+                    "samples": waits.count,
+                    "p50": waits.percentile(0.50),
+                    "p95": waits.percentile(0.95),
+                    "p99": waits.percentile(0.99),
+                },
+            }
+        return {
+            "bridge": {
+                "inflight": self._bridge_scheduler.inflight,
+                "queued": self._bridge_scheduler.queued,
+                "max_inflight": self._bridge_scheduler.max_inflight,
+            },
+            "lanes": lanes,
+        }
+
+    @staticmethod
+    def _request_action_payload(payload: dict) -> dict:
         action_payload = payload.get("payload")
         if action_payload is None:
             action_payload = {
@@ -1486,6 +1964,26 @@ class MaxMSPConnection:
                     "timestamp_ms",
                 }
             }
+        return action_payload
+
+    def _build_request_envelope(
+        self,
+        payload: dict,
+        *,
+        idempotency_key: str | None = None,
+        deadline_ms: int | None = None,
+    ) -> dict:
+        request_id = str(uuid.uuid4())
+        action = payload.get("action")
+        requested_transport = self._normalize_transport_name(payload.get("transport"))
+        selected_transport = self.request_transport
+        if requested_transport == TRANSPORT_DICT_REF:
+            selected_transport = (
+                requested_transport
+                if requested_transport in self.supported_transports
+                else self.request_transport
+            )
+        action_payload = self._request_action_payload(payload)
 
         envelope = {
             "protocol_version": self.protocol_version,
@@ -1499,8 +1997,63 @@ class MaxMSPConnection:
         }
         if idempotency_key:
             envelope["idempotency_key"] = idempotency_key
+        if deadline_ms is not None:
+            envelope["deadline_ms"] = deadline_ms
+        workspace_target = _REQUEST_WORKSPACE_TARGET.get()
+        if workspace_target is not None:
+            envelope["workspace_target"] = {
+                "target_id": workspace_target["target_id"],
+                "workspace_varname": workspace_target["workspace_varname"],
+                "workspace_name": workspace_target["workspace_name"],
+            }
+            if workspace_target.get("reset_navigation"):
+                envelope["workspace_target"]["reset_navigation"] = True
         return envelope
 
+    def supports_workspace_target(self) -> bool:
+        return isinstance(self.capabilities, dict) and self.capabilities.get("supports_workspace_target") is True
+
+    def reset_workspace_navigation(self, target_id: str) -> None:
+        """Note that the next request for ``target_id`` starts back at the workspace root.
+
+        Envelope sessions reset navigation on their first request, as a
+        ``set_workspace_target`` activation does on older bridges; reads cached inside a
+        subpatcher must not survive that.
+        """
+        if target_id in self._navigated_targets:
+            self._navigated_targets.discard(target_id)
+            self._preflight_epoch += 1
+            self._target_epochs[target_id] += 1
+
+    def target_epoch(self, target_id: str | None) -> tuple[int, int, int]:
+        """Return the epoch that moves when ``target_id``'s patch may have changed.
+
+        Unlike the global epochs it ignores edits and navigation scoped to other
+        workspace targets.
+        """
+        unscoped = self._target_epochs.get(None, 0)
+        scoped = self._target_epochs.get(target_id, 0) if target_id is not None else unscoped
+        return (self.connection_epoch, unscoped, scoped)
+
+    def _bump_target_epoch(self) -> None:
+        scope = _REQUEST_WORKSPACE_TARGET.get()
+        self._target_epochs[scope["target_id"] if scope is not None else None] += 1
+
+    def _track_envelope_navigation(self, envelope: dict, action: Any, *, succeeded: bool) -> None:
+        spec = envelope.get("workspace_target")
+        if not isinstance(spec, dict):
+            return
+        scope = _REQUEST_WORKSPACE_TARGET.get()
+        if spec.get("reset_navigation") and scope is not None:
+            # The bridge handled the reset whether or not the action itself succeeded.
+            scope["reset_navigation"] = False
+        if not succeeded or action not in PREFLIGHT_EPOCH_ACTIONS:
+            return
+        if action == "set_workspace_target":
+            self._navigated_targets.discard(spec["target_id"])
+        else:
+            self._navigated_targets.add(spec["target_id"])
+
     def _cache_idempotent_result(self, idempotency_key: str, value: Any) -> None:
         self._idempotent_results[idempotency_key] = value
         self._idempotent_results.move_to_end(idempotency_key)
@@ -1592,18 +2145,30 @@ class MaxMSPConnection:
                 recoverable=False,
             )
 
+        with self.tracer.trace(str(payload.get("action")), "send_request"):
+            return await self._send_validated_request(
+                payload,
+                timeout,
+                idempotency_key=idempotency_key,
+                include_envelope=include_envelope,
+            )
+
+    async def _send_validated_request(
+        self,
+        payload: dict,
+        timeout: float | None,
+        *,
+        idempotency_key: str | None,
+        include_envelope: bool,
+    ):
         action = payload.get("action")
         timeout_seconds = (
             float(timeout)
             if timeout is not None
-            else self._default_timeout_for_action(action)
+            else self._default_timeout_for_action(action, payload)
         )
         timeout_seconds = max(0.001, timeout_seconds)
         request_deadline = time.monotonic() + timeout_seconds
-        remaining_timeout_seconds = timeout_seconds
-        queue_wait_seconds = 0.0
-        acquired_mutation_slot = False
-        request_id: str | None = None
 
         if isinstance(action, str):
             self.action_request_counts[action] += 1
@@ -1631,54 +2196,236 @@ class MaxMSPConnection:
         self._enforce_transport_contract()
         self._enforce_capabilities(action)
 
-        if idempotency_key and idempotency_key in self._idempotent_results:
-            cached = self._idempotent_results[idempotency_key]
-            self._push_event(
-                level="info",
-                code="IDEMPOTENCY_CACHE_HIT",
-                message="Served request from idempotency cache.",
-                action=action if isinstance(action, str) else None,
-                details={"idempotency_key": idempotency_key},
+        coalesce_key = None if idempotency_key else self._read_coalesce_key(payload)
+        if coalesce_key is not None:
+            response_envelope = await self._send_coalesced_read(
+                payload,
+                coalesce_key,
+                timeout_seconds=timeout_seconds,
+                request_deadline=request_deadline,
             )
-            if include_envelope:
-                return {
-                    "protocol_version": self.protocol_version,
-                    "request_id": "idempotent-cache-hit",
-                    "state": "succeeded",
-                    "results": cached,
-                    "meta": {"idempotency_cache_hit": True},
-                }
-            return cached
-
-        if self._is_mutating_action(action):
-            queue_wait_seconds = await self._acquire_mutation_slot(action)
-            acquired_mutation_slot = True
+            return response_envelope if include_envelope else response_envelope.get("results")
+        return await self._dispatch_request(
+            payload,
+            timeout_seconds=timeout_seconds,
+            request_deadline=request_deadline,
+            idempotency_key=idempotency_key,
+            include_envelope=include_envelope,
+        )
 
-        envelope = self._build_request_envelope(payload, idempotency_key=idempotency_key)
-        request_id = envelope["request_id"]
-        if self.auth_token:
-            envelope["auth_token"] = self.auth_token
-            envelope["auth"] = {"token": self.auth_token}
-        envelope_chars = 0
+    def _read_coalesce_key(self, payload: dict) -> tuple | None:
+        action = payload.get("action")
+        if action not in COALESCED_READ_ACTIONS:
+            return None
         try:
-            envelope_chars = compact_json_size(envelope, ensure_ascii=False)
-        except Exception:
-            envelope_chars = 0
+            body = canonical_json([action, self._request_action_payload(payload)])
+        except (TypeError, ValueError):
+            return None
+        # Mutations and target switches move these epochs, so a read issued afterwards
+        # never joins (or is served from) a read of the previous patch state.
+        workspace_target = _REQUEST_WORKSPACE_TARGET.get()
+        target_id = workspace_target["target_id"] if workspace_target is not None else None
+        return (self.connection_epoch, self._preflight_epoch, self._mutation_epoch, target_id, body)
+
+    def _lookup_read_cache(self, key: tuple) -> dict | None:
+        entry = self._read_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, envelope = entry
+        if time.monotonic() >= expires_at:
+            self._read_cache.pop(key, None)
+            return None
+        return envelope
+
+    def _store_read_cache(self, key: tuple, envelope: dict) -> None:
+        if self.read_cache_ttl_seconds <= 0.0:
+            return
+        now = time.monotonic()
+        for stale_key in [k for k, (expires_at, _) in self._read_cache.items() if expires_at <= now]:
+            self._read_cache.pop(stale_key, None)
+        while len(self._read_cache) >= READ_CACHE_MAX_ENTRIES:
+            self._read_cache.pop(next(iter(self._read_cache)))
+        self._read_cache[key] = (now + self.read_cache_ttl_seconds, envelope)
+
+    def _invalidate_read_cache(self) -> None:
+        self._mutation_epoch += 1
+        self._bump_target_epoch()
+        self._read_cache.clear()
+
+    async def _send_coalesced_read(
+        self,
+        payload: dict,
+        key: tuple,
+        *,
+        timeout_seconds: float,
+        request_deadline: float,
+    ) -> dict:
+        """Serve a read-only request from the brief cache, an identical in-flight read, or the bridge.
+
+        Callers receive their own copy of the response envelope, so one caller editing the
+        results cannot leak into another's.
+        """
+        cached = self._lookup_read_cache(key)
+        if cached is not None:
+            self.read_cache_hits += 1
+            return clone_json_value(cached)
+
+        shared = self._inflight_reads.get(key)
+        if shared is not None:
+            self.read_coalesced_requests += 1
+            remaining = request_deadline - time.monotonic()
+            try:
+                envelope = await asyncio.wait_for(asyncio.shield(shared), max(0.001, remaining))
+            except asyncio.TimeoutError:
+                raise MaxMCPError(
+                    ERROR_BRIDGE_TIMEOUT,
+                    (
+                        "No response received before timeout budget expired "
+                        f"(timeout={timeout_seconds:.3f}s, coalesced with an in-flight read)."
+                    ),
+                    hint="Check bridge health and retry with a higher timeout for large patches.",
+                    recoverable=True,
+                    details={"timeout_seconds_requested": round(timeout_seconds, 6), "coalesced": True},
+                )
+            except asyncio.CancelledError:
+                if not shared.cancelled():
+                    raise
+                # The leading caller was cancelled; issue this read ourselves.
+                return await self._send_coalesced_read(
+                    payload,
+                    key,
+                    timeout_seconds=timeout_seconds,
+                    request_deadline=request_deadline,
+                )
+            return clone_json_value(envelope)
+
+        self.read_bridge_requests += 1
+        shared = asyncio.get_event_loop().create_future()
+        self._inflight_reads[key] = shared
+        try:
+            envelope = await self._dispatch_request(
+                payload,
+                timeout_seconds=timeout_seconds,
+                request_deadline=request_deadline,
+                include_envelope=True,
+            )
+        except asyncio.CancelledError:
+            shared.cancel()
+            raise
+        except BaseException as e:
+            shared.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting on it.
+            shared.exception()
+            raise
+        finally:
+            if self._inflight_reads.get(key) is shared:
+                self._inflight_reads.pop(key, None)
+        snapshot = clone_json_value(envelope)
+        shared.set_result(snapshot)
+        if key[:3] == (self.connection_epoch, self._preflight_epoch, self._mutation_epoch):
+            self._store_read_cache(key, snapshot)
+        return envelope
+
+    async def _dispatch_request(
+        self,
+        payload: dict,
+        *,
+        timeout_seconds: float,
+        request_deadline: float,
+        idempotency_key: str | None = None,
+        include_envelope: bool = False,
+    ):
+        action = payload.get("action")
+        remaining_timeout_seconds = timeout_seconds
+        queue_wait_seconds = 0.0
+        request_id: str | None = None
+
+        if idempotency_key and idempotency_key in self._idempotent_results:
+            cached = self._idempotent_results[idempotency_key]
+            self._push_event(
+                level="info",
+                code="IDEMPOTENCY_CACHE_HIT",
+                message="Served request from idempotency cache.",
+                action=action if isinstance(action, str) else None,
+                details={"idempotency_key": idempotency_key},
+            )
+            if include_envelope:
+                return {
+                    "protocol_version": self.protocol_version,
+                    "request_id": "idempotent-cache-hit",
+                    "state": "succeeded",
+                    "results": cached,
+                    "meta": {"idempotency_cache_hit": True},
+                }
+            return cached
+
+        lane = self._request_lane(payload)
+        mutating = lane == LANE_MUTATION
+        queue_started_at = time.perf_counter()
+        with span("queue_wait", lane=lane):
+            try:
+                queue_wait_seconds = await self._acquire_lane_slots(
+                    lane,
+                    action if isinstance(action, str) else lane,
+                    request_deadline,
+                )
+            except MaxMCPError as e:
+                if isinstance(action, str) and (e.details or {}).get("queue_timeout"):
+                    # Censored sample: the request would have taken at least this long.
+                    self.latency_model.observe(
+                        action,
+                        size_bucket(self._request_size_units(payload)),
+                        (time.perf_counter() - queue_started_at) * 1000.0,
+                    )
+                raise
+        if mutating:
+            self._invalidate_read_cache()
+
+        # Wall-clock deadline so the bridge and Max can drop work nobody is waiting for.
+        deadline_ms = int(
+            (time.time() + max(0.0, request_deadline - time.monotonic())) * 1000
+        )
+        envelope = self._build_request_envelope(
+            payload, idempotency_key=idempotency_key, deadline_ms=deadline_ms
+        )
+        request_id = envelope["request_id"]
+        if self.auth_token:
+            envelope["auth_token"] = self.auth_token
+            envelope["auth"] = {"token": self.auth_token}
+        with span("encode", framing=self.request_framing):
+            frame, frame_bytes = encode_frame(envelope, self.request_framing)
+            if self.request_compression and (
+                (frame_bytes or 0) >= self.compress_min_bytes
+                or (frame_bytes is None and action in COMPRESSIBLE_REQUEST_ACTIONS)
+            ):
+                frame, frame_bytes = self._compress_request_frame(envelope, frame)
         future = asyncio.get_event_loop().create_future()
         self._pending[request_id] = future
         self.total_requests += 1
         self.last_request_at = time.time()
         started_at = time.perf_counter()
+        emitted = False
 
         try:
             remaining_timeout_seconds = request_deadline - time.monotonic()
             if remaining_timeout_seconds <= 0.0:
                 raise asyncio.TimeoutError()
-            await self.sio.emit("request", envelope, namespace=self.namespace)
-            logging.info("Request to MaxMSP: %s", self._redact_sensitive(envelope))
-            response_envelope = await asyncio.wait_for(future, remaining_timeout_seconds)
+            with span("emit", frame_bytes=frame_bytes):
+                await self.sio.emit("request", frame, namespace=self.namespace)
+            emitted = True
+            if frame_bytes is not None:
+                self.frames_sent += 1
+                self.frame_bytes_sent += frame_bytes
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info("Request to MaxMSP: %s", self._redact_sensitive(envelope))
+            awaited_at = time.perf_counter()
+            with span("await_response", request_id=request_id):
+                response_envelope = await asyncio.wait_for(future, remaining_timeout_seconds)
+            self._trace_response_stages(request_id, response_envelope.get("meta"), awaited_at)
             self.last_response_at = time.time()
+            self._record_bridge_queue_depth(response_envelope.get("meta"))
             state = response_envelope.get("state", "succeeded")
+            self._track_envelope_navigation(envelope, action, succeeded=state != "failed")
             duration_ms = (time.perf_counter() - started_at) * 1000.0
             if state == "failed":
                 self.total_failures += 1
@@ -1690,21 +2437,30 @@ class MaxMSPConnection:
                 err_code = err.get("code", ERROR_INTERNAL)
                 err_message = err.get("message", "Bridge request failed.")
                 err_details = err.get("details") if isinstance(err.get("details"), dict) else {}
-                if self._is_dict_transport_failure(err_code, err_message, err_details):
+                if err_code == ERROR_DEADLINE_EXCEEDED:
+                    self.bridge_deadline_rejections += 1
+                transport_failure = self._is_dict_transport_failure(
+                    err_code, err_message, err_details
+                )
+                if transport_failure:
                     self._record_transport_failure(
                         code=err_code,
                         message=err_message,
                         details=err_details,
                     )
-                self._latency_samples.append(
-                    {
-                        "duration_ms": round(duration_ms, 3),
-                        "queue_wait_ms": round(queue_wait_seconds * 1000.0, 3),
-                        "timestamp": time.time(),
-                        "action": action,
-                        "state": "failed",
-                        "code": err_code,
-                    }
+                if mutating and (
+                    transport_failure
+                    or err_code in {ERROR_OVERLOADED, ERROR_DEADLINE_EXCEEDED}
+                ):
+                    self._tune_mutation_concurrency(
+                        "transport_failure" if transport_failure else err_code.lower()
+                    )
+                self._latency.record(
+                    duration_ms=duration_ms,
+                    queue_wait_ms=queue_wait_seconds * 1000.0,
+                    action=action,
+                    lane=lane,
+                    state="failed",
                 )
                 self._push_event(
                     level="error",
@@ -1726,39 +2482,32 @@ class MaxMSPConnection:
             self.consecutive_failures = 0
             self.last_successful_request_at = time.time()
             self._record_transport_success()
-            self._latency_samples.append(
-                {
-                    "duration_ms": round(duration_ms, 3),
-                    "queue_wait_ms": round(queue_wait_seconds * 1000.0, 3),
-                    "timestamp": time.time(),
-                    "action": action,
-                    "state": "succeeded",
-                }
+            if mutating:
+                self._tune_mutation_concurrency()
+            if isinstance(action, str):
+                # Learned budgets cover the whole request, so they include queue wait.
+                self.latency_model.observe(
+                    action,
+                    size_bucket(self._request_size_units(payload)),
+                    duration_ms + queue_wait_seconds * 1000.0,
+                )
+            self._latency.record(
+                duration_ms=duration_ms,
+                queue_wait_ms=queue_wait_seconds * 1000.0,
+                action=action,
+                lane=lane,
             )
             results = response_envelope.get("results")
-            if isinstance(action, str) and action in {
-                "set_workspace_target",
-                "enter_subpatcher",
-                "exit_subpatcher",
-                "apply_topology_snapshot",
-                "apply_topology_snapshot_progressive",
-            }:
+            if isinstance(action, str) and action in PREFLIGHT_EPOCH_ACTIONS:
                 self._preflight_epoch += 1
+                self._bump_target_epoch()
             if idempotency_key:
                 self._cache_idempotent_result(idempotency_key, results)
-            if self.runtime_manager and isinstance(action, str):
-                try:
-                    await self.runtime_manager.after_successful_action(
-                        action,
-                        payload,
-                        results,
-                    )
-                except Exception as e:
-                    logging.warning(f"Post-action twin sync failed for '{action}': {e}")
-            if include_envelope:
-                return response_envelope
-            return results
         except asyncio.TimeoutError:
+            if emitted:
+                await self._send_cancel(request_id, reason="timeout")
+            if mutating:
+                self._tune_mutation_concurrency("timeout")
             self.total_timeouts += 1
             self.total_failures += 1
             self.consecutive_failures += 1
@@ -1768,15 +2517,19 @@ class MaxMSPConnection:
             if isinstance(action, str):
                 self.action_timeout_counts[action] += 1
                 self.action_failure_counts[action] += 1
-            self._latency_samples.append(
-                {
-                    "duration_ms": round(duration_ms, 3),
-                    "queue_wait_ms": round(queue_wait_seconds * 1000.0, 3),
-                    "timestamp": time.time(),
-                    "action": action,
-                    "state": "timeout",
-                    "code": ERROR_BRIDGE_TIMEOUT,
-                }
+                # Censored sample: the true latency is at least the budget that ran out,
+                # whether it was spent queued or waiting on the bridge.
+                self.latency_model.observe(
+                    action,
+                    size_bucket(self._request_size_units(payload)),
+                    duration_ms + queue_wait_seconds * 1000.0,
+                )
+            self._latency.record(
+                duration_ms=duration_ms,
+                queue_wait_ms=queue_wait_seconds * 1000.0,
+                action=action,
+                lane=lane,
+                state="timeout",
             )
             self._push_event(
                 level="warn",
@@ -1789,7 +2542,8 @@ class MaxMSPConnection:
                 action=action if isinstance(action, str) else None,
                 request_id=request_id,
                 details={
-                    "payload_chars": envelope_chars,
+                    "payload_chars": self._envelope_size(envelope),
+                    "frame_bytes": frame_bytes,
                     "timeout_seconds_requested": round(timeout_seconds, 6),
                     "timeout_seconds_dispatch_budget": round(
                         max(0.0, remaining_timeout_seconds), 6
@@ -1814,6 +2568,13 @@ class MaxMSPConnection:
                     "queue_wait_ms": round(queue_wait_seconds * 1000.0, 3),
                 },
             )
+        except asyncio.CancelledError:
+            if emitted and request_id in self._pending:
+                # The caller is gone; tell the bridge without delaying the cancellation.
+                task = asyncio.ensure_future(self._send_cancel(request_id, reason="cancelled"))
+                self._cancel_tasks.add(task)
+                task.add_done_callback(self._cancel_tasks.discard)
+            raise
         except MaxMCPError:
             raise
         except Exception as e:
@@ -1822,6 +2583,8 @@ class MaxMSPConnection:
             self.last_failed_request_at = time.time()
             if isinstance(action, str):
                 self.action_failure_counts[action] += 1
+            if mutating:
+                self._tune_mutation_concurrency("transport_failure")
             self._push_event(
                 level="error",
                 code=ERROR_INTERNAL,
@@ -1837,8 +2600,356 @@ class MaxMSPConnection:
             )
         finally:
             self._pending.pop(request_id, None)
-            if acquired_mutation_slot:
-                await self._release_mutation_slot()
+            self._response_timings.pop(request_id, None)
+            if mutating:
+                # Reads that overlapped this mutation may have seen either state.
+                self._invalidate_read_cache()
+            await self._release_lane_slots(lane)
+
+        # The twin hook may issue its own reads, so it runs only once this request's
+        # lane and bridge slots are free again.
+        if self.runtime_manager and isinstance(action, str):
+            try:
+                with span("twin_sync"):
+                    await self.runtime_manager.after_successful_action(
+                        action,
+                        payload,
+                        results,
+                        meta=response_envelope.get("meta"),
+                    )
+            except Exception as e:
+                logging.warning(f"Post-action twin sync failed for '{action}': {e}")
+        if include_envelope:
+            return response_envelope
+        return results
+
+    def _trace_response_stages(self, request_id: str, meta: Any, awaited_at: float) -> None:
+        """Lay the bridge's echoed stage timings and local decoding out on the current trace.
+
+        The bridge reports durations only, so its stages are placed back to back from
+        the start of the wait and clamped to it.
+        """
+        timings = self._response_timings.pop(request_id, None)
+        finished_at = timings[0] if timings is not None else time.perf_counter()
+        bridge = meta.get("bridge_timings") if isinstance(meta, dict) else None
+        if isinstance(bridge, dict):
+            cursor = awaited_at
+            for stage in ("handoff_ms", "max_ms"):
+                value = bridge.get(stage)
+                if not isinstance(value, (int, float)) or value < 0:
+                    continue
+                end = min(finished_at, cursor + value / 1000.0)
+                add_span(f"bridge.{stage[:-3]}", cursor, end, category="bridge", reported_ms=value)
+                if stage == "max_ms":
+                    execute_ms = meta.get("max_execute_ms")
+                    if isinstance(execute_ms, (int, float)) and execute_ms >= 0:
+                        add_span(
+                            "max.execute",
+                            max(cursor, end - execute_ms / 1000.0),
+                            end,
+                            category="bridge",
+                            reported_ms=execute_ms,
+                        )
+                cursor = end
+        if timings is not None:
+            add_span("decode_response", timings[0], timings[1])
+
+    def traces_snapshot(self, *, limit: int = 20) -> dict:
+        traces = self.tracer.recent(limit)
+        return {
+            "enabled": self.tracer.enabled,
+            "count": len(traces),
+            "traces": [trace.to_dict() for trace in traces],
+        }
+
+    def load_latency_model(self, path: Path) -> int:
+        """Attach the persisted latency model file and restore it; returns windows loaded."""
+        self.latency_model_file = path
+        if not path.exists():
+            return 0
+        try:
+            return self.latency_model.load_state(read_json_file(path))
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable latency model {path}: {e}")
+            return 0
+
+    def persist_latency_model(self) -> None:
+        if self.latency_model_file is None or not self.latency_model.dirty:
+            return
+        try:
+            self.latency_model_file.parent.mkdir(parents=True, exist_ok=True)
+            write_json_file(self.latency_model_file, self.latency_model.to_state())
+            self.latency_model.dirty = False
+        except Exception as e:
+            logging.warning(f"Failed to persist latency model: {e}")
+
+    def timeouts_snapshot(self) -> dict:
+        return {
+            "adaptive": self.adaptive_timeouts,
+            "applied": self.adaptive_timeouts_applied,
+            "model_file": str(self.latency_model_file) if self.latency_model_file else None,
+            **self.latency_model.snapshot(),
+        }
+
+    async def _send_cancel(self, request_id: str, *, reason: str) -> None:
+        """Best-effort notice that nobody is waiting for ``request_id`` any more."""
+        message = {
+            "protocol_version": self.protocol_version,
+            "request_id": request_id,
+            "reason": reason,
+        }
+        if self.auth_token:
+            message["auth_token"] = self.auth_token
+        try:
+            await self.sio.emit(REQUEST_CANCEL_EVENT, message, namespace=self.namespace)
+        except Exception as e:
+            self.cancel_failures += 1
+            logging.debug(f"Failed to send cancel for request {request_id}: {e}")
+            return
+        self.cancels_sent += 1
+
+    def _compress_request_frame(self, envelope: dict, frame: Any) -> tuple[Any, int | None]:
+        started = time.perf_counter()
+        compressed = compress_frame(envelope, frame, self.request_framing, self.request_compression)
+        if compressed["raw_bytes"] < self.compress_min_bytes:
+            # Only reachable for JSON topology requests that turned out small.
+            return frame, None
+        wire_bytes = len(compressed["data"])
+        self._record_compression(
+            "sent",
+            raw_bytes=compressed["raw_bytes"],
+            wire_bytes=wire_bytes,
+            seconds=time.perf_counter() - started,
+        )
+        return compressed, wire_bytes
+
+    def _record_compression(
+        self, direction: str, *, raw_bytes: int, wire_bytes: int, seconds: float
+    ) -> None:
+        stats = self.compression_stats[direction]
+        stats["frames"] += 1
+        stats["raw_bytes"] += raw_bytes
+        stats["wire_bytes"] += wire_bytes
+        stats["seconds"] += seconds
+
+    def compression_snapshot(self) -> dict:
+        snapshot: dict[str, Any] = {
+            "mode": self.request_compression or "off",
+            "offered": list(self.offered_compressions),
+            "min_bytes": self.compress_min_bytes,
+        }
+        for direction, stats in self.compression_stats.items():
+            raw_bytes = stats["raw_bytes"]
+            snapshot[direction] = {
+                "frames": stats["frames"],
+                "raw_bytes": raw_bytes,
+                "wire_bytes": stats["wire_bytes"],
+                "ratio": round(stats["wire_bytes"] / raw_bytes, 4) if raw_bytes else None,
+                "total_ms": round(stats["seconds"] * 1000.0, 3),
+            }
+        return snapshot
+
+    @staticmethod
+    def _envelope_size(envelope: dict) -> int:
+        try:
+            return compact_json_size(envelope, ensure_ascii=False)
+        except Exception:
+            return 0
+
+    def _normalize_batch_items(self, items: Any) -> list[dict]:
+        if not isinstance(items, list) or not items:
+            raise MaxMCPError(
+                ERROR_VALIDATION,
+                "Batch items must be a non-empty list of request payloads.",
+                recoverable=False,
+                details={"items_type": str(type(items))},
+            )
+        if len(items) > self.batch_max_items:
+            raise MaxMCPError(
+                ERROR_VALIDATION,
+                f"Batch exceeds the maximum of {self.batch_max_items} items.",
+                hint="Split the batch or raise MAXMCP_BATCH_MAX_ITEMS.",
+                recoverable=False,
+                details={"item_count": len(items), "max_items": self.batch_max_items},
+            )
+        normalized: list[dict] = []
+        for index, item in enumerate(items):
+            action = item.get("action") if isinstance(item, dict) else None
+            if not isinstance(action, str) or not action:
+                raise MaxMCPError(
+                    ERROR_VALIDATION,
+                    "Each batch item must be a dictionary with an 'action'.",
+                    recoverable=False,
+                    details={"index": index},
+                )
+            if action == BATCH_BRIDGE_ACTION:
+                raise MaxMCPError(
+                    ERROR_VALIDATION,
+                    "Batch items cannot contain nested batch requests.",
+                    recoverable=False,
+                    details={"index": index},
+                )
+            normalized.append(
+                {"action": action, "payload": self._request_action_payload(item)}
+            )
+        return normalized
+
+    def _bridge_supports_batch(self) -> bool:
+        supported = self.capabilities.get("supported_actions")
+        return isinstance(supported, list) and BATCH_BRIDGE_ACTION in supported
+
+    @staticmethod
+    def _batch_summary(items: list[dict], *, batched: bool) -> dict:
+        succeeded = sum(1 for item in items if item.get("success"))
+        skipped = sum(1 for item in items if item.get("skipped"))
+        failed = len(items) - succeeded - skipped
+        return {
+            "success": failed == 0 and skipped == 0,
+            "batched": batched,
+            "item_count": len(items),
+            "succeeded": succeeded,
+            "failed": failed,
+            "skipped": skipped,
+            "items": items,
+        }
+
+    @staticmethod
+    def _skipped_batch_item(index: int, action: str) -> dict:
+        return {
+            "index": index,
+            "action": action,
+            "success": False,
+            "skipped": True,
+            "error": {
+                "code": ERROR_PRECONDITION,
+                "message": "Skipped after an earlier batch item failed.",
+                "recoverable": True,
+                "details": {},
+            },
+        }
+
+    async def _send_batch_sequential(
+        self,
+        items: list[dict],
+        normalized: list[dict],
+        *,
+        deadline: float | None,
+        stop_on_error: bool,
+    ) -> dict:
+        self.batch_sequential_fallbacks += 1
+        outcomes: list[dict] = []
+        halted = False
+        for index, item in enumerate(items):
+            action = normalized[index]["action"]
+            if halted:
+                outcomes.append(self._skipped_batch_item(index, action))
+                continue
+            item_timeout = None
+            if deadline is not None:
+                item_timeout = max(0.001, deadline - time.monotonic())
+            try:
+                results = await self.send_request(item, timeout=item_timeout)
+                outcomes.append(
+                    {"index": index, "action": action, "success": True, "results": results}
+                )
+            except MaxMCPError as e:
+                self.batch_item_failures += 1
+                outcomes.append(
+                    {"index": index, "action": action, "success": False, "error": e.to_dict()}
+                )
+                halted = stop_on_error
+        return self._batch_summary(outcomes, batched=False)
+
+    async def send_batch(
+        self,
+        items: list[dict],
+        timeout: float | None = None,
+        *,
+        stop_on_error: bool = False,
+        idempotency_key: str | None = None,
+    ) -> dict:
+        """Send several bridge actions in one request envelope.
+
+        Items use the same shape as ``send_request`` payloads. Item failures do not
+        fail the batch: each entry carries its own result or error, and
+        ``stop_on_error`` marks the remainder as skipped. Bridges that do not
+        advertise the ``batch`` action are served with sequential requests.
+        """
+        normalized = self._normalize_batch_items(items)
+        deadline = time.monotonic() + float(timeout) if timeout is not None else None
+
+        await self.ensure_connected()
+        if self.strict_capability_gating and not self.capabilities:
+            await self.refresh_capabilities()
+        for item in normalized:
+            self._enforce_capabilities(item["action"])
+        self.batch_requests += 1
+        self.batch_items_total += len(normalized)
+        if not self._bridge_supports_batch():
+            return await self._send_batch_sequential(
+                items,
+                normalized,
+                deadline=deadline,
+                stop_on_error=stop_on_error,
+            )
+
+        batch_timeout = (
+            max(0.001, deadline - time.monotonic())
+            if deadline is not None
+            else sum(self._default_timeout_for_action(item["action"], item) for item in normalized)
+        )
+        results = await self.send_request(
+            {
+                "action": BATCH_BRIDGE_ACTION,
+                "payload": {"items": normalized, "stop_on_error": bool(stop_on_error)},
+            },
+            timeout=batch_timeout,
+            idempotency_key=idempotency_key,
+        )
+        reported = results.get("items") if isinstance(results, dict) else None
+        if not isinstance(reported, list):
+            reported = []
+
+        outcomes: list[dict] = []
+        for index, item in enumerate(normalized):
+            action = item["action"]
+            entry = reported[index] if index < len(reported) else None
+            state = entry.get("state") if isinstance(entry, dict) else None
+            self.action_request_counts[action] += 1
+            if state == "succeeded":
+                item_results = entry.get("results")
+                outcomes.append(
+                    {"index": index, "action": action, "success": True, "results": item_results}
+                )
+                if action in PREFLIGHT_EPOCH_ACTIONS:
+                    self._preflight_epoch += 1
+                    self._bump_target_epoch()
+                if self.runtime_manager:
+                    try:
+                        await self.runtime_manager.after_successful_action(
+                            action,
+                            items[index],
+                            item_results,
+                            meta=entry.get("meta"),
+                        )
+                    except Exception as e:
+                        logging.warning(f"Post-action twin sync failed for '{action}': {e}")
+                continue
+            if state == "skipped":
+                outcomes.append(self._skipped_batch_item(index, action))
+                continue
+            err = entry.get("error") if isinstance(entry, dict) else None
+            if not isinstance(err, dict):
+                err = {
+                    "code": ERROR_INTERNAL,
+                    "message": "Bridge did not report a result for this batch item.",
+                    "recoverable": True,
+                    "details": {},
+                }
+            self.action_failure_counts[action] += 1
+            self.batch_item_failures += 1
+            outcomes.append({"index": index, "action": action, "success": False, "error": err})
+        return self._batch_summary(outcomes, batched=True)
 
     async def start_server(self) -> bool:
         """IMPORTANT: This method should only be called ONCE per application instance.
@@ -1853,9 +2964,18 @@ class MaxMSPConnection:
             self.node_hello_seen = False
             self.node_hello_at = None
             self.node_hello_payload = {}
-            connect_kwargs: dict[str, Any] = {"namespaces": [self.namespace]}
+            self.request_framing = FRAMING_JSON
+            self.request_compression = None
+            connect_kwargs: dict[str, Any] = {
+                "namespaces": [self.namespace],
+                "auth": {
+                    "framings": list(self.offered_framings),
+                    "compressions": list(self.offered_compressions),
+                    "compress_min_bytes": self.compress_min_bytes,
+                },
+            }
             if self.auth_token:
-                connect_kwargs["auth"] = {"token": self.auth_token}
+                connect_kwargs["auth"]["token"] = self.auth_token
                 connect_kwargs["headers"] = {"x-maxmcp-token": self.auth_token}
             await self.sio.connect(full_url, **connect_kwargs)
             self.last_connect_error = None
@@ -2006,17 +3126,8 @@ class MaxMSPConnection:
         include_events: bool = False,
         event_limit: int = 25,
     ) -> dict:
-        latency_samples = list(self._latency_samples)
-        durations = [
-            float(sample.get("duration_ms", 0.0))
-            for sample in latency_samples
-            if isinstance(sample, dict)
-        ]
-        queue_waits = [
-            float(sample.get("queue_wait_ms", 0.0))
-            for sample in latency_samples
-            if isinstance(sample, dict)
-        ]
+        durations = self._latency.durations
+        queue_waits = self._latency.queue_waits
 
         action_stats = {}
         for action_name in sorted(self.action_request_counts.keys()):
@@ -2030,6 +3141,13 @@ class MaxMSPConnection:
                 "failed": failed,
                 "timeouts": timeouts,
             }
+            histogram = self._latency.by_action.get(action_name)
+            if histogram is not None:
+                action_stats[action_name]["latency_ms"] = {
+                    "p50": histogram.percentile(0.50),
+                    "p95": histogram.percentile(0.95),
+                    "p99": histogram.percentile(0.99),
+                }
 
         snapshot = {
             "protocol_version": self.protocol_version,
@@ -2037,18 +3155,21 @@ class MaxMSPConnection:
             "total_successes": self.total_successes,
             "total_failures": self.total_failures,
             "total_timeouts": self.total_timeouts,
-            "latency_samples": len(latency_samples),
+            "latency_samples": self._latency.count,
             "latency_ms": {
-                "p50": self._percentile(durations, 0.50),
-                "p95": self._percentile(durations, 0.95),
-                "p99": self._percentile(durations, 0.99),
-                "max": max(durations) if durations else None,
+                "p50": durations.percentile(0.50),
+                "p95": durations.percentile(0.95),
+                "p99": durations.percentile(0.99),
+                "max": durations.max,
+            },
+            "latency_ms_by_lane": {
+                lane: histogram.summary() for lane, histogram in self._latency.by_lane.items()
             },
             "queue_wait_ms": {
-                "p50": self._percentile(queue_waits, 0.50),
-                "p95": self._percentile(queue_waits, 0.95),
-                "p99": self._percentile(queue_waits, 0.99),
-                "max": max(queue_waits) if queue_waits else None,
+                "p50": queue_waits.percentile(0.50),
+                "p95": queue_waits.percentile(0.95),
+                "p99": queue_waits.percentile(0.99),
+                "max": queue_waits.max,
                 "total_seconds": round(self.total_mutation_queue_wait_seconds, 6),
             },
             "mutation_queue": {
@@ -2059,7 +3180,13 @@ class MaxMSPConnection:
                 "max_depth_seen": self.max_queue_depth_seen,
                 "rejections": self.mutation_queue_rejections,
                 "timeouts": self.mutation_queue_timeouts,
+                "adaptive": {
+                    "enabled": self.mutation_aimd_enabled,
+                    "bridge_queue_depth": self.bridge_queue_depth,
+                    **self._mutation_concurrency.snapshot(),
+                },
             },
+            "lanes": self.lane_snapshot(),
             "preflight": {
                 "mode": MAXMCP_PREFLIGHT_MODE,
                 "cache_seconds": MAXMCP_PREFLIGHT_CACHE_SECONDS,
@@ -2074,8 +3201,53 @@ class MaxMSPConnection:
                 "timeout_seconds": MAXMCP_WORKSPACE_CAPTURE_TIMEOUT_SECONDS,
                 "retries": MAXMCP_WORKSPACE_CAPTURE_RETRIES,
                 "backoff_seconds": MAXMCP_WORKSPACE_CAPTURE_BACKOFF_SECONDS,
+                "page_size": MAXMCP_WORKSPACE_CAPTURE_PAGE_SIZE,
+                "pages": self.workspace_capture_pages,
                 "timeouts": self.workspace_capture_timeouts,
                 "retry_attempts": self.workspace_capture_retries,
+                "restarts": self.workspace_capture_restarts,
+            },
+            "batch": {
+                "max_items": self.batch_max_items,
+                "requests": self.batch_requests,
+                "items": self.batch_items_total,
+                "item_failures": self.batch_item_failures,
+                "sequential_fallbacks": self.batch_sequential_fallbacks,
+            },
+            "topology_cache": (
+                self.runtime_manager.topology_cache_snapshot()
+                if self.runtime_manager is not None
+                else None
+            ),
+            "workspace_activation": (
+                self.runtime_manager.workspace_activation_snapshot()
+                if self.runtime_manager is not None
+                else None
+            ),
+            "read_coalescing": {
+                "cache_ttl_seconds": self.read_cache_ttl_seconds,
+                "bridge_requests": self.read_bridge_requests,
+                "coalesced": self.read_coalesced_requests,
+                "cache_hits": self.read_cache_hits,
+                "inflight": len(self._inflight_reads),
+                "cached_entries": len(self._read_cache),
+            },
+            "framing": {
+                "mode": self.request_framing,
+                "offered": list(self.offered_framings),
+                "frames_sent": self.frames_sent,
+                "frame_bytes_sent": self.frame_bytes_sent,
+                "frames_received": self.frames_received,
+                "frame_bytes_received": self.frame_bytes_received,
+                "decode_failures": self.frame_decode_failures,
+            },
+            "compression": self.compression_snapshot(),
+            "timeouts": self.timeouts_snapshot(),
+            "deadlines": {
+                "cancels_sent": self.cancels_sent,
+                "cancel_failures": self.cancel_failures,
+                "late_responses": self.late_responses,
+                "bridge_deadline_rejections": self.bridge_deadline_rejections,
             },
             "transport_handoff": self._extract_transport_handoff_metrics(self.transport_health),
             "actions": action_stats,
@@ -2101,61 +3273,26 @@ class MaxMSPConnection:
         bounded_window = max(30.0, float(window_seconds or self.alert_window_seconds))
         threshold = now - bounded_window
         bounded_points = max(4, min(int(max_points), 1000))
-        samples = [
-            sample
-            for sample in self._latency_samples
-            if isinstance(sample, dict) and float(sample.get("timestamp", 0.0)) >= threshold
-        ]
-        durations = [
-            float(sample.get("duration_ms", 0.0))
-            for sample in samples
-            if isinstance(sample.get("duration_ms"), (int, float))
-        ]
-        queue_waits = [
-            float(sample.get("queue_wait_ms", 0.0))
-            for sample in samples
-            if isinstance(sample.get("queue_wait_ms"), (int, float))
-        ]
-
-        request_count = len(samples)
-        success_count = 0
-        failure_count = 0
-        timeout_count = 0
-        action_counts: dict[str, dict[str, int]] = {}
-        for sample in samples:
-            state = str(sample.get("state", "") or "")
-            action = str(sample.get("action", "unknown") or "unknown")
-            row = action_counts.setdefault(
-                action,
-                {"requests": 0, "succeeded": 0, "failed": 0, "timeouts": 0},
-            )
-            row["requests"] += 1
-            if state == "succeeded":
-                success_count += 1
-                row["succeeded"] += 1
-            elif state == "timeout":
-                timeout_count += 1
-                failure_count += 1
-                row["timeouts"] += 1
-                row["failed"] += 1
-            elif state == "failed":
-                failure_count += 1
-                row["failed"] += 1
-
+        window = self._rolling_window(bounded_window, now)
+        short_window = self._rolling_window(self.alert_short_window_seconds, now)
+        durations = window.durations
+        queue_waits = window.queue_waits
+
+        request_count = window.requests
+        success_count = window.successes
+        failure_count = window.failures
+        timeout_count = window.timeouts
+        action_counts = {action: dict(counts) for action, counts in window.actions.items()}
         failure_rate = (failure_count / request_count) if request_count else 0.0
         timeout_rate = (timeout_count / request_count) if request_count else 0.0
-        p95_latency = self._percentile(durations, 0.95)
-        p99_latency = self._percentile(durations, 0.99)
-        p95_queue_wait = self._percentile(queue_waits, 0.95)
+        p95_latency = durations.percentile(0.95)
+        p99_latency = durations.percentile(0.99)
+        p95_queue_wait = queue_waits.percentile(0.95)
         queue_capacity = max(1, self.mutation_max_queue)
         queue_depth_ratio = self._queued_mutation_requests / queue_capacity
         handoff = self._extract_transport_handoff_metrics(self.transport_health)
 
-        burn_rate = (
-            failure_rate / max(0.000001, float(self.alert_failure_rate))
-            if request_count
-            else 0.0
-        )
+        burn_rate = self._burn_rate(window)
         budget_remaining = max(0.0, 1.0 - burn_rate)
         objectives = {
             "failure_rate_max": float(self.alert_failure_rate),
@@ -2209,21 +3346,23 @@ class MaxMSPConnection:
                 "timeout_rate": round(timeout_rate, 6),
             },
             "latency_ms": {
-                "p50": self._percentile(durations, 0.50),
+                "p50": durations.percentile(0.50),
                 "p95": p95_latency,
                 "p99": p99_latency,
-                "max": max(durations) if durations else None,
+                "max": durations.max,
             },
             "queue_wait_ms": {
-                "p50": self._percentile(queue_waits, 0.50),
+                "p50": queue_waits.percentile(0.50),
                 "p95": p95_queue_wait,
-                "p99": self._percentile(queue_waits, 0.99),
-                "max": max(queue_waits) if queue_waits else None,
+                "p99": queue_waits.percentile(0.99),
+                "max": queue_waits.max,
             },
             "queue_depth_ratio": round(queue_depth_ratio, 6),
             "error_budget": {
                 "burn_rate": round(burn_rate, 6),
                 "remaining_ratio": round(budget_remaining, 6),
+                "short_window_seconds": self.alert_short_window_seconds,
+                "short_burn_rate": round(self._burn_rate(short_window), 6),
             },
             "objectives": objectives,
             "objective_breaches": objective_breaches,
@@ -2234,56 +3373,275 @@ class MaxMSPConnection:
 
         if include_series:
             bucket_width = max(1.0, bounded_window / float(bounded_points))
-            buckets: dict[int, dict[str, Any]] = {}
-            for sample in samples:
-                timestamp = float(sample.get("timestamp", 0.0))
-                idx = int(max(0.0, (timestamp - threshold)) // bucket_width)
-                row = buckets.setdefault(
-                    idx,
-                    {
-                        "timestamps": [],
-                        "durations": [],
-                        "queue_waits": [],
-                        "requests": 0,
-                        "failures": 0,
-                    },
-                )
-                row["timestamps"].append(timestamp)
-                row["requests"] += 1
-                duration = sample.get("duration_ms")
-                if isinstance(duration, (int, float)):
-                    row["durations"].append(float(duration))
-                wait = sample.get("queue_wait_ms")
-                if isinstance(wait, (int, float)):
-                    row["queue_waits"].append(float(wait))
-                if str(sample.get("state", "")) in {"failed", "timeout"}:
-                    row["failures"] += 1
-
+            buckets = self._latency.series(threshold, bucket_width)
+            bucket_width = max(self._latency.slice_seconds, bucket_width)
             series: list[dict[str, Any]] = []
             for idx in sorted(buckets.keys()):
                 bucket = buckets[idx]
-                durations_bucket = bucket["durations"]
-                waits_bucket = bucket["queue_waits"]
                 series.append(
                     {
                         "bucket_index": idx,
                         "timestamp_start_epoch": threshold + (idx * bucket_width),
                         "timestamp_end_epoch": threshold + ((idx + 1) * bucket_width),
-                        "requests": bucket["requests"],
-                        "failures": bucket["failures"],
+                        "requests": bucket.requests,
+                        "failures": bucket.failures,
                         "failure_rate": (
-                            round(bucket["failures"] / bucket["requests"], 6)
-                            if bucket["requests"]
+                            round(bucket.failures / bucket.requests, 6)
+                            if bucket.requests
                             else 0.0
                         ),
-                        "p95_latency_ms": self._percentile(durations_bucket, 0.95),
-                        "p95_queue_wait_ms": self._percentile(waits_bucket, 0.95),
+                        "p95_latency_ms": bucket.durations.percentile(0.95),
+                        "p95_queue_wait_ms": bucket.queue_waits.percentile(0.95),
                     }
                 )
             report["series"] = series
 
         return report
 
+    def write_openmetrics(self, writer: MetricsWriter) -> None:
+        """Export connection metrics from in-process counters; never touches the bridge."""
+        writer.gauge(
+            "bridge_connected",
+            bool(self.sio.connected),
+            "Socket.IO bridge connection state.",
+        )
+        writer.counter("bridge_connections", self.connection_epoch, "Bridge (re)connections.")
+        writer.gauge(
+            "transport_failure_streak",
+            self.transport_failure_streak,
+            "Consecutive bridge transport failures.",
+        )
+        writer.counter("requests", self.total_requests, "Bridge requests sent.")
+        writer.counter("request_successes", self.total_successes, "Bridge requests that succeeded.")
+        writer.counter("request_failures", self.total_failures, "Bridge requests that failed.")
+        writer.counter("request_timeouts", self.total_timeouts, "Bridge requests that timed out.")
+        for action_name, total in sorted(self.action_request_counts.items()):
+            labels = {"action": action_name}
+            writer.counter("action_requests", total, "Bridge requests by action.", labels)
+            writer.counter(
+                "action_failures",
+                self.action_failure_counts.get(action_name, 0),
+                "Failed bridge requests by action.",
+                labels,
+            )
+            writer.counter(
+                "action_timeouts",
+                self.action_timeout_counts.get(action_name, 0),
+                "Timed-out bridge requests by action.",
+                labels,
+            )
+        writer.latency_histogram(
+            "request_duration_seconds", self._latency.durations, "Bridge request latency."
+        )
+        for action_name, histogram in sorted(self._latency.by_action.items()):
+            writer.latency_histogram(
+                "action_request_duration_seconds",
+                histogram,
+                "Bridge request latency by action.",
+                {"action": action_name},
+            )
+        for lane, histogram in sorted(self._latency.by_lane.items()):
+            writer.latency_histogram(
+                "lane_request_duration_seconds",
+                histogram,
+                "Bridge request latency by scheduling lane.",
+                {"lane": lane},
+            )
+        writer.latency_histogram(
+            "queue_wait_seconds",
+            self._latency.queue_waits,
+            "Time requests spent queued for a slot.",
+        )
+
+        for lane in LANE_PRIORITIES:
+            scheduler = self._lane_schedulers[lane]
+            labels = {"lane": lane}
+            writer.gauge(
+                "lane_inflight",
+                scheduler.inflight,
+                "Requests holding a lane slot.",
+                labels,
+            )
+            writer.gauge(
+                "lane_queued",
+                scheduler.queued,
+                "Requests waiting for a lane slot.",
+                labels,
+            )
+            writer.gauge("lane_max_inflight", scheduler.max_inflight, "Lane slot limit.", labels)
+            writer.counter(
+                "lane_rejections",
+                self.lane_rejections.get(lane, 0),
+                "Lane queue rejections.",
+                labels,
+            )
+        writer.gauge(
+            "mutation_inflight",
+            self._inflight_mutation_requests,
+            "Mutations holding a slot.",
+        )
+        writer.gauge(
+            "mutation_queued",
+            self._queued_mutation_requests,
+            "Mutations waiting for a slot.",
+        )
+        writer.gauge(
+            "mutation_max_inflight",
+            self.mutation_max_inflight,
+            "Current mutation concurrency limit.",
+        )
+        writer.gauge("mutation_max_queue", self.mutation_max_queue, "Mutation queue capacity.")
+        writer.gauge(
+            "mutation_max_depth_seen",
+            self.max_queue_depth_seen,
+            "Deepest mutation queue seen.",
+        )
+        writer.counter(
+            "mutation_rejections",
+            self.mutation_queue_rejections,
+            "Mutation queue rejections.",
+        )
+        writer.counter(
+            "mutation_queue_timeouts",
+            self.mutation_queue_timeouts,
+            "Mutation queue wait timeouts.",
+        )
+        writer.counter(
+            "mutation_concurrency_increases",
+            self._mutation_concurrency.increases,
+            "Adaptive mutation concurrency increases.",
+        )
+        writer.counter(
+            "mutation_concurrency_decreases",
+            self._mutation_concurrency.decreases,
+            "Adaptive mutation concurrency decreases.",
+        )
+
+        writer.counter(
+            "read_bridge_requests",
+            self.read_bridge_requests,
+            "Reads sent to the bridge.",
+        )
+        writer.counter(
+            "read_coalesced",
+            self.read_coalesced_requests,
+            "Reads joined to an inflight read.",
+        )
+        writer.counter(
+            "read_cache_hits",
+            self.read_cache_hits,
+            "Reads answered from the read cache.",
+        )
+        writer.counter("frames_sent", self.frames_sent, "Binary frames sent.")
+        writer.counter("frame_sent_bytes", self.frame_bytes_sent, "Binary frame bytes sent.")
+        writer.counter("frames_received", self.frames_received, "Binary frames received.")
+        writer.counter(
+            "frame_received_bytes",
+            self.frame_bytes_received,
+            "Binary frame bytes received.",
+        )
+        writer.counter(
+            "cancels_sent",
+            self.cancels_sent,
+            "Cancellations sent for abandoned requests.",
+        )
+        writer.counter(
+            "late_responses",
+            self.late_responses,
+            "Responses that arrived after their request ended.",
+        )
+        writer.counter(
+            "bridge_deadline_rejections",
+            self.bridge_deadline_rejections,
+            "Requests the bridge rejected past their deadline.",
+        )
+
+        alerts, rolling = self._compute_alerts()
+        window_labels = {"window_seconds": rolling["window_seconds"]}
+        writer.gauge(
+            "rolling_requests",
+            rolling["request_count"],
+            "Requests in the alert window.",
+            window_labels,
+        )
+        writer.gauge(
+            "rolling_failure_rate",
+            rolling["failure_rate"],
+            "Failure rate in the alert window.",
+            window_labels,
+        )
+        writer.gauge(
+            "rolling_p95_latency_seconds",
+            None if rolling["p95_latency_ms"] is None else rolling["p95_latency_ms"] / 1000.0,
+            "p95 latency in the alert window.",
+            window_labels,
+        )
+        writer.gauge(
+            "error_budget_burn_rate",
+            rolling["burn_rate"],
+            "Error budget burn rate.",
+            window_labels,
+        )
+        writer.gauge(
+            "error_budget_burn_rate",
+            rolling["short_burn_rate"],
+            "Error budget burn rate.",
+            {"window_seconds": rolling["short_window_seconds"]},
+        )
+        for alert in alerts:
+            writer.gauge(
+                "alert_active",
+                1,
+                "Active bridge alerts.",
+                {"code": alert["code"], "severity": alert["severity"]},
+            )
+
+
+class _PatchTwin:
+    """Digital twin state for one workspace target."""
+
+    __slots__ = (
+        "model",
+        "baseline_hash",
+        "last_live_hash",
+        "hash_stale",
+        "live_epoch",
+        "last_sync_at",
+        "last_check_at",
+        "last_error",
+        "last_reason",
+        "object_count",
+        "connection_count",
+        "live_object_count",
+        "live_connection_count",
+        "last_drift",
+    )
+
+    def __init__(self) -> None:
+        self.model: MutableTopology | None = None
+        self.baseline_hash: str | None = None
+        self.last_live_hash: str | None = None
+        self.hash_stale = False
+        # Topology epoch at which the model last matched a live capture.
+        self.live_epoch: tuple | None = None
+        self.last_sync_at: float | None = None
+        self.last_check_at: float | None = None
+        self.last_error: str | None = None
+        self.last_reason: str | None = None
+        self.object_count = 0
+        self.connection_count = 0
+        self.live_object_count = 0
+        self.live_connection_count = 0
+        self.last_drift: bool | None = None
+
+    def refresh_baseline(self) -> None:
+        # Deltas only mark the baseline stale; the Merkle root is refreshed when someone
+        # reads it, rehashing just the buckets the deltas touched.
+        if not self.hash_stale or self.model is None:
+            return
+        self.baseline_hash, self.object_count, self.connection_count = self.model.digest_counts()
+        self.hash_stale = False
+
 
 class MaxRuntimeManager:
     """Managed runtime layer that keeps Max and the bridge patch available."""
@@ -2309,26 +3667,47 @@ class MaxRuntimeManager:
         if self.enforce_patch_roots and not configured_roots:
             configured_roots = [Path(current_dir).resolve(), self.session_dir.resolve()]
         self.allowed_patch_roots = configured_roots
-        self.active_target = "host"
-        self.active_project_id: str | None = None
-        self.active_workspace_id: str | None = None
+        self._active_target = "host"
+        self._active_project_id: str | None = None
+        self._active_workspace_id: str | None = None
         self.projects: dict[str, dict] = {}
         self._workspace_lock = asyncio.Lock()
+        self._workspace_locks: dict[str, asyncio.Lock] = {}
+        self._bridge_activation: tuple[int, str, int] | None = None
+        self.workspace_activations_sent = 0
+        self.workspace_activations_skipped = 0
         self.checkpoints: OrderedDict[str, dict] = OrderedDict()
-        self.checkpoints_file = self.session_dir / "checkpoints.json"
+        self.checkpoints_file = self.session_dir / "checkpoints.jsonl"
         self.max_checkpoints = MAXMCP_CHECKPOINT_MAX
+        # Topologies live here, deduplicated; self.checkpoints keeps the metadata. Record
+        # bodies are dropped once journaled, leaving a few hot topologies resident.
+        self.checkpoint_store = CheckpointStore(
+            hot_bytes=MAXMCP_CHECKPOINT_CACHE_BYTES, spill_saved=True
+        )
+        self._checkpoint_journal: CheckpointJournal | None = None
+        self._checkpoint_journal_lock = asyncio.Lock()
+        self._checkpoint_compaction_task: asyncio.Task | None = None
+        self.checkpoint_journal_compactions = 0
+        self.restore_diff_max_ratio = max(0.0, float(MAXMCP_RESTORE_DIFF_MAX_RATIO))
+        self.checkpoint_restores = {
+            "diff": 0,
+            "full": 0,
+            "diff_mismatches": 0,
+            "verify_mismatches": 0,
+        }
+        self.checkpoint_sources = {"live": 0, "twin": 0}
+        self._checkpoint_context: tuple[tuple | None, dict] = (None, {})
         self.twin_auto_sync = MAXMCP_TWIN_AUTO_SYNC
-        self.twin_baseline_hash: str | None = None
-        self.twin_last_live_hash: str | None = None
-        self.twin_last_sync_at: float | None = None
-        self.twin_last_check_at: float | None = None
-        self.twin_last_error: str | None = None
-        self.twin_last_reason: str | None = None
-        self.twin_object_count = 0
-        self.twin_connection_count = 0
-        self.twin_live_object_count = 0
-        self.twin_live_connection_count = 0
-        self.twin_last_drift: bool | None = None
+        self.twin_reconcile_seconds = max(0.0, float(MAXMCP_TWIN_RECONCILE_SECONDS))
+        # Keyed by workspace target, so work in one workspace keeps the others' models.
+        self._twins: dict[str, _PatchTwin] = {}
+        self.twin_delta_applies = 0
+        self.twin_delta_fallbacks = 0
+        self.twin_full_syncs = 0
+        self.topology_cache_seconds = max(0.0, float(MAXMCP_TOPOLOGY_CACHE_SECONDS))
+        self._topology_cache: dict[str, tuple[tuple, float, dict]] = {}
+        self.topology_cache_hits = 0
+        self.topology_cache_misses = 0
         self.hygiene_manager = None
         self._lock = asyncio.Lock()
         self._last_launch_at = 0.0
@@ -2342,6 +3721,7 @@ class MaxRuntimeManager:
             0.0,
             float(MAXMCP_WORKSPACE_CAPTURE_BACKOFF_SECONDS),
         )
+        self.workspace_capture_page_size = max(0, int(MAXMCP_WORKSPACE_CAPTURE_PAGE_SIZE))
         self.import_apply_timeout_seconds = max(
             1.0,
             float(MAXMCP_IMPORT_APPLY_TIMEOUT_SECONDS),
@@ -2376,23 +3756,225 @@ class MaxRuntimeManager:
         self._warmup_started_at: float | None = None
         self._warmup_completed_at: float | None = None
 
+    # Inside a per-workspace session the active workspace is the one bound to the current
+    # task, so concurrent sessions on different workspaces each see their own target.
+    @property
+    def active_target(self) -> str:
+        scope = _REQUEST_WORKSPACE_TARGET.get()
+        return scope["target_id"] if scope is not None else self._active_target
+
+    @active_target.setter
+    def active_target(self, value: str) -> None:
+        self._active_target = value
+
+    @property
+    def active_project_id(self) -> str | None:
+        scope = _REQUEST_WORKSPACE_TARGET.get()
+        return scope["project_id"] if scope is not None else self._active_project_id
+
+    @active_project_id.setter
+    def active_project_id(self, value: str | None) -> None:
+        self._active_project_id = value
+
+    @property
+    def active_workspace_id(self) -> str | None:
+        scope = _REQUEST_WORKSPACE_TARGET.get()
+        return scope["workspace_id"] if scope is not None else self._active_workspace_id
+
+    @active_workspace_id.setter
+    def active_workspace_id(self, value: str | None) -> None:
+        self._active_workspace_id = value
+
+    def _twin(self, target: str | None = None) -> _PatchTwin:
+        """Return the twin for ``target`` (the active target by default), creating it."""
+        key = self.active_target if target is None else target
+        twin = self._twins.get(key)
+        if twin is None:
+            twin = self._twins[key] = _PatchTwin()
+        return twin
+
+    def twin_known_in_sync(self) -> bool:
+        """True when the twin matched the last live capture and nothing has changed since.
+
+        Any mutation, navigation or reconnect moves the epoch, so this never trusts a
+        twin that has only been kept current through deltas.
+        """
+        twin = self._twins.get(self.active_target)
+        if twin is None or twin.model is None:
+            return False
+        if twin.live_epoch != self._topology_cache_epoch():
+            return False
+        twin.refresh_baseline()
+        return twin.baseline_hash is not None and twin.baseline_hash == twin.last_live_hash
+
     def _twin_status_payload(self) -> dict:
+        twin = self._twin()
+        twin.refresh_baseline()
         return {
-            "baseline_hash": self.twin_baseline_hash,
-            "last_live_hash": self.twin_last_live_hash,
-            "last_sync_at": self.twin_last_sync_at,
-            "last_check_at": self.twin_last_check_at,
-            "last_error": self.twin_last_error,
-            "last_reason": self.twin_last_reason,
-            "baseline_object_count": self.twin_object_count,
-            "baseline_connection_count": self.twin_connection_count,
-            "live_object_count": self.twin_live_object_count,
-            "live_connection_count": self.twin_live_connection_count,
-            "last_drift": self.twin_last_drift,
+            "target": self.active_target,
+            "tracked_targets": len(self._twins),
+            "baseline_hash": twin.baseline_hash,
+            "last_live_hash": twin.last_live_hash,
+            "last_sync_at": twin.last_sync_at,
+            "last_check_at": twin.last_check_at,
+            "last_error": twin.last_error,
+            "last_reason": twin.last_reason,
+            "baseline_object_count": twin.object_count,
+            "baseline_connection_count": twin.connection_count,
+            "live_object_count": twin.live_object_count,
+            "live_connection_count": twin.live_connection_count,
+            "last_drift": twin.last_drift,
             "auto_sync_enabled": self.twin_auto_sync,
+            "reconcile_seconds": self.twin_reconcile_seconds,
+            "delta_model_loaded": twin.model is not None,
+            "known_in_sync": self.twin_known_in_sync(),
+            "delta_applies": self.twin_delta_applies,
+            "delta_fallbacks": self.twin_delta_fallbacks,
+            "full_syncs": self.twin_full_syncs,
         }
 
+    def write_openmetrics(self, writer: MetricsWriter) -> None:
+        # Reads the active target's last recorded twin state; the baseline hash is not
+        # recomputed here.
+        twin = self._twins.get(self.active_target) or _PatchTwin()
+        writer.gauge(
+            "twin_targets",
+            len(self._twins),
+            "Workspace targets with twin state.",
+        )
+        writer.gauge(
+            "twin_loaded",
+            twin.model is not None,
+            "Whether the delta twin model is loaded.",
+        )
+        writer.gauge("twin_objects", twin.object_count, "Objects in the twin baseline.")
+        writer.gauge(
+            "twin_connections",
+            twin.connection_count,
+            "Connections in the twin baseline.",
+        )
+        writer.gauge(
+            "twin_live_objects",
+            twin.live_object_count,
+            "Objects seen in the last live check.",
+        )
+        writer.gauge(
+            "twin_live_connections",
+            twin.live_connection_count,
+            "Connections seen in the last live check.",
+        )
+        writer.gauge("twin_drift", twin.last_drift, "Whether the last live check found drift.")
+        writer.gauge(
+            "twin_last_sync_timestamp_seconds",
+            twin.last_sync_at,
+            "Last twin sync time.",
+        )
+        writer.counter(
+            "twin_delta_applies",
+            self.twin_delta_applies,
+            "Mutations applied to the twin as deltas.",
+        )
+        writer.counter(
+            "twin_delta_fallbacks",
+            self.twin_delta_fallbacks,
+            "Twin deltas that needed a resync.",
+        )
+        writer.counter(
+            "twin_full_syncs",
+            self.twin_full_syncs,
+            "Full twin resyncs from the bridge.",
+        )
+
+    def _topology_cache_epoch(self) -> tuple:
+        return (
+            getattr(self.maxmsp, "connection_epoch", 0),
+            getattr(self.maxmsp, "_preflight_epoch", 0),
+            getattr(self.maxmsp, "_mutation_epoch", 0),
+        )
+
+    def _capture_epoch(self) -> tuple:
+        # Paged captures only care about edits to their own target, so concurrent
+        # sessions on other workspaces do not force a restart.
+        target_epoch = getattr(self.maxmsp, "target_epoch", None)
+        if not callable(target_epoch):
+            return self._topology_cache_epoch()
+        scope = _REQUEST_WORKSPACE_TARGET.get()
+        return tuple(target_epoch(scope["target_id"] if scope is not None else None))
+
+    def _remember_topology(self, topology: dict, epoch: tuple) -> None:
+        # Only keep captures that no mutation or navigation raced with.
+        if self.topology_cache_seconds <= 0.0 or epoch != self._topology_cache_epoch():
+            return
+        self._topology_cache[self.active_target] = (
+            epoch,
+            time.monotonic() + self.topology_cache_seconds,
+            clone_json_value(topology),
+        )
+
+    def workspace_activation_snapshot(self) -> dict:
+        return {
+            "sent": self.workspace_activations_sent,
+            "skipped": self.workspace_activations_skipped,
+        }
+
+    def topology_cache_snapshot(self) -> dict:
+        return {
+            "ttl_seconds": self.topology_cache_seconds,
+            "hits": self.topology_cache_hits,
+            "misses": self.topology_cache_misses,
+            "entries": len(self._topology_cache),
+        }
+
+    async def read_topology(self, *, timeout: float | None = None) -> Any:
+        """Return the active workspace topology, reusing a capture from the same mutation epoch."""
+        epoch = self._topology_cache_epoch()
+        entry = self._topology_cache.get(self.active_target)
+        if entry is not None and entry[0] == epoch and time.monotonic() < entry[1]:
+            self.topology_cache_hits += 1
+            return clone_json_value(entry[2])
+        self._topology_cache.pop(self.active_target, None)
+        self.topology_cache_misses += 1
+        topology = await self.maxmsp.send_request(
+            {"action": "get_objects_in_patch"},
+            timeout=timeout if timeout is not None else self.workspace_capture_timeout_seconds,
+        )
+        if isinstance(topology, dict):
+            self._remember_topology(topology, epoch)
+        return topology
+
+    def _bump_bridge_counter(self, name: str) -> None:
+        current = getattr(self.maxmsp, name, 0)
+        try:
+            setattr(self.maxmsp, name, int(current) + 1)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _capture_error(last_error: Exception | None, capture_meta: dict) -> MaxMCPError:
+        if isinstance(last_error, MaxMCPError):
+            merged = dict(last_error.details or {})
+            merged["capture"] = capture_meta
+            return MaxMCPError(
+                last_error.code,
+                last_error.message,
+                hint=last_error.hint,
+                recoverable=last_error.recoverable,
+                details=merged,
+            )
+        return MaxMCPError(
+            ERROR_INTERNAL,
+            "Failed to capture live topology.",
+            recoverable=True,
+            details={"capture": capture_meta, "error": str(last_error) if last_error else "unknown"},
+        )
+
     async def _capture_live_topology(self, *, include_meta: bool = False) -> dict | tuple[dict, dict]:
+        if self.workspace_capture_page_size > 0 and self._bridge_action_supported(PAGED_CAPTURE_ACTION):
+            topology, capture_meta = await self._capture_live_topology_paged()
+            if include_meta:
+                return topology, capture_meta
+            return topology
+
         timeout_seconds = self.workspace_capture_timeout_seconds
         max_attempts = 1 + self.workspace_capture_retries
         backoff = self.workspace_capture_backoff_seconds
@@ -2407,6 +3989,7 @@ class MaxRuntimeManager:
 
         for attempt in range(1, max_attempts + 1):
             capture_meta["attempts"] = attempt
+            epoch = self._topology_cache_epoch()
             try:
                 topology = await self.maxmsp.send_request(
                     {"action": "get_objects_in_patch"},
@@ -2419,6 +4002,7 @@ class MaxRuntimeManager:
                         recoverable=True,
                         details={"payload_type": str(type(topology))},
                     )
+                self._remember_topology(topology, epoch)
                 if include_meta:
                     capture_meta["captured"] = True
                     return topology, capture_meta
@@ -2427,41 +4011,131 @@ class MaxRuntimeManager:
                 last_error = e
                 is_timeout = isinstance(e, MaxMCPError) and e.code == ERROR_BRIDGE_TIMEOUT
                 if is_timeout:
-                    current_timeouts = getattr(self.maxmsp, "workspace_capture_timeouts", 0)
-                    try:
-                        self.maxmsp.workspace_capture_timeouts = int(current_timeouts) + 1
-                    except Exception:
-                        pass
+                    self._bump_bridge_counter("workspace_capture_timeouts")
                 if attempt >= max_attempts:
                     break
                 if not is_timeout:
                     break
                 capture_meta["retry_attempts"] = capture_meta.get("retry_attempts", 0) + 1
-                current_retries = getattr(self.maxmsp, "workspace_capture_retries", 0)
-                try:
-                    self.maxmsp.workspace_capture_retries = int(current_retries) + 1
-                except Exception:
-                    pass
+                self._bump_bridge_counter("workspace_capture_retries")
                 if backoff > 0.0:
                     await asyncio.sleep(backoff * attempt)
 
-        if isinstance(last_error, MaxMCPError):
-            merged = dict(last_error.details or {})
-            merged["capture"] = capture_meta
-            raise MaxMCPError(
-                last_error.code,
-                last_error.message,
-                hint=last_error.hint,
-                recoverable=last_error.recoverable,
-                details=merged,
-            )
+        raise self._capture_error(last_error, capture_meta)
 
-        raise MaxMCPError(
-            ERROR_INTERNAL,
-            "Failed to capture live topology.",
-            recoverable=True,
-            details={"capture": capture_meta, "error": str(last_error) if last_error else "unknown"},
-        )
+    async def iter_live_topology_pages(self, capture_meta: dict | None = None):
+        """Yield ``get_objects_in_patch_page`` results in cursor order.
+
+        Every page gets the full capture timeout. A timed-out page is retried from its
+        own cursor, sharing ``workspace_capture_retries`` across the whole capture.
+        Pages are only consistent while no mutation or navigation lands on this target
+        in between, so a change of the target's epoch (or of ``total_boxes``) raises a
+        precondition error marked ``patch_changed`` for the caller to restart.
+        """
+        meta = capture_meta if capture_meta is not None else {}
+        meta.setdefault("pages", 0)
+        meta.setdefault("retry_attempts", 0)
+        timeout_seconds = self.workspace_capture_timeout_seconds
+        backoff = self.workspace_capture_backoff_seconds
+        cursor: str | None = None
+        total_boxes: int | None = None
+        epoch = self._capture_epoch()
+        while True:
+            request: dict[str, Any] = {
+                "action": PAGED_CAPTURE_ACTION,
+                "page_size": self.workspace_capture_page_size,
+            }
+            if cursor is not None:
+                request["cursor"] = cursor
+            try:
+                page = await self.maxmsp.send_request(request, timeout=timeout_seconds)
+            except MaxMCPError as e:
+                if e.code != ERROR_BRIDGE_TIMEOUT:
+                    raise
+                self._bump_bridge_counter("workspace_capture_timeouts")
+                if meta["retry_attempts"] >= self.workspace_capture_retries:
+                    raise
+                meta["retry_attempts"] += 1
+                self._bump_bridge_counter("workspace_capture_retries")
+                if backoff > 0.0:
+                    await asyncio.sleep(backoff * meta["retry_attempts"])
+                continue
+            if not isinstance(page, dict) or not isinstance(page.get("boxes"), list):
+                raise MaxMCPError(
+                    ERROR_INTERNAL,
+                    "Bridge returned unexpected topology page payload.",
+                    recoverable=True,
+                    details={"payload_type": str(type(page)), "cursor": cursor},
+                )
+            page_total = page.get("total_boxes")
+            if total_boxes is None:
+                total_boxes = page_total
+            page_epoch = self._capture_epoch()
+            if page_total != total_boxes or page_epoch != epoch:
+                raise MaxMCPError(
+                    ERROR_PRECONDITION,
+                    "Patch changed while it was being captured page by page.",
+                    hint="Retry the capture once concurrent edits have settled.",
+                    recoverable=True,
+                    details={
+                        "patch_changed": True,
+                        "cursor": cursor,
+                        "total_boxes": total_boxes,
+                        "page_total_boxes": page_total,
+                        "epoch": list(epoch),
+                        "page_epoch": list(page_epoch),
+                    },
+                )
+            meta["pages"] += 1
+            self._bump_bridge_counter("workspace_capture_pages")
+            yield page
+            next_cursor = page.get("next_cursor")
+            if not next_cursor:
+                return
+            cursor = str(next_cursor)
+
+    async def _capture_live_topology_paged(self) -> tuple[dict, dict]:
+        capture_meta: dict[str, Any] = {
+            "timeout_seconds": self.workspace_capture_timeout_seconds,
+            "max_attempts": 1 + self.workspace_capture_retries,
+            "backoff_seconds": self.workspace_capture_backoff_seconds,
+            "paged": True,
+            "page_size": self.workspace_capture_page_size,
+            "restarts": 0,
+        }
+        while True:
+            epoch = self._topology_cache_epoch()
+            boxes: list = []
+            lines: list = []
+            try:
+                async for page in self.iter_live_topology_pages(capture_meta):
+                    boxes.extend(page["boxes"])
+                    page_lines = page.get("lines")
+                    if isinstance(page_lines, list):
+                        lines.extend(page_lines)
+            except Exception as e:
+                if (
+                    isinstance(e, MaxMCPError)
+                    and (e.details or {}).get("patch_changed")
+                    and capture_meta["retry_attempts"] < self.workspace_capture_retries
+                ):
+                    # Pages from before the change cannot be stitched to later ones.
+                    capture_meta["retry_attempts"] += 1
+                    capture_meta["restarts"] += 1
+                    self._bump_bridge_counter("workspace_capture_restarts")
+                    if self.workspace_capture_backoff_seconds > 0.0:
+                        await asyncio.sleep(
+                            self.workspace_capture_backoff_seconds * capture_meta["retry_attempts"]
+                        )
+                    continue
+                capture_meta["attempts"] = capture_meta.get("pages", 0) + capture_meta.get("retry_attempts", 0) + 1
+                raise self._capture_error(e, capture_meta) from e
+            break
+        capture_meta["attempts"] = capture_meta["pages"] + capture_meta["retry_attempts"]
+        capture_meta["captured"] = True
+        topology = {"boxes": boxes, "lines": lines}
+        self._remember_topology(topology, epoch)
+        return topology, capture_meta
 
     async def sync_patch_twin(self, reason: str = "manual") -> dict:
         if not self.maxmsp.sio.connected:
@@ -2470,21 +4144,28 @@ class MaxRuntimeManager:
                 "error": "bridge_disconnected",
                 "twin": self._twin_status_payload(),
             }
+        twin = self._twin()
+        epoch = self._topology_cache_epoch()
         try:
             topology = await self._capture_live_topology()
-            digest, object_count, connection_count = topology_hash(topology)
+            model = MutableTopology.from_payload(topology)
+            digest, object_count, connection_count = model.digest_counts()
             now = time.time()
-            self.twin_baseline_hash = digest
-            self.twin_last_live_hash = digest
-            self.twin_last_sync_at = now
-            self.twin_last_check_at = now
-            self.twin_last_error = None
-            self.twin_last_reason = reason
-            self.twin_object_count = object_count
-            self.twin_connection_count = connection_count
-            self.twin_live_object_count = object_count
-            self.twin_live_connection_count = connection_count
-            self.twin_last_drift = False
+            twin.model = model
+            twin.hash_stale = False
+            twin.live_epoch = epoch
+            self.twin_full_syncs += 1
+            twin.baseline_hash = digest
+            twin.last_live_hash = digest
+            twin.last_sync_at = now
+            twin.last_check_at = now
+            twin.last_error = None
+            twin.last_reason = reason
+            twin.object_count = object_count
+            twin.connection_count = connection_count
+            twin.live_object_count = object_count
+            twin.live_connection_count = connection_count
+            twin.last_drift = False
             return {
                 "success": True,
                 "in_sync": True,
@@ -2495,7 +4176,8 @@ class MaxRuntimeManager:
                 "twin": self._twin_status_payload(),
             }
         except Exception as e:
-            self.twin_last_error = str(e)
+            twin.last_error = str(e)
+            twin.model = None
             return {
                 "success": False,
                 "error": str(e),
@@ -2511,22 +4193,29 @@ class MaxRuntimeManager:
                 "twin": self._twin_status_payload(),
             }
 
+        twin = self._twin()
+        epoch = self._topology_cache_epoch()
         try:
             topology = await self._capture_live_topology()
-            live_hash, live_objects, live_connections = topology_hash(topology)
+            live_model = MutableTopology.from_payload(topology)
+            live_hash, live_objects, live_connections = live_model.digest_counts()
             now = time.time()
-            self.twin_last_live_hash = live_hash
-            self.twin_last_check_at = now
-            self.twin_live_object_count = live_objects
-            self.twin_live_connection_count = live_connections
-            self.twin_last_error = None
-
-            if self.twin_baseline_hash is None:
-                self.twin_baseline_hash = live_hash
-                self.twin_last_sync_at = now
-                self.twin_object_count = live_objects
-                self.twin_connection_count = live_connections
-                self.twin_last_drift = False
+            twin.last_live_hash = live_hash
+            twin.last_check_at = now
+            twin.live_object_count = live_objects
+            twin.live_connection_count = live_connections
+            twin.last_error = None
+
+            twin.refresh_baseline()
+            if twin.baseline_hash is None:
+                # No baseline for this workspace yet: adopt the live patch.
+                twin.model = live_model
+                twin.live_epoch = epoch
+                twin.baseline_hash = live_hash
+                twin.last_sync_at = now
+                twin.object_count = live_objects
+                twin.connection_count = live_connections
+                twin.last_drift = False
                 return {
                     "success": True,
                     "in_sync": True,
@@ -2534,25 +4223,36 @@ class MaxRuntimeManager:
                     "twin": self._twin_status_payload(),
                 }
 
-            in_sync = self.twin_baseline_hash == live_hash
-            self.twin_last_drift = not in_sync
+            in_sync = twin.baseline_hash == live_hash
+            twin.last_drift = not in_sync
+            twin.live_epoch = epoch if in_sync else None
+            diverged = None
+            if not in_sync and twin.model is not None:
+                diverged = twin.model.merkle.diff(
+                    live_model.merkle, limit=TWIN_DRIFT_REPORT_LIMIT
+                )
+            if not in_sync:
+                # The local model no longer matches; the next mutation recaptures in full.
+                twin.model = None
             response = {
                 "success": True,
                 "in_sync": in_sync,
-                "baseline_hash": self.twin_baseline_hash,
+                "baseline_hash": twin.baseline_hash,
                 "live_hash": live_hash,
-                "baseline_object_count": self.twin_object_count,
-                "baseline_connection_count": self.twin_connection_count,
+                "baseline_object_count": twin.object_count,
+                "baseline_connection_count": twin.connection_count,
                 "live_object_count": live_objects,
                 "live_connection_count": live_connections,
                 "twin": self._twin_status_payload(),
             }
+            if diverged is not None:
+                response["diverged"] = diverged
             if not in_sync and auto_resync:
                 sync_result = await self.sync_patch_twin(reason="auto_resync_after_drift")
                 response["auto_resync"] = sync_result
             return response
         except Exception as e:
-            self.twin_last_error = str(e)
+            twin.last_error = str(e)
             return {"success": False, "error": str(e), "twin": self._twin_status_payload()}
 
     def _host_mutation_error(self, operation: str) -> dict:
@@ -2674,6 +4374,51 @@ class MaxRuntimeManager:
     def _is_retryable_import_error(error: MaxMCPError) -> bool:
         return error.code in {ERROR_BRIDGE_TIMEOUT, ERROR_OVERLOADED}
 
+    @staticmethod
+    def _topology_stage_pieces(topology: dict) -> list[dict]:
+        boxes = topology.get("boxes", []) if isinstance(topology, dict) else []
+        lines = topology.get("lines", []) if isinstance(topology, dict) else []
+        pieces: list[dict] = []
+        for field, rows in (("boxes", boxes), ("lines", lines)):
+            for offset in range(0, len(rows), TOPOLOGY_STAGE_PIECE_ROWS):
+                pieces.append({field: rows[offset : offset + TOPOLOGY_STAGE_PIECE_ROWS]})
+        return pieces or [{"boxes": [], "lines": []}]
+
+    async def _stage_topology_snapshot(
+        self,
+        topology: dict,
+        snapshot_hash: str,
+        *,
+        deadline: float,
+        idempotency_key: str | None = None,
+    ) -> int:
+        """Upload a snapshot to the bridge once so progressive chunks can refer to it by hash."""
+        pieces = self._topology_stage_pieces(topology)
+        for piece_index, piece in enumerate(pieces):
+            payload: dict[str, Any] = {
+                "action": "stage_topology_snapshot",
+                "snapshot_hash": snapshot_hash,
+                "piece_index": piece_index,
+                "piece_count": len(pieces),
+            }
+            payload.update(piece)
+            await self.maxmsp.send_request(
+                payload,
+                timeout=max(0.001, deadline - time.monotonic()),
+                idempotency_key=(
+                    f"{idempotency_key}.{piece_index}" if idempotency_key else None
+                ),
+            )
+        return len(pieces)
+
+    @staticmethod
+    def _is_staged_snapshot_lost(error: MaxMCPError) -> bool:
+        details = error.details if isinstance(error.details, dict) else {}
+        return error.code == ERROR_PRECONDITION and details.get("reason") in {
+            "staged_snapshot_missing",
+            "staged_cursor_mismatch",
+        }
+
     async def _apply_topology_snapshot_progressive(
         self,
         topology: dict,
@@ -2691,6 +4436,28 @@ class MaxRuntimeManager:
         started_at = time.monotonic()
         deadline = started_at + safe_timeout_seconds
 
+        # Bridges that support staging receive the snapshot once; chunks then carry only
+        # the content hash and cursor instead of re-sending the full topology each time.
+        staged = self._bridge_action_supported("stage_topology_snapshot") is True
+        snapshot_hash = topology_content_hash(topology) if staged else None
+        stage_generation = 0
+        stage_pieces = 0
+
+        async def stage() -> None:
+            nonlocal stage_generation, stage_pieces
+            stage_generation += 1
+            stage_pieces += await self._stage_topology_snapshot(
+                topology,
+                snapshot_hash,
+                deadline=deadline,
+                idempotency_key=(
+                    f"{idempotency_key}:stage{stage_generation}" if idempotency_key else None
+                ),
+            )
+
+        if staged:
+            await stage()
+
         state: dict | None = None
         for chunk_idx in range(1, max_chunks + 1):
             remaining_timeout = deadline - time.monotonic()
@@ -2718,9 +4485,12 @@ class MaxRuntimeManager:
             per_chunk_timeout = max(0.001, min(safe_timeout_seconds, remaining_timeout))
             payload: dict[str, Any] = {
                 "action": "apply_topology_snapshot_progressive",
-                "snapshot": topology,
                 "chunk_size": safe_chunk_size,
             }
+            if staged:
+                payload["snapshot_hash"] = snapshot_hash
+            else:
+                payload["snapshot"] = topology
             if state is not None:
                 payload["progress_state"] = state
 
@@ -2728,11 +4498,19 @@ class MaxRuntimeManager:
             if idempotency_key:
                 chunk_idempotency = f"{idempotency_key}:chunk{chunk_idx}"
 
-            response = await self.maxmsp.send_request(
-                payload,
-                timeout=per_chunk_timeout,
-                idempotency_key=chunk_idempotency,
-            )
+            try:
+                response = await self.maxmsp.send_request(
+                    payload,
+                    timeout=per_chunk_timeout,
+                    idempotency_key=chunk_idempotency,
+                )
+            except MaxMCPError as e:
+                # A reloaded bridge loses staged snapshots; re-upload once and restart.
+                if not staged or stage_generation > 1 or not self._is_staged_snapshot_lost(e):
+                    raise
+                await stage()
+                state = None
+                continue
             if not isinstance(response, dict):
                 raise MaxMCPError(
                     ERROR_INTERNAL,
@@ -2752,6 +4530,10 @@ class MaxRuntimeManager:
                     max(0.0, time.monotonic() - started_at),
                 )
                 final.setdefault("timeout_seconds", safe_timeout_seconds)
+                final["staged_upload"] = staged
+                if staged:
+                    final["snapshot_hash"] = snapshot_hash
+                    final["stage_pieces"] = stage_pieces
                 return final
 
             state_raw = response.get("state")
@@ -2909,32 +4691,204 @@ class MaxRuntimeManager:
             "object_count": entry.get("object_count"),
             "connection_count": entry.get("connection_count"),
             "target": entry.get("target"),
+            "source": entry.get("source", "live"),
         }
 
-    def _save_checkpoint_journal_sync(self) -> dict:
-        self.session_dir.mkdir(parents=True, exist_ok=True)
-        payload = {
-            "session_id": self.session_id,
-            "updated_at": int(time.time()),
-            "checkpoints": [clone_json_value(entry) for entry in self.checkpoints.values()],
-        }
-        write_json_file(self.checkpoints_file, payload)
+    @property
+    def checkpoint_journal(self) -> CheckpointJournal:
+        journal = self._checkpoint_journal
+        if journal is None or journal.index_path != self.checkpoints_file:
+            journal = self._checkpoint_journal = CheckpointJournal(self.checkpoints_file)
+        return journal
+
+    def _checkpoint_journal_row(self, checkpoint_id: str, entry: dict) -> dict:
+        manifest = self.checkpoint_store.manifest(checkpoint_id)
+        return {**clone_json_value(entry), "manifest": manifest}
+
+    def _checkpoint_journal_rows(self) -> list[dict]:
+        # Hidden bases come first: every live delta replays from one of them or a row above.
+        store = self.checkpoint_store
+        return [
+            *(
+                {
+                    "op": "checkpoint",
+                    "checkpoint_id": checkpoint_id,
+                    "dropped": True,
+                    "manifest": store.manifest(checkpoint_id),
+                }
+                for checkpoint_id in store.hidden_bases()
+            ),
+            *(
+                {"op": "checkpoint", **self._checkpoint_journal_row(checkpoint_id, entry)}
+                for checkpoint_id, entry in self.checkpoints.items()
+            ),
+        ]
+
+    def _evict_checkpoints(self) -> list[dict]:
+        """Trim to max_checkpoints and return the journal events recording it.
+
+        Evicted checkpoints stay in the store as hidden bases while deltas need them, so
+        a drop event never carries a rewritten manifest.
+        """
+        events = []
+        while len(self.checkpoints) > self.max_checkpoints:
+            evicted_id, _evicted = self.checkpoints.popitem(last=False)
+            self.checkpoint_store.remove(evicted_id)
+            events.append({"op": "drop", "checkpoint_id": evicted_id})
+        return events
+
+    async def _append_checkpoint_journal(self, events: list[dict]) -> dict:
+        # The lock is FIFO, so appends land in the order the store was changed. Records
+        # are only marked saved (and dropped from memory) once they are on disk.
+        async with self._checkpoint_journal_lock:
+            records = self.checkpoint_store.unsaved_records()
+            written = await asyncio.to_thread(self.checkpoint_journal.append, events, records)
+            self.checkpoint_store.mark_saved(digest for digest, _row in records)
+        self._schedule_checkpoint_compaction()
         return {
             "saved": True,
             "path": str(self.checkpoints_file),
             "count": len(self.checkpoints),
+            **written,
+        }
+
+    def _schedule_checkpoint_compaction(self) -> None:
+        task = self._checkpoint_compaction_task
+        if task is not None and not task.done():
+            return
+        if not self.checkpoint_journal.compaction_due(
+            len(self.checkpoints) + len(self.checkpoint_store.hidden_bases()),
+            len(self.checkpoint_store.live_hashes()),
+        ):
+            return
+        self._checkpoint_compaction_task = asyncio.create_task(self.compact_checkpoint_journal())
+
+    async def compact_checkpoint_journal(self) -> dict:
+        """Rewrite the checkpoint journal down to the live checkpoints in a worker thread."""
+        async with self._checkpoint_journal_lock:
+            rows = self._checkpoint_journal_rows()
+            live = self.checkpoint_store.live_hashes()
+            # Resident bodies are written from memory; the rest are copied from disk.
+            resident = dict(self.checkpoint_store.records)
+            try:
+                result = await asyncio.to_thread(
+                    self.checkpoint_journal.compact, rows, live, resident
+                )
+            except Exception as e:
+                logging.warning(f"Checkpoint journal compaction failed: {e}")
+                return {"compacted": False, "error": str(e)}
+            self.checkpoint_store.mark_saved(resident)
+        self.checkpoint_journal_compactions += 1
+        return result
+
+    def _checkpoint_entry_from_row(
+        self, checkpoint_id: str, raw: dict, topology: dict | None
+    ) -> dict:
+        digest = raw.get("hash")
+        object_count = raw.get("object_count")
+        connection_count = raw.get("connection_count")
+        stored = bool(digest) and object_count is not None and connection_count is not None
+        if topology is not None and not stored:
+            digest, object_count, connection_count = topology_hash(topology)
+        return {
+            "checkpoint_id": checkpoint_id,
+            "label": str(raw.get("label", "")),
+            "created_at": raw.get("created_at", time.time()),
+            "hash": digest,
+            "object_count": object_count,
+            "connection_count": connection_count,
+            "target": raw.get("target") or "unknown",
+            "context": raw.get("context") if isinstance(raw.get("context"), dict) else {},
+            "source": raw.get("source") or "live",
         }
 
+    def _load_legacy_checkpoints_sync(
+        self, document: dict, store: CheckpointStore
+    ) -> tuple[OrderedDict, int]:
+        """Read a whole-document journal from before the append-only format."""
+        rows = document.get("checkpoints", [])
+        if not isinstance(rows, list):
+            rows = []
+        records: dict[str, Any] = {}
+        records_name = document.get("records_file")
+        records_path = (
+            self.checkpoints_file.with_name(Path(records_name).name)
+            if isinstance(records_name, str) and records_name
+            else None
+        )
+        if records_path is not None and records_path.exists():
+            for line in records_path.read_text(encoding="utf-8").splitlines():
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(row, dict) and isinstance(row.get("hash"), str):
+                    records[row["hash"]] = row.get("row")
+
+        loaded = OrderedDict()
+        skipped = 0
+        for raw in rows:
+            if not isinstance(raw, dict):
+                continue
+            checkpoint_id = raw.get("checkpoint_id")
+            if not isinstance(checkpoint_id, str) or not checkpoint_id:
+                continue
+            topology = None
+            manifest = raw.get("manifest")
+            if isinstance(manifest, dict):
+                if not store.load(checkpoint_id, manifest, records):
+                    skipped += 1
+                    continue
+                store.adopt_records(records)
+                # Queued for the rewrite below, which keeps them resident until then.
+                store.mark_unsaved(records)
+                if not raw.get("hash"):
+                    topology = store.topology(checkpoint_id)
+            else:
+                raw_topology = raw.get("topology")
+                if not isinstance(raw_topology, dict):
+                    continue
+                topology = extract_topology_from_payload(raw_topology)
+                store.add(checkpoint_id, topology, parent_id=next(reversed(loaded), None))
+            loaded[checkpoint_id] = self._checkpoint_entry_from_row(checkpoint_id, raw, topology)
+        if records_path is not None and records_path.exists():
+            records_path.unlink()
+        return loaded, skipped
+
     def _load_checkpoint_journal_sync(self) -> dict:
-        if not self.checkpoints_file.exists():
+        journal = self.checkpoint_journal
+        if not journal.exists():
             return {
                 "loaded": False,
                 "path": str(self.checkpoints_file),
                 "count": 0,
             }
 
+        store = CheckpointStore(
+            max_delta_chain=self.checkpoint_store.max_delta_chain,
+            hot_bytes=self.checkpoint_store.hot_bytes,
+            spill_saved=self.checkpoint_store.spill_saved,
+        )
         try:
-            payload = read_json_file(self.checkpoints_file)
+            state = journal.load()
+            if state["legacy"] is not None:
+                loaded, skipped = self._load_legacy_checkpoints_sync(state["legacy"], store)
+            else:
+                # Only the index is read: hashes and counts are stored, record bodies stay on disk.
+                loaded = OrderedDict()
+                skipped = 0
+                for checkpoint_id, raw in state["checkpoints"].items():
+                    hidden = bool(raw.get("dropped"))
+                    if not store.load(
+                        checkpoint_id, raw.get("manifest"), journal.locations, hidden=hidden
+                    ):
+                        skipped += 1
+                        continue
+                    if hidden:
+                        continue
+                    loaded[checkpoint_id] = self._checkpoint_entry_from_row(
+                        checkpoint_id, raw, None
+                    )
         except Exception as e:
             logging.warning(f"Failed to load checkpoint journal: {e}")
             return {
@@ -2944,46 +4898,35 @@ class MaxRuntimeManager:
                 "error": str(e),
             }
 
-        rows = payload.get("checkpoints", []) if isinstance(payload, dict) else []
-        if not isinstance(rows, list):
-            rows = []
-
-        loaded = OrderedDict()
-        for raw in rows:
-            if not isinstance(raw, dict):
-                continue
-            checkpoint_id = raw.get("checkpoint_id")
-            raw_topology = raw.get("topology")
-            if not isinstance(raw_topology, dict):
-                continue
-            topology = extract_topology_from_payload(raw_topology)
-            if not isinstance(checkpoint_id, str) or not checkpoint_id:
-                continue
-
-            digest, object_count, connection_count = topology_hash(topology)
-            entry = {
-                "checkpoint_id": checkpoint_id,
-                "label": str(raw.get("label", "")),
-                "created_at": raw.get("created_at", time.time()),
-                "hash": raw.get("hash") or digest,
-                "object_count": raw.get("object_count", object_count),
-                "connection_count": raw.get("connection_count", connection_count),
-                "target": raw.get("target") or "unknown",
-                "context": raw.get("context") if isinstance(raw.get("context"), dict) else {},
-                "topology": clone_json_value(topology),
-            }
-            loaded[checkpoint_id] = entry
-            while len(loaded) > self.max_checkpoints:
-                loaded.popitem(last=False)
-
+        if skipped:
+            logging.warning(f"Skipped {skipped} checkpoint(s) with missing records or parents.")
         self.checkpoints = loaded
+        self.checkpoint_store = store
+        drops = self._evict_checkpoints()
+        try:
+            if state["legacy"] is not None:
+                rows = self._checkpoint_journal_rows()
+                journal.compact(rows, store.live_hashes(), dict(store.records))
+                store.mark_saved(list(store.records))
+            elif drops:
+                journal.append(drops)
+        except Exception as e:
+            logging.warning(f"Failed to rewrite checkpoint journal: {e}")
         return {
             "loaded": True,
             "path": str(self.checkpoints_file),
             "count": len(self.checkpoints),
+            "skipped": skipped,
+            "corrupt_lines": state["corrupt_lines"],
+            "truncated_bytes": state["truncated_bytes"],
         }
 
-    async def create_checkpoint(self, label: str = "") -> dict:
+    async def create_checkpoint(self, label: str = "", *, source: str = "live") -> dict:
+        """Checkpoint the active workspace.
+
+        ``source="twin"`` takes the topology from the local twin, with no bridge calls,
+        when :meth:`twin_known_in_sync`; otherwise the patch is captured live.
+        """
         if self.active_target == "host":
             return _error_result(
                 ERROR_PRECONDITION,
@@ -2999,27 +4942,36 @@ class MaxRuntimeManager:
                 recoverable=True,
                 details={"target": self.active_target},
             )
-        try:
-            topology = await self._capture_live_topology()
-        except Exception as e:
-            return self._operation_error(
-                operation="create_checkpoint",
-                action="get_objects_in_patch",
-                error=e,
-                details={"target": self.active_target},
-            )
-        try:
-            context = await self.maxmsp.send_request(
-                {"action": "get_patcher_context"},
-                timeout=3.0,
-            )
-        except Exception as e:
-            return self._operation_error(
-                operation="create_checkpoint",
-                action="get_patcher_context",
-                error=e,
-                details={"target": self.active_target},
-            )
+        navigation = (self.active_target, *self._topology_cache_epoch()[:2])
+        if source == "twin" and self.twin_known_in_sync():
+            source_used = "twin"
+            topology = self._twin().model.to_payload()
+            # Context only moves with navigation, which also invalidates the twin epoch.
+            cached_navigation, context = self._checkpoint_context
+            if cached_navigation != navigation:
+                context = {}
+        else:
+            source_used = "live"
+            try:
+                topology = await self._capture_live_topology()
+            except Exception as e:
+                return self._operation_error(
+                    operation="create_checkpoint",
+                    action="get_objects_in_patch",
+                    error=e,
+                    details={"target": self.active_target},
+                )
+            try:
+                context = await self.maxmsp.send_request({"action": "get_patcher_context"})
+            except Exception as e:
+                return self._operation_error(
+                    operation="create_checkpoint",
+                    action="get_patcher_context",
+                    error=e,
+                    details={"target": self.active_target},
+                )
+            if isinstance(context, dict):
+                self._checkpoint_context = (navigation, clone_json_value(context))
 
         try:
             digest, object_count, connection_count = topology_hash(topology)
@@ -3033,14 +4985,22 @@ class MaxRuntimeManager:
                 "connection_count": connection_count,
                 "target": self.active_target,
                 "context": context if isinstance(context, dict) else {},
-                "topology": clone_json_value(topology),
+                "source": source_used,
             }
+            # The newest checkpoint is usually a small edit away, so delta against it.
+            stored = self.checkpoint_store.add(
+                checkpoint_id,
+                topology,
+                parent_id=next(reversed(self.checkpoints), None),
+            )
             self.checkpoints[checkpoint_id] = entry
             self.checkpoints.move_to_end(checkpoint_id)
-            while len(self.checkpoints) > self.max_checkpoints:
-                self.checkpoints.popitem(last=False)
+            events = [
+                {"op": "checkpoint", **self._checkpoint_journal_row(checkpoint_id, entry)},
+                *self._evict_checkpoints(),
+            ]
             try:
-                checkpoint_journal = await asyncio.to_thread(self._save_checkpoint_journal_sync)
+                checkpoint_journal = await self._append_checkpoint_journal(events)
             except Exception as e:
                 return self._operation_error(
                     operation="create_checkpoint",
@@ -3048,6 +5008,7 @@ class MaxRuntimeManager:
                     error=e,
                     details={"checkpoint_id": checkpoint_id},
                 )
+            self.checkpoint_sources[source_used] += 1
             return {
                 "success": True,
                 "checkpoint_id": checkpoint_id,
@@ -3057,7 +5018,9 @@ class MaxRuntimeManager:
                 "object_count": object_count,
                 "connection_count": connection_count,
                 "target": self.active_target,
+                "source": source_used,
                 "total_checkpoints": len(self.checkpoints),
+                "checkpoint_store": stored,
                 "checkpoint_journal": checkpoint_journal,
             }
         except Exception as e:
@@ -3074,7 +5037,71 @@ class MaxRuntimeManager:
             for entry in reversed(list(self.checkpoints.values()))
         ]
 
-    async def restore_checkpoint(self, checkpoint_id: str) -> dict:
+    def _bridge_supports_topology_delta(self) -> bool:
+        capabilities = getattr(self.maxmsp, "capabilities", None)
+        supported = capabilities.get("supported_actions") if isinstance(capabilities, dict) else None
+        return isinstance(supported, list) and TOPOLOGY_DELTA_ACTION in supported
+
+    async def _restore_checkpoint_diff(
+        self, checkpoint_id: str, topology: dict, expected: str
+    ) -> tuple[dict | None, dict]:
+        """Apply only the boxes and lines that differ from the checkpoint, in one request.
+
+        The diff is taken against the twin only while :meth:`twin_known_in_sync`, and
+        against a live capture otherwise; the result is always confirmed by a live resync.
+        Returns ``(None, info)`` when the caller should replace the whole snapshot instead:
+        the bridge lacks the delta action, boxes are unnamed, the diff exceeds
+        ``restore_diff_max_ratio`` of the checkpoint, or the result fails verification.
+        """
+        if self.restore_diff_max_ratio <= 0:
+            return None, {"fallback_reason": "disabled"}
+        if not self._bridge_supports_topology_delta():
+            return None, {"fallback_reason": "unsupported"}
+        if self.twin_known_in_sync():
+            current, source = self._twin().model.to_payload(), "twin"
+        else:
+            current, source = await self._capture_live_topology(), "live"
+        delta = topology_delta(current, topology)
+        if delta is None:
+            return None, {"source": source, "fallback_reason": "unnamed_boxes"}
+        operations = sum(len(rows) for rows in delta.values())
+        size = len(topology.get("boxes") or []) + len(topology.get("lines") or [])
+        info = {
+            "mode": "diff",
+            "source": source,
+            "operations": operations,
+            "removed": len(delta["remove"]),
+            "created": len(delta["boxes"]),
+            "disconnected": len(delta["disconnect"]),
+            "connected": len(delta["connect"]),
+        }
+        if operations > self.restore_diff_max_ratio * max(1, size):
+            return None, {**info, "fallback_reason": "diff_too_large"}
+
+        applied: Any = {"success": True, "noop": True}
+        if operations:
+            try:
+                applied = await self.maxmsp.send_request(
+                    {"action": TOPOLOGY_DELTA_ACTION, "delta": delta},
+                    timeout=20.0,
+                )
+            except MaxMCPError as e:
+                # A partial delta is repaired by the full replace that follows.
+                return None, {**info, "fallback_reason": "delta_failed", "error": e.to_dict()}
+        # Deltas echoed into the twin only prove what the bridge reported, so the
+        # result is checked against a fresh capture of the live patch.
+        twin = await self.sync_patch_twin(reason=f"restore_checkpoint:{checkpoint_id}")
+        if twin.get("hash") != expected:
+            self.checkpoint_restores["diff_mismatches"] += 1
+            return None, {**info, "fallback_reason": "verification_failed"}
+        return {"applied": applied, "twin": twin}, info
+
+    async def restore_checkpoint(self, checkpoint_id: str, *, verify: bool = False) -> dict:
+        """Put the active workspace back into a checkpoint's topology.
+
+        With ``verify``, the live hash from the resync every restore ends with must equal
+        the checkpoint hash; a mismatch is counted and reported as an error.
+        """
         if self.active_target == "host":
             return _error_result(
                 ERROR_PRECONDITION,
@@ -3098,26 +5125,84 @@ class MaxRuntimeManager:
                 recoverable=True,
                 details={"checkpoint_id": checkpoint_id},
             )
-        topology = entry.get("topology")
-        if not isinstance(topology, dict):
+        if checkpoint_id not in self.checkpoint_store:
             return _error_result(
                 ERROR_PRECONDITION,
                 "Checkpoint topology is missing or invalid.",
                 recoverable=False,
                 details={"checkpoint_id": checkpoint_id},
             )
+        missing = self.checkpoint_store.missing_records(checkpoint_id)
+        if missing:
+            # Topologies load lazily: only the index is read at startup.
+            try:
+                async with self._checkpoint_journal_lock:
+                    rows = await asyncio.to_thread(self.checkpoint_journal.read_records, missing)
+            except Exception as e:
+                return self._operation_error(
+                    operation="restore_checkpoint",
+                    action="checkpoint_journal_read",
+                    error=e,
+                    details={"checkpoint_id": checkpoint_id},
+                )
+            self.checkpoint_store.adopt_records(rows)
         try:
-            result = await self.maxmsp.send_request(
-                {"action": "apply_topology_snapshot", "snapshot": topology},
-                timeout=20.0,
+            topology = self.checkpoint_store.topology(checkpoint_id)
+        except KeyError:
+            return _error_result(
+                ERROR_PRECONDITION,
+                "Checkpoint records are missing from the journal.",
+                recoverable=False,
+                details={"checkpoint_id": checkpoint_id, "missing_records": len(missing)},
             )
-            twin = await self.sync_patch_twin(reason=f"restore_checkpoint:{checkpoint_id}")
-            return {
-                "success": True,
-                "checkpoint_id": checkpoint_id,
-                "applied": result,
-                "twin": twin,
-            }
+        # Restores (including transaction rollbacks) jump ahead of queued regular edits.
+        priority_token = _REQUEST_MUTATION_PRIORITY.set(PRIORITY_URGENT)
+        try:
+            expected, _objects, _connections = MutableTopology.from_payload(topology).digest_counts()
+            diff_restore, restore = await self._restore_checkpoint_diff(
+                checkpoint_id, topology, expected
+            )
+            if diff_restore is not None:
+                self.checkpoint_restores["diff"] += 1
+                twin = diff_restore["twin"]
+                response = {
+                    "success": True,
+                    "checkpoint_id": checkpoint_id,
+                    **diff_restore,
+                    "restore": restore,
+                }
+            else:
+                result = await self.maxmsp.send_request(
+                    {"action": "apply_topology_snapshot", "snapshot": topology},
+                    timeout=20.0,
+                )
+                twin = await self.sync_patch_twin(reason=f"restore_checkpoint:{checkpoint_id}")
+                self.checkpoint_restores["full"] += 1
+                response = {
+                    "success": True,
+                    "checkpoint_id": checkpoint_id,
+                    "applied": result,
+                    "twin": twin,
+                    "restore": {**restore, "mode": "full"},
+                }
+            if verify:
+                if twin.get("hash") != expected:
+                    self.checkpoint_restores["verify_mismatches"] += 1
+                    return _error_result(
+                        ERROR_PRECONDITION,
+                        "Restored patch does not match the checkpoint.",
+                        hint="Inspect the patch, then restore again or resync the twin.",
+                        recoverable=True,
+                        details={
+                            "checkpoint_id": checkpoint_id,
+                            "expected_hash": expected,
+                            "live_hash": twin.get("hash"),
+                            "twin_sync_error": twin.get("error"),
+                            "mode": response["restore"]["mode"],
+                        },
+                    )
+                response["restore"]["verified"] = True
+            return response
         except Exception as e:
             return self._operation_error(
                 operation="restore_checkpoint",
@@ -3125,8 +5210,17 @@ class MaxRuntimeManager:
                 error=e,
                 details={"checkpoint_id": checkpoint_id},
             )
+        finally:
+            _REQUEST_MUTATION_PRIORITY.reset(priority_token)
 
-    async def after_successful_action(self, action: str, payload: dict, results: Any) -> None:
+    async def after_successful_action(
+        self,
+        action: str,
+        payload: dict,
+        results: Any,
+        *,
+        meta: dict | None = None,
+    ) -> None:
         topology_mutations = {
             "add_object",
             "add_object_with_preflight",
@@ -3140,10 +5234,36 @@ class MaxRuntimeManager:
             "encapsulate",
             "apply_topology_snapshot",
             "apply_topology_snapshot_progressive",
+            TOPOLOGY_DELTA_ACTION,
             "set_workspace_target",
         }
-        if action in topology_mutations and self.twin_auto_sync:
-            await self.sync_patch_twin(reason=f"mutation:{action}")
+        # Workspace-targeted envelopes carry their own target, so this is the twin of
+        # the workspace the action ran in.
+        twin = self._twin()
+        if action not in topology_mutations:
+            if action in PREFLIGHT_EPOCH_ACTIONS:
+                # Subpatcher navigation changes which patcher the model describes.
+                twin.model = None
+            return
+        if not self.twin_auto_sync:
+            return
+        delta = meta.get("twin_delta") if isinstance(meta, dict) else None
+        reconcile_due = (
+            twin.last_sync_at is None
+            or time.time() - twin.last_sync_at >= self.twin_reconcile_seconds
+        )
+        if delta is not None and twin.model is not None and not reconcile_due:
+            if twin.model.apply_delta(delta):
+                object_count, connection_count = twin.model.counts()
+                twin.object_count = object_count
+                twin.connection_count = connection_count
+                twin.hash_stale = True
+                twin.last_reason = f"delta:{action}"
+                self.twin_delta_applies += 1
+                return
+            twin.model = None
+            self.twin_delta_fallbacks += 1
+        await self.sync_patch_twin(reason=f"mutation:{action}")
 
     def _resolve_host_patch(self) -> Path | None:
         if self.host_patch_path.exists():
@@ -3450,6 +5570,7 @@ class MaxRuntimeManager:
 
         removed = workspaces.pop(wid)
         project["updated_at"] = time.time()
+        self._twins.pop(self._workspace_target_id(pid, wid), None)
         deselected = False
         if self.active_project_id == pid and self.active_workspace_id == wid:
             self.active_project_id = None
@@ -3486,12 +5607,82 @@ class MaxRuntimeManager:
                 create_if_missing=create_if_missing,
             )
 
+    def uses_workspace_envelopes(self) -> bool:
+        checker = getattr(self.maxmsp, "supports_workspace_target", None)
+        return bool(checker()) if callable(checker) else False
+
+    def _workspace_lock_for(self, target_id: str) -> asyncio.Lock:
+        lock = self._workspace_locks.get(target_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._workspace_locks[target_id] = lock
+        return lock
+
+    @asynccontextmanager
+    async def workspace_session(
+        self,
+        *,
+        project_id: str,
+        workspace_id: str,
+        create_if_missing: bool = True,
+    ):
+        """Hold a workspace for the duration of an operation and yield the activation result.
+
+        When the bridge resolves ``workspace_target`` per envelope, only that workspace's
+        lock is taken and the target is bound to the current task, so operations on
+        different workspaces proceed concurrently; the session's first envelope asks the
+        bridge to return to the workspace root. Older bridges fall back to the global
+        lock and a ``set_workspace_target`` round trip.
+        """
+        if not self.uses_workspace_envelopes():
+            async with _locked_workspace_session(
+                self,
+                project_id=project_id,
+                workspace_id=workspace_id,
+                create_if_missing=create_if_missing,
+            ) as switch:
+                yield switch
+            return
+        pid = self._normalize_scope_identifier(project_id, field_name="project_id")
+        wid = self._normalize_scope_identifier(workspace_id, field_name="workspace_id")
+        async with _traced_lock(self._workspace_lock_for(self._workspace_target_id(pid, wid))):
+            switch = await self._activate_workspace_locked(
+                project_id=pid,
+                workspace_id=wid,
+                create_if_missing=create_if_missing,
+                select_on_bridge=False,
+            )
+            if not switch.get("success"):
+                yield switch
+                return
+            # Every session starts at the workspace root, as an activation does on
+            # older bridges, so checkpoints, restores and captures never inherit a
+            # subpatcher left open by an earlier call.
+            reset_navigation = getattr(self.maxmsp, "reset_workspace_navigation", None)
+            if callable(reset_navigation):
+                reset_navigation(switch["target_id"])
+            token = _REQUEST_WORKSPACE_TARGET.set(
+                {
+                    "target_id": switch["target_id"],
+                    "project_id": pid,
+                    "workspace_id": wid,
+                    "workspace_varname": switch["workspace_varname"],
+                    "workspace_name": switch["workspace_name"],
+                    "reset_navigation": True,
+                }
+            )
+            try:
+                yield switch
+            finally:
+                _REQUEST_WORKSPACE_TARGET.reset(token)
+
     async def _activate_workspace_locked(
         self,
         *,
         project_id: str,
         workspace_id: str,
         create_if_missing: bool = True,
+        select_on_bridge: bool = True,
     ) -> dict:
         pid = self._normalize_scope_identifier(project_id, field_name="project_id")
         wid = self._normalize_scope_identifier(workspace_id, field_name="workspace_id")
@@ -3525,18 +5716,38 @@ class MaxRuntimeManager:
         workspace_name = str(workspace.get("display_name") or wid)
         if not self.maxmsp.sio.connected:
             await self.maxmsp.ensure_connected()
-        bridge_result = await self.maxmsp.send_request(
-            {
-                "action": "set_workspace_target",
-                "target_id": target_id,
-                "workspace_varname": workspace_varname,
-                "workspace_name": workspace_name,
-            },
-            timeout=3.0,
-        )
-        self.active_target = target_id
-        self.active_project_id = pid
-        self.active_workspace_id = wid
+        bridge_result = None
+        activation_cached = False
+        if select_on_bridge:
+            activation_key = (getattr(self.maxmsp, "connection_epoch", 0), target_id)
+            # Navigation and target changes bump the preflight epoch, so an unchanged epoch
+            # means the bridge still sits at this workspace's root.
+            if (
+                self._active_target == target_id
+                and self._bridge_activation is not None
+                and self._bridge_activation[:2] == activation_key
+                and self._bridge_activation[2] == getattr(self.maxmsp, "_preflight_epoch", 0)
+            ):
+                activation_cached = True
+                self.workspace_activations_skipped += 1
+            else:
+                self._bridge_activation = None
+                bridge_result = await self.maxmsp.send_request(
+                    {
+                        "action": "set_workspace_target",
+                        "target_id": target_id,
+                        "workspace_varname": workspace_varname,
+                        "workspace_name": workspace_name,
+                    },
+                    timeout=3.0,
+                )
+                self.workspace_activations_sent += 1
+                self._bridge_activation = activation_key + (
+                    getattr(self.maxmsp, "_preflight_epoch", 0),
+                )
+            self.active_target = target_id
+            self.active_project_id = pid
+            self.active_workspace_id = wid
         workspace["updated_at"] = time.time()
         project["updated_at"] = time.time()
         return {
@@ -3545,6 +5756,8 @@ class MaxRuntimeManager:
             "workspace_id": wid,
             "target_id": target_id,
             "workspace_varname": workspace_varname,
+            "workspace_name": workspace_name,
+            "activation_cached": activation_cached,
             "created_workspace": (
                 created_workspace.get("created")
                 if isinstance(created_workspace, dict)
@@ -3869,12 +6082,14 @@ class MaxRuntimeManager:
                 },
             }
 
-        async with self._workspace_lock:
+        async with AsyncExitStack() as stack:
             try:
-                switch_result = await self._activate_workspace_locked(
-                    project_id=project_id,
-                    workspace_id=workspace_id,
-                    create_if_missing=True,
+                switch_result = await stack.enter_async_context(
+                    self.workspace_session(
+                        project_id=project_id,
+                        workspace_id=workspace_id,
+                        create_if_missing=True,
+                    )
                 )
             except Exception as e:
                 return self._operation_error(
@@ -4151,12 +6366,14 @@ class MaxRuntimeManager:
         )
         if capability_error:
             return capability_error
-        async with self._workspace_lock:
+        async with AsyncExitStack() as stack:
             try:
-                switch_result = await self._activate_workspace_locked(
-                    project_id=project_id,
-                    workspace_id=workspace_id,
-                    create_if_missing=False,
+                switch_result = await stack.enter_async_context(
+                    self.workspace_session(
+                        project_id=project_id,
+                        workspace_id=workspace_id,
+                        create_if_missing=False,
+                    )
                 )
             except Exception as e:
                 return self._operation_error(
@@ -4586,6 +6803,10 @@ class MaxRuntimeManager:
             "checkpoint_count": len(self.checkpoints),
             "checkpoint_journal_file": str(self.checkpoints_file),
             "checkpoint_journal_exists": self.checkpoints_file.exists(),
+            "checkpoint_store": self.checkpoint_store.stats(),
+            "checkpoint_journal_compactions": self.checkpoint_journal_compactions,
+            "checkpoint_restores": dict(self.checkpoint_restores),
+            "checkpoint_sources": dict(self.checkpoint_sources),
             "enforce_patch_roots": self.enforce_patch_roots,
             "allowed_patch_roots": [str(root) for root in self.allowed_patch_roots],
             "twin": self._twin_status_payload(),
@@ -4817,6 +7038,13 @@ class MaxHygieneManager:
         self.keep_recent_sessions = max(0, MAXMCP_HYGIENE_KEEP_RECENT_SESSIONS)
         self.last_run_at: float | None = None
         self.last_summary: dict = {}
+        self.totals = {
+            "sweeps": 0,
+            "processes_terminated": 0,
+            "sessions_deleted": 0,
+            "failed": 0,
+            "reclaimed_bytes": 0,
+        }
         self._events = deque(maxlen=self.report_max)
         self._lock = asyncio.Lock()
         self._startup_cleanup_ran = False
@@ -5214,9 +7442,10 @@ class MaxHygieneManager:
                 continue
             active = entry / "active.maxpat"
             scratch = entry / "scratch.maxpat"
-            checkpoints = entry / "checkpoints.json"
+            checkpoints = entry / "checkpoints.jsonl"
+            legacy_checkpoints = entry / "checkpoints.json"
             mtimes = [entry.stat().st_mtime]
-            for candidate in (active, scratch, checkpoints):
+            for candidate in (active, scratch, checkpoints, legacy_checkpoints):
                 if candidate.exists():
                     mtimes.append(candidate.stat().st_mtime)
             mtime_epoch = max(mtimes)
@@ -5231,7 +7460,7 @@ class MaxHygieneManager:
                     "age_seconds": round(age_seconds, 3),
                     "has_active": active.exists(),
                     "has_scratch": scratch.exists(),
-                    "has_checkpoints": checkpoints.exists(),
+                    "has_checkpoints": checkpoints.exists() or legacy_checkpoints.exists(),
                     "is_current_runtime_session": is_current,
                     "is_stale": (not is_current) and age_seconds >= self.stale_seconds,
                     "size_bytes": self._session_dir_size_bytes(entry),
@@ -5456,6 +7685,11 @@ class MaxHygieneManager:
     def _record_cleanup_result(self, summary: dict, events: list[dict]) -> None:
         self.last_run_at = time.time()
         self.last_summary = summary
+        self.totals["sweeps"] += 1
+        for key in ("processes_terminated", "sessions_deleted", "failed", "reclaimed_bytes"):
+            value = summary.get(key)
+            if isinstance(value, int):
+                self.totals[key] += value
         for row in events:
             if isinstance(row, dict):
                 event = dict(row)
@@ -5790,10 +8024,48 @@ class MaxHygieneManager:
             "policy": self.policy_snapshot(),
             "last_run_at": self.last_run_at,
             "last_summary": self.last_summary,
+            "totals": dict(self.totals),
             "events": list(self._events)[-bounded:],
             "report_file": str(self.report_file),
         }
 
+    def write_openmetrics(self, writer: MetricsWriter) -> None:
+        writer.gauge(
+            "hygiene_auto_cleanup",
+            self.auto_cleanup,
+            "Whether automatic hygiene cleanup is on.",
+        )
+        writer.gauge(
+            "hygiene_last_run_timestamp_seconds",
+            self.last_run_at,
+            "Last hygiene cleanup time.",
+        )
+        writer.counter(
+            "hygiene_sweeps",
+            self.totals["sweeps"],
+            "Hygiene cleanups recorded by this process.",
+        )
+        writer.counter(
+            "hygiene_processes_terminated",
+            self.totals["processes_terminated"],
+            "Max processes terminated by hygiene cleanup.",
+        )
+        writer.counter(
+            "hygiene_sessions_deleted",
+            self.totals["sessions_deleted"],
+            "Session directories deleted by hygiene cleanup.",
+        )
+        writer.counter(
+            "hygiene_failures",
+            self.totals["failed"],
+            "Hygiene cleanup actions that failed.",
+        )
+        writer.counter(
+            "hygiene_reclaimed_bytes",
+            self.totals["reclaimed_bytes"],
+            "Bytes reclaimed by hygiene cleanup.",
+        )
+
 
 def _is_protected_varname(varname: str) -> bool:
     return bool(varname and varname.startswith(PROTECTED_VARNAME_PREFIX))
@@ -5821,6 +8093,7 @@ async def _bridge_metrics_loop(maxmsp: MaxMSPConnection):
         await asyncio.sleep(maxmsp.metrics_log_interval_seconds)
         try:
             maxmsp.emit_metrics_log()
+            maxmsp.persist_latency_model()
         except Exception as e:
             logging.warning(f"Bridge metrics loop error: {e}")
 
@@ -5834,8 +8107,42 @@ async def _hygiene_loop(hygiene: MaxHygieneManager):
             logging.warning(f"Hygiene loop error: {e}")
 
 
+def _render_openmetrics(context: dict[str, Any]) -> str:
+    writer = MetricsWriter()
+    context["maxmsp"].write_openmetrics(writer)
+    context["runtime"].write_openmetrics(writer)
+    context["hygiene"].write_openmetrics(writer)
+    return writer.render()
+
+
+async def _start_metrics_http_server(context: dict[str, Any]) -> asyncio.AbstractServer | None:
+    if MAXMCP_METRICS_HTTP_PORT <= 0:
+        return None
+    try:
+        server = await serve_openmetrics(
+            MAXMCP_METRICS_HTTP_HOST,
+            MAXMCP_METRICS_HTTP_PORT,
+            lambda: _render_openmetrics(context),
+        )
+    except OSError as e:
+        logging.warning(
+            "OpenMetrics endpoint unavailable on %s:%s: %s",
+            MAXMCP_METRICS_HTTP_HOST,
+            MAXMCP_METRICS_HTTP_PORT,
+            e,
+        )
+        return None
+    logging.info(
+        "Serving OpenMetrics at http://%s:%s/metrics",
+        MAXMCP_METRICS_HTTP_HOST,
+        MAXMCP_METRICS_HTTP_PORT,
+    )
+    return server
+
+
 async def _build_lifespan_context() -> dict[str, Any]:
     maxmsp = MaxMSPConnection(SOCKETIO_SERVER_URL, SOCKETIO_SERVER_PORT, NAMESPACE)
+    maxmsp.load_latency_model(MAXMCP_STATE_DIR / "latency_model.json")
     runtime = MaxRuntimeManager(maxmsp)
     hygiene = MaxHygieneManager(runtime, maxmsp)
     maxmsp.runtime_manager = runtime
@@ -5850,7 +8157,7 @@ async def _build_lifespan_context() -> dict[str, Any]:
         logging.warning(
             f"Starting in degraded mode. {status.get('error', maxmsp._offline_error_message())}"
         )
-    return {
+    context = {
         "maxmsp": maxmsp,
         "runtime": runtime,
         "hygiene": hygiene,
@@ -5858,6 +8165,8 @@ async def _build_lifespan_context() -> dict[str, Any]:
         "metrics_task": metrics_task,
         "hygiene_task": hygiene_task,
     }
+    context["metrics_http_server"] = await _start_metrics_http_server(context)
+    return context
 
 
 async def _shutdown_lifespan_context(context: dict[str, Any]) -> None:
@@ -5868,6 +8177,7 @@ async def _shutdown_lifespan_context(context: dict[str, Any]) -> None:
     hygiene_task = context["hygiene_task"]
     logging.info("Shutting down connection")
     maxmsp.emit_metrics_log(force=True)
+    maxmsp.persist_latency_model()
     warmup_task = getattr(runtime, "_warmup_task", None)
     if warmup_task is not None and not warmup_task.done():
         warmup_task.cancel()
@@ -5891,6 +8201,10 @@ async def _shutdown_lifespan_context(context: dict[str, Any]) -> None:
         await hygiene_task
     except asyncio.CancelledError:
         pass
+    metrics_http_server = context.get("metrics_http_server")
+    if metrics_http_server is not None:
+        metrics_http_server.close()
+        await metrics_http_server.wait_closed()
     await maxmsp.disconnect()
 
 
@@ -6016,6 +8330,34 @@ async def _activate_workspace_scope(
     return runtime, maxmsp, None
 
 
+@asynccontextmanager
+async def _traced_lock(lock: asyncio.Lock, name: str = "workspace_lock"):
+    """Hold ``lock``, recording the wait for it as a span of the current trace."""
+    with span(name):
+        await lock.acquire()
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+@asynccontextmanager
+async def _locked_workspace_session(
+    runtime: Any,
+    *,
+    project_id: str,
+    workspace_id: str,
+    create_if_missing: bool,
+):
+    """Serialize on the runtime-wide lock and select the workspace on the bridge."""
+    async with _traced_lock(runtime._workspace_lock):
+        yield await runtime._activate_workspace_locked(
+            project_id=project_id,
+            workspace_id=workspace_id,
+            create_if_missing=create_if_missing,
+        )
+
+
 @asynccontextmanager
 async def _workspace_operation_scope(
     ctx: Context,
@@ -6048,13 +8390,31 @@ async def _workspace_operation_scope(
             },
         }
         return
-    async with runtime._workspace_lock:
-        try:
-            switch = await runtime._activate_workspace_locked(
-                project_id=project_id,
-                workspace_id=workspace_id,
-                create_if_missing=create_if_missing,
+    open_session = getattr(runtime, "workspace_session", None)
+    tracer = getattr(maxmsp, "tracer", None)
+    async with AsyncExitStack() as stack:
+        if tracer is not None:
+            stack.enter_context(
+                tracer.trace(
+                    "workspace_operation", project_id=project_id, workspace_id=workspace_id
+                )
             )
+        try:
+            if callable(open_session):
+                session = open_session(
+                    project_id=project_id,
+                    workspace_id=workspace_id,
+                    create_if_missing=create_if_missing,
+                )
+            else:
+                session = _locked_workspace_session(
+                    runtime,
+                    project_id=project_id,
+                    workspace_id=workspace_id,
+                    create_if_missing=create_if_missing,
+                )
+            with span("workspace_enter"):
+                switch = await stack.enter_async_context(session)
         except MaxMCPError as e:
             yield runtime, maxmsp, {"success": False, "error": e.to_dict()}
             return
@@ -6184,6 +8544,40 @@ def get_bridge_metrics(
     )
 
 
+@mcp.tool()
+def get_bridge_traces(
+    ctx: Context,
+    limit: int = 20,
+    chrome_format: bool = False,
+    write_file: bool = False,
+) -> dict:
+    """Return recent per-request stage traces (lock, queue, emit, bridge handoff, Max, twin sync).
+
+    With ``chrome_format`` the traces come back as Chrome trace-event JSON; with
+    ``write_file`` that JSON is also saved under the state dir for chrome://tracing or Perfetto.
+    """
+    maxmsp = ctx.request_context.lifespan_context.get("maxmsp")
+    if maxmsp is None:
+        return _error_result(
+            ERROR_BRIDGE_UNAVAILABLE,
+            "Bridge connection is unavailable in this MCP lifespan context.",
+            recoverable=True,
+        )
+    bounded = max(1, min(int(limit), 1000))
+    if not chrome_format and not write_file:
+        return maxmsp.traces_snapshot(limit=bounded)
+    chrome_trace = maxmsp.tracer.chrome_trace(bounded)
+    result: dict[str, Any] = {"enabled": maxmsp.tracer.enabled}
+    if write_file:
+        path = MAXMCP_STATE_DIR / "traces" / f"trace-{int(time.time() * 1000)}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_json_file(path, chrome_trace)
+        result["path"] = str(path)
+    if chrome_format:
+        result["chrome_trace"] = chrome_trace
+    return result
+
+
 @mcp.tool()
 def get_bridge_slo_report(
     ctx: Context,
@@ -6619,20 +9013,30 @@ async def dry_run_plan(
         project_id=project_id,
         workspace_id=workspace_id,
         create_if_missing=False,
-    ) as (_runtime, maxmsp, scope_error):
+    ) as (runtime, maxmsp, scope_error):
         if scope_error:
             return {"valid": False, "errors": [scope_error], "warnings": [], "steps": []}
         return await _dry_run_plan_impl(
             maxmsp=maxmsp,
+            runtime=runtime,
             steps=steps,
             engine=engine,
             unknown_action_policy=unknown_action_policy,
         )
 
 
+async def _read_patch_topology(runtime: Any, maxmsp: Any, *, timeout: float) -> Any:
+    """Read the workspace topology through the runtime's epoch-keyed cache when it has one."""
+    read_topology = getattr(runtime, "read_topology", None)
+    if callable(read_topology):
+        return await read_topology(timeout=timeout)
+    return await maxmsp.send_request({"action": "get_objects_in_patch"}, timeout=timeout)
+
+
 async def _dry_run_plan_impl(
     *,
     maxmsp: Any | None,
+    runtime: Any | None = None,
     steps: list[dict],
     engine: str,
     unknown_action_policy: str,
@@ -6641,10 +9045,7 @@ async def _dry_run_plan_impl(
     topology = None
     if maxmsp is not None:
         try:
-            context_response = await maxmsp.send_request(
-                {"action": "get_patcher_context"},
-                timeout=2.0,
-            )
+            context_response = await maxmsp.send_request({"action": "get_patcher_context"})
             if isinstance(context_response, dict):
                 starting_context = context_response
         except Exception:
@@ -6652,10 +9053,7 @@ async def _dry_run_plan_impl(
             pass
         if engine == "maxpy":
             try:
-                topology = await maxmsp.send_request(
-                    {"action": "get_objects_in_patch"},
-                    timeout=4.0,
-                )
+                topology = await _read_patch_topology(runtime, maxmsp, timeout=4.0)
             except Exception:
                 topology = None
 
@@ -7460,8 +9858,22 @@ async def run_patch_transaction(
     rollback_on_error: bool = True,
     checkpoint_label: str = "",
     idempotency_seed: str = "",
+    checkpoint_mode: str = "twin_verified",
 ) -> dict:
-    """Execute a multi-step patch transaction with optional rollback on failure."""
+    """Execute a multi-step patch transaction with optional rollback on failure.
+
+    checkpoint_mode: "twin_verified" (default) checkpoints from the local twin with no
+    bridge calls when it is known in sync and confirms the restored hash on rollback;
+    "twin" skips that confirmation; "live" always captures the patch first.
+    """
+    mode = (checkpoint_mode or "twin_verified").strip().lower()
+    if mode not in TRANSACTION_CHECKPOINT_MODES:
+        return _error_result(
+            ERROR_VALIDATION,
+            "checkpoint_mode must be one of: twin_verified, twin, live.",
+            recoverable=True,
+            details={"checkpoint_mode": checkpoint_mode},
+        )
     async with _workspace_operation_scope(
         ctx,
         project_id=project_id,
@@ -7475,6 +9887,7 @@ async def run_patch_transaction(
 
         preflight = await _dry_run_plan_impl(
             maxmsp=maxmsp,
+            runtime=runtime,
             steps=steps,
             engine=dry_run_engine,
             unknown_action_policy="error",
@@ -7488,7 +9901,10 @@ async def run_patch_transaction(
                 "workspace_id": workspace_id,
             }
 
-        checkpoint = await runtime.create_checkpoint(label=checkpoint_label or "transaction")
+        checkpoint = await runtime.create_checkpoint(
+            label=checkpoint_label or "transaction",
+            source="live" if mode == "live" else "twin",
+        )
         if not checkpoint.get("success"):
             return {
                 "success": False,
@@ -7548,7 +9964,10 @@ async def run_patch_transaction(
                 )
                 rollback_result = None
                 if rollback_on_error:
-                    rollback_result = await runtime.restore_checkpoint(checkpoint["checkpoint_id"])
+                    rollback_result = await runtime.restore_checkpoint(
+                        checkpoint["checkpoint_id"],
+                        verify=mode == "twin_verified" and checkpoint.get("source") == "twin",
+                    )
                 return {
                     "success": False,
                     "transaction_id": tx_id,
@@ -7574,6 +9993,103 @@ async def run_patch_transaction(
             "post_transaction_drift": drift,
         }
 
+
+@mcp.tool()
+async def run_batch_actions(
+    ctx: Context,
+    project_id: str,
+    workspace_id: str,
+    steps: list[dict],
+    stop_on_error: bool = True,
+) -> dict:
+    """Send several patch steps to Max in one bridge round trip, without checkpoint or rollback.
+
+    Steps use the run_patch_transaction format; up to MAXMCP_BATCH_MAX_ITEMS steps share
+    each request envelope, and every step reports its own result or error.
+    """
+    payloads: list[dict] = []
+    timeout = 0.0
+    try:
+        for idx, raw_step in enumerate(steps if isinstance(steps, list) else []):
+            step_index = idx + 1
+            action = raw_step.get("action") if isinstance(raw_step, dict) else None
+            params = raw_step.get("params", {}) if isinstance(raw_step, dict) else None
+            if not isinstance(action, str) or not isinstance(params, dict):
+                raise MaxMCPError(
+                    ERROR_VALIDATION,
+                    f"Step {step_index}: each step must be an object with action + params.",
+                    recoverable=False,
+                )
+            payload, step_timeout = _build_transaction_bridge_request(step_index, action, params)
+            payloads.append(payload)
+            timeout += step_timeout
+    except MaxMCPError as e:
+        return _error_result(
+            e.code,
+            e.message,
+            hint=e.hint,
+            recoverable=e.recoverable,
+            details={**(e.details or {}), "project_id": project_id, "workspace_id": workspace_id},
+        )
+    if not payloads:
+        return _error_result(
+            ERROR_VALIDATION,
+            "steps must be a non-empty list.",
+            recoverable=True,
+            details={"project_id": project_id, "workspace_id": workspace_id},
+        )
+
+    async with _workspace_operation_scope(
+        ctx,
+        project_id=project_id,
+        workspace_id=workspace_id,
+        create_if_missing=False,
+    ) as (_runtime, maxmsp, error):
+        if error:
+            return error
+        assert maxmsp is not None
+        chunk_size = max(1, int(getattr(maxmsp, "batch_max_items", len(payloads))))
+        outcomes: list[dict] = []
+        envelopes = 0
+        batched = True
+        halted = False
+        for start in range(0, len(payloads), chunk_size):
+            chunk = payloads[start : start + chunk_size]
+            if halted:
+                outcomes.extend(
+                    MaxMSPConnection._skipped_batch_item(start + offset, item["action"])
+                    for offset, item in enumerate(chunk)
+                )
+                continue
+            try:
+                result = await maxmsp.send_batch(
+                    chunk,
+                    timeout=timeout * len(chunk) / len(payloads),
+                    stop_on_error=stop_on_error,
+                )
+            except MaxMCPError as e:
+                return {
+                    "success": False,
+                    "error": e.to_dict(),
+                    "steps_completed": sum(1 for item in outcomes if item.get("success")),
+                    "items": outcomes,
+                    "project_id": project_id,
+                    "workspace_id": workspace_id,
+                }
+            envelopes += 1
+            batched = batched and bool(result.get("batched"))
+            for item in result.get("items", []):
+                outcomes.append({**item, "index": start + int(item.get("index", 0))})
+            halted = stop_on_error and not result.get("success")
+        summary = MaxMSPConnection._batch_summary(outcomes, batched=batched)
+        return {
+            **summary,
+            "envelopes": envelopes,
+            "project_id": project_id,
+            "workspace_id": workspace_id,
+        }
+
+
 async def _ensure_preflight_for_add(maxmsp: Any) -> dict:
     mode = MAXMCP_PREFLIGHT_MODE
     if mode == "manual":
@@ -7603,7 +10119,7 @@ async def _ensure_preflight_for_add(maxmsp: Any) -> dict:
                 "age_seconds": round(age, 3),
             }
 
-    raw_rect = await maxmsp.send_request({"action": "get_avoid_rect_position"}, timeout=2.0)
+    raw_rect = await maxmsp.send_request({"action": "get_avoid_rect_position"})
     avoid_rect, valid = _normalize_avoid_rect_payload(raw_rect)
     if not valid:
         try:
@@ -8466,14 +10982,14 @@ async def get_patch_context(
         project_id=project_id,
         workspace_id=workspace_id,
         create_if_missing=False,
-    ) as (_runtime, maxmsp, error):
+    ) as (runtime, maxmsp, error):
         if error:
             return error
         assert maxmsp is not None
-        patch = await maxmsp.send_request({"action": "get_objects_in_patch"}, timeout=8.0)
+        patch = await _read_patch_topology(runtime, maxmsp, timeout=8.0)
         context = None
         if include_hierarchy:
-            context = await maxmsp.send_request({"action": "get_patcher_context"}, timeout=2.0)
+            context = await maxmsp.send_request({"action": "get_patcher_context"})
     summary = {
         "object_count": 0,
         "connection_count": 0,
@@ -8520,13 +11036,13 @@ async def qa_audit_patch(
         project_id=project_id,
         workspace_id=workspace_id,
         create_if_missing=False,
-    ) as (_runtime, maxmsp, error):
+    ) as (runtime, maxmsp, error):
         if error:
             return error
         assert maxmsp is not None
 
         try:
-            topology = await maxmsp.send_request({"action": "get_objects_in_patch"}, timeout=8.0)
+            topology = await _read_patch_topology(runtime, maxmsp, timeout=8.0)
         except MaxMCPError as exc:
             return {"success": False, "error": exc.to_dict()}
         except Exception as exc:
@@ -8737,7 +11253,7 @@ async def validate_publish_readiness(
         assert maxmsp is not None
 
         try:
-            topology = await maxmsp.send_request({"action": "get_objects_in_patch"}, timeout=8.0)
+            topology = await _read_patch_topology(runtime, maxmsp, timeout=8.0)
         except MaxMCPError as exc:
             return {"success": False, "error": exc.to_dict()}
         except Exception as exc:
@@ -4,6 +4,7 @@ import os
 import tempfile
 import time
 import unittest
+import zlib
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
@@ -35,12 +36,14 @@ from server import (
     get_avoid_rect_position,
     get_bridge_slo_report,
     get_object_schema,
+    get_patch_context,
     maxpy_catalog,
     search_objects,
     qa_audit_patch,
     diff_patch_summary,
     validate_publish_readiness,
     dry_run_plan,
+    run_batch_actions,
     run_patch_transaction,
 )
 
@@ -154,6 +157,39 @@ class ProtocolTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(payload["action"], "health_ping")
         self.assertEqual(payload["payload"], {})
 
+    async def test_post_action_hook_runs_after_slots_are_released(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        seen = []
+
+        class RuntimeHook:
+            managed_mode = False
+
+            async def after_successful_action(self, action, payload, results, *, meta=None):
+                seen.append(
+                    (
+                        action,
+                        conn._bridge_scheduler.inflight,  # noqa: SLF001
+                        conn._mutation_scheduler.inflight,  # noqa: SLF001
+                    )
+                )
+
+        async def handler(_event, payload, _namespace):
+            req_id = payload["request_id"]
+            conn._pending[req_id].set_result(
+                {
+                    "protocol_version": "2.0",
+                    "request_id": req_id,
+                    "state": "succeeded",
+                    "results": {"ok": True},
+                }
+            )
+
+        conn.runtime_manager = RuntimeHook()
+        conn.sio = FakeSocketClient(handler=handler)
+        await conn.send_request({"action": "add_object", "payload": {}}, timeout=1.0)
+
+        self.assertEqual(seen[-1], ("add_object", 0, 0))
+
     def test_build_request_envelope_does_not_mirror_payload_fields(self):
         conn = MaxMSPConnection("http://127.0.0.1", "5002")
         envelope = conn._build_request_envelope(  # noqa: SLF001
@@ -350,6 +386,147 @@ class ProtocolTests(unittest.IsolatedAsyncioTestCase):
             await conn.send_request({"action": "health_ping"}, timeout=0.01)
         self.assertEqual(ctx.exception.code, ERROR_BRIDGE_TIMEOUT)
 
+    async def test_send_request_timeout_propagates_deadline_and_cancels(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        on_response = conn.sio.handlers[conn.namespace]["response"]
+        conn.sio = FakeSocketClient(handler=None)
+        before_ms = int(time.time() * 1000)
+        with self.assertRaises(MaxMCPError):
+            await conn.send_request({"action": "health_ping"}, timeout=0.05)
+
+        events = [event for event, _data, _ns in conn.sio.emits]
+        self.assertEqual(events, ["request", "cancel"])
+        request = conn.sio.emits[0][1]
+        self.assertGreaterEqual(request["deadline_ms"], before_ms)
+        self.assertLessEqual(request["deadline_ms"], int(time.time() * 1000) + 1)
+        cancel = conn.sio.emits[1][1]
+        self.assertEqual(cancel["request_id"], request["request_id"])
+        self.assertEqual(cancel["reason"], "timeout")
+
+        # A response for the abandoned request is counted but otherwise ignored.
+        await on_response(
+            {"request_id": request["request_id"], "state": "succeeded", "results": {}}
+        )
+        deadlines = conn.metrics_snapshot()["deadlines"]
+        self.assertEqual(deadlines["cancels_sent"], 1)
+        self.assertEqual(deadlines["late_responses"], 1)
+
+    async def test_send_request_records_stage_spans_with_bridge_timings(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.read_cache_ttl_seconds = 0.0
+        on_response = conn.sio.handlers[conn.namespace]["response"]
+
+        async def handler(_event, data, _namespace):
+            await on_response(
+                {
+                    "protocol_version": conn.protocol_version,
+                    "request_id": data["request_id"],
+                    "state": "succeeded",
+                    "results": {},
+                    "meta": {
+                        "bridge_timings": {"handoff_ms": 0.5, "max_ms": 2.0},
+                        "max_execute_ms": 1.0,
+                    },
+                }
+            )
+
+        conn.sio = FakeSocketClient(handler=handler)
+        await conn.send_request({"action": "get_objects_in_patch"})
+
+        traces = conn.traces_snapshot()["traces"]
+        self.assertEqual(len(traces), 1)
+        self.assertEqual(traces[0]["name"], "get_objects_in_patch")
+        spans = {row["name"]: row for row in traces[0]["spans"]}
+        for stage in ("queue_wait", "encode", "emit", "await_response", "decode_response"):
+            self.assertIn(stage, spans)
+        self.assertEqual(spans["bridge.handoff"]["args"]["reported_ms"], 0.5)
+        self.assertEqual(spans["max.execute"]["args"]["reported_ms"], 1.0)
+        self.assertEqual(conn._response_timings, {})
+
+        chrome = conn.tracer.chrome_trace()
+        complete = [event for event in chrome["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual(len(complete), len(traces[0]["spans"]) + 1)
+        root = complete[0]
+        for event in complete[1:]:
+            self.assertGreaterEqual(event["ts"], root["ts"])
+            self.assertLessEqual(event["ts"] + event["dur"], root["ts"] + root["dur"] + 0.01)
+
+    async def test_default_timeouts_adapt_to_observed_latency_and_persist(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.read_cache_ttl_seconds = 0.0
+        conn.latency_model.min_samples = 3
+        payload = {"action": "get_objects_in_patch"}
+        self.assertEqual(conn._default_timeout_for_action("get_objects_in_patch", payload), 8.0)
+
+        async def handler(_event, data, _namespace):
+            conn._pending[data["request_id"]].set_result(
+                {"request_id": data["request_id"], "state": "succeeded", "results": {}}
+            )
+
+        conn.sio = FakeSocketClient(handler=handler)
+        for _ in range(3):
+            await conn.send_request(dict(payload))
+        learned = conn._default_timeout_for_action("get_objects_in_patch", payload)
+        self.assertEqual(learned, conn.latency_model.min_seconds)
+        timeouts = conn.metrics_snapshot()["timeouts"]
+        self.assertEqual(timeouts["actions"]["get_objects_in_patch"]["0"]["samples"], 3)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            model_file = Path(tmp) / "latency_model.json"
+            conn.latency_model_file = model_file
+            conn.persist_latency_model()
+            restarted = MaxMSPConnection("http://127.0.0.1", "5002")
+            restarted.latency_model.min_samples = 3
+            self.assertGreaterEqual(restarted.load_latency_model(model_file), 2)
+            self.assertEqual(
+                restarted._default_timeout_for_action("get_objects_in_patch", payload), learned
+            )
+
+    async def test_mutation_concurrency_follows_aimd_signals(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.capabilities = {"supported_actions": ["move_object"]}
+        conn.mutation_max_inflight = 1
+        bridge_inflight = {"value": 0}
+
+        async def handler(_event, data, _namespace):
+            conn._pending[data["request_id"]].set_result(
+                {
+                    "request_id": data["request_id"],
+                    "state": "succeeded",
+                    "results": {},
+                    "meta": {"bridge_inflight": bridge_inflight["value"], "bridge_max_inflight": 4},
+                }
+            )
+
+        conn.sio = FakeSocketClient(handler=handler)
+        move = {"action": "move_object", "varname": "a", "position": [0, 0]}
+        await conn.send_request(dict(move))
+        self.assertEqual(conn.mutation_max_inflight, 2)
+
+        # A busy Node bridge holds the limit even though local latency looks fine.
+        bridge_inflight["value"] = 4
+        for _ in range(4):
+            await conn.send_request(dict(move))
+        self.assertEqual(conn.mutation_max_inflight, 2)
+
+        conn.sio = FakeSocketClient(handler=None)
+        with self.assertRaises(MaxMCPError):
+            await conn.send_request(dict(move), timeout=0.02)
+        self.assertEqual(conn.mutation_max_inflight, 1)
+        adaptive = conn.metrics_snapshot()["mutation_queue"]["adaptive"]
+        self.assertEqual(
+            [(row["to"], row["reason"]) for row in adaptive["history"]],
+            [(2, "healthy_round"), (1, "timeout")],
+        )
+        self.assertEqual(adaptive["bridge_queue_depth"], {"inflight": 4, "max_inflight": 4})
+
+    def test_mutation_aimd_ceiling_leaves_a_bridge_slot_free(self):
+        with patch.object(server_module, "MAXMCP_BRIDGE_MAX_INFLIGHT", 4), patch.object(
+            server_module, "MAXMCP_MUTATION_AIMD_MAX_INFLIGHT", 8
+        ):
+            conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        self.assertEqual(conn._mutation_concurrency.maximum, 3)  # noqa: SLF001
+
     async def test_send_request_timeout_budget_exhausted_by_queue_wait(self):
         conn = MaxMSPConnection("http://127.0.0.1", "5002")
         conn.sio = FakeSocketClient(handler=None)
@@ -375,6 +552,29 @@ class ProtocolTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(ctx.exception.code, ERROR_BRIDGE_TIMEOUT)
         self.assertEqual(len(conn.sio.emits), 0)
         self.assertGreaterEqual(conn.total_timeouts, 1)
+        # Time spent queued counts toward the learned budget.
+        samples = conn.latency_model.snapshot()["actions"]["add_object"]
+        self.assertGreaterEqual(next(iter(samples.values()))["p99_ms"], 200.0)
+
+    async def test_queue_slot_timeouts_are_recorded_as_censored_latency(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.sio = FakeSocketClient(handler=None)
+
+        async def slow_lane_slots(lane, action, _deadline):
+            await asyncio.sleep(0.05)
+            raise MaxMCPError(
+                ERROR_OVERLOADED,
+                f"Timed out waiting for a bridge {lane} lane slot.",
+                details={"lane": lane, "queue_timeout": True},
+            )
+
+        conn._acquire_lane_slots = slow_lane_slots  # type: ignore[method-assign]
+        with self.assertRaises(MaxMCPError):
+            await conn.send_request({"action": "get_objects_in_patch"}, timeout=1.0)
+        window = conn.latency_model.snapshot()["actions"]["get_objects_in_patch"]["0"]
+        self.assertEqual(window["samples"], 1)
+        self.assertGreaterEqual(window["p99_ms"], 50.0)
+        self.assertEqual(len(conn.sio.emits), 0)
 
     async def test_idempotency_cache_prevents_duplicate_emit(self):
         conn = MaxMSPConnection("http://127.0.0.1", "5002")
@@ -440,16 +640,25 @@ class ProtocolTests(unittest.IsolatedAsyncioTestCase):
         conn = MaxMSPConnection("http://127.0.0.1", "5002")
         conn.sio = FakeSocketClient(handler=None)
         conn.capabilities = {"supported_actions": ["add_object"]}
-        conn._mutation_waiters.clear()
-        for i in range(conn.mutation_max_queue):
-            conn._mutation_waiters.append(f"queued-{i}")
-        conn._queued_mutation_requests = len(conn._mutation_waiters)
+        conn.mutation_max_inflight = 1
+        conn.mutation_max_queue = 2
+        await conn._acquire_mutation_slot("add_object")
+        queued = [
+            asyncio.create_task(conn._acquire_mutation_slot("add_object"))
+            for _ in range(conn.mutation_max_queue)
+        ]
+        await asyncio.sleep(0)
+        self.assertEqual(conn._queued_mutation_requests, conn.mutation_max_queue)
         with self.assertRaises(MaxMCPError) as ctx:
             await conn.send_request(
                 {"action": "add_object", "position": [0, 0], "obj_type": "button", "varname": "a"},
                 timeout=0.1,
             )
         self.assertEqual(ctx.exception.code, ERROR_OVERLOADED)
+        for task in queued:
+            task.cancel()
+        await asyncio.gather(*queued, return_exceptions=True)
+        self.assertEqual(conn._queued_mutation_requests, 0)
 
     async def test_metrics_snapshot_tracks_action_counts(self):
         conn = MaxMSPConnection("http://127.0.0.1", "5002")
@@ -477,9 +686,6 @@ class ProtocolTests(unittest.IsolatedAsyncioTestCase):
         conn = MaxMSPConnection("http://127.0.0.1", "5002")
         conn.mutation_max_inflight = 1
         conn.mutation_max_queue = 8
-        conn._mutation_waiters.clear()
-        conn._queued_mutation_requests = 0
-        conn._inflight_mutation_requests = 0
         conn.capabilities = {"supported_actions": ["add_object"]}
         seen = []
 
@@ -522,6 +728,308 @@ class ProtocolTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(seen, ["fifo_1", "fifo_2", "fifo_3"])
         self.assertEqual([r["varname"] for r in results], ["fifo_1", "fifo_2", "fifo_3"])
 
+    async def test_concurrent_identical_reads_share_one_bridge_round_trip(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.capabilities = {"supported_actions": ["get_objects_in_patch", "add_object"]}
+        held = []
+
+        async def handler(_event, payload, _namespace):
+            req_id = payload["request_id"]
+            if payload["action"] == "get_objects_in_patch":
+                held.append(req_id)
+                return
+            conn._pending[req_id].set_result(
+                {"protocol_version": "2.0", "request_id": req_id, "state": "succeeded", "results": {}}
+            )
+
+        fake_sio = FakeSocketClient(handler=handler)
+        conn.sio = fake_sio
+        readers = [
+            asyncio.create_task(conn.send_request({"action": "get_objects_in_patch"}, timeout=1.0))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        self.assertEqual(len(held), 1)
+        conn._pending[held[0]].set_result(
+            {
+                "protocol_version": "2.0",
+                "request_id": held[0],
+                "state": "succeeded",
+                "results": {"boxes": [{"box": {"varname": "a"}}], "lines": []},
+            }
+        )
+        results = await asyncio.gather(*readers)
+        self.assertEqual([len(r["boxes"]) for r in results], [1, 1, 1])
+        results[0]["boxes"].clear()
+        self.assertEqual(len(results[1]["boxes"]), 1)
+
+        cached = await conn.send_request({"action": "get_objects_in_patch"}, timeout=1.0)
+        self.assertEqual(cached["boxes"][0]["box"]["varname"], "a")
+        self.assertEqual(len(held), 1)
+
+        await conn.send_request(
+            {"action": "add_object", "position": [0, 0], "obj_type": "button", "varname": "b"},
+            timeout=1.0,
+        )
+        pending_read = asyncio.create_task(
+            conn.send_request({"action": "get_objects_in_patch"}, timeout=0.05)
+        )
+        with self.assertRaises(MaxMCPError):
+            await pending_read
+        self.assertEqual(len(held), 2)
+
+        metrics = conn.metrics_snapshot()["read_coalescing"]
+        self.assertEqual(metrics["bridge_requests"], 2)
+        self.assertEqual(metrics["coalesced"], 2)
+        self.assertEqual(metrics["cache_hits"], 1)
+        self.assertEqual(metrics["inflight"], 0)
+
+    async def test_request_framing_follows_node_hello_and_falls_back_to_json(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.capabilities = {"supported_actions": ["get_patcher_context"]}
+        self.assertEqual(conn.offered_framings[-1], "json")
+
+        conn._record_node_hello({"node_bridge_build_id": "b1", "framing": "cbor"})
+        self.assertEqual(conn.request_framing, "json")
+        conn.offered_framings = ["msgpack", "json"]
+        conn._record_node_hello({"framing": "msgpack"})
+        self.assertEqual(conn.request_framing, "msgpack")
+        # Broadcast hellos omit framing and must not reset the negotiated mode.
+        conn._record_node_hello({"node_bridge_build_id": "b2"})
+        self.assertEqual(conn.request_framing, "msgpack")
+        conn.offered_framings = ["json"]
+        conn._record_node_hello({"framing": "msgpack"})
+        self.assertEqual(conn.request_framing, "json")
+
+        async def handler(_event, payload, _namespace):
+            conn._pending[payload["request_id"]].set_result(
+                {
+                    "protocol_version": "2.0",
+                    "request_id": payload["request_id"],
+                    "state": "succeeded",
+                    "results": {"depth": 0},
+                }
+            )
+
+        fake_sio = FakeSocketClient(handler=handler)
+        conn.sio = fake_sio
+        self.assertEqual(await conn.send_request({"action": "get_patcher_context"}), {"depth": 0})
+        self.assertIsInstance(fake_sio.emits[0][1], dict)
+        framing_metrics = conn.metrics_snapshot()["framing"]
+        self.assertEqual(framing_metrics["mode"], "json")
+        self.assertEqual(framing_metrics["frames_sent"], 0)
+
+    async def test_negotiated_compression_wraps_large_envelopes_both_ways(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.capabilities = {"supported_actions": ["apply_topology_snapshot", "get_patcher_context"]}
+        on_response = conn.sio.handlers[conn.namespace]["response"]
+        conn.offered_compressions = ["zlib"]
+        conn.compress_min_bytes = 1024
+        conn._record_node_hello({"framing": "json", "compression": "zlib"})
+        self.assertEqual(conn.request_compression, "zlib")
+        boxes = [
+            {"box": {"maxclass": "newobj", "varname": f"obj_{i}", "patching_rect": [10, i, 80, 22]}}
+            for i in range(200)
+        ]
+        frames = []
+
+        async def handler(_event, frame, _namespace):
+            frames.append(frame)
+            request = json.loads(zlib.decompress(frame["data"])) if "compression" in frame else frame
+            response = {
+                "protocol_version": "2.0",
+                "request_id": request["request_id"],
+                "state": "succeeded",
+                "results": {"boxes": boxes} if request["action"] == "apply_topology_snapshot" else {},
+            }
+            body = json.dumps(response).encode("utf-8")
+            if len(body) >= conn.compress_min_bytes:
+                await on_response(
+                    {"compression": "zlib", "framing": "json", "raw_bytes": len(body), "data": zlib.compress(body)}
+                )
+            else:
+                await on_response(response)
+
+        conn.sio = FakeSocketClient(handler=handler)
+        results = await conn.send_request(
+            {"action": "apply_topology_snapshot", "topology": {"boxes": boxes, "lines": []}},
+            timeout=1.0,
+        )
+        self.assertEqual(len(results["boxes"]), 200)
+        self.assertEqual(frames[0]["compression"], "zlib")
+        self.assertEqual(frames[0]["framing"], "json")
+        await conn.send_request({"action": "get_patcher_context"}, timeout=1.0)
+        self.assertNotIn("compression", frames[1])
+
+        metrics = conn.metrics_snapshot()["compression"]
+        self.assertEqual(metrics["mode"], "zlib")
+        self.assertEqual(metrics["sent"]["frames"], 1)
+        self.assertEqual(metrics["received"]["frames"], 1)
+        self.assertLess(metrics["sent"]["ratio"], 0.5)
+        self.assertGreater(metrics["received"]["raw_bytes"], metrics["received"]["wire_bytes"])
+
+    async def test_request_lanes_cap_bulk_reads_and_grant_health_first(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.capabilities = {
+            "supported_actions": ["get_objects_in_selected", "get_patcher_context", "health_ping"]
+        }
+        conn._bridge_scheduler.max_inflight = 2
+        held = []
+        emitted = []
+
+        async def handler(_event, payload, _namespace):
+            emitted.append(payload["action"])
+            held.append(payload["request_id"])
+
+        conn.sio = FakeSocketClient(handler=handler)
+
+        def release_next():
+            req_id = held.pop(0)
+            conn._pending[req_id].set_result(
+                {"protocol_version": "2.0", "request_id": req_id, "state": "succeeded", "results": {}}
+            )
+
+        bulk = [
+            asyncio.create_task(conn.send_request({"action": "get_objects_in_selected"}, timeout=1.0))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        self.assertEqual(emitted, ["get_objects_in_selected"] * 2)
+        self.assertEqual(conn.lane_snapshot()["lanes"]["bulk"]["queued"], 1)
+
+        read = asyncio.create_task(conn.send_request({"action": "get_patcher_context"}, timeout=1.0))
+        ping = asyncio.create_task(conn.send_request({"action": "health_ping"}, timeout=1.0))
+        await asyncio.sleep(0.01)
+        self.assertEqual(conn._bridge_scheduler.queued, 2)
+
+        release_next()
+        await asyncio.sleep(0.01)
+        release_next()
+        await asyncio.sleep(0.01)
+        self.assertEqual(emitted[2:], ["health_ping", "get_patcher_context"])
+        while held:
+            release_next()
+            await asyncio.sleep(0.01)
+        await asyncio.gather(*bulk, read, ping)
+        self.assertEqual(emitted[-1], "get_objects_in_selected")
+
+        snapshot = conn.metrics_snapshot()["lanes"]
+        self.assertEqual(snapshot["bridge"]["inflight"], 0)
+        self.assertEqual(snapshot["lanes"]["bulk"]["queue_wait_ms"]["samples"], 3)
+        self.assertGreater(snapshot["lanes"]["bulk"]["queue_wait_ms"]["p99"], 0.0)
+        self.assertEqual(snapshot["lanes"]["health"]["priority"], 0)
+        self.assertEqual(snapshot["lanes"]["mutation"]["max_inflight"], conn.mutation_max_inflight)
+
+    async def test_send_batch_reports_partial_failures_in_one_envelope(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.capabilities = {
+            "supported_actions": ["batch", "add_object", "connect_objects", "get_patcher_context"]
+        }
+        slot_actions = []
+        original_acquire = conn._acquire_mutation_slot
+
+        async def tracking_acquire(action):
+            slot_actions.append(action)
+            return await original_acquire(action)
+
+        conn._acquire_mutation_slot = tracking_acquire  # type: ignore[method-assign]
+
+        async def handler(_event, payload, _namespace):
+            req_id = payload["request_id"]
+            items = payload["payload"]["items"]
+            conn._pending[req_id].set_result(
+                {
+                    "protocol_version": "2.0",
+                    "request_id": req_id,
+                    "state": "succeeded",
+                    "results": {
+                        "items": [
+                            {"index": 0, "action": items[0]["action"], "state": "succeeded", "results": {"ok": True}},
+                            {
+                                "index": 1,
+                                "action": items[1]["action"],
+                                "state": "failed",
+                                "error": {"code": "OBJECT_NOT_FOUND", "message": "missing", "details": {}},
+                            },
+                            {"index": 2, "action": items[2]["action"], "state": "succeeded", "results": {"depth": 0}},
+                        ]
+                    },
+                }
+            )
+
+        fake_sio = FakeSocketClient(handler=handler)
+        conn.sio = fake_sio
+        result = await conn.send_batch(
+            [
+                {"action": "add_object", "position": [0, 0], "obj_type": "button", "varname": "a"},
+                {"action": "connect_objects", "src_varname": "a", "dst_varname": "zz"},
+                {"action": "get_patcher_context"},
+            ],
+            timeout=1.0,
+        )
+
+        self.assertEqual(len(fake_sio.emits), 1)
+        envelope = fake_sio.emits[0][1]
+        self.assertEqual(envelope["action"], "batch")
+        self.assertEqual(envelope["payload"]["items"][0]["payload"]["varname"], "a")
+        self.assertEqual(slot_actions, ["batch"])
+        self.assertTrue(result["batched"])
+        self.assertFalse(result["success"])
+        self.assertEqual((result["succeeded"], result["failed"], result["skipped"]), (2, 1, 0))
+        self.assertEqual(result["items"][1]["error"]["code"], "OBJECT_NOT_FOUND")
+        metrics = conn.metrics_snapshot()
+        self.assertEqual(metrics["actions"]["connect_objects"]["failed"], 1)
+        self.assertEqual(metrics["batch"]["requests"], 1)
+        self.assertEqual(metrics["batch"]["item_failures"], 1)
+
+    async def test_send_batch_falls_back_to_sequential_requests(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.capabilities = {"supported_actions": ["get_patcher_context", "get_object_attributes"]}
+
+        async def handler(_event, payload, _namespace):
+            req_id = payload["request_id"]
+            if payload["action"] == "get_object_attributes":
+                response = {
+                    "protocol_version": "2.0",
+                    "request_id": req_id,
+                    "state": "failed",
+                    "error": {"code": "OBJECT_NOT_FOUND", "message": "missing"},
+                }
+            else:
+                response = {
+                    "protocol_version": "2.0",
+                    "request_id": req_id,
+                    "state": "succeeded",
+                    "results": {"ok": True},
+                }
+            conn._pending[req_id].set_result(response)
+
+        fake_sio = FakeSocketClient(handler=handler)
+        conn.sio = fake_sio
+        result = await conn.send_batch(
+            [
+                {"action": "get_object_attributes", "varname": "nope"},
+                {"action": "get_patcher_context"},
+            ],
+            timeout=1.0,
+            stop_on_error=True,
+        )
+
+        self.assertEqual([emit[1]["action"] for emit in fake_sio.emits], ["get_object_attributes"])
+        self.assertFalse(result["batched"])
+        self.assertEqual((result["succeeded"], result["failed"], result["skipped"]), (0, 1, 1))
+        self.assertTrue(result["items"][1]["skipped"])
+        self.assertEqual(conn.batch_sequential_fallbacks, 1)
+
+    async def test_send_batch_rejects_nested_batch_items(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        fake_sio = FakeSocketClient(handler=None)
+        conn.sio = fake_sio
+        with self.assertRaises(MaxMCPError) as ctx:
+            await conn.send_batch([{"action": "batch", "items": []}], timeout=0.1)
+        self.assertEqual(ctx.exception.code, ERROR_VALIDATION)
+        self.assertEqual(fake_sio.emits, [])
+
     async def test_start_server_sends_auth_token_in_handshake(self):
         conn = MaxMSPConnection("http://127.0.0.1", "5002")
         conn.auth_token = "handshake-token"
@@ -614,12 +1122,13 @@ class ProtocolTests(unittest.IsolatedAsyncioTestCase):
                     "state": "succeeded",
                 }
             )
-        conn._latency_samples.extend(healthy_samples)
+        for sample in healthy_samples:
+            conn._latency.record(**sample)
         conn._queued_mutation_requests = 0
         healthy_metrics = conn.metrics_snapshot()
         self.assertEqual(healthy_metrics.get("alerts"), [])
 
-        conn._latency_samples.clear()
+        conn._latency.clear()
         unhealthy_samples = []
         for i in range(20):
             unhealthy_samples.append(
@@ -629,16 +1138,18 @@ class ProtocolTests(unittest.IsolatedAsyncioTestCase):
                     "timestamp": now,
                     "action": "add_object",
                     "state": "failed" if i % 2 == 0 else "timeout",
-                    "code": ERROR_BRIDGE_TIMEOUT,
                 }
             )
-        conn._latency_samples.extend(unhealthy_samples)
+        for sample in unhealthy_samples:
+            conn._latency.record(**sample)
         conn._queued_mutation_requests = conn.mutation_max_queue
         unhealthy_metrics = conn.metrics_snapshot()
         alert_codes = {a.get("code") for a in unhealthy_metrics.get("alerts", [])}
         self.assertIn("ALERT_FAILURE_RATE", alert_codes)
         self.assertIn("ALERT_P95_LATENCY", alert_codes)
         self.assertIn("ALERT_QUEUE_SATURATION", alert_codes)
+        self.assertIn("ALERT_ERROR_BUDGET_BURN", alert_codes)
+        self.assertEqual(unhealthy_metrics["rolling_windows"]["short_request_count"], 20)
 
     def test_emit_metrics_log_sets_timestamp(self):
         conn = MaxMSPConnection("http://127.0.0.1", "5002")
@@ -911,34 +1422,31 @@ class BridgeSLOTests(unittest.TestCase):
     def test_get_bridge_slo_report_with_series(self):
         conn = MaxMSPConnection("http://127.0.0.1", "5002")
         now = time.time()
-        conn._latency_samples.clear()
-        conn._latency_samples.extend(
-            [
-                {
-                    "duration_ms": 40.0,
-                    "queue_wait_ms": 2.0,
-                    "timestamp": now - 40.0,
-                    "action": "health_ping",
-                    "state": "succeeded",
-                },
-                {
-                    "duration_ms": 75.0,
-                    "queue_wait_ms": 4.0,
-                    "timestamp": now - 20.0,
-                    "action": "add_object",
-                    "state": "failed",
-                    "code": ERROR_INTERNAL,
-                },
-                {
-                    "duration_ms": 65.0,
-                    "queue_wait_ms": 3.0,
-                    "timestamp": now - 5.0,
-                    "action": "add_object",
-                    "state": "timeout",
-                    "code": ERROR_BRIDGE_TIMEOUT,
-                },
-            ]
-        )
+        conn._latency.clear()
+        for sample in [
+            {
+                "duration_ms": 40.0,
+                "queue_wait_ms": 2.0,
+                "timestamp": now - 40.0,
+                "action": "health_ping",
+                "state": "succeeded",
+            },
+            {
+                "duration_ms": 75.0,
+                "queue_wait_ms": 4.0,
+                "timestamp": now - 20.0,
+                "action": "add_object",
+                "state": "failed",
+            },
+            {
+                "duration_ms": 65.0,
+                "queue_wait_ms": 3.0,
+                "timestamp": now - 5.0,
+                "action": "add_object",
+                "state": "timeout",
+            },
+        ]:
+            conn._latency.record(**sample)
         ctx = SimpleNamespace(
             request_context=SimpleNamespace(lifespan_context={"maxmsp": conn})
         )
@@ -1621,6 +2129,31 @@ class HygieneInventoryTests(unittest.TestCase):
         self.assertEqual(MaxHygieneManager._parse_elapsed_seconds("1-00:00:01"), 86401)
         self.assertIsNone(MaxHygieneManager._parse_elapsed_seconds("bad"))
 
+    def test_openmetrics_render_reads_local_state_only(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.sio = FakeSocketClient()
+        runtime = MaxRuntimeManager(conn)
+        hygiene = MaxHygieneManager(runtime, conn)
+        conn.action_request_counts["add_object"] = 3
+        conn.action_failure_counts["add_object"] = 1
+        conn._latency.record(duration_ms=12.0, action="add_object", lane="mutation")
+        conn._latency.record(duration_ms=4000.0, action="add_object", lane="mutation", state="failed")
+        hygiene.totals["sweeps"] = 2
+
+        text = server_module._render_openmetrics(
+            {"maxmsp": conn, "runtime": runtime, "hygiene": hygiene}
+        )
+        self.assertEqual(conn.sio.emits, [])
+        self.assertTrue(text.endswith("# EOF\n"))
+        self.assertIn("# TYPE maxmcp_requests counter", text)
+        self.assertIn('maxmcp_action_failures_total{action="add_object"} 1', text)
+        self.assertIn('maxmcp_lane_request_duration_seconds_bucket{lane="mutation",le="0.025"} 1', text)
+        self.assertIn('maxmcp_lane_request_duration_seconds_count{lane="mutation"} 2', text)
+        self.assertIn("maxmcp_mutation_max_inflight ", text)
+        self.assertIn("maxmcp_twin_drift NaN", text)
+        self.assertIn("maxmcp_hygiene_sweeps_total 2", text)
+        self.assertEqual(text.count("# TYPE maxmcp_error_budget_burn_rate gauge"), 1)
+
     def test_inventory_exposes_scan_diagnostics(self):
         conn = MaxMSPConnection("http://127.0.0.1", "5002")
         conn.sio = SimpleNamespace(connected=True)
@@ -2009,67 +2542,458 @@ class RuntimeManagerTests(unittest.IsolatedAsyncioTestCase):
         drift = await runtime.check_patch_drift(auto_resync=True)
         self.assertTrue(drift["success"])
         self.assertFalse(drift["in_sync"])
+        self.assertEqual(drift["diverged"]["boxes"]["added"], ["b"])
+        self.assertEqual(drift["diverged"]["boxes"]["changed"], [])
         self.assertTrue(drift["auto_resync"]["success"])
-        self.assertEqual(runtime.twin_baseline_hash, runtime.twin_last_live_hash)
+        self.assertEqual(runtime._twin().baseline_hash, runtime._twin().last_live_hash)  # noqa: SLF001
 
-    async def test_runtime_checkpoint_restore_roundtrip(self):
-        topo = {
-            "boxes": [{"box": {"varname": "x", "maxclass": "newobj", "numinlets": 1, "numoutlets": 1}}],
-            "lines": [],
-        }
+    async def test_runtime_twin_applies_mutation_deltas_without_recapture(self):
+        def box(varname, inlets=0, outlets=0):
+            return {"box": {"varname": varname, "maxclass": "newobj", "numinlets": inlets, "numoutlets": outlets}}
+
+        live = {"boxes": [box("a")], "lines": []}
 
         class FakeBridge:
             def __init__(self):
                 self.sio = SimpleNamespace(connected=True)
-                self.applied_snapshot = None
+                self.captures = 0
 
             async def send_request(self, payload, timeout=2.0):
-                action = payload.get("action")
-                if action == "get_objects_in_patch":
-                    return topo
-                if action == "get_patcher_context":
-                    return {"depth": 0, "path": [], "is_root": True}
-                if action == "apply_topology_snapshot":
-                    self.applied_snapshot = payload.get("snapshot")
-                    return {"success": True}
+                if payload.get("action") == "get_objects_in_patch":
+                    self.captures += 1
+                    return json.loads(json.dumps(live))
                 return {}
 
         bridge = FakeBridge()
         runtime = MaxRuntimeManager(bridge)
-        _seed_workspace(runtime)
-        ckpt = await runtime.create_checkpoint(label="test")
-        self.assertTrue(ckpt["success"])
-        restored = await runtime.restore_checkpoint(ckpt["checkpoint_id"])
-        self.assertTrue(restored["success"])
-        self.assertEqual(bridge.applied_snapshot, topo)
-
-    async def test_runtime_checkpoint_blocked_on_host_target(self):
-        class FakeBridge:
-            def __init__(self):
-                self.sio = SimpleNamespace(connected=True)
+        await runtime.sync_patch_twin(reason="unit-test")
+        self.assertEqual(bridge.captures, 1)
+
+        line = {"patchline": {"source": ["a", 0], "destination": ["b", 0]}}
+        live["boxes"] = [box("a", outlets=1), box("b", inlets=1)]
+        live["lines"] = [line]
+        await runtime.after_successful_action(
+            "add_object",
+            {"action": "add_object", "varname": "b"},
+            "ok",
+            meta={"twin_delta": {"complete": True, "removed": [], "boxes": {"b": box("b")}, "lines_for": {"b": []}}},
+        )
+        await runtime.after_successful_action(
+            "connect_objects",
+            {"action": "connect_objects", "src_varname": "a", "dst_varname": "b"},
+            {"success": True},
+            meta={
+                "twin_delta": {
+                    "complete": True,
+                    "removed": [],
+                    "boxes": {"a": box("a", outlets=1), "b": box("b", inlets=1)},
+                    "lines_for": {"a": [line], "b": [line]},
+                }
+            },
+        )
+        self.assertEqual(bridge.captures, 1)
+        self.assertEqual(runtime.twin_delta_applies, 2)
+        self.assertEqual((runtime._twin().object_count, runtime._twin().connection_count), (2, 1))  # noqa: SLF001
+
+        drift = await runtime.check_patch_drift()
+        self.assertTrue(drift["in_sync"])
+
+        await runtime.after_successful_action(
+            "remove_object",
+            {"action": "remove_object", "varname": "missing"},
+            {"success": True},
+            meta={"twin_delta": {"complete": True, "removed": ["missing"], "boxes": {}, "lines_for": {}}},
+        )
+        self.assertEqual(runtime.twin_delta_fallbacks, 1)
+        self.assertEqual(bridge.captures, 3)
 
-            async def send_request(self, _payload, timeout=2.0):
-                raise AssertionError("send_request should not be called for host target checkpoint")
+    async def test_runtime_keeps_a_twin_per_workspace_target(self):
+        def box(varname):
+            return {"box": {"varname": varname, "maxclass": "newobj", "numinlets": 0, "numoutlets": 0}}
 
-        runtime = MaxRuntimeManager(FakeBridge())
-        runtime.active_target = "host"
-        result = await runtime.create_checkpoint(label="host-guard")
-        self.assertFalse(result["success"])
-        self.assertEqual(result["error"]["code"], ERROR_PRECONDITION)
+        live = {"p:a": {"boxes": [box("a1")], "lines": []}, "p:b": {"boxes": [box("b1")], "lines": []}}
 
-    async def test_workspace_target_switch_accepts_scoped_target(self):
         class FakeBridge:
             def __init__(self):
                 self.sio = SimpleNamespace(connected=True)
-                self.current_target = "host"
+                self.captures = []
 
-            async def send_request(
-                self,
-                payload,
-                timeout=2.0,
-                idempotency_key=None,
-                include_envelope=False,
-            ):
+            async def send_request(self, payload, timeout=2.0):
+                if payload.get("action") == "get_objects_in_patch":
+                    self.captures.append(runtime.active_target)
+                    return json.loads(json.dumps(live[runtime.active_target]))
+                return {}
+
+        bridge = FakeBridge()
+        runtime = MaxRuntimeManager(bridge)
+        for target in ("p:a", "p:b"):
+            runtime.active_target = target
+            await runtime.sync_patch_twin(reason="unit-test")
+        live["p:b"]["boxes"].append(box("b2"))
+        await runtime.after_successful_action(
+            "add_object",
+            {"action": "add_object", "varname": "b2"},
+            "ok",
+            meta={"twin_delta": {"complete": True, "removed": [], "boxes": {"b2": box("b2")}, "lines_for": {"b2": []}}},
+        )
+
+        runtime.active_target = "p:a"
+        live["p:a"]["boxes"].append(box("a2"))
+        await runtime.after_successful_action(
+            "add_object",
+            {"action": "add_object", "varname": "a2"},
+            "ok",
+            meta={"twin_delta": {"complete": True, "removed": [], "boxes": {"a2": box("a2")}, "lines_for": {"a2": []}}},
+        )
+        # Work in workspace b left workspace a's model in place.
+        self.assertEqual(bridge.captures, ["p:a", "p:b"])
+        self.assertEqual(runtime.twin_delta_applies, 2)
+        self.assertEqual(runtime._twin("p:a").object_count, 2)  # noqa: SLF001
+        self.assertEqual(runtime._twin("p:b").object_count, 2)  # noqa: SLF001
+        self.assertTrue((await runtime.check_patch_drift())["in_sync"])
+        self.assertEqual(runtime._twin_status_payload()["tracked_targets"], 2)  # noqa: SLF001
+
+    async def test_workspace_sessions_run_concurrently_with_envelope_targets(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.capabilities = {
+            "supported_actions": ["get_objects_in_patch", "get_patcher_context", "set_workspace_target"],
+            "supports_workspace_target": True,
+        }
+        held = {}
+
+        async def handler(_event, payload, _namespace):
+            target = (payload.get("workspace_target") or {}).get("target_id")
+            held[target] = payload["request_id"]
+
+        fake_sio = FakeSocketClient(handler=handler)
+        conn.sio = fake_sio
+        runtime = MaxRuntimeManager(conn)
+        runtime.topology_cache_seconds = 0.0
+        runtime.register_project(project_id=TEST_PROJECT_ID, create_default_workspace=False)
+        for workspace_id in ("a", "b"):
+            runtime.create_workspace(project_id=TEST_PROJECT_ID, workspace_id=workspace_id)
+        ctx = _make_scoped_ctx(conn, runtime=runtime)
+
+        calls = [
+            asyncio.create_task(
+                get_patch_context(ctx, TEST_PROJECT_ID, workspace_id, include_hierarchy=False)
+            )
+            for workspace_id in ("a", "b")
+        ]
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertEqual(set(held), {f"{TEST_PROJECT_ID}:a", f"{TEST_PROJECT_ID}:b"})
+        self.assertNotIn("set_workspace_target", [emit[1]["action"] for emit in fake_sio.emits])
+        self.assertTrue(fake_sio.emits[0][1]["workspace_target"]["workspace_varname"])
+        for index, request_id in enumerate(held.values()):
+            conn._pending[request_id].set_result(
+                {
+                    "protocol_version": "2.0",
+                    "request_id": request_id,
+                    "state": "succeeded",
+                    "results": {"boxes": [{"box": {"varname": f"o{i}"}} for i in range(index + 1)], "lines": []},
+                }
+            )
+        results = await asyncio.gather(*calls)
+        self.assertEqual(sorted(r["summary"]["object_count"] for r in results), [1, 2])
+        self.assertEqual(runtime.active_target, "host")
+
+    async def test_envelope_sessions_start_at_the_workspace_root(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.capabilities = {
+            "supported_actions": ["enter_subpatcher", "get_patcher_context"],
+            "supports_workspace_target": True,
+        }
+
+        async def handler(_event, payload, _namespace):
+            conn._pending[payload["request_id"]].set_result(
+                {"request_id": payload["request_id"], "state": "succeeded", "results": {"success": True}}
+            )
+
+        conn.sio = FakeSocketClient(handler=handler)
+        runtime = MaxRuntimeManager(conn)
+        _seed_workspace(runtime)
+
+        def resets():
+            return [
+                emit[1]["workspace_target"].get("reset_navigation", False) for emit in conn.sio.emits
+            ]
+
+        async with runtime.workspace_session(project_id=TEST_PROJECT_ID, workspace_id=TEST_WORKSPACE_ID):
+            await conn.send_request({"action": "enter_subpatcher", "varname": "sub"})
+            await conn.send_request({"action": "get_patcher_context"})
+        self.assertEqual(resets(), [True, False])
+        self.assertEqual(conn._navigated_targets, {TEST_SCOPE})  # noqa: SLF001
+
+        epoch = conn._preflight_epoch  # noqa: SLF001
+        conn.sio.emits.clear()
+        async with runtime.workspace_session(project_id=TEST_PROJECT_ID, workspace_id=TEST_WORKSPACE_ID):
+            # Reads cached inside the subpatcher are not served at the root.
+            self.assertEqual(conn._preflight_epoch, epoch + 1)  # noqa: SLF001
+            await conn.send_request({"action": "get_patcher_context"})
+        self.assertEqual(resets(), [True])
+        self.assertEqual(conn._navigated_targets, set())  # noqa: SLF001
+
+    async def test_workspace_activation_skips_redundant_set_workspace_target(self):
+        class FakeBridge:
+            def __init__(self):
+                self.sio = SimpleNamespace(connected=True)
+                self.connection_epoch = 1
+                self._preflight_epoch = 0
+                self.activations = 0
+
+            async def send_request(self, payload, timeout=2.0):
+                if payload.get("action") == "set_workspace_target":
+                    self.activations += 1
+                    self._preflight_epoch += 1
+                return {"success": True}
+
+        bridge = FakeBridge()
+        runtime = MaxRuntimeManager(bridge)
+        _seed_workspace(runtime)
+        runtime.active_target = "host"
+
+        async def activate():
+            return await runtime.activate_workspace(
+                project_id=TEST_PROJECT_ID,
+                workspace_id=TEST_WORKSPACE_ID,
+                create_if_missing=False,
+            )
+
+        self.assertFalse((await activate())["activation_cached"])
+        self.assertTrue((await activate())["activation_cached"])
+        self.assertEqual(bridge.activations, 1)
+
+        bridge._preflight_epoch += 1  # e.g. enter_subpatcher moved the bridge off the workspace root
+        self.assertFalse((await activate())["activation_cached"])
+        bridge.connection_epoch += 1
+        self.assertFalse((await activate())["activation_cached"])
+        self.assertTrue((await activate())["activation_cached"])
+        self.assertEqual(bridge.activations, 3)
+        self.assertEqual(runtime.workspace_activation_snapshot(), {"sent": 3, "skipped": 2})
+
+    async def test_runtime_topology_cache_follows_mutation_epoch_and_target(self):
+        class FakeBridge:
+            def __init__(self):
+                self.sio = SimpleNamespace(connected=True)
+                self.connection_epoch = 1
+                self._preflight_epoch = 0
+                self._mutation_epoch = 0
+                self.captures = 0
+
+            async def send_request(self, payload, timeout=2.0):
+                if payload.get("action") == "get_objects_in_patch":
+                    self.captures += 1
+                    return {"boxes": [{"box": {"varname": f"v{self.captures}"}}], "lines": []}
+                return {}
+
+        bridge = FakeBridge()
+        runtime = MaxRuntimeManager(bridge)
+        runtime.active_target = TEST_SCOPE
+        await runtime._capture_live_topology()
+        first = await runtime.read_topology(timeout=1.0)
+        self.assertEqual(first["boxes"][0]["box"]["varname"], "v1")
+        first["boxes"].clear()
+        again = await runtime.read_topology(timeout=1.0)
+        self.assertEqual(again["boxes"][0]["box"]["varname"], "v1")
+        self.assertEqual(bridge.captures, 1)
+
+        bridge._mutation_epoch += 1
+        after_mutation = await runtime.read_topology(timeout=1.0)
+        self.assertEqual(after_mutation["boxes"][0]["box"]["varname"], "v2")
+
+        runtime.active_target = "other:main"
+        await runtime.read_topology(timeout=1.0)
+        self.assertEqual(bridge.captures, 3)
+        self.assertEqual(runtime.topology_cache_snapshot()["hits"], 2)
+        self.assertEqual(runtime.topology_cache_snapshot()["misses"], 2)
+
+    async def test_runtime_twin_reconciles_on_interval(self):
+        class FakeBridge:
+            def __init__(self):
+                self.sio = SimpleNamespace(connected=True)
+                self.captures = 0
+
+            async def send_request(self, payload, timeout=2.0):
+                if payload.get("action") == "get_objects_in_patch":
+                    self.captures += 1
+                    return {"boxes": [], "lines": []}
+                return {}
+
+        bridge = FakeBridge()
+        runtime = MaxRuntimeManager(bridge)
+        runtime.twin_reconcile_seconds = 0.0
+        await runtime.sync_patch_twin(reason="unit-test")
+        await runtime.after_successful_action(
+            "move_object",
+            {"action": "move_object", "varname": "a"},
+            {"success": True},
+            meta={"twin_delta": {"complete": True, "removed": [], "boxes": {}, "lines_for": {}}},
+        )
+        self.assertEqual(bridge.captures, 2)
+        self.assertEqual(runtime.twin_delta_applies, 0)
+
+    async def test_runtime_checkpoint_restore_roundtrip(self):
+        topo = {
+            "boxes": [{"box": {"varname": "x", "maxclass": "newobj", "numinlets": 1, "numoutlets": 1}}],
+            "lines": [],
+        }
+
+        class FakeBridge:
+            def __init__(self):
+                self.sio = SimpleNamespace(connected=True)
+                self.applied_snapshot = None
+
+            async def send_request(self, payload, timeout=2.0):
+                action = payload.get("action")
+                if action == "get_objects_in_patch":
+                    return topo
+                if action == "get_patcher_context":
+                    return {"depth": 0, "path": [], "is_root": True}
+                if action == "apply_topology_snapshot":
+                    self.applied_snapshot = payload.get("snapshot")
+                    return {"success": True}
+                return {}
+
+        bridge = FakeBridge()
+        runtime = MaxRuntimeManager(bridge)
+        _seed_workspace(runtime)
+        ckpt = await runtime.create_checkpoint(label="test")
+        self.assertTrue(ckpt["success"])
+        restored = await runtime.restore_checkpoint(ckpt["checkpoint_id"])
+        self.assertTrue(restored["success"])
+        self.assertEqual(bridge.applied_snapshot, topo)
+
+    async def test_runtime_checkpoint_restore_applies_minimal_diff(self):
+        def box(varname, text):
+            return {"box": {"varname": varname, "maxclass": "newobj", "text": text}}
+
+        def line(src, dst):
+            return {"patchline": {"source": [src, 0], "destination": [dst, 0]}}
+
+        class FakeBridge:
+            def __init__(self):
+                self.sio = SimpleNamespace(connected=True)
+                self.capabilities = {"supported_actions": ["apply_topology_delta"]}
+                self.topo = {
+                    "boxes": [box(f"b{i}", f"+ {i}") for i in range(8)],
+                    "lines": [line(f"b{i}", f"b{i + 1}") for i in range(7)],
+                }
+                self.actions = []
+
+            async def send_request(self, payload, timeout=2.0):
+                action = payload.get("action")
+                self.actions.append(action)
+                if action == "get_objects_in_patch":
+                    return json.loads(json.dumps(self.topo))
+                if action == "get_patcher_context":
+                    return {"depth": 0, "path": [], "is_root": True}
+                if action == "apply_topology_delta":
+                    delta = payload["delta"]
+                    gone = set(delta["remove"])
+                    dropped = {json.dumps(row, sort_keys=True) for row in delta["disconnect"]}
+                    self.topo["boxes"] = [
+                        row for row in self.topo["boxes"] if row["box"]["varname"] not in gone
+                    ] + delta["boxes"]
+                    self.topo["lines"] = [
+                        row
+                        for row in self.topo["lines"]
+                        if json.dumps(row, sort_keys=True) not in dropped
+                        and row["patchline"]["source"][0] not in gone
+                        and row["patchline"]["destination"][0] not in gone
+                    ] + delta["connect"]
+                    return {"success": True}
+                if action == "apply_topology_snapshot":
+                    self.topo = payload["snapshot"]
+                    return {"success": True}
+                return {}
+
+        bridge = FakeBridge()
+        runtime = MaxRuntimeManager(bridge)
+        _seed_workspace(runtime)
+        ckpt = await runtime.create_checkpoint(label="diff")
+        self.assertTrue(ckpt["success"])
+
+        bridge.topo["boxes"][3] = box("b3", "- 3")
+        bridge.topo["lines"].pop()
+        bridge.actions.clear()
+        restored = await runtime.restore_checkpoint(ckpt["checkpoint_id"])
+        self.assertTrue(restored["success"])
+        self.assertEqual(restored["restore"]["mode"], "diff")
+        self.assertEqual(restored["restore"]["removed"], 1)
+        self.assertEqual(restored["restore"]["created"], 1)
+        self.assertIn("apply_topology_delta", bridge.actions)
+        self.assertNotIn("apply_topology_snapshot", bridge.actions)
+        self.assertTrue(restored["twin"]["in_sync"])
+        self.assertEqual(runtime.checkpoint_restores["diff"], 1)
+
+        # A rewrite of most of the patch is cheaper as one full replace.
+        bridge.topo = {"boxes": [box(f"b{i}", "x") for i in range(8)], "lines": []}
+        await runtime.sync_patch_twin(reason="test")
+        bridge.actions.clear()
+        restored = await runtime.restore_checkpoint(ckpt["checkpoint_id"])
+        self.assertTrue(restored["success"])
+        self.assertEqual(restored["restore"]["mode"], "full")
+        self.assertEqual(restored["restore"]["fallback_reason"], "diff_too_large")
+        self.assertNotIn("apply_topology_delta", bridge.actions)
+        self.assertEqual(runtime.checkpoint_restores["full"], 1)
+
+        # A twin the epoch no longer vouches for is not diffed against.
+        bridge.topo["boxes"][5] = box("b5", "- 5")
+        await runtime.sync_patch_twin(reason="test")
+        bridge._mutation_epoch = 1
+        bridge.topo["boxes"][6] = box("b6", "- 6")
+        bridge.actions.clear()
+        restored = await runtime.restore_checkpoint(ckpt["checkpoint_id"])
+        self.assertTrue(restored["success"])
+        self.assertEqual((restored["restore"]["mode"], restored["restore"]["source"]), ("diff", "live"))
+        self.assertEqual(restored["restore"]["removed"], 2)
+        delta_at = bridge.actions.index("apply_topology_delta")
+        self.assertIn("get_objects_in_patch", bridge.actions[:delta_at])
+        self.assertIn("get_objects_in_patch", bridge.actions[delta_at:])
+        self.assertEqual(runtime.checkpoint_restores["diff_mismatches"], 0)
+
+        # verify=True holds diff restores to the live hash, like full replaces.
+        bridge.topo["boxes"][2] = box("b2", "- 2")
+        restored = await runtime.restore_checkpoint(ckpt["checkpoint_id"], verify=True)
+        self.assertEqual((restored["restore"]["mode"], restored["restore"]["verified"]), ("diff", True))
+
+        async def drifted_diff(_checkpoint_id, _topology, expected):
+            return {"applied": {}, "twin": {"success": True, "hash": "0" * len(expected)}}, {"mode": "diff"}
+
+        with patch.object(runtime, "_restore_checkpoint_diff", drifted_diff):
+            restored = await runtime.restore_checkpoint(ckpt["checkpoint_id"], verify=True)
+        self.assertFalse(restored["success"])
+        self.assertEqual(restored["error"]["details"]["mode"], "diff")
+        self.assertEqual(runtime.checkpoint_restores["verify_mismatches"], 1)
+
+    async def test_runtime_checkpoint_blocked_on_host_target(self):
+        class FakeBridge:
+            def __init__(self):
+                self.sio = SimpleNamespace(connected=True)
+
+            async def send_request(self, _payload, timeout=2.0):
+                raise AssertionError("send_request should not be called for host target checkpoint")
+
+        runtime = MaxRuntimeManager(FakeBridge())
+        runtime.active_target = "host"
+        result = await runtime.create_checkpoint(label="host-guard")
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"]["code"], ERROR_PRECONDITION)
+
+    async def test_workspace_target_switch_accepts_scoped_target(self):
+        class FakeBridge:
+            def __init__(self):
+                self.sio = SimpleNamespace(connected=True)
+                self.current_target = "host"
+
+            async def send_request(
+                self,
+                payload,
+                timeout=2.0,
+                idempotency_key=None,
+                include_envelope=False,
+            ):
                 action = payload.get("action")
                 if action == "set_workspace_target":
                     self.current_target = payload.get("target_id", "host")
@@ -2138,6 +3062,152 @@ class RuntimeManagerTests(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(len(checkpoints), 1)
             self.assertEqual(checkpoints[0]["checkpoint_id"], created["checkpoint_id"])
 
+    async def test_checkpoint_journal_writes_only_new_records(self):
+        boxes = [{"box": {"varname": f"b{i}", "maxclass": "newobj", "text": "+ 1"}} for i in range(40)]
+        state = {"topology": {"boxes": boxes, "lines": []}}
+
+        class FakeBridge:
+            def __init__(self):
+                self.sio = SimpleNamespace(connected=True)
+                self.applied_snapshot = None
+
+            async def send_request(self, payload, timeout=2.0):
+                action = payload.get("action")
+                if action == "get_objects_in_patch":
+                    return state["topology"]
+                if action == "get_patcher_context":
+                    return {"depth": 0, "path": [], "is_root": True}
+                if action == "apply_topology_snapshot":
+                    self.applied_snapshot = payload.get("snapshot")
+                    return {"success": True}
+                return {"success": True}
+
+        bridge = FakeBridge()
+        runtime = MaxRuntimeManager(bridge)
+        _seed_workspace(runtime)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            runtime.session_dir = tmp_path
+            runtime.checkpoints_file = tmp_path / "checkpoints.json"
+            # Room for one hot topology.
+            runtime.checkpoint_store.hot_bytes = 3000
+
+            first = await runtime.create_checkpoint(label="base")
+            self.assertEqual(first["checkpoint_journal"]["records_written"], 40)
+            edited = [dict(row) for row in boxes]
+            edited[3] = {"box": {"varname": "b3", "maxclass": "newobj", "text": "* 2"}}
+            state["topology"] = {"boxes": edited, "lines": []}
+            second = await runtime.create_checkpoint(label="edit")
+            self.assertEqual(second["checkpoint_journal"]["records_written"], 1)
+            self.assertTrue(second["checkpoint_store"]["delta"])
+            records_path = runtime.checkpoint_journal.records_path
+            self.assertEqual(len(records_path.read_text().splitlines()), 41)
+            self.assertEqual(len(runtime.checkpoints_file.read_text().splitlines()), 3)
+            self.assertNotIn('"topology"', runtime.checkpoints_file.read_text())
+            # Journaled bodies leave memory; the newest topology stays hot for rollback.
+            store_stats = runtime.checkpoint_store.stats()
+            self.assertEqual(store_stats["resident_records"], 0)
+            self.assertEqual(runtime.checkpoint_store.missing_records(second["checkpoint_id"]), [])
+            self.assertEqual(len(runtime.checkpoint_store.missing_records(first["checkpoint_id"])), 40)
+            restored = await runtime.restore_checkpoint(first["checkpoint_id"])
+            self.assertTrue(restored["success"])
+            self.assertEqual(bridge.applied_snapshot, {"boxes": boxes, "lines": []})
+            self.assertEqual(runtime.checkpoint_store.stats()["resident_records"], 0)
+
+            runtime2 = MaxRuntimeManager(bridge)
+            _seed_workspace(runtime2)
+            runtime2.checkpoints_file = tmp_path / "checkpoints.json"
+            with patch("server.topology_hash", side_effect=AssertionError("rehashed on load")):
+                loaded = runtime2._load_checkpoint_journal_sync()
+            self.assertEqual((loaded["count"], loaded["skipped"]), (2, 0))
+            self.assertEqual(runtime2.list_checkpoints()[0]["hash"], second["hash"])
+            self.assertEqual(runtime2.checkpoint_store.stats()["resident_records"], 0)
+            restored = await runtime2.restore_checkpoint(second["checkpoint_id"])
+            self.assertTrue(restored["success"])
+            self.assertEqual(bridge.applied_snapshot, {"boxes": edited, "lines": []})
+
+    async def test_checkpoint_eviction_journals_drops_without_rebased_manifests(self):
+        boxes = [{"box": {"varname": f"b{i}", "maxclass": "newobj", "text": "+ 1"}} for i in range(300)]
+        state = {"topology": {"boxes": boxes, "lines": []}}
+
+        class FakeBridge:
+            def __init__(self):
+                self.sio = SimpleNamespace(connected=True)
+                self.applied_snapshot = None
+
+            async def send_request(self, payload, timeout=2.0):
+                action = payload.get("action")
+                if action == "get_objects_in_patch":
+                    return state["topology"]
+                if action == "get_patcher_context":
+                    return {"depth": 0, "path": [], "is_root": True}
+                if action == "apply_topology_snapshot":
+                    self.applied_snapshot = payload.get("snapshot")
+                return {"success": True}
+
+        bridge = FakeBridge()
+        runtime = MaxRuntimeManager(bridge)
+        _seed_workspace(runtime)
+        runtime.max_checkpoints = 2
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            runtime.session_dir = tmp_path
+            runtime.checkpoints_file = tmp_path / "checkpoints.json"
+            created = []
+            for i in range(5):
+                edited = [dict(row) for row in boxes]
+                edited[i] = {"box": {"varname": f"b{i}", "maxclass": "newobj", "text": f"* {i}"}}
+                state["topology"] = {"boxes": edited, "lines": []}
+                created.append(await runtime.create_checkpoint(label=f"edit {i}"))
+            # Each create evicts the oldest checkpoint; the write still scales with the edit.
+            for result in created[2:]:
+                self.assertEqual(result["checkpoint_journal"]["records_written"], 1)
+                self.assertLess(result["checkpoint_journal"]["bytes_written"], 4096)
+            self.assertEqual(len(runtime.checkpoints), 2)
+            self.assertEqual(len(runtime.checkpoint_store.hidden_bases()), 3)
+
+            runtime2 = MaxRuntimeManager(bridge)
+            _seed_workspace(runtime2)
+            runtime2.max_checkpoints = 2
+            runtime2.checkpoints_file = tmp_path / "checkpoints.json"
+            loaded = runtime2._load_checkpoint_journal_sync()
+            self.assertEqual((loaded["count"], loaded["skipped"]), (2, 0))
+            self.assertEqual(runtime2.checkpoint_store.stats()["hidden_bases"], 3)
+            restored = await runtime2.restore_checkpoint(created[3]["checkpoint_id"])
+            self.assertTrue(restored["success"])
+            self.assertEqual(bridge.applied_snapshot["boxes"][3]["box"]["text"], "* 3")
+
+            compacted = await runtime2.compact_checkpoint_journal()
+            self.assertEqual(compacted["checkpoints"], 5)
+            runtime3 = MaxRuntimeManager(bridge)
+            _seed_workspace(runtime3)
+            runtime3.checkpoints_file = tmp_path / "checkpoints.json"
+            self.assertEqual(runtime3._load_checkpoint_journal_sync()["count"], 2)
+
+    def test_legacy_checkpoint_document_migrates_to_journal(self):
+        topology = {"boxes": [{"box": {"varname": "x", "maxclass": "newobj"}}], "lines": []}
+        runtime = MaxRuntimeManager(SimpleNamespace(sio=SimpleNamespace(connected=True)))
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            runtime.session_dir = tmp_path
+            runtime.checkpoints_file = tmp_path / "checkpoints.jsonl"
+            legacy = {"session_id": "old", "checkpoints": [{"checkpoint_id": "legacy1", "topology": topology}]}
+            (tmp_path / "checkpoints.json").write_text(json.dumps(legacy, indent=2), encoding="utf-8")
+            loaded = runtime._load_checkpoint_journal_sync()
+            self.assertEqual(loaded["count"], 1)
+            self.assertEqual(runtime.checkpoints["legacy1"]["object_count"], 1)
+            self.assertTrue(runtime.checkpoints_file.exists())
+
+            reloaded = MaxRuntimeManager(SimpleNamespace(sio=SimpleNamespace(connected=True)))
+            reloaded.checkpoints_file = runtime.checkpoints_file
+            self.assertEqual(reloaded._load_checkpoint_journal_sync()["count"], 1)
+            missing = reloaded.checkpoint_store.missing_records("legacy1")
+            rows = reloaded.checkpoint_journal.read_records(missing)
+            reloaded.checkpoint_store.adopt_records(rows)
+            self.assertEqual(reloaded.checkpoint_store.topology("legacy1"), topology)
+
     async def test_capture_live_topology_retries_after_timeout(self):
         class FlakyBridge:
             def __init__(self):
@@ -2184,6 +3254,137 @@ class RuntimeManagerTests(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(bridge.workspace_capture_retries, 2)
 
 
+    async def test_paged_capture_resumes_from_the_timed_out_cursor(self):
+        class PagedBridge:
+            def __init__(self):
+                self.sio = SimpleNamespace(connected=True)
+                self.capabilities = {"supported_actions": ["get_objects_in_patch_page"]}
+                self.boxes = [{"box": {"varname": f"b{i}"}} for i in range(5)]
+                self.cursors = []
+                self.timeouts_left = 1
+                self.grow_after_first_page = False
+                self.mutate_on_cursor = None
+                self._mutation_epoch = 0
+                self.workspace_capture_timeouts = 0
+                self.workspace_capture_retries = 0
+                self.workspace_capture_pages = 0
+                self.workspace_capture_restarts = 0
+
+            async def send_request(self, payload, timeout=2.0, idempotency_key=None, include_envelope=False):
+                cursor = payload.get("cursor")
+                self.cursors.append(cursor)
+                if cursor == "2" and self.timeouts_left:
+                    self.timeouts_left -= 1
+                    raise MaxMCPError(ERROR_BRIDGE_TIMEOUT, "No response.", recoverable=True, details={})
+                offset = int(cursor or 0)
+                end = min(len(self.boxes), offset + payload["page_size"])
+                total = len(self.boxes)
+                if cursor is None and self.grow_after_first_page:
+                    self.boxes.append({"box": {"varname": "added_mid_capture"}})
+                if cursor is not None and cursor == self.mutate_on_cursor:
+                    # A concurrent edit that leaves the box count unchanged.
+                    self.mutate_on_cursor = None
+                    self._mutation_epoch += 1
+                    self.boxes[0] = {"box": {"varname": "b0_edited"}}
+                return {
+                    "boxes": self.boxes[offset:end],
+                    "lines": [{"patchline": {"source": [f"b{offset}", 0], "destination": ["b0", 0]}}],
+                    "next_cursor": str(end) if end < len(self.boxes) else None,
+                    "total_boxes": total,
+                }
+
+        bridge = PagedBridge()
+        runtime = MaxRuntimeManager(bridge)
+        runtime.workspace_capture_page_size = 2
+        runtime.workspace_capture_retries = 1
+        runtime.workspace_capture_backoff_seconds = 0.0
+
+        topology, capture = await runtime._capture_live_topology(include_meta=True)
+        self.assertEqual([b["box"]["varname"] for b in topology["boxes"]], ["b0", "b1", "b2", "b3", "b4"])
+        self.assertEqual(len(topology["lines"]), 3)
+        self.assertEqual(bridge.cursors, [None, "2", "2", "4"])
+        self.assertEqual((capture["pages"], capture["retry_attempts"], capture["attempts"]), (3, 1, 4))
+        self.assertTrue(capture["paged"])
+        self.assertEqual((bridge.workspace_capture_pages, bridge.workspace_capture_timeouts), (3, 1))
+
+        bridge.cursors = []
+        bridge.mutate_on_cursor = "4"
+        topology, capture = await runtime._capture_live_topology(include_meta=True)
+        self.assertEqual(
+            [b["box"]["varname"] for b in topology["boxes"]],
+            ["b0_edited", "b1", "b2", "b3", "b4"],
+        )
+        self.assertEqual(bridge.cursors, [None, "2", "4", None, "2", "4"])
+        self.assertEqual((capture["restarts"], capture["retry_attempts"]), (1, 1))
+        self.assertEqual(bridge.workspace_capture_restarts, 1)
+
+        bridge.grow_after_first_page = True
+        with self.assertRaises(MaxMCPError) as ctx:
+            await runtime._capture_live_topology()
+        self.assertEqual(ctx.exception.code, ERROR_PRECONDITION)
+        self.assertTrue(ctx.exception.details["capture"]["paged"])
+
+    async def test_paged_capture_only_restarts_for_edits_to_its_own_target(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.capabilities = {
+            "supported_actions": ["get_objects_in_patch_page"],
+            "supports_workspace_target": True,
+        }
+        conn.read_cache_ttl_seconds = 0.0
+        boxes = [{"box": {"varname": f"b{i}"}} for i in range(4)]
+        edit_on_cursor: dict[str, str | None] = {}
+
+        def edit(target_id):
+            # What a mutation scoped to ``target_id`` (or unscoped) does to the bridge epochs.
+            scope = {"target_id": target_id} if target_id is not None else None
+            token = server_module._REQUEST_WORKSPACE_TARGET.set(scope)  # noqa: SLF001
+            try:
+                conn._invalidate_read_cache()  # noqa: SLF001
+            finally:
+                server_module._REQUEST_WORKSPACE_TARGET.reset(token)  # noqa: SLF001
+
+        async def handler(_event, payload, _namespace):
+            cursor = payload["payload"].get("cursor")
+            if cursor in edit_on_cursor:
+                edit(edit_on_cursor.pop(cursor))
+            offset = int(cursor or 0)
+            end = min(len(boxes), offset + 2)
+            conn._pending[payload["request_id"]].set_result(  # noqa: SLF001
+                {
+                    "request_id": payload["request_id"],
+                    "state": "succeeded",
+                    "results": {
+                        "boxes": boxes[offset:end],
+                        "lines": [],
+                        "next_cursor": str(end) if end < len(boxes) else None,
+                        "total_boxes": len(boxes),
+                    },
+                }
+            )
+
+        conn.sio = FakeSocketClient(handler=handler)
+        runtime = MaxRuntimeManager(conn)
+        _seed_workspace(runtime)
+        runtime.topology_cache_seconds = 0.0
+        runtime.workspace_capture_page_size = 2
+
+        edit_on_cursor["2"] = f"{TEST_PROJECT_ID}:other"
+        async with runtime.workspace_session(project_id=TEST_PROJECT_ID, workspace_id=TEST_WORKSPACE_ID):
+            _, capture = await runtime._capture_live_topology(include_meta=True)  # noqa: SLF001
+        self.assertEqual((capture["pages"], capture["restarts"]), (2, 0))
+
+        edit_on_cursor["2"] = TEST_SCOPE
+        async with runtime.workspace_session(project_id=TEST_PROJECT_ID, workspace_id=TEST_WORKSPACE_ID):
+            _, capture = await runtime._capture_live_topology(include_meta=True)  # noqa: SLF001
+        self.assertEqual(capture["restarts"], 1)
+
+        # Unscoped edits may land on any target, so they still restart the capture.
+        edit_on_cursor["2"] = None
+        async with runtime.workspace_session(project_id=TEST_PROJECT_ID, workspace_id=TEST_WORKSPACE_ID):
+            _, capture = await runtime._capture_live_topology(include_meta=True)  # noqa: SLF001
+        self.assertEqual(capture["restarts"], 1)
+
+
 class PatchFileFlowTests(unittest.IsolatedAsyncioTestCase):
     class FakeBridge:
         def __init__(self):
@@ -2531,6 +3732,101 @@ class PatchFileFlowTests(unittest.IsolatedAsyncioTestCase):
             self.assertEqual(loaded["apply_result"]["attempt"], 2)
             self.assertEqual(len(loaded["apply_meta"]["attempts_failed"]), 1)
 
+    class StagingBridge(FakeBridge):
+        def __init__(self, *, drop_after_chunks: int | None = None):
+            super().__init__()
+            self.capabilities["supported_actions"].append("stage_topology_snapshot")
+            self.staged: dict[str, dict] = {}
+            self.stage_calls = []
+            self.chunk_payloads = []
+            self._drop_after_chunks = drop_after_chunks
+
+        async def send_request(
+            self,
+            payload,
+            timeout=2.0,
+            idempotency_key=None,
+            include_envelope=False,
+        ):
+            action = payload.get("action")
+            if action == "stage_topology_snapshot":
+                self.stage_calls.append(dict(payload))
+                if payload["piece_index"] == 0:
+                    self.staged[payload["snapshot_hash"]] = {"boxes": [], "lines": []}
+                entry = self.staged[payload["snapshot_hash"]]
+                entry["boxes"].extend(payload.get("boxes", []))
+                entry["lines"].extend(payload.get("lines", []))
+                return {"success": True}
+            if action == "apply_topology_snapshot_progressive":
+                self.chunk_payloads.append(dict(payload))
+                if self._drop_after_chunks is not None and len(self.chunk_payloads) > self._drop_after_chunks:
+                    self._drop_after_chunks = None
+                    self.staged.clear()
+                snapshot = self.staged.get(payload.get("snapshot_hash"))
+                if snapshot is None:
+                    raise MaxMCPError(
+                        ERROR_PRECONDITION,
+                        "No complete staged snapshot for this hash.",
+                        details={"reason": "staged_snapshot_missing"},
+                    )
+                cursor = int((payload.get("progress_state") or {}).get("box_index", 0))
+                total = len(snapshot["boxes"])
+                cursor = min(total, cursor + int(payload["chunk_size"]))
+                if cursor < total:
+                    return {"done": False, "state": {"phase": "boxes", "box_index": cursor}}
+                self.topologies[self.current_target] = json.loads(json.dumps(snapshot))
+                return {"success": True, "done": True, "restored_boxes": total}
+            return await super().send_request(
+                payload,
+                timeout=timeout,
+                idempotency_key=idempotency_key,
+                include_envelope=include_envelope,
+            )
+
+    @staticmethod
+    def _boxes_topology(count: int) -> dict:
+        return {
+            "boxes": [{"box": {"maxclass": "newobj", "varname": f"b{i}"}} for i in range(count)],
+            "lines": [],
+        }
+
+    async def test_progressive_apply_stages_snapshot_once(self):
+        bridge = self.StagingBridge()
+        runtime = MaxRuntimeManager(bridge)
+        topology = self._boxes_topology(2500)
+
+        result = await runtime._apply_topology_snapshot_progressive(
+            topology,
+            timeout_seconds=5.0,
+            chunk_size=1000,
+        )
+
+        self.assertTrue(result["done"])
+        self.assertTrue(result["staged_upload"])
+        self.assertEqual(result["stage_pieces"], 3)
+        self.assertEqual(len(bridge.chunk_payloads), 3)
+        for chunk in bridge.chunk_payloads:
+            self.assertNotIn("snapshot", chunk)
+            self.assertEqual(chunk["snapshot_hash"], result["snapshot_hash"])
+        self.assertEqual(bridge.topologies[TEST_SCOPE], topology)
+
+    async def test_progressive_apply_restages_when_bridge_loses_snapshot(self):
+        bridge = self.StagingBridge(drop_after_chunks=1)
+        runtime = MaxRuntimeManager(bridge)
+        topology = self._boxes_topology(30)
+
+        result = await runtime._apply_topology_snapshot_progressive(
+            topology,
+            timeout_seconds=5.0,
+            chunk_size=10,
+            idempotency_key="import-1",
+        )
+
+        self.assertTrue(result["done"])
+        self.assertEqual(result["stage_pieces"], 2)
+        self.assertNotIn("progress_state", bridge.chunk_payloads[2])
+        self.assertEqual(bridge.topologies[TEST_SCOPE], topology)
+
     async def test_progressive_apply_uses_remaining_timeout_budget(self):
         class BudgetBridge(self.FakeBridge):
             def __init__(self):
@@ -2973,6 +4269,157 @@ class TransactionExecutionTests(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(result["rollback"]["success"])
         self.assertEqual(bridge.applied_snapshot, {"boxes": [], "lines": []})
 
+    async def test_transaction_checkpoints_from_in_sync_twin(self):
+        box = {"box": {"varname": "keep", "maxclass": "newobj", "text": "+ 1"}}
+
+        class FakeBridge:
+            def __init__(self):
+                self.sio = SimpleNamespace(connected=True)
+                self._mutation_epoch = 0
+                self.topology = {"boxes": [box], "lines": []}
+                self.restore_sticks = True
+                self.actions = []
+
+            async def send_request(
+                self,
+                payload,
+                timeout=2.0,
+                idempotency_key=None,
+                include_envelope=False,
+            ):
+                action = payload.get("action")
+                self.actions.append(action)
+                if action == "get_patcher_context":
+                    return {"depth": 0, "path": [], "is_root": True}
+                if action == "get_objects_in_patch":
+                    return json.loads(json.dumps(self.topology))
+                if action == "set_workspace_target":
+                    return {"success": True, "target_id": payload.get("target_id")}
+                self._mutation_epoch += 1
+                if action == "add_object":
+                    self.topology["boxes"].append({"box": {"varname": payload["varname"]}})
+                    return {"success": True}
+                if action == "apply_topology_snapshot":
+                    if self.restore_sticks:
+                        self.topology = payload["snapshot"]
+                    return {"success": True}
+                return {"success": False, "error": {"code": "OBJECT_NOT_FOUND", "message": "gone"}}
+
+        bridge = FakeBridge()
+        runtime = MaxRuntimeManager(bridge)
+        _seed_workspace(runtime)
+        ctx = _make_scoped_ctx(bridge, runtime=runtime)
+        steps = [
+            {
+                "action": "add_max_object",
+                "params": {"position": [10, 10], "obj_type": "button", "varname": "tx_obj", "args": []},
+            },
+            {"action": "remove_max_object", "params": {"varname": "tx_obj"}},
+        ]
+
+        def setup_calls():
+            calls = bridge.actions[: bridge.actions.index("add_object")]
+            bridge.actions.clear()
+            return len(calls)
+
+        await run_patch_transaction(
+            ctx, TEST_PROJECT_ID, TEST_WORKSPACE_ID, steps=steps, checkpoint_mode="live"
+        )
+        await runtime.sync_patch_twin(reason="test")
+        bridge.actions.clear()
+        result = await run_patch_transaction(
+            ctx, TEST_PROJECT_ID, TEST_WORKSPACE_ID, steps=steps, checkpoint_label="tx-twin"
+        )
+        self.assertEqual(result["checkpoint"]["source"], "twin")
+        twin_calls = setup_calls()
+        await runtime.sync_patch_twin(reason="test")
+        bridge.actions.clear()
+        await run_patch_transaction(
+            ctx, TEST_PROJECT_ID, TEST_WORKSPACE_ID, steps=steps, checkpoint_mode="live"
+        )
+        # No patch dump or context round trip before the first step.
+        self.assertEqual(setup_calls() - twin_calls, 2)
+        self.assertEqual(result["rollback"]["restore"]["verified"], True)
+        self.assertEqual(bridge.topology, {"boxes": [box], "lines": []})
+
+        # A mutation since the last live capture means the twin is no longer trusted.
+        bridge._mutation_epoch += 1
+        bridge.actions.clear()
+        result = await run_patch_transaction(
+            ctx, TEST_PROJECT_ID, TEST_WORKSPACE_ID, steps=steps, checkpoint_mode="twin"
+        )
+        self.assertEqual(result["checkpoint"]["source"], "live")
+        self.assertNotIn("verified", result["rollback"]["restore"])
+
+        # Lazy verification catches a rollback that did not reach the checkpoint.
+        await runtime.sync_patch_twin(reason="test")
+        bridge.restore_sticks = False
+        result = await run_patch_transaction(ctx, TEST_PROJECT_ID, TEST_WORKSPACE_ID, steps=steps)
+        self.assertEqual(result["checkpoint"]["source"], "twin")
+        self.assertFalse(result["rollback"]["success"])
+        self.assertEqual(runtime.checkpoint_restores["verify_mismatches"], 1)
+
+        invalid = await run_patch_transaction(
+            ctx, TEST_PROJECT_ID, TEST_WORKSPACE_ID, steps=steps, checkpoint_mode="cached"
+        )
+        self.assertEqual(invalid["error"]["code"], ERROR_VALIDATION)
+
+    async def test_batch_actions_share_one_bridge_envelope(self):
+        conn = MaxMSPConnection("http://127.0.0.1", "5002")
+        conn.capabilities = {"supported_actions": ["batch", "add_object", "connect_objects"]}
+
+        async def handler(_event, payload, _namespace):
+            req_id = payload["request_id"]
+            items = payload["payload"]["items"]
+            conn._pending[req_id].set_result(
+                {
+                    "protocol_version": "2.0",
+                    "request_id": req_id,
+                    "state": "succeeded",
+                    "results": {
+                        "items": [
+                            {"index": i, "action": item["action"], "state": "succeeded", "results": {}}
+                            for i, item in enumerate(items)
+                        ]
+                    },
+                }
+            )
+
+        conn.sio = FakeSocketClient(handler=handler)
+        steps = [
+            {
+                "action": "add_max_object",
+                "params": {"position": [10, 10 * i], "obj_type": "button", "varname": f"b{i}", "args": []},
+            }
+            for i in range(3)
+        ]
+        steps.append(
+            {
+                "action": "connect_max_objects",
+                "params": {"src_varname": "b0", "outlet_idx": 0, "dst_varname": "b1", "inlet_idx": 0},
+            }
+        )
+        result = await run_batch_actions(
+            _make_scoped_ctx(conn), TEST_PROJECT_ID, TEST_WORKSPACE_ID, steps=steps
+        )
+
+        self.assertTrue(result["success"])
+        self.assertEqual(len(conn.sio.emits), 1)
+        envelope = conn.sio.emits[0][1]
+        self.assertEqual(envelope["action"], "batch")
+        self.assertEqual(
+            [item["action"] for item in envelope["payload"]["items"]],
+            ["add_object", "add_object", "add_object", "connect_objects"],
+        )
+        self.assertEqual((result["envelopes"], result["succeeded"]), (1, 4))
+
+        invalid = await run_batch_actions(
+            _make_scoped_ctx(conn), TEST_PROJECT_ID, TEST_WORKSPACE_ID, steps=[{"action": "nope"}]
+        )
+        self.assertFalse(invalid["success"])
+        self.assertEqual(invalid["error"]["details"]["workspace_id"], TEST_WORKSPACE_ID)
+        self.assertEqual(len(conn.sio.emits), 1)
+
     async def test_transaction_requires_existing_workspace_scope(self):
         class FakeBridge:
             def __init__(self):
@@ -0,0 +1,53 @@
+"""Micro-benchmark: CPU cost per mutation-slot hand-off as the queue grows.
+
+Run directly (``PYTHONPATH=. python tests/test_queue_scaling.py``) to print the table; the unittest
+only asserts that the per-waiter cost stays roughly flat.
+"""
+
+import asyncio
+import time
+import unittest
+
+from server import MaxMSPConnection
+
+
+QUEUE_DEPTHS = (100, 1000, 4000)
+
+
+async def _drain_queue(depth: int) -> float:
+    conn = MaxMSPConnection("http://127.0.0.1", "5002")
+    conn.mutation_max_inflight = 1
+    conn.mutation_max_queue = depth
+    conn.mutation_queue_wait_timeout_seconds = 60.0
+    await conn._acquire_mutation_slot("add_object")
+
+    async def waiter(i: int) -> None:
+        await conn._acquire_mutation_slot("add_object" if i % 2 else "move_object")
+        await conn._release_mutation_slot()
+
+    tasks = [asyncio.create_task(waiter(i)) for i in range(depth)]
+    await asyncio.sleep(0)
+    started = time.process_time()
+    await conn._release_mutation_slot()
+    await asyncio.gather(*tasks)
+    elapsed = time.process_time() - started
+    assert conn._inflight_mutation_requests == 0
+    assert conn._queued_mutation_requests == 0
+    return elapsed / depth
+
+
+def measure() -> dict[int, float]:
+    return {depth: asyncio.run(_drain_queue(depth)) for depth in QUEUE_DEPTHS}
+
+
+class QueueScalingBenchmarkTests(unittest.TestCase):
+    def test_handoff_cost_per_waiter_stays_flat(self):
+        costs = measure()
+        smallest, largest = costs[QUEUE_DEPTHS[0]], costs[QUEUE_DEPTHS[-1]]
+        # A notify_all scheduler grows ~linearly per waiter (40x here); allow generous noise.
+        self.assertLess(largest, max(smallest, 1e-6) * 8)
+
+
+if __name__ == "__main__":
+    for depth, cost in measure().items():
+        print(f"queue_depth={depth:>5}  cpu_per_handoff_us={cost * 1e6:8.2f}")
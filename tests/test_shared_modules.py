@@ -1,10 +1,15 @@
+import asyncio
+import json
 import tempfile
+import tracemalloc
 import unittest
 from pathlib import Path
 from unittest.mock import Mock, patch
 
-from maxmsp_mcp import protocol
+from maxmsp_mcp import framing, protocol
+from maxmsp_mcp.checkpoints import CheckpointJournal, CheckpointStore, record_hash
 from maxmsp_mcp.config import load_settings
+from maxmsp_mcp.histograms import LatencyRecorder, LogHistogram
 from maxmsp_mcp.json_utils import (
     canonical_json,
     compact_json_size,
@@ -19,9 +24,17 @@ from maxmsp_mcp.object_specs import (
     normalize_avoid_rect_payload,
     validate_add_object_payload,
 )
+from maxmsp_mcp.openmetrics import CONTENT_TYPE, MetricsWriter, serve_openmetrics
 from maxmsp_mcp.process_utils import run_command_json_object
 from maxmsp_mcp.qa_utils import collect_patch_audit
 from maxmsp_mcp.release_utils import render_text_for_diff
+from maxmsp_mcp.scheduling import (
+    PRIORITY_URGENT,
+    AimdLimit,
+    QueueFullError,
+    QueueWaitTimeout,
+    SlotScheduler,
+)
 from maxmsp_mcp.shared_daemon import (
     SHARED_DAEMON_MODE,
     build_sse_url,
@@ -29,13 +42,19 @@ from maxmsp_mcp.shared_daemon import (
     normalize_multi_client_mode,
     parse_shared_daemon_payload,
 )
+from maxmsp_mcp.timeouts import MAX_SIZE_BUCKET, LatencyModel, size_bucket
+from maxmsp_mcp.tracing import Tracer, current_trace, span
 from maxmsp_mcp.topology import (
+    MutableTopology,
     Topology,
     TopologyError,
+    TopologyMerkle,
     clone_json_data,
     load_patch_topology,
     normalize_import_topology,
     patch_payload_from_template,
+    topology_content_hash,
+    topology_delta,
     topology_hash,
 )
 
@@ -49,6 +68,7 @@ class SharedProtocolTests(unittest.TestCase):
         self.assertEqual(protocol.PROTOCOL_VERSION, spec["protocol_version"])
         self.assertEqual(protocol.DEFAULT_BRIDGE_PROTO, spec["bridge_proto"])
         self.assertEqual(protocol.TRANSPORTS, spec["transports"])
+        self.assertEqual(protocol.FRAMINGS, spec["framings"])
         self.assertEqual(protocol.STREAM_KINDS, spec["stream_kinds"])
         self.assertEqual(protocol.EVENTS, spec["events"])
         self.assertEqual(protocol.ACTIONS, spec["actions"])
@@ -63,6 +83,38 @@ class SharedProtocolTests(unittest.TestCase):
         self.assertEqual(settings.runtime.bridge_proto, protocol.DEFAULT_BRIDGE_PROTO)
 
 
+class SharedFramingTests(unittest.TestCase):
+    def test_json_framing_is_always_offered_last_and_passes_envelopes_through(self):
+        self.assertEqual(framing.available_framings("json"), [protocol.FRAMING_JSON])
+        self.assertEqual(framing.available_framings()[-1], protocol.FRAMING_JSON)
+        envelope = {"request_id": "r1", "payload": {"boxes": []}}
+        frame, frame_bytes = framing.encode_frame(envelope, protocol.FRAMING_JSON)
+        self.assertIs(frame, envelope)
+        self.assertIsNone(frame_bytes)
+        self.assertIs(framing.decode_frame(envelope), envelope)
+
+    def test_compressed_json_frame_round_trips(self):
+        self.assertEqual(framing.available_compressions(), [])
+        self.assertEqual(framing.available_compressions("zlib"), [protocol.COMPRESSION_ZLIB])
+        envelope = {"request_id": "r1", "payload": {"boxes": [{"maxclass": "newobj"}] * 100}}
+        frame = framing.compress_frame(envelope, envelope, protocol.FRAMING_JSON, "zlib")
+        self.assertTrue(framing.is_compressed_frame(frame))
+        self.assertEqual(frame["raw_bytes"], compact_json_size(envelope))
+        self.assertLess(len(frame["data"]), frame["raw_bytes"])
+        self.assertEqual(framing.decode_frame(frame), envelope)
+        with self.assertRaises(ValueError):
+            framing.compress_body(b"x", "brotli")
+
+    @unittest.skipUnless(framing.msgpack is not None, "msgpack is not installed")
+    def test_msgpack_frame_round_trips_and_reports_encoded_size(self):
+        self.assertEqual(framing.available_framings()[0], protocol.FRAMING_MSGPACK)
+        envelope = {"request_id": "r1", "payload": {"text": "été", "n": [1, 2.5, None, True]}}
+        frame, frame_bytes = framing.encode_frame(envelope, protocol.FRAMING_MSGPACK)
+        self.assertTrue(framing.is_binary_frame(frame))
+        self.assertEqual(frame_bytes, len(frame))
+        self.assertEqual(framing.decode_frame(frame), envelope)
+
+
 class SharedDaemonTests(unittest.TestCase):
     def test_normalize_multi_client_mode_defaults_to_shared_daemon(self):
         self.assertEqual(normalize_multi_client_mode(""), SHARED_DAEMON_MODE)
@@ -227,6 +279,431 @@ class SharedQaUtilsTests(unittest.TestCase):
         self.assertTrue(any(item["id"] == "signal_warning_1" for item in audit["findings"]))
 
 
+class SharedSchedulingTests(unittest.TestCase):
+    def test_slot_scheduler_hands_off_by_priority_then_round_robin(self):
+        async def scenario():
+            scheduler = SlotScheduler(max_inflight=1, max_queue=8)
+            await scheduler.acquire("add_object", timeout=1.0)
+            order = []
+
+            async def wait(label, key, priority=None):
+                kwargs = {} if priority is None else {"priority": priority}
+                await scheduler.acquire(key, timeout=1.0, **kwargs)
+                order.append(label)
+
+            tasks = [
+                asyncio.create_task(wait("a1", "add_object")),
+                asyncio.create_task(wait("a2", "add_object")),
+                asyncio.create_task(wait("a3", "add_object")),
+                asyncio.create_task(wait("m1", "move_object")),
+                asyncio.create_task(wait("restore", "apply_topology_snapshot", PRIORITY_URGENT)),
+            ]
+            await asyncio.sleep(0)
+            self.assertEqual(scheduler.queued, 5)
+            scheduler.max_queue = 5
+            with self.assertRaises(QueueFullError):
+                await scheduler.acquire("add_object", timeout=1.0)
+            for _ in tasks:
+                scheduler.release()
+                await asyncio.sleep(0)
+            await asyncio.gather(*tasks)
+            self.assertEqual(order, ["restore", "a1", "m1", "a2", "a3"])
+            self.assertEqual((scheduler.inflight, scheduler.queued), (1, 0))
+
+        asyncio.run(scenario())
+
+    def test_slot_scheduler_timeout_and_cancel_leave_no_waiters(self):
+        async def scenario():
+            scheduler = SlotScheduler(max_inflight=1, max_queue=4)
+            await scheduler.acquire("a", timeout=1.0)
+            with self.assertRaises(QueueWaitTimeout):
+                await scheduler.acquire("a", timeout=0.01)
+            cancelled = asyncio.create_task(scheduler.acquire("a", timeout=1.0))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await cancelled
+            self.assertEqual(scheduler.queued, 0)
+            scheduler.release()
+            self.assertEqual(scheduler.inflight, 0)
+            scheduler.max_inflight = 2
+            self.assertEqual(await scheduler.acquire("a", timeout=1.0), 0.0)
+
+        asyncio.run(scenario())
+
+
+class SharedHistogramTests(unittest.TestCase):
+    def test_log_histogram_percentiles_stay_within_bucket_precision(self):
+        histogram = LogHistogram()
+        for value in range(1, 10001):
+            histogram.record(value / 10.0)
+        for fraction, exact in ((0.5, 500.0), (0.95, 950.0), (0.99, 990.0)):
+            self.assertLess(abs(histogram.percentile(fraction) - exact) / exact, 0.035)
+        self.assertEqual((histogram.count, histogram.min, histogram.max), (10000, 0.1, 1000.0))
+        self.assertLessEqual(len(histogram.buckets), 600)
+
+        halves = LogHistogram(), LogHistogram()
+        for value in range(1, 10001):
+            halves[value % 2].record(value / 10.0)
+        halves[0].merge(halves[1])
+        self.assertEqual(halves[0].buckets, histogram.buckets)
+        self.assertIsNone(LogHistogram().percentile(0.5))
+
+    def test_latency_recorder_windows_and_series_merge_time_slices(self):
+        recorder = LatencyRecorder(slice_seconds=10.0, retention_seconds=60.0)
+        now = 1_000_000.0
+        recorder.record(duration_ms=5.0, action="health_ping", lane="health", timestamp=now - 100)
+        recorder.record(duration_ms=40.0, action="add_object", lane="mutation", timestamp=now - 25)
+        recorder.record(
+            duration_ms=80.0, action="add_object", lane="mutation", state="timeout", timestamp=now - 5
+        )
+        self.assertEqual(recorder.count, 3)
+        self.assertEqual(recorder.by_lane["mutation"].count, 2)
+
+        window = recorder.window(now - 30)
+        self.assertEqual((window.requests, window.failures, window.timeouts), (2, 1, 1))
+        self.assertEqual(window.actions["add_object"]["timeouts"], 1)
+        self.assertEqual(window.durations.max, 80.0)
+        # The oldest slice fell out of retention.
+        self.assertEqual(recorder.window(now - 1000).requests, 2)
+        series = recorder.series(now - 30, 20.0)
+        self.assertEqual(sum(bucket.requests for bucket in series.values()), 2)
+
+    def test_rolling_window_matches_merged_slices_as_time_advances(self):
+        recorder = LatencyRecorder(slice_seconds=10.0, retention_seconds=600.0, rolling_seconds=(60.0,))
+        start = 1_000_000.0
+        for step in range(200):
+            recorder.record(
+                duration_ms=float(step % 50 + 1),
+                action="add_object" if step % 3 else "connect_objects",
+                state="failed" if step % 7 == 0 else "succeeded",
+                timestamp=start + step,
+            )
+            if step % 15 == 0:
+                now = start + step
+                rolling = recorder.rolling(60.0, now)
+                merged = recorder.window(now - 60.0)
+                self.assertEqual(
+                    (rolling.requests, rolling.failures, rolling.actions),
+                    (merged.requests, merged.failures, merged.actions),
+                )
+                self.assertEqual(rolling.durations.buckets, merged.durations.buckets)
+                self.assertEqual(rolling.durations.percentile(0.95), merged.durations.percentile(0.95))
+
+        # Back-dated records that already aged out of the window leave it untouched.
+        before = recorder.rolling(60.0, start + 199).requests
+        recorder.record(duration_ms=1.0, timestamp=start + 10)
+        self.assertEqual(recorder.rolling(60.0, start + 199).requests, before)
+        self.assertEqual(recorder.rolling(60.0, start + 10_000).requests, 0)
+        self.assertIsNone(recorder.rolling(60.0, start + 10_000).durations.max)
+        self.assertIsNone(recorder.rolling(30.0))
+
+
+class SharedOpenMetricsTests(unittest.TestCase):
+    def test_writer_groups_families_and_serves_them_over_http(self):
+        histogram = LogHistogram()
+        for value in (0.5, 20.0, 20.0, 3000.0):
+            histogram.record(value)
+        writer = MetricsWriter()
+        writer.counter("requests", 4, "Requests.", {"action": 'say "hi"'})
+        writer.gauge("connected", True, "Connected.")
+        writer.counter("requests", 1, "Requests.", {"action": "other"})
+        writer.latency_histogram("duration_seconds", histogram, "Latency.")
+        text = writer.render()
+
+        self.assertEqual(text.count("# TYPE maxmcp_requests counter"), 1)
+        self.assertIn('maxmcp_requests_total{action="say \\"hi\\""} 4', text)
+        self.assertLess(text.index('action="other"'), text.index("maxmcp_connected 1"))
+        self.assertIn('maxmcp_duration_seconds_bucket{le="0.001"} 1', text)
+        self.assertIn('maxmcp_duration_seconds_bucket{le="0.025"} 3', text)
+        self.assertIn('maxmcp_duration_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("maxmcp_duration_seconds_sum 3.0405", text)
+        self.assertTrue(text.endswith("# EOF\n"))
+        with self.assertRaises(ValueError):
+            writer.gauge("requests", 1, "Requests.")
+
+        async def scrape(path: str) -> bytes:
+            server = await serve_openmetrics("127.0.0.1", 0, lambda: text)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                reader, writer_ = await asyncio.open_connection("127.0.0.1", port)
+                writer_.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+                await writer_.drain()
+                response = await reader.read()
+                writer_.close()
+                return response
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        response = asyncio.run(scrape("/metrics"))
+        self.assertTrue(response.startswith(b"HTTP/1.1 200 OK"))
+        self.assertIn(CONTENT_TYPE.encode(), response)
+        self.assertTrue(response.endswith(text.encode()))
+        self.assertTrue(asyncio.run(scrape("/other")).startswith(b"HTTP/1.1 404"))
+
+
+class SharedTracingTests(unittest.TestCase):
+    def test_tracer_nests_spans_and_exports_chrome_trace_events(self):
+        tracer = Tracer(capacity=2)
+        with span("orphan"):
+            pass
+        self.assertEqual(tracer.recent(), [])
+
+        with tracer.trace("add_object", "send_request", action="add_object"):
+            with span("queue_wait", lane="mutation") as args:
+                args["granted"] = True
+            with tracer.trace("set_workspace_target", "send_request"):
+                pass
+            self.assertIsNotNone(current_trace())
+        self.assertIsNone(current_trace())
+
+        (trace,) = tracer.recent()
+        payload = trace.to_dict()
+        self.assertEqual([row["name"] for row in payload["spans"]], ["queue_wait", "set_workspace_target"])
+        self.assertEqual(payload["spans"][0]["args"], {"lane": "mutation", "granted": True})
+
+        events = tracer.chrome_trace()["traceEvents"]
+        self.assertEqual(events[0]["ph"], "M")
+        self.assertEqual([event["name"] for event in events[1:]], ["add_object", "queue_wait", "set_workspace_target"])
+        self.assertEqual({event["tid"] for event in events}, {trace.trace_id})
+        self.assertTrue(all(event["dur"] >= 0 for event in events[1:]))
+
+        for index in range(3):
+            with tracer.trace(f"op{index}"):
+                pass
+        self.assertEqual([row.name for row in tracer.recent()], ["op1", "op2"])
+        disabled = Tracer(enabled=False)
+        with disabled.trace("noop"):
+            self.assertIsNone(current_trace())
+        self.assertEqual(disabled.recent(), [])
+
+
+class SharedCheckpointStoreTests(unittest.TestCase):
+    @staticmethod
+    def _topology(count: int, *, edited: int | None = None) -> dict:
+        boxes = [
+            {"box": {"varname": f"b{i}", "maxclass": "newobj", "text": "edit" if i == edited else "+ 1"}}
+            for i in range(count)
+        ]
+        lines = [
+            {"patchline": {"source": [f"b{i}", 0], "destination": [f"b{i + 1}", 0]}}
+            for i in range(count - 1)
+        ]
+        return {"boxes": boxes, "lines": lines}
+
+    def test_store_dedupes_records_and_deltas_against_parent(self):
+        store = CheckpointStore(max_delta_chain=2)
+        base = self._topology(50)
+        first = store.add("c1", base)
+        self.assertEqual(first, {"new_records": 99, "delta": False, "depth": 0})
+        self.assertEqual(len(store.unsaved_records()), 99)
+        store.mark_saved(digest for digest, _row in store.unsaved_records())
+
+        edited = self._topology(50, edited=7)
+        edited["boxes"].append({"box": {"varname": "b50", "maxclass": "newobj", "text": "+ 1"}})
+        second = store.add("c2", edited, parent_id="c1")
+        self.assertEqual(second, {"new_records": 2, "delta": True, "depth": 1})
+        self.assertEqual(len(store.unsaved_records()), 2)
+        self.assertEqual(len(store.records), 101)
+        manifest = store.manifest("c2")
+        self.assertNotIn("boxes", manifest)
+        self.assertEqual(len(manifest["box_splices"]), 2)
+        self.assertEqual(store.topology("c1"), base)
+        self.assertEqual(store.topology("c2"), edited)
+
+        store.add("c3", edited, parent_id="c2")
+        self.assertEqual(store.add("c4", base, parent_id="c3")["depth"], 0)
+
+        # Evicting the chain root keeps it as a hidden base: no child manifest changes.
+        c2_manifest = store.manifest("c2")
+        store.remove("c1")
+        self.assertNotIn("c1", store)
+        self.assertEqual(store.hidden_bases(), ["c1"])
+        self.assertEqual(store.manifest("c2"), c2_manifest)
+        self.assertEqual(len(store), 3)
+        with self.assertRaises(KeyError):
+            store.topology("c1")
+        self.assertEqual(store.topology("c3"), edited)
+        store.remove("c4")
+        self.assertEqual(len(store.records), 101)
+
+        restored = CheckpointStore()
+        records = dict(store.records)
+        self.assertTrue(restored.load("c1", store.manifest("c1"), records, hidden=True))
+        self.assertTrue(restored.load("c2", store.manifest("c2"), records))
+        self.assertTrue(restored.load("c3", store.manifest("c3"), records))
+        self.assertFalse(restored.load("orphan", {"parent": "missing", "depth": 1}, records))
+        self.assertEqual(len(restored.missing_records("c3")), 100)
+        restored.adopt_records(records)
+        self.assertEqual(restored.topology("c3"), edited)
+        self.assertEqual(restored.stats()["delta_manifests"], 2)
+        self.assertEqual(restored.stats()["hidden_bases"], 1)
+
+        # Once its last delta child is gone the hidden base and its records are freed.
+        store.remove("c2")
+        self.assertEqual(store.hidden_bases(), ["c1", "c2"])
+        store.remove("c3")
+        self.assertEqual((store.hidden_bases(), len(store), len(store.records)), ([], 0, 0))
+
+
+    def _spilled_store(self, count: int, *, pad: int, hot_bytes: int) -> tuple[CheckpointStore, int]:
+        # Serialized up front so each captured topology is freed once it is checkpointed.
+        captures = []
+        for i in range(count):
+            topology = self._topology(100, edited=i)
+            for row in topology["boxes"]:
+                row["box"]["text"] += " " * pad
+            captures.append(json.dumps(topology))
+        tracemalloc.start()
+        try:
+            store = CheckpointStore(hot_bytes=hot_bytes, spill_saved=True)
+            for i, capture in enumerate(captures):
+                store.add(f"c{i}", json.loads(capture), parent_id=f"c{i - 1}" if i else None)
+                store.mark_saved(digest for digest, _row in store.unsaved_records())
+            resident, _peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return store, resident
+
+    def test_spilled_store_keeps_hot_topologies_under_budget(self):
+        store, fat = self._spilled_store(40, pad=4000, hot_bytes=64 * 1024)
+        _thin_store, thin = self._spilled_store(40, pad=0, hot_bytes=64 * 1024)
+        _few_store, few = self._spilled_store(10, pad=4000, hot_bytes=64 * 1024)
+        # Saved bodies leave memory: record size does not matter, and each extra
+        # checkpoint costs less than the one padded record it adds.
+        self.assertLess(fat, thin * 1.5)
+        self.assertLess((fat - few) / 30, 4000)
+        stats = store.stats()
+        self.assertEqual(stats["resident_records"], 0)
+        self.assertLessEqual(stats["hot_bytes"], 64 * 1024)
+
+        small, _resident = self._spilled_store(3, pad=0, hot_bytes=64 * 1024)
+        self.assertEqual(small.missing_records("c2"), [])
+        self.assertIn("edit", small.topology("c2")["boxes"][2]["box"]["text"])
+        cold, _resident = self._spilled_store(3, pad=0, hot_bytes=0)
+        missing = cold.missing_records("c1")
+        self.assertEqual(len(missing), 199)
+        with self.assertRaises(KeyError):
+            cold.topology("c1")
+        expected = self._topology(100, edited=1)
+        records = {}
+        for row in expected["boxes"] + expected["lines"]:
+            records[record_hash(row)] = row
+        cold.adopt_records(records)
+        self.assertEqual(cold.topology("c1"), expected)
+        self.assertEqual(cold.stats()["resident_records"], 0)
+
+    def test_journal_appends_recovers_torn_tail_and_compacts(self):
+        store = CheckpointStore()
+        base = self._topology(10)
+        edited = self._topology(10, edited=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = CheckpointJournal(Path(tmp) / "checkpoints.jsonl")
+            for checkpoint_id, topology, parent in (("c1", base, None), ("c2", edited, "c1")):
+                store.add(checkpoint_id, topology, parent_id=parent)
+                event = {"op": "checkpoint", "checkpoint_id": checkpoint_id, "hash": checkpoint_id}
+                journal.append([{**event, "manifest": store.manifest(checkpoint_id)}], store.unsaved_records())
+                store.mark_saved(digest for digest, _row in store.unsaved_records())
+            store.remove("c1")
+            journal.append([{"op": "drop", "checkpoint_id": "c1"}])
+            with journal.index_path.open("ab") as handle:
+                handle.write(b'{"op":"checkpoint","checkpoint_id":"c3","man')
+
+            reopened = CheckpointJournal(journal.index_path)
+            state = reopened.load()
+            self.assertGreater(state["truncated_bytes"], 0)
+            # The dropped c1 is replayed as the hidden base c2 still deltas against.
+            self.assertEqual(list(state["checkpoints"]), ["c1", "c2"])
+            self.assertTrue(state["checkpoints"]["c1"]["dropped"])
+            self.assertEqual(state["checkpoints"]["c2"]["hash"], "c2")
+            self.assertTrue(journal.index_path.read_bytes().endswith(b"\n"))
+
+            lazy = CheckpointStore()
+            for checkpoint_id, row in state["checkpoints"].items():
+                self.assertTrue(
+                    lazy.load(checkpoint_id, row["manifest"], reopened.locations, hidden=bool(row.get("dropped")))
+                )
+            self.assertEqual((len(lazy), lazy.hidden_bases()), (1, ["c1"]))
+            lazy.adopt_records(reopened.read_records(lazy.missing_records("c2")))
+            self.assertEqual(lazy.topology("c2"), edited)
+            lazy.adopt_records(reopened.read_records(lazy.missing_records("c1")))
+
+            old_records = reopened.records_path
+            old_index = journal.index_path.read_bytes()
+            rows = [{"op": "checkpoint", **row} for row in state["checkpoints"].values()]
+            with self.assertRaises(ValueError):
+                reopened.compact(rows, [*lazy.live_hashes(), "0" * 64], {})
+            self.assertEqual(journal.index_path.read_bytes(), old_index)
+            self.assertEqual(reopened.records_path, old_records)
+            self.assertTrue(old_records.exists())
+            result = reopened.compact(rows, lazy.live_hashes(), {})
+            self.assertEqual((result["checkpoints"], result["records"]), (2, 20))
+            self.assertFalse(old_records.exists())
+            compacted = CheckpointJournal(journal.index_path)
+            self.assertEqual(list(compacted.load()["checkpoints"]), ["c1", "c2"])
+            self.assertEqual(compacted.read_records(lazy.live_hashes()), lazy.records)
+
+            # Dropping the last delta child retires the hidden base on replay too.
+            compacted.append([{"op": "drop", "checkpoint_id": "c2"}])
+            self.assertEqual(list(CheckpointJournal(journal.index_path).load()["checkpoints"]), [])
+
+
+class SharedTimeoutModelTests(unittest.TestCase):
+    def test_latency_model_derives_clamped_timeouts_per_size_bucket(self):
+        model = LatencyModel(factor=3.0, min_seconds=0.5, max_seconds=10.0, min_samples=5)
+        self.assertEqual([size_bucket(n) for n in (0, 1, 3, 4, 1000)], [0, 1, 2, 3, 10])
+        self.assertIsNone(model.timeout_for("get_objects_in_patch", 0))
+        for duration_ms in (100.0, 120.0, 110.0, 400.0, 130.0):
+            model.observe("get_objects_in_patch", size_bucket(0), duration_ms)
+        for _ in range(5):
+            model.observe("get_objects_in_patch", size_bucket(900), 5000.0)
+
+        self.assertAlmostEqual(model.timeout_for("get_objects_in_patch", 0), 1.2)
+        self.assertEqual(model.timeout_for("get_objects_in_patch", size_bucket(900)), 10.0)
+        # Unseen buckets borrow only from a warm larger bucket.
+        self.assertEqual(model.timeout_for("get_objects_in_patch", 4), 10.0)
+        self.assertIsNone(model.timeout_for("get_objects_in_patch", size_bucket(900) + 1))
+        self.assertIsNone(model.timeout_for("get_patcher_context", 0))
+
+        restored = LatencyModel(factor=3.0, min_seconds=0.5, max_seconds=10.0, min_samples=5)
+        self.assertEqual(restored.load_state(model.to_state()), 2)
+        self.assertEqual(restored.snapshot(), model.snapshot())
+        self.assertEqual(restored.load_state({"version": 0, "windows": []}), 0)
+        self.assertEqual(sorted(model.snapshot()["actions"]["get_objects_in_patch"]), ["0", "10"])
+        legacy = {"version": 1, "windows": [{"action": "get_objects_in_patch", "bucket": None, "samples": [1.0]}]}
+        self.assertEqual(restored.load_state(legacy), 0)
+
+    def test_latency_model_cold_large_bucket_keeps_static_default(self):
+        model = LatencyModel(factor=3.0, min_seconds=0.5, max_seconds=60.0, min_samples=5)
+        for _ in range(50):
+            model.observe("add_objects_batch", size_bucket(2), 40.0)
+        self.assertAlmostEqual(model.timeout_for("add_objects_batch", size_bucket(2)), 0.5)
+        # A fast small bucket must not shrink the budget for a much larger payload.
+        self.assertIsNone(model.timeout_for("add_objects_batch", size_bucket(500)))
+        self.assertIsNone(model.timeout_for("add_objects_batch", MAX_SIZE_BUCKET))
+
+
+    def test_aimd_limit_grows_per_saturated_round_and_cuts_once_per_burst(self):
+        limit = AimdLimit(initial=2, minimum=1, maximum=4)
+        healthy = lambda: True  # noqa: E731
+        self.assertIsNone(limit.on_success(healthy=healthy, saturated=True))
+        self.assertEqual(limit.on_success(healthy=healthy, saturated=False), 3)
+        for _ in range(3):
+            limit.on_success(healthy=lambda: False, saturated=True)
+        self.assertEqual(limit.limit, 3)
+        for _ in range(3):
+            limit.on_success(healthy=healthy, saturated=False)
+        self.assertEqual(limit.limit, 3)
+
+        self.assertEqual(limit.on_congestion("timeout"), 1)
+        self.assertIsNone(limit.on_congestion("timeout"))
+        self.assertEqual(limit.limit, 1)
+        self.assertEqual([row["to"] for row in limit.history], [3, 1])
+        limit.reset(9)
+        self.assertEqual(limit.snapshot()["limit"], 4)
+
+
 class SharedTopologyTests(unittest.TestCase):
     def test_clone_json_data_alias_deep_copies_values(self):
         original = {"nested": [{"x": 1}]}
@@ -302,6 +779,115 @@ class SharedTopologyTests(unittest.TestCase):
             Topology.from_payload(topology_b).canonical_payload(),
         )
 
+    def test_topology_content_hash_tracks_row_order(self):
+        rows = [{"box": {"varname": "a"}}, {"box": {"varname": "b"}}]
+        forward = topology_content_hash({"boxes": rows, "lines": []})
+        self.assertEqual(forward, topology_content_hash({"lines": [], "boxes": list(rows)}))
+        self.assertNotEqual(forward, topology_content_hash({"boxes": rows[::-1], "lines": []}))
+
+    def test_topology_delta_recreates_changed_boxes_and_their_lines(self):
+        current = {
+            "boxes": [
+                {"box": {"varname": "a", "text": "osc~ 440"}},
+                {"box": {"varname": "b", "text": "*~ 0.5"}},
+                {"box": {"varname": "c", "text": "dac~"}},
+            ],
+            "lines": [
+                {"patchline": {"source": ["a", 0], "destination": ["b", 0]}},
+                {"patchline": {"source": ["b", 0], "destination": ["c", 0]}},
+                {"patchline": {"source": ["a", 0], "destination": ["c", 1]}},
+            ],
+        }
+        target = {
+            "boxes": [
+                {"box": {"varname": "a", "text": "osc~ 220"}},
+                {"box": {"varname": "b", "text": "*~ 0.5"}},
+                {"box": {"varname": "d", "text": "ezdac~"}},
+            ],
+            "lines": [
+                {"patchline": {"source": ["a", 0], "destination": ["b", 0]}},
+                {"patchline": {"source": ["b", 0], "destination": ["d", 0]}},
+            ],
+        }
+        delta = topology_delta(current, target)
+        self.assertEqual(sorted(delta["remove"]), ["a", "c"])
+        self.assertEqual([row["box"]["varname"] for row in delta["boxes"]], ["a", "d"])
+        # Cords on removed boxes go with them; only b's cords need attention.
+        self.assertEqual(delta["disconnect"], [])
+        self.assertEqual(len(delta["connect"]), 2)
+        self.assertEqual(topology_delta(target, target)["boxes"], [])
+        self.assertIsNone(topology_delta({"boxes": [{"box": {}}], "lines": []}, target))
+
+    def test_topology_delta_rolls_back_one_cord_without_recreating_boxes(self):
+        def box(varname, inlets, outlets):
+            return {"box": {"varname": varname, "maxclass": "newobj", "text": varname, "numinlets": inlets, "numoutlets": outlets}}
+
+        line = {"patchline": {"source": ["a", 0], "destination": ["b", 0]}}
+        # Live captures count patchcords into numinlets/numoutlets.
+        connected = {"boxes": [box("a", 0, 1), box("b", 1, 0)], "lines": [line]}
+        checkpoint = {"boxes": [box("a", 0, 0), box("b", 0, 0)], "lines": []}
+        delta = topology_delta(connected, checkpoint)
+        self.assertEqual(delta, {"remove": [], "boxes": [], "disconnect": [line], "connect": []})
+        self.assertEqual(topology_delta(checkpoint, connected)["connect"], [line])
+
+    def test_mutable_topology_delta_matches_recaptured_hash(self):
+        model = MutableTopology.from_payload(
+            {
+                "boxes": [{"box": {"varname": "a"}}, {"box": {"varname": "b"}}],
+                "lines": [{"patchline": {"source": ["a", 0], "destination": ["b", 0]}}],
+            }
+        )
+        applied = model.apply_delta(
+            {
+                "complete": True,
+                "removed": ["b"],
+                "boxes": {"c": {"box": {"varname": "c"}}},
+                "lines_for": {"c": [{"patchline": {"source": ["a", 0], "destination": ["c", 1]}}]},
+            }
+        )
+        self.assertTrue(applied)
+        recaptured = {
+            "boxes": [{"box": {"varname": "c"}}, {"box": {"varname": "a"}}],
+            "lines": [{"patchline": {"source": ["a", 0], "destination": ["c", 1]}}],
+        }
+        self.assertEqual(topology_hash(model.to_payload()), topology_hash(recaptured))
+        self.assertFalse(model.apply_delta({"complete": False}))
+        self.assertFalse(model.apply_delta({"complete": True, "removed": ["zzz"]}))
+
+    def test_topology_merkle_rehashes_incrementally_and_reports_divergence(self):
+        base = {
+            "boxes": [{"box": {"varname": f"n{i}", "maxclass": "newobj"}} for i in range(40)],
+            "lines": [{"patchline": {"source": ["n0", 0], "destination": ["n1", 0]}}],
+        }
+        model = MutableTopology.from_payload(base)
+        baseline = TopologyMerkle.from_payload(base)
+        self.assertEqual(model.merkle.root(), baseline.root())
+        self.assertTrue(
+            model.apply_delta(
+                {
+                    "complete": True,
+                    "removed": ["n1"],
+                    "boxes": {"n2": {"box": {"varname": "n2", "maxclass": "toggle"}}},
+                    "lines_for": {"n2": [{"patchline": {"source": ["n0", 0], "destination": ["n2", 0]}}]},
+                }
+            )
+        )
+        digest, object_count, connection_count = model.digest_counts()
+        self.assertEqual(digest, MutableTopology.from_payload(model.to_payload()).merkle.root())
+        self.assertEqual((object_count, connection_count), (39, 1))
+
+        report = baseline.diff(model.merkle)
+        self.assertEqual(report["boxes"], {"added": [], "removed": ["n1"], "changed": ["n2"]})
+        self.assertEqual(
+            report["lines"],
+            {
+                "added": [{"source": ["n0", 0], "destination": ["n2", 0]}],
+                "removed": [{"source": ["n0", 0], "destination": ["n1", 0]}],
+            },
+        )
+        self.assertLessEqual(report["bucket_mismatches"], 4)
+        self.assertFalse(report["truncated"])
+
     def test_load_patch_topology_extracts_patcher_payload(self):
         with tempfile.TemporaryDirectory() as tmp:
             path = Path(tmp) / "patch.maxpat"